@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'corsheaders',
     'django_extensions',
@@ -122,6 +123,11 @@ STORAGES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Beweismittel-Dateien: '' = Django/sendfile, 'nginx' = X-Accel-Redirect, 'xsendfile' = X-Sendfile
+EVIDENCE_SENDFILE = config('EVIDENCE_SENDFILE', default='')
+# Interne nginx-Location, die auf MEDIA_ROOT zeigt (nur für 'nginx')
+EVIDENCE_SENDFILE_PREFIX = config('EVIDENCE_SENDFILE_PREFIX', default='/protected-media/')
+
 # --- SONSTIGES ---
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
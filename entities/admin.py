@@ -1,13 +1,30 @@
-from django.contrib import admin
-from .models import Person, Address, Vehicle, PersonAddress, PersonRelationship
+from django.contrib import admin, messages
+from .models import (
+    Person, Address, Vehicle, PersonAddress, PersonRelationship, PersonAlias, PersonMatchCandidate,
+    ImportRun
+)
+from .services import PersonMergeService, PersonSearchService
+
+
+class PersonAliasInline(admin.TabularInline):
+    """Aus known_aliases abgeleitet, daher nur lesend."""
+    model = PersonAlias
+    fields = ['alias', 'normalized']
+    readonly_fields = ['alias', 'normalized']
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Person)
 class PersonAdmin(admin.ModelAdmin):
     list_display = ['full_name', 'birth_date', 'age', 'risk_level', 'created_at']
     list_filter = ['risk_level', 'created_at', 'birth_date']
-    search_fields = ['first_name', 'last_name', 'known_aliases', 'id_number']
+    search_fields = ['first_name', 'last_name', 'id_number']
     readonly_fields = ['created_at', 'updated_at']
+    inlines = [PersonAliasInline]
     
     fieldsets = (
         ('Grunddaten', {
@@ -24,6 +41,24 @@ class PersonAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Ergänzt die Standardsuche um Alias-Präfixe und unscharfe Treffer (Tippfehler).
+        """
+        base_queryset = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            queryset |= base_queryset.filter(
+                id__in=PersonSearchService.alias_person_ids(search_term, prefix=True)
+            )
+            fuzzy_ids = [
+                person.id for person in
+                PersonSearchService.fuzzy_search(search_term, queryset=base_queryset, limit=100)
+            ]
+            if fuzzy_ids:
+                queryset |= base_queryset.filter(id__in=fuzzy_ids)
+        return queryset, may_have_duplicates
 
 
 @admin.register(Address)
@@ -56,3 +91,42 @@ class PersonRelationshipAdmin(admin.ModelAdmin):
     list_filter = ['relationship_type', 'strength', 'start_date', 'created_at']
     search_fields = ['person1__first_name', 'person1__last_name', 'person2__first_name', 'person2__last_name']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(PersonMatchCandidate)
+class PersonMatchCandidateAdmin(admin.ModelAdmin):
+    list_display = ['person_a', 'person_b', 'score', 'reasons', 'status', 'created_at']
+    list_filter = ['status', 'created_at']
+    list_select_related = ['person_a', 'person_b']
+    search_fields = ['person_a__last_name', 'person_b__last_name']
+    readonly_fields = ['person_a', 'person_b', 'score', 'reasons', 'created_at']
+    actions = ['mark_rejected', 'merge_persons']
+    
+    @admin.action(description='Als kein Duplikat markieren')
+    def mark_rejected(self, request, queryset):
+        updated = queryset.filter(status='open').update(status='rejected')
+        self.message_user(request, f'{updated} Kandidaten abgelehnt.')
+    
+    @admin.action(description='Personen zusammenführen (ältere Person bleibt erhalten)')
+    def merge_persons(self, request, queryset):
+        pairs = PersonMergeService.pairs_from_candidates(
+            queryset.filter(status='open').values_list('person_a_id', 'person_b_id')
+        )
+        try:
+            stats = PersonMergeService.merge_many(pairs, user=request.user)
+        except ValueError as exc:
+            self.message_user(request, str(exc), level=messages.ERROR)
+            return
+        self.message_user(request, f"{stats['merged']} Personen zusammengeführt.")
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = ['source_name', 'kind', 'status', 'rows_done', 'created', 'duplicates', 'invalid', 'started_at']
+    list_filter = ['kind', 'status', 'started_at']
+    search_fields = ['source_name', 'checksum']
+    readonly_fields = [field.name for field in ImportRun._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+
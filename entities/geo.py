@@ -0,0 +1,142 @@
+# entities/geo.py
+"""
+Räumliche Hilfsfunktionen ohne PostGIS: Geohash-Kodierung der Adress-
+Koordinaten, Abdeckung eines Suchrechtecks durch Geohash-Zellen und
+vektorisierte Entfernungsberechnung mit NumPy.
+
+Der Geohash wird in Address.geohash gespeichert (Index). Eine Umkreis- oder
+Rechtecksuche liest nur die Adressen der abdeckenden Zellen (Präfix-Bereiche
+auf dem Index) und filtert die Kandidaten danach exakt.
+"""
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6371008.8  # mittlerer Erdradius
+GEOHASH_PRECISION = 9  # ca. 4,8 m x 4,8 m
+MAX_CELLS = 16  # höchstens so viele Präfix-Bereiche pro Abfrage
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash einer Koordinate ('' ohne Koordinaten)."""
+    if latitude is None or longitude is None:
+        return ''
+    latitude, longitude = float(latitude), float(longitude)
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = value = 0
+    even = True  # Bits abwechselnd Länge, Breite - beginnend mit der Länge
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            interval[0] = middle
+        else:
+            value *= 2
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return ''.join(chars)
+
+
+def cell_size(precision: int) -> tuple:
+    """(Höhe, Breite) einer Geohash-Zelle in Grad."""
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision - lon_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def bounding_box(latitude: float, longitude: float, radius_m: float) -> tuple:
+    """
+    Rechteck um einen Umkreis.
+
+    Returns:
+        (min_lat, min_lon, max_lat, max_lon); reicht der Umkreis über einen Pol,
+        umfasst es alle Längengrade
+    """
+    delta_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    delta_lon = math.degrees(radius_m / (EARTH_RADIUS_M * math.cos(math.radians(latitude))))
+    if delta_lon >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, longitude - delta_lon, max_lat, longitude + delta_lon
+
+
+def bbox_size_m(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> tuple:
+    """(Höhe, größte Breite) eines Rechtecks in Metern; die Breite gilt am äquatornächsten Rand."""
+    height = math.radians(max_lat - min_lat) * EARTH_RADIUS_M
+    widest = 0.0 if min_lat <= 0 <= max_lat else min(abs(min_lat), abs(max_lat))
+    width = math.radians(max_lon - min_lon) * EARTH_RADIUS_M * math.cos(math.radians(widest))
+    return height, width
+
+
+def split_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list:
+    """Teilt ein Rechteck über die Datumsgrenze (Längengrade außerhalb ±180) in zwei."""
+    if min_lon < -180:
+        return [(min_lat, min_lon + 360, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+
+def _cell_range(low: float, high: float, origin: float, step: float, count: int) -> range:
+    first = min(int((low - origin) // step), count - 1)
+    last = min(int((high - origin) // step), count - 1)
+    return range(max(first, 0), max(last, 0) + 1)
+
+
+def covering_cells(min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                   max_cells: int = MAX_CELLS) -> list:
+    """
+    Geohash-Präfixe, die das Rechteck vollständig abdecken - mit der feinsten
+    Genauigkeit, bei der höchstens max_cells Zellen nötig sind.
+    """
+    boxes = split_bbox(min_lat, min_lon, max_lat, max_lon)
+    best = ['']  # Genauigkeit 0: ganze Erde
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = round(180 / height)
+        columns = round(360 / width)
+        grid = []
+        for box_min_lat, box_min_lon, box_max_lat, box_max_lon in boxes:
+            lat_cells = _cell_range(box_min_lat, box_max_lat, -90.0, height, rows)
+            lon_cells = _cell_range(box_min_lon, box_max_lon, -180.0, width, columns)
+            grid.extend((row, column) for row in lat_cells for column in lon_cells)
+        if len(grid) > max_cells:
+            break
+        best = sorted({
+            encode_geohash(-90.0 + (row + 0.5) * height, -180.0 + (column + 0.5) * width, precision)
+            for row, column in grid
+        })
+    return best
+
+
+def haversine_m(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Großkreis-Entfernungen in Metern von einem Punkt zu vielen Punkten."""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    delta_lat = lat2 - lat1
+    delta_lon = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(delta_lat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(delta_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def in_bbox(latitudes: np.ndarray, longitudes: np.ndarray,
+            min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+    """Maske der Punkte im Rechteck (auch über die Datumsgrenze)."""
+    mask = np.zeros(len(latitudes), dtype=bool)
+    for box_min_lat, box_min_lon, box_max_lat, box_max_lon in split_bbox(min_lat, min_lon, max_lat, max_lon):
+        mask |= (
+            (latitudes >= box_min_lat) & (latitudes <= box_max_lat)
+            & (longitudes >= box_min_lon) & (longitudes <= box_max_lon)
+        )
+    return mask
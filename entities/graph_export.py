@@ -0,0 +1,161 @@
+# entities/graph_export.py
+"""
+Streaming-Export des Beziehungsnetzwerks als GraphML oder GEXF
+für externe Graph-Werkzeuge (Gephi, yEd, Cytoscape, networkx).
+
+Knoten und Kanten kommen als Generatoren aus RelationshipGraphService.iter_network;
+das XML wird blockweise erzeugt und nie als Ganzes im Speicher gehalten.
+"""
+from xml.sax.saxutils import escape, quoteattr
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from investigations.export import ILLEGAL_XML_RE
+
+
+FORMATS = ('graphml', 'gexf')
+ELEMENTS_PER_WRITE = 1000
+
+CONTENT_TYPES = {
+    'graphml': 'application/graphml+xml; charset=utf-8',
+    'gexf': 'application/gexf+xml; charset=utf-8',
+}
+
+# (Schlüssel, Typ) der exportierten Attribute
+NODE_ATTRIBUTES = [
+    ('risk_level', 'int'),
+    ('case_count', 'int'),
+    ('roles', 'string'),
+    ('case_types', 'string'),
+]
+EDGE_ATTRIBUTES = [
+    ('type', 'string'),
+    ('label', 'string'),
+    ('strength', 'int'),
+    ('common_cases', 'int'),
+]
+
+
+def _plain(value) -> str:
+    """Listen (Rollen, Falltypen) werden kommagetrennt geschrieben."""
+    if isinstance(value, (list, tuple)):
+        value = ','.join(str(item) for item in value)
+    return ILLEGAL_XML_RE.sub('', str(value))
+
+
+def _text(value) -> str:
+    return escape(_plain(value))
+
+
+def _attr(value) -> str:
+    return quoteattr(_plain(value))
+
+
+def _buffered(parts):
+    """Fasst Elemente zu Blöcken von ELEMENTS_PER_WRITE zusammen."""
+    pending = []
+    for part in parts:
+        pending.append(part)
+        if len(pending) >= ELEMENTS_PER_WRITE:
+            yield ''.join(pending).encode()
+            pending.clear()
+    if pending:
+        yield ''.join(pending).encode()
+
+
+def _graphml_parts(nodes, edges):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+        'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+        '<key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+    )
+    for key, attr_type in NODE_ATTRIBUTES:
+        yield f'<key id="{key}" for="node" attr.name="{key}" attr.type="{attr_type}"/>\n'
+    for key, attr_type in EDGE_ATTRIBUTES:
+        yield f'<key id="e_{key}" for="edge" attr.name="{key}" attr.type="{attr_type}"/>\n'
+    yield '<graph id="network" edgedefault="undirected">\n'
+
+    for node in nodes:
+        data = ''.join(f'<data key="{key}">{_text(node[key])}</data>' for key, _ in NODE_ATTRIBUTES)
+        yield f'<node id="p{node["id"]}"><data key="label">{_text(node["label"])}</data>{data}</node>\n'
+    for edge in edges:
+        data = ''.join(f'<data key="e_{key}">{_text(edge[key])}</data>' for key, _ in EDGE_ATTRIBUTES)
+        yield f'<edge id="r{edge["id"]}" source="p{edge["from"]}" target="p{edge["to"]}">{data}</edge>\n'
+
+    yield '</graph>\n</graphml>\n'
+
+
+def _gexf_attributes(kind: str, attributes: list) -> str:
+    return f'<attributes class="{kind}">' + ''.join(
+        f'<attribute id="{index}" title="{key}" type="{"integer" if attr_type == "int" else "string"}"/>'
+        for index, (key, attr_type) in enumerate(attributes)
+    ) + '</attributes>\n'
+
+
+def _gexf_values(item: dict, attributes: list) -> str:
+    return '<attvalues>' + ''.join(
+        f'<attvalue for="{index}" value={_attr(item[key])}/>'
+        for index, (key, _) in enumerate(attributes)
+    ) + '</attvalues>'
+
+
+def _gexf_parts(nodes, edges):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gexf xmlns="http://gexf.net/1.3" version="1.3">\n'
+        f'<meta lastmodifieddate="{timezone.localdate().isoformat()}"><creator>Ermittlungssystem</creator></meta>\n'
+        '<graph mode="static" defaultedgetype="undirected">\n'
+        + _gexf_attributes('node', NODE_ATTRIBUTES)
+        + _gexf_attributes('edge', EDGE_ATTRIBUTES)
+        + '<nodes>\n'
+    )
+    for node in nodes:
+        yield (
+            f'<node id="p{node["id"]}" label={_attr(node["label"])}>'
+            f'{_gexf_values(node, NODE_ATTRIBUTES)}</node>\n'
+        )
+    yield '</nodes>\n<edges>\n'
+    for edge in edges:
+        yield (
+            f'<edge id="r{edge["id"]}" source="p{edge["from"]}" target="p{edge["to"]}" '
+            f'weight="{edge["strength"]}">{_gexf_values(edge, EDGE_ATTRIBUTES)}</edge>\n'
+        )
+    yield '</edges>\n</graph>\n</gexf>\n'
+
+
+def stream_graphml(nodes, edges):
+    """
+    GraphML-Dokument; Knoten-IDs 'p<Person-ID>', Kanten-IDs 'r<Beziehungs-ID>'.
+
+    Yields:
+        bytes-Blöcke zu je ELEMENTS_PER_WRITE Elementen
+    """
+    return _buffered(_graphml_parts(nodes, edges))
+
+
+def stream_gexf(nodes, edges):
+    """
+    GEXF-1.3-Dokument; die Beziehungsstärke ist zusätzlich Kantengewicht.
+
+    Yields:
+        bytes-Blöcke zu je ELEMENTS_PER_WRITE Elementen
+    """
+    return _buffered(_gexf_parts(nodes, edges))
+
+
+STREAMS = {
+    'graphml': stream_graphml,
+    'gexf': stream_gexf,
+}
+
+
+def network_export_response(nodes, edges, fmt: str, filename: str = 'netzwerk') -> StreamingHttpResponse:
+    """StreamingHttpResponse für GraphML ('graphml') oder GEXF ('gexf')."""
+    response = StreamingHttpResponse(STREAMS[fmt](nodes, edges), content_type=CONTENT_TYPES[fmt])
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{fmt}"'
+    return response
@@ -0,0 +1,138 @@
+# entities/importing.py
+"""
+Lesen und Validieren von Importzeilen (CSV/JSONL) für den Massenimport.
+Reine Funktionen ohne Datenbankzugriff; das Schreiben übernimmt BulkImportService.
+
+Personen werden über ihre externe ID referenziert, Fälle über das Aktenzeichen.
+"""
+import csv
+import io
+import json
+from datetime import date
+
+from investigations.models import PersonInvolvement
+from .models import Person, PersonRelationship
+
+
+FORMATS = ('csv', 'jsonl')
+
+
+class ImportRowError(ValueError):
+    """Zeile ist fehlerhaft und wird übersprungen."""
+
+
+def detect_format(name: str) -> str:
+    """Format anhand der Dateiendung (.csv, .jsonl/.ndjson)."""
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    raise ValueError(f'Unbekanntes Importformat: {name}')
+
+
+def read_rows(stream, fmt: str):
+    """
+    Liest Zeilen aus einem binären Datenstrom, ohne die Datei ganz zu laden.
+
+    Yields:
+        dict je Datenzeile oder ImportRowError für unlesbare JSONL-Zeilen
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        yield from csv.DictReader(text)
+        return
+
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield ImportRowError(f'Ungültiges JSON: {exc}')
+            continue
+        yield row if isinstance(row, dict) else ImportRowError('JSON-Objekt erwartet')
+
+
+def _text(row: dict, field: str, max_length: int = None, required: bool = False):
+    value = row.get(field)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise ImportRowError(f'{field} fehlt')
+    if max_length and len(value) > max_length:
+        raise ImportRowError(f'{field} ist länger als {max_length} Zeichen')
+    return value
+
+
+def _date(row: dict, field: str):
+    value = _text(row, field)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f'{field} ist kein Datum (YYYY-MM-DD): {value}') from None
+
+
+def _integer(row: dict, field: str, default: int, minimum: int, maximum: int) -> int:
+    value = _text(row, field)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ImportRowError(f'{field} ist keine Zahl: {value}') from None
+    if not minimum <= number <= maximum:
+        raise ImportRowError(f'{field} muss zwischen {minimum} und {maximum} liegen')
+    return number
+
+
+def _choice(row: dict, field: str, choices: list) -> str:
+    value = _text(row, field, required=True)
+    if value not in {key for key, _ in choices}:
+        raise ImportRowError(f'{field} ungültig: {value}')
+    return value
+
+
+def clean_person(row: dict) -> dict:
+    return {
+        'external_id': _text(row, 'external_id', 100, required=True),
+        'first_name': _text(row, 'first_name', 100, required=True),
+        'last_name': _text(row, 'last_name', 100, required=True),
+        'birth_date': _date(row, 'birth_date'),
+        'birth_place': _text(row, 'birth_place', 200) or None,
+        'id_number': _text(row, 'id_number', 50) or None,
+        'known_aliases': _text(row, 'known_aliases'),
+        'risk_level': _integer(row, 'risk_level', 0, 0, len(Person.RISK_LEVEL_CHOICES) - 1),
+        'notes': _text(row, 'notes'),
+    }
+
+
+def clean_relationship(row: dict) -> dict:
+    return {
+        'person1': _text(row, 'person1', 100, required=True),
+        'person2': _text(row, 'person2', 100, required=True),
+        'relationship_type': _choice(row, 'relationship_type', PersonRelationship.RELATIONSHIP_TYPE_CHOICES),
+        'description': _text(row, 'description'),
+        'strength': _integer(row, 'strength', 1, 1, 5),
+        'start_date': _date(row, 'start_date'),
+        'end_date': _date(row, 'end_date'),
+    }
+
+
+def clean_involvement(row: dict) -> dict:
+    return {
+        'person': _text(row, 'person', 100, required=True),
+        'case': _text(row, 'case', 50, required=True),
+        'involvement_type': _choice(row, 'involvement_type', PersonInvolvement.INVOLVEMENT_TYPE_CHOICES),
+        'description': _text(row, 'description'),
+        'credibility': _integer(row, 'credibility', 3, 1, 5),
+    }
+
+
+CLEANERS = {
+    'person': clean_person,
+    'relationship': clean_relationship,
+    'involvement': clean_involvement,
+}
@@ -0,0 +1,51 @@
+# entities/management/commands/export_network.py
+"""
+Management-Command für den Export des Beziehungsnetzwerks als GraphML oder GEXF.
+Schreibt blockweise in die Zieldatei - auch Netzwerke mit Millionen Kanten
+werden nie vollständig im Speicher gehalten.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from entities.graph_export import FORMATS, STREAMS
+from entities.services import RelationshipGraphService
+
+
+class Command(BaseCommand):
+    help = 'Exportiert das Beziehungsnetzwerk als GraphML oder GEXF'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Zieldatei (.graphml oder .gexf)')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='Exportformat (Standard: aus der Dateiendung)')
+        parser.add_argument('--case', type=int, help='Nur Personen dieses Falls')
+        parser.add_argument('--case-type', help='Nur Personen aus Fällen dieses Typs')
+        parser.add_argument('--min-risk', type=int, help='Minimale Risikostufe')
+        parser.add_argument('--mode', choices=('all', 'case', 'cross_case'), default='all',
+                            help='Analyse-Modus wie in der Netzwerkansicht')
+        parser.add_argument('--chunk-size', type=int, default=RelationshipGraphService.EXPORT_CHUNK_SIZE,
+                            help='Personen bzw. Beziehungen pro Datenbankabfrage')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if fmt not in FORMATS:
+            raise CommandError(f'Unbekanntes Format: {fmt} (erlaubt: {", ".join(FORMATS)})')
+
+        nodes, edges = RelationshipGraphService.iter_network(
+            case_id=options['case'],
+            case_type=options['case_type'],
+            min_risk_level=options['min_risk'],
+            analysis_mode=options['mode'],
+            chunk_size=options['chunk_size'],
+        )
+        counts = {'nodes': 0, 'edges': 0}
+
+        def counted(items, key):
+            for item in items:
+                counts[key] += 1
+                yield item
+
+        with open(options['path'], 'wb') as handle:
+            for block in STREAMS[fmt](counted(nodes, 'nodes'), counted(edges, 'edges')):
+                handle.write(block)
+        self.stdout.write(f"Knoten: {counts['nodes']}, Kanten: {counts['edges']}")
+
+        self.stdout.write(self.style.SUCCESS(f'Netzwerk-Export erfolgreich nach {options["path"]} geschrieben!'))
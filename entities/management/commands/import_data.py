@@ -0,0 +1,63 @@
+# entities/management/commands/import_data.py
+"""
+Management-Command für den Massenimport aus Fremdsystemen (CSV/JSONL).
+Reihenfolge: erst Personen, dann Beziehungen und Fallbeteiligungen, die
+Personen über ihre externe ID und Fälle über das Aktenzeichen referenzieren.
+Ein abgebrochener Import derselben Datei wird beim nächsten Aufruf fortgesetzt.
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from entities.models import ImportRun
+from entities.services import BulkImportService
+
+
+class Command(BaseCommand):
+    help = 'Importiert Personen, Beziehungen oder Fallbeteiligungen aus CSV/JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV- oder JSONL-Datei')
+        parser.add_argument('--type', required=True, choices=[kind for kind, _ in ImportRun.KIND_CHOICES],
+                            help='Datenart der Datei')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Standard: anhand der Dateiendung')
+        parser.add_argument('--chunk-size', type=int, default=BulkImportService.CHUNK_SIZE,
+                            help='Zeilen pro Transaktion')
+        parser.add_argument('--user', help='Benutzername für "Erstellt von"')
+        parser.add_argument('--restart', action='store_true',
+                            help='Nicht fortsetzen, sondern die Datei von vorn importieren')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Benutzer {options['user']} nicht gefunden")
+        
+        started = time.monotonic()
+        
+        def progress(run):
+            rate = run.rows_done / max(time.monotonic() - started, 0.001) * 60
+            self.stdout.write(
+                f'{run.rows_done} Zeilen verarbeitet (angelegt: {run.created}, '
+                f'vorhanden: {run.duplicates}, fehlerhaft: {run.invalid}) - {rate:.0f} Zeilen/min'
+            )
+        
+        self.stdout.write(f"Importiere {options['path']}...")
+        try:
+            run = BulkImportService.import_file(
+                options['path'], options['type'], fmt=options['format'], user=user,
+                chunk_size=options['chunk_size'], progress=progress, resume=not options['restart'],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        
+        for error in run.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"Zeile {error['line']}: {error['error']}"))
+        if run.invalid > 20:
+            self.stdout.write(f'... weitere Fehler im Importlauf #{run.pk}')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Import erfolgreich abgeschlossen! Angelegt: {run.created}, vorhanden: {run.duplicates}, '
+            f'fehlerhaft: {run.invalid}'
+        ))
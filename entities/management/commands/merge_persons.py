@@ -0,0 +1,48 @@
+# entities/management/commands/merge_persons.py
+"""
+Management-Command für die Stapel-Zusammenführung doppelt erfasster Personen.
+Paare kommen aus einer CSV-Datei (target_id,source_id) oder aus den offenen
+Kandidaten der Entity Resolution ab einer Mindest-Übereinstimmung.
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from entities.models import PersonMatchCandidate
+from entities.services import PersonMergeService
+
+
+class Command(BaseCommand):
+    help = 'Führt doppelt erfasste Personen zusammen und hängt alle Verweise um'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='CSV mit den Spalten target_id,source_id')
+        parser.add_argument('--min-score', type=float,
+                            help='Offene Kandidaten ab dieser Übereinstimmung zusammenführen (0-1)')
+        parser.add_argument('--batch-size', type=int, default=PersonMergeService.BATCH_SIZE,
+                            help='Dubletten pro Transaktion')
+
+    def handle(self, *args, **options):
+        if bool(options['file']) == (options['min_score'] is not None):
+            raise CommandError('Genau eine der Optionen --file oder --min-score angeben')
+        
+        if options['file']:
+            with open(options['file'], newline='', encoding='utf-8') as handle:
+                pairs = [(row['target_id'], row['source_id']) for row in csv.DictReader(handle)]
+        else:
+            pairs = PersonMergeService.pairs_from_candidates(
+                PersonMatchCandidate.objects.filter(
+                    status='open', score__gte=options['min_score']
+                ).values_list('person_a_id', 'person_b_id')
+            )
+        self.stdout.write(f'Führe {len(pairs)} Dubletten zusammen...')
+        
+        try:
+            stats = PersonMergeService.merge_many(pairs, batch_size=options['batch_size'])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(
+            f"Zusammengeführt: {stats['merged']}, umgehängte Verweise: {stats['rewired']}, "
+            f"entfernte doppelte Verweise: {stats['duplicates_removed']}"
+        )
+        
+        self.stdout.write(self.style.SUCCESS('Zusammenführung erfolgreich abgeschlossen!'))
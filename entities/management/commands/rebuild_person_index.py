@@ -0,0 +1,37 @@
+# entities/management/commands/rebuild_person_index.py
+"""
+Management-Command zum Neuaufbau der Suchindizes für Personen.
+Nötig nach Bulk-Importen, die keine Signale auslösen. Ergänzt dabei auch
+fehlende Kennzeichen-Trigramme der Fahrzeuge.
+"""
+from django.core.management.base import BaseCommand
+from entities.services import PersonSearchService, VehicleSearchService
+
+
+class Command(BaseCommand):
+    help = 'Baut die Suchindizes für Personen (Aliase, Trigramme, Kölner Phonetik) neu auf'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Nur noch nicht indizierte Personen verarbeiten (Backfill)',
+        )
+
+    def handle(self, *args, **options):
+        if options['missing']:
+            self.stdout.write('Indiziere fehlende Personen...')
+            counts = PersonSearchService.index_missing()
+        else:
+            self.stdout.write('Baue Personen-Suchindex neu auf...')
+            counts = PersonSearchService.rebuild_index()
+        
+        self.stdout.write(f"Aliase: {counts['aliases']} Zeilen")
+        if PersonSearchService.uses_pg_trgm():
+            self.stdout.write('Trigramme: pg_trgm-GIN-Indizes werden von Postgres gepflegt')
+        else:
+            self.stdout.write(f"Trigramme: {counts['trigrams']} Zeilen")
+        self.stdout.write(f"Phonetische Codes: {counts['phonetic']} Zeilen")
+        self.stdout.write(f"Kennzeichen-Trigramme: {VehicleSearchService.index_missing()} Zeilen")
+        
+        self.stdout.write(self.style.SUCCESS('Personen-Suchindex erfolgreich aufgebaut!'))
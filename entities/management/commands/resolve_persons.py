@@ -0,0 +1,34 @@
+# entities/management/commands/resolve_persons.py
+"""
+Management-Command für den Entity-Resolution-Lauf über alle Personen.
+Schreibt die Tabelle der Duplikat-Kandidaten neu (offene Paare).
+"""
+from django.core.management.base import BaseCommand
+from entities.services import EntityResolutionService
+
+
+class Command(BaseCommand):
+    help = 'Sucht doppelt erfasste Personen und erstellt eine gerankte Kandidatenliste'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Zeilen pro Chunk')
+        parser.add_argument('--max-block-size', type=int, default=EntityResolutionService.MAX_BLOCK_SIZE,
+                            help='Größere Blöcke werden übersprungen')
+        parser.add_argument('--min-score', type=float, default=EntityResolutionService.MIN_SCORE,
+                            help='Mindest-Übereinstimmung für Kandidaten (0-1)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Suche Personen-Duplikate...')
+        
+        stats = EntityResolutionService.run(
+            batch_size=options['batch_size'],
+            max_block_size=options['max_block_size'],
+            min_score=options['min_score'],
+        )
+        self.stdout.write(
+            f"Schlüssel: {stats['keys']}, Blöcke: {stats['blocks']} "
+            f"(übersprungen: {stats['skipped_blocks']}), Vergleiche: {stats['comparisons']}"
+        )
+        self.stdout.write(f"Offene Kandidaten: {stats['candidates']}")
+        
+        self.stdout.write(self.style.SUCCESS('Entity Resolution abgeschlossen!'))
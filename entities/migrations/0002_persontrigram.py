@@ -0,0 +1,74 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:53
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from entities.utils import split_aliases, trigrams
+
+
+TRGM_INDEXES = [
+    ('person_first_name_trgm_idx', 'first_name'),
+    ('person_last_name_trgm_idx', 'last_name'),
+    ('person_known_aliases_trgm_idx', 'known_aliases'),
+]
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON entities_person '
+            f'USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def backfill_trigrams(apps, schema_editor):
+    # Nur ohne pg_trgm nötig
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    Person = apps.get_model('entities', 'Person')
+    PersonTrigram = apps.get_model('entities', 'PersonTrigram')
+    rows = []
+    for person in Person.objects.only('first_name', 'last_name', 'known_aliases').iterator():
+        values = [person.first_name, person.last_name] + split_aliases(person.known_aliases)
+        grams = set().union(*(trigrams(value) for value in values))
+        rows.extend(PersonTrigram(person_id=person.pk, trigram=gram) for gram in grams)
+        if len(rows) >= 5000:
+            PersonTrigram.objects.bulk_create(rows)
+            rows = []
+    PersonTrigram.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Trigramm')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='entities.person', verbose_name='Person')),
+            ],
+            options={
+                'verbose_name': 'Personen-Trigramm',
+                'verbose_name_plural': 'Personen-Trigramme',
+                'unique_together': {('trigram', 'person')},
+            },
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+        migrations.RunPython(backfill_trigrams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0002_persontrigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonPhoneticKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, verbose_name='Phonetischer Code')),
+                ('source', models.CharField(choices=[('first_name', 'Vorname'), ('last_name', 'Nachname'), ('alias', 'Alias')], max_length=20, verbose_name='Quelle')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='phonetic_keys', to='entities.person', verbose_name='Person')),
+            ],
+            options={
+                'verbose_name': 'Phonetischer Schlüssel',
+                'verbose_name_plural': 'Phonetische Schlüssel',
+                'unique_together': {('code', 'person', 'source')},
+            },
+        ),
+    ]
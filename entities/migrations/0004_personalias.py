@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from entities.utils import parse_aliases
+
+
+def parse_known_aliases(apps, schema_editor):
+    Person = apps.get_model('entities', 'Person')
+    PersonAlias = apps.get_model('entities', 'PersonAlias')
+    rows = []
+    for person in Person.objects.exclude(known_aliases='').only('known_aliases').iterator():
+        rows.extend(
+            PersonAlias(person_id=person.pk, alias=alias, normalized=normalized)
+            for normalized, alias in parse_aliases(person.known_aliases).items()
+        )
+        if len(rows) >= 5000:
+            PersonAlias.objects.bulk_create(rows)
+            rows = []
+    PersonAlias.objects.bulk_create(rows)
+
+
+def create_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS personalias_normalized_trgm_idx '
+        'ON entities_personalias USING gin (normalized gin_trgm_ops)'
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS personalias_normalized_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0003_personphonetickey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=200, verbose_name='Alias')),
+                ('normalized', models.CharField(db_index=True, max_length=200, verbose_name='Normalisierter Alias')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='entities.person', verbose_name='Person')),
+            ],
+            options={
+                'verbose_name': 'Alias',
+                'verbose_name_plural': 'Aliase',
+                'ordering': ['normalized'],
+                'unique_together': {('person', 'normalized')},
+            },
+        ),
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+        migrations.RunPython(parse_known_aliases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:04
+
+from django.db import migrations, models
+
+from entities.utils import normalize_text
+
+
+def _bulk_update(queryset, fields, compute, batch_size=1000):
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        compute(obj)
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            queryset.model.objects.bulk_update(batch, fields)
+            batch = []
+    queryset.model.objects.bulk_update(batch, fields)
+
+
+def fill_person_keys(person):
+    person.name_key = normalize_text(f"{person.last_name} {person.first_name}")
+    person.name_key_first = normalize_text(f"{person.first_name} {person.last_name}")
+
+
+def fill_address_key(address):
+    address.search_key = normalize_text(
+        f"{address.street} {address.house_number or ''} {address.postal_code or ''} {address.city}"
+    )
+
+
+def fill_search_keys(apps, schema_editor):
+    Person = apps.get_model('entities', 'Person')
+    Address = apps.get_model('entities', 'Address')
+    _bulk_update(
+        Person.objects.only('first_name', 'last_name'),
+        ['name_key', 'name_key_first'], fill_person_keys
+    )
+    _bulk_update(
+        Address.objects.only('street', 'house_number', 'postal_code', 'city'),
+        ['search_key'], fill_address_key
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0004_personalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='search_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=350, verbose_name='Suchschlüssel'),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=201, verbose_name='Suchschlüssel (Nachname Vorname)'),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='name_key_first',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=201, verbose_name='Suchschlüssel (Vorname Nachname)'),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from collections import Counter
+
+from django.db import migrations, models
+
+from entities.utils import normalize_plate
+
+
+def fill_plate_keys(apps, schema_editor):
+    Vehicle = apps.get_model('entities', 'Vehicle')
+    vehicles = list(Vehicle.objects.only('license_plate'))
+    for vehicle in vehicles:
+        vehicle.plate_key = normalize_plate(vehicle.license_plate)
+    
+    duplicates = [key for key, count in Counter(v.plate_key for v in vehicles).items() if count > 1]
+    if duplicates:
+        raise RuntimeError(
+            'Kennzeichen sind nach Normalisierung doppelt, bitte vorher bereinigen: '
+            + ', '.join(sorted(duplicates))
+        )
+    Vehicle.objects.bulk_update(vehicles, ['plate_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0005_search_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_key',
+            field=models.CharField(default='', editable=False, max_length=20, verbose_name='Kennzeichen-Schlüssel'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_plate_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='vehicle',
+            name='plate_key',
+            field=models.CharField(editable=False, max_length=20, unique=True, verbose_name='Kennzeichen-Schlüssel'),
+        ),
+    ]
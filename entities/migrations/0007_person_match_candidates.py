@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0006_vehicle_plate_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonBlockKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=120, verbose_name='Schlüssel')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='block_keys', to='entities.person', verbose_name='Person')),
+            ],
+            options={
+                'verbose_name': 'Blocking-Schlüssel',
+                'verbose_name_plural': 'Blocking-Schlüssel',
+                'unique_together': {('key', 'person')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonMatchCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Übereinstimmung')),
+                ('reasons', models.CharField(blank=True, max_length=255, verbose_name='Begründung')),
+                ('status', models.CharField(choices=[('open', 'Offen'), ('merged', 'Zusammengeführt'), ('rejected', 'Abgelehnt')], default='open', max_length=20, verbose_name='Status')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')),
+                ('person_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_candidates_a', to='entities.person', verbose_name='Person A')),
+                ('person_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_candidates_b', to='entities.person', verbose_name='Person B')),
+            ],
+            options={
+                'verbose_name': 'Duplikat-Kandidat',
+                'verbose_name_plural': 'Duplikat-Kandidaten',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['status', '-score'], name='personmatch_status_score_idx')],
+                'unique_together': {('person_a', 'person_b')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0007_person_match_candidates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonMergeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_id', models.PositiveBigIntegerField(verbose_name='ID der Dublette')),
+                ('source_name', models.CharField(max_length=201, verbose_name='Name der Dublette')),
+                ('source_data', models.JSONField(default=dict, verbose_name='Stammdaten der Dublette')),
+                ('merged_at', models.DateTimeField(auto_now_add=True, verbose_name='Zusammengeführt am')),
+                ('merged_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Zusammengeführt von')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merge_log', to='entities.person', verbose_name='Zielperson')),
+            ],
+            options={
+                'verbose_name': 'Zusammenführung',
+                'verbose_name_plural': 'Zusammenführungen',
+                'ordering': ['-merged_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0008_personmergelog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='external_id',
+            field=models.CharField(blank=True, help_text='Schlüssel aus dem Quellsystem (Massenimport)', max_length=100, null=True, unique=True, verbose_name='Externe ID'),
+        ),
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('person', 'Personen'), ('relationship', 'Beziehungen'), ('involvement', 'Fallbeteiligungen')], max_length=20, verbose_name='Datenart')),
+                ('source_name', models.CharField(max_length=255, verbose_name='Datei')),
+                ('checksum', models.CharField(blank=True, db_index=True, max_length=64, verbose_name='SHA-256')),
+                ('status', models.CharField(choices=[('running', 'Läuft'), ('done', 'Abgeschlossen'), ('failed', 'Fehlgeschlagen')], default='running', max_length=20, verbose_name='Status')),
+                ('rows_done', models.PositiveIntegerField(default=0, verbose_name='Verarbeitete Zeilen')),
+                ('created', models.PositiveIntegerField(default=0, verbose_name='Angelegt')),
+                ('duplicates', models.PositiveIntegerField(default=0, verbose_name='Bereits vorhanden')),
+                ('invalid', models.PositiveIntegerField(default=0, verbose_name='Fehlerhaft')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Fehlerprotokoll')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='Gestartet am')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Beendet am')),
+                ('started_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Gestartet von')),
+            ],
+            options={
+                'verbose_name': 'Importlauf',
+                'verbose_name_plural': 'Importläufe',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
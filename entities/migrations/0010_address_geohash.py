@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 07:50
+
+from django.db import migrations, models
+
+from entities.geo import encode_geohash
+
+
+def fill_geohash(apps, schema_editor, batch_size=1000):
+    Address = apps.get_model('entities', 'Address')
+    addresses = Address.objects.filter(latitude__isnull=False, longitude__isnull=False).only('latitude', 'longitude')
+    batch = []
+    for address in addresses.iterator(chunk_size=batch_size):
+        address.geohash = encode_geohash(address.latitude, address.longitude)
+        batch.append(address)
+        if len(batch) >= batch_size:
+            Address.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    Address.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0009_bulk_import'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-19 08:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from entities.utils import plate_ngrams
+
+
+def fill_plate_index(apps, schema_editor, batch_size=1000):
+    Vehicle = apps.get_model('entities', 'Vehicle')
+    VehiclePlateTrigram = apps.get_model('entities', 'VehiclePlateTrigram')
+    vehicles, trigrams = [], []
+    for vehicle in Vehicle.objects.only('plate_key').iterator(chunk_size=batch_size):
+        vehicle.plate_key_reversed = vehicle.plate_key[::-1]
+        vehicles.append(vehicle)
+        trigrams.extend(VehiclePlateTrigram(vehicle_id=vehicle.pk, trigram=gram) for gram in plate_ngrams(vehicle.plate_key))
+        if len(vehicles) >= batch_size:
+            Vehicle.objects.bulk_update(vehicles, ['plate_key_reversed'])
+            VehiclePlateTrigram.objects.bulk_create(trigrams)
+            vehicles, trigrams = [], []
+    Vehicle.objects.bulk_update(vehicles, ['plate_key_reversed'])
+    VehiclePlateTrigram.objects.bulk_create(trigrams)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0010_address_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_key_reversed',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='Kennzeichen-Schlüssel (rückwärts)'),
+        ),
+        migrations.CreateModel(
+            name='VehiclePlateTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Trigramm')),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='plate_trigrams', to='entities.vehicle', verbose_name='Fahrzeug')),
+            ],
+            options={
+                'verbose_name': 'Kennzeichen-Trigramm',
+                'verbose_name_plural': 'Kennzeichen-Trigramme',
+                'unique_together': {('trigram', 'vehicle')},
+            },
+        ),
+        migrations.RunPython(fill_plate_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0011_vehicle_plate_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='personmatchcandidate',
+            name='status',
+            field=models.CharField(choices=[('open', 'Offen'), ('rejected', 'Abgelehnt')], default='open', max_length=20, verbose_name='Status'),
+        ),
+    ]
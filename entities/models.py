@@ -1,7 +1,10 @@
 # entities/models.py
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils.timezone import now
+from .utils import normalize_text, normalize_plate
+from .geo import encode_geohash
 
 
 class Person(models.Model):
@@ -25,6 +28,12 @@ class Person(models.Model):
     # Identifikation
     id_number = models.CharField(max_length=50, null=True, blank=True, verbose_name="Ausweisnummer")
     known_aliases = models.TextField(blank=True, verbose_name="Bekannte Aliase")
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True, verbose_name="Externe ID",
+                                   help_text="Schlüssel aus dem Quellsystem (Massenimport)")
+    
+    # Normalisierte Suchschlüssel für Präfix-Suche (per Signal gepflegt)
+    name_key = models.CharField(max_length=201, blank=True, editable=False, db_index=True, verbose_name="Suchschlüssel (Nachname Vorname)")
+    name_key_first = models.CharField(max_length=201, blank=True, editable=False, db_index=True, verbose_name="Suchschlüssel (Vorname Nachname)")
     
     # Bewertung
     risk_level = models.IntegerField(choices=RISK_LEVEL_CHOICES, default=0, verbose_name="Risikostufe")
@@ -42,6 +51,10 @@ class Person(models.Model):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
     
+    def update_search_keys(self):
+        self.name_key = normalize_text(f"{self.last_name} {self.first_name}")
+        self.name_key_first = normalize_text(f"{self.first_name} {self.last_name}")
+    
     @property
     def age(self):
         if self.birth_date:
@@ -69,6 +82,11 @@ class Address(models.Model):
     latitude = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True, verbose_name="Breitengrad")
     longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True, verbose_name="Längengrad")
     
+    # Normalisierter Suchschlüssel für Präfix-Suche (per Signal gepflegt)
+    search_key = models.CharField(max_length=350, blank=True, editable=False, db_index=True, verbose_name="Suchschlüssel")
+    # Geohash der Koordinaten für Umkreis-/Rechtecksuche (per Signal gepflegt)
+    geohash = models.CharField(max_length=12, blank=True, editable=False, db_index=True, verbose_name="Geohash")
+    
     # Metadaten
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Erstellt am")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Aktualisiert am")
@@ -76,6 +94,12 @@ class Address(models.Model):
     def __str__(self):
         return f"{self.street} {self.house_number}, {self.postal_code} {self.city}"
     
+    def update_search_keys(self):
+        self.search_key = normalize_text(
+            f"{self.street} {self.house_number or ''} {self.postal_code or ''} {self.city}"
+        )
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+    
     class Meta:
         verbose_name = "Adresse"
         verbose_name_plural = "Adressen"
@@ -95,6 +119,10 @@ class Vehicle(models.Model):
     ]
     
     license_plate = models.CharField(max_length=20, unique=True, verbose_name="Kennzeichen")
+    plate_key = models.CharField(max_length=20, unique=True, editable=False, verbose_name="Kennzeichen-Schlüssel")
+    # Rückwärts gelesener Schlüssel: Endungs-Suche als Index-Präfix
+    plate_key_reversed = models.CharField(max_length=20, blank=True, editable=False, db_index=True,
+                                          verbose_name="Kennzeichen-Schlüssel (rückwärts)")
     vehicle_type = models.CharField(max_length=20, choices=VEHICLE_TYPE_CHOICES, default='car', verbose_name="Fahrzeugtyp")
     make = models.CharField(max_length=50, null=True, blank=True, verbose_name="Hersteller")
     model = models.CharField(max_length=50, null=True, blank=True, verbose_name="Modell")
@@ -111,6 +139,21 @@ class Vehicle(models.Model):
     def __str__(self):
         return f"{self.license_plate} ({self.make} {self.model})"
     
+    def update_search_keys(self):
+        self.plate_key = normalize_plate(self.license_plate)
+        self.plate_key_reversed = self.plate_key[::-1]
+    
+    def validate_unique(self, exclude=None):
+        # plate_key ist nicht editierbar und wird von Formularen sonst nicht geprüft
+        super().validate_unique(exclude=exclude)
+        if exclude and 'license_plate' in exclude:
+            return
+        duplicate = Vehicle.objects.filter(plate_key=normalize_plate(self.license_plate)).exclude(pk=self.pk)
+        if duplicate.exists():
+            raise ValidationError({
+                'license_plate': f'Ein Fahrzeug mit dem Kennzeichen {duplicate.first().license_plate} existiert bereits.'
+            })
+    
     class Meta:
         verbose_name = "Fahrzeug"
         verbose_name_plural = "Fahrzeuge"
@@ -189,3 +232,188 @@ class PersonRelationship(models.Model):
         verbose_name = "Beziehung"
         verbose_name_plural = "Beziehungen"
         unique_together = ['person1', 'person2', 'relationship_type']
+
+
+class PersonAlias(models.Model):
+    """
+    Normalisierte Aliase einer Person, eine Zeile pro Alias.
+    Wird beim Speichern der Person aus known_aliases abgeleitet.
+    """
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='aliases', verbose_name="Person")
+    alias = models.CharField(max_length=200, verbose_name="Alias")
+    normalized = models.CharField(max_length=200, db_index=True, verbose_name="Normalisierter Alias")
+    
+    def __str__(self):
+        return self.alias
+    
+    class Meta:
+        verbose_name = "Alias"
+        verbose_name_plural = "Aliase"
+        ordering = ['normalized']
+        unique_together = ['person', 'normalized']
+
+
+class PersonTrigram(models.Model):
+    """
+    Trigramm-Index für die unscharfe Namenssuche ohne pg_trgm (z.B. SQLite).
+    Eine Zeile pro Person und Trigramm aus Vor-, Nachname und Aliasen.
+    """
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='trigrams', verbose_name="Person")
+    trigram = models.CharField(max_length=3, verbose_name="Trigramm")
+    
+    def __str__(self):
+        return f"{self.person_id}: '{self.trigram}'"
+    
+    class Meta:
+        verbose_name = "Personen-Trigramm"
+        verbose_name_plural = "Personen-Trigramme"
+        unique_together = ['trigram', 'person']
+
+
+class VehiclePlateTrigram(models.Model):
+    """
+    Trigramm-Index der Kennzeichen-Schlüssel für Teilstück-Suche ("AB12" in "BAB123").
+    """
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='plate_trigrams', verbose_name="Fahrzeug")
+    trigram = models.CharField(max_length=3, verbose_name="Trigramm")
+    
+    def __str__(self):
+        return f"{self.vehicle_id}: '{self.trigram}'"
+    
+    class Meta:
+        verbose_name = "Kennzeichen-Trigramm"
+        verbose_name_plural = "Kennzeichen-Trigramme"
+        unique_together = ['trigram', 'vehicle']
+
+
+class PersonPhoneticKey(models.Model):
+    """
+    Kölner-Phonetik-Codes der Namenswörter und Aliase einer Person.
+    Ermöglicht phonetische Suche (Müller/Mueller/Miller) per Index-Lookup.
+    """
+    SOURCE_CHOICES = [
+        ('first_name', 'Vorname'),
+        ('last_name', 'Nachname'),
+        ('alias', 'Alias'),
+    ]
+    
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='phonetic_keys', verbose_name="Person")
+    code = models.CharField(max_length=50, verbose_name="Phonetischer Code")
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, verbose_name="Quelle")
+    
+    def __str__(self):
+        return f"{self.person_id}: {self.code} ({self.get_source_display()})"
+    
+    class Meta:
+        verbose_name = "Phonetischer Schlüssel"
+        verbose_name_plural = "Phonetische Schlüssel"
+        unique_together = ['code', 'person', 'source']
+
+
+class PersonBlockKey(models.Model):
+    """
+    Blocking-Schlüssel der Entity Resolution (phonetischer Name + Geburtsjahr,
+    phonetischer Vor- und Nachname, Ausweisnummer). Nur Personen mit gleichem
+    Schlüssel werden paarweise verglichen. Wird vom Resolution-Lauf neu aufgebaut.
+    """
+    key = models.CharField(max_length=120, verbose_name="Schlüssel")
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='block_keys', verbose_name="Person")
+    
+    def __str__(self):
+        return f"{self.key}: {self.person_id}"
+    
+    class Meta:
+        verbose_name = "Blocking-Schlüssel"
+        verbose_name_plural = "Blocking-Schlüssel"
+        unique_together = ['key', 'person']
+
+
+class PersonMatchCandidate(models.Model):
+    """
+    Kandidatenpaar für die Zusammenführung doppelt erfasster Personen
+    (person_a hat stets die kleinere ID). Nach einer Zusammenführung entfällt
+    der Kandidat mit der Dublette; nachvollziehbar bleibt sie über PersonMergeLog.
+    """
+    STATUS_CHOICES = [
+        ('open', 'Offen'),
+        ('rejected', 'Abgelehnt'),
+    ]
+    
+    person_a = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='match_candidates_a', verbose_name="Person A")
+    person_b = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='match_candidates_b', verbose_name="Person B")
+    score = models.FloatField(verbose_name="Übereinstimmung")
+    reasons = models.CharField(max_length=255, blank=True, verbose_name="Begründung")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open', verbose_name="Status")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Erstellt am")
+    
+    def __str__(self):
+        return f"{self.person_a} ~ {self.person_b} ({self.score:.2f})"
+    
+    class Meta:
+        verbose_name = "Duplikat-Kandidat"
+        verbose_name_plural = "Duplikat-Kandidaten"
+        ordering = ['-score']
+        unique_together = ['person_a', 'person_b']
+        indexes = [
+            models.Index(fields=['status', '-score'], name='personmatch_status_score_idx'),
+        ]
+
+
+class PersonMergeLog(models.Model):
+    """
+    Protokoll einer Personen-Zusammenführung (Nachvollziehbarkeit der gelöschten Dublette).
+    """
+    target = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='merge_log', verbose_name="Zielperson")
+    source_id = models.PositiveBigIntegerField(verbose_name="ID der Dublette")
+    source_name = models.CharField(max_length=201, verbose_name="Name der Dublette")
+    source_data = models.JSONField(default=dict, verbose_name="Stammdaten der Dublette")
+    merged_at = models.DateTimeField(auto_now_add=True, verbose_name="Zusammengeführt am")
+    merged_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Zusammengeführt von")
+    
+    def __str__(self):
+        return f"{self.source_name} (#{self.source_id}) -> {self.target_id}"
+    
+    class Meta:
+        verbose_name = "Zusammenführung"
+        verbose_name_plural = "Zusammenführungen"
+        ordering = ['-merged_at']
+
+
+class ImportRun(models.Model):
+    """
+    Fortschritt eines Massenimports (CSV/JSONL).
+    Der Zeilenstand wird mit jedem Chunk in derselben Transaktion geschrieben,
+    ein abgebrochener Lauf derselben Datei setzt dort wieder auf.
+    """
+    KIND_CHOICES = [
+        ('person', 'Personen'),
+        ('relationship', 'Beziehungen'),
+        ('involvement', 'Fallbeteiligungen'),
+    ]
+    STATUS_CHOICES = [
+        ('running', 'Läuft'),
+        ('done', 'Abgeschlossen'),
+        ('failed', 'Fehlgeschlagen'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Datenart")
+    source_name = models.CharField(max_length=255, verbose_name="Datei")
+    checksum = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="SHA-256")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running', verbose_name="Status")
+    rows_done = models.PositiveIntegerField(default=0, verbose_name="Verarbeitete Zeilen")
+    created = models.PositiveIntegerField(default=0, verbose_name="Angelegt")
+    duplicates = models.PositiveIntegerField(default=0, verbose_name="Bereits vorhanden")
+    invalid = models.PositiveIntegerField(default=0, verbose_name="Fehlerhaft")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Fehlerprotokoll")
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name="Gestartet am")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Beendet am")
+    started_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Gestartet von")
+    
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.source_name} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = "Importlauf"
+        verbose_name_plural = "Importläufe"
+        ordering = ['-started_at']
+
@@ -3,9 +3,42 @@
 Service-Layer für Entity-bezogene Business Logic.
 Trennt Logik von Views für bessere Testbarkeit und Wartbarkeit.
 """
-from django.db.models import Count, Q, Prefetch
-from .models import Person, PersonRelationship, PersonAddress
-from investigations.models import PersonInvolvement, Case
+import base64
+import binascii
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, groupby, islice
+
+import numpy as np
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import (
+    Count, F, Q, Prefetch, Sum, OuterRef, Subquery, Value, FloatField, BooleanField, ExpressionWrapper,
+    BigIntegerField, IntegerField, When, Case as CaseExpression
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from .models import (
+    Person, PersonRelationship, PersonAddress, PersonAlias, PersonTrigram, PersonPhoneticKey,
+    PersonBlockKey, PersonMatchCandidate, PersonMergeLog, ImportRun, Vehicle, VehiclePlateTrigram, Address
+)
+from . import geo
+from .importing import CLEANERS, FORMATS, ImportRowError, detect_format, read_rows
+from .utils import (
+    normalize_text, normalize_plate, parse_aliases, plate_ngrams, plate_pattern_regex, prefix_q, split_aliases,
+    trigrams, trigram_similarity, phonetic_codes, cologne_phonetic, normalize_id_number,
+    birth_date_similarity
+)
+from investigations.models import (
+    PersonInvolvement, Case, CaseMonthlyStat, SuspectCaseCounter, Investigation, Timeline
+)
+from investigations.services import CaseRollupService, EvidenceTextService
 
 
 class PersonAnalysisService:
@@ -138,31 +171,24 @@ class RelationshipGraphService:
     Service für Beziehungs-Graphen und Netzwerk-Visualisierung.
     """
     
+    EXPORT_CHUNK_SIZE = 2000
+    
     @staticmethod
-    def build_network_data(
+    def network_querysets(
         case_id: int = None,
         case_type: str = None,
         min_risk_level: int = None,
         analysis_mode: str = 'all'
-    ) -> dict:
+    ) -> tuple:
         """
-        Baut Netzwerk-Daten für Visualisierung.
-        Optimiert mit prefetch_related.
+        Personen- und Beziehungs-Querysets für eine Filterkombination
+        (gleiche Semantik wie build_network_data).
         
-        Args:
-            case_id: Optional - Filter nach spezifischem Fall
-            case_type: Optional - Filter nach Falltyp
-            min_risk_level: Optional - Minimum Risikostufe
-            analysis_mode: 'all', 'case', 'cross_case'
-            
         Returns:
-            dict mit 'nodes', 'edges', 'stats'
+            (persons, relationships) - beide noch nicht ausgewertet
         """
-        # Basis-Queryset mit Optimierung
         persons = Person.objects.all()
-        relationships = PersonRelationship.objects.select_related(
-            'person1', 'person2'
-        )
+        relationships = PersonRelationship.objects.all()
         
         # Filter anwenden
         person_ids = None
@@ -195,6 +221,118 @@ class RelationshipGraphService:
                 person2__risk_level__gte=min_risk_level
             )
         
+        return persons, relationships
+    
+    @staticmethod
+    def iter_network(
+        case_id: int = None,
+        case_type: str = None,
+        min_risk_level: int = None,
+        analysis_mode: str = 'all',
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> tuple:
+        """
+        Knoten und Kanten als Generatoren für den Export großer Netzwerke.
+        Personen und Beziehungen werden blockweise gelesen; Fallbeteiligungen
+        nur für die Personen des jeweiligen Blocks nachgeladen.
+        
+        Returns:
+            (nodes, edges) - Generatoren von dicts wie in build_network_data
+        """
+        persons, relationships = RelationshipGraphService.network_querysets(
+            case_id, case_type, min_risk_level, analysis_mode
+        )
+        return (
+            RelationshipGraphService._iter_nodes(persons, chunk_size),
+            RelationshipGraphService._iter_edges(relationships, chunk_size),
+        )
+    
+    @staticmethod
+    def _chunked(rows, size: int):
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+    
+    @staticmethod
+    def _involvements(person_ids) -> dict:
+        """person_id -> Liste von (case_id, Rolle, Falltyp)."""
+        involvements = {}
+        rows = PersonInvolvement.objects.filter(person_id__in=person_ids).values_list(
+            'person_id', 'case_id', 'involvement_type', 'case__case_type'
+        )
+        for person_id, case_id, role, case_type in rows:
+            involvements.setdefault(person_id, []).append((case_id, role, case_type))
+        return involvements
+    
+    @staticmethod
+    def _iter_nodes(persons, chunk_size: int):
+        rows = persons.order_by('id').values_list(
+            'id', 'first_name', 'last_name', 'risk_level'
+        ).iterator(chunk_size=chunk_size)
+        for chunk in RelationshipGraphService._chunked(rows, chunk_size):
+            involvements = RelationshipGraphService._involvements([row[0] for row in chunk])
+            for person_id, first_name, last_name, risk_level in chunk:
+                entries = involvements.get(person_id, [])
+                yield {
+                    'id': person_id,
+                    'label': f'{first_name} {last_name}',
+                    'risk_level': risk_level,
+                    'case_count': len({case_id for case_id, _, _ in entries}),
+                    'roles': sorted({role for _, role, _ in entries}),
+                    'case_types': sorted({case_type for _, _, case_type in entries}),
+                }
+    
+    @staticmethod
+    def _iter_edges(relationships, chunk_size: int):
+        labels = dict(PersonRelationship.RELATIONSHIP_TYPE_CHOICES)
+        rows = relationships.order_by('id').values_list(
+            'id', 'person1_id', 'person2_id', 'relationship_type', 'strength'
+        ).iterator(chunk_size=chunk_size)
+        for chunk in RelationshipGraphService._chunked(rows, chunk_size):
+            person_ids = {row[1] for row in chunk} | {row[2] for row in chunk}
+            cases = {
+                person_id: {case_id for case_id, _, _ in entries}
+                for person_id, entries in RelationshipGraphService._involvements(person_ids).items()
+            }
+            for rel_id, person1_id, person2_id, relationship_type, strength in chunk:
+                yield {
+                    'id': rel_id,
+                    'from': person1_id,
+                    'to': person2_id,
+                    'label': labels.get(relationship_type, relationship_type),
+                    'type': relationship_type,
+                    'strength': strength,
+                    'common_cases': len(cases.get(person1_id, set()) & cases.get(person2_id, set())),
+                }
+    
+    @staticmethod
+    def build_network_data(
+        case_id: int = None,
+        case_type: str = None,
+        min_risk_level: int = None,
+        analysis_mode: str = 'all'
+    ) -> dict:
+        """
+        Baut Netzwerk-Daten für Visualisierung.
+        Optimiert mit prefetch_related.
+        
+        Args:
+            case_id: Optional - Filter nach spezifischem Fall
+            case_type: Optional - Filter nach Falltyp
+            min_risk_level: Optional - Minimum Risikostufe
+            analysis_mode: 'all', 'case', 'cross_case'
+            
+        Returns:
+            dict mit 'nodes', 'edges', 'stats'
+        """
+        persons, relationships = RelationshipGraphService.network_querysets(
+            case_id, case_type, min_risk_level, analysis_mode
+        )
+        relationships = relationships.select_related('person1', 'person2')
+        
         # Prefetch für Performance
         persons = persons.prefetch_related(
             Prefetch(
@@ -315,30 +453,1439 @@ class CrossCaseAnalysisService:
     def get_pattern_analysis() -> dict:
         """
         Identifiziert Muster in den Daten.
+        Liest ausschließlich aus den vorberechneten Rollups (wenige hundert Zeilen).
         """
         # Zeitliche Muster
-        from django.db.models.functions import TruncMonth
-        
-        monthly_cases = Case.objects.annotate(
-            month=TruncMonth('incident_date')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
+        monthly_cases = CaseRollupService.get_trend('month')
         
         # Häufigste Falltypen
-        case_type_stats = Case.objects.values('case_type').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        case_type_stats = CaseMonthlyStat.objects.values('case_type').annotate(
+            count=Sum('count')
+        ).filter(count__gt=0).order_by('-count')
         
-        # Rückfällige Personen (in >2 Fällen als Verdächtige)
-        repeat_suspects = PersonInvolvement.objects.filter(
-            involvement_type='suspect'
-        ).values('person').annotate(
-            case_count=Count('case', distinct=True)
-        ).filter(case_count__gt=1).count()
+        # Rückfällige Personen (in >1 Fällen als Verdächtige)
+        repeat_suspects = SuspectCaseCounter.objects.filter(case_count__gt=1).count()
         
         return {
-            'monthly_trend': list(monthly_cases),
+            'monthly_trend': monthly_cases,
             'case_type_distribution': list(case_type_stats),
             'repeat_suspect_count': repeat_suspects,
         }
+
+
+class PersonSearchService:
+    """
+    Unscharfe und phonetische Personensuche.
+    Trigramme: Postgres nutzt pg_trgm mit GIN-Indizes, andere Datenbanken die Tabelle PersonTrigram.
+    Phonetik: Kölner-Phonetik-Codes in PersonPhoneticKey (alle Datenbanken).
+    Aliase: normalisierte Zeilen in PersonAlias für exakte und Präfix-Suche.
+    """
+    
+    MIN_SIMILARITY = 0.3
+    # Anzahl Kandidaten pro Treffer, die exakt nachbewertet werden
+    CANDIDATE_FACTOR = 5
+    
+    @staticmethod
+    def uses_pg_trgm() -> bool:
+        return connection.vendor == 'postgresql'
+    
+    @staticmethod
+    def person_trigrams(person: Person) -> set:
+        """
+        Trigramme aus Vor-, Nachname und allen Aliasen einer Person.
+        """
+        values = [person.first_name, person.last_name] + split_aliases(person.known_aliases)
+        return set().union(*(trigrams(value) for value in values))
+    
+    @staticmethod
+    def person_phonetic_keys(person: Person) -> set:
+        """
+        (Code, Quelle)-Paare aus Vor-, Nachname und Aliasen einer Person.
+        """
+        keys = {(code, 'first_name') for code in phonetic_codes(person.first_name)}
+        keys |= {(code, 'last_name') for code in phonetic_codes(person.last_name)}
+        for alias in split_aliases(person.known_aliases):
+            keys |= {(code, 'alias') for code in phonetic_codes(alias)}
+        return keys
+    
+    @staticmethod
+    def _sync_rows(model, person: Person, fields: tuple, wanted: set) -> None:
+        """
+        Gleicht die Index-Zeilen einer Person mit dem Sollzustand ab.
+        """
+        existing = {
+            tuple(row[1:]): row[0]
+            for row in model.objects.filter(person=person).values_list('id', *fields)
+        }
+        stale = [pk for key, pk in existing.items() if key not in wanted]
+        if stale:
+            model.objects.filter(id__in=stale).delete()
+        model.objects.bulk_create([
+            model(person=person, **dict(zip(fields, key)))
+            for key in wanted if key not in existing
+        ])
+    
+    @staticmethod
+    def index_person(person: Person) -> None:
+        """
+        Pflegt Alias-, Trigramm- (nur ohne pg_trgm) und Phonetik-Zeilen einer Person.
+        """
+        PersonSearchService._sync_rows(
+            PersonAlias, person, ('normalized', 'alias'),
+            set(parse_aliases(person.known_aliases).items())
+        )
+        if not PersonSearchService.uses_pg_trgm():
+            PersonSearchService._sync_rows(
+                PersonTrigram, person, ('trigram',),
+                {(gram,) for gram in PersonSearchService.person_trigrams(person)}
+            )
+        PersonSearchService._sync_rows(
+            PersonPhoneticKey, person, ('code', 'source'),
+            PersonSearchService.person_phonetic_keys(person)
+        )
+    
+    @staticmethod
+    def _insert_rows(model, columns: tuple, rows: list) -> None:
+        """
+        Schreibt Index-Zeilen per executemany ohne Model-Instanzen
+        (bei Hunderttausenden Zeilen dominiert sonst der ORM-Overhead).
+        """
+        if not rows:
+            return
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table), ', '.join(quote(column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+    
+    @staticmethod
+    def _bulk_index(persons, batch_size: int) -> dict:
+        counts = {'aliases': 0, 'trigrams': 0, 'phonetic': 0}
+        alias_rows, trigram_rows, phonetic_rows = [], [], []
+        
+        def flush():
+            PersonSearchService._insert_rows(PersonAlias, ('person_id', 'alias', 'normalized'), alias_rows)
+            PersonSearchService._insert_rows(PersonTrigram, ('person_id', 'trigram'), trigram_rows)
+            PersonSearchService._insert_rows(PersonPhoneticKey, ('person_id', 'code', 'source'), phonetic_rows)
+            counts['aliases'] += len(alias_rows)
+            counts['trigrams'] += len(trigram_rows)
+            counts['phonetic'] += len(phonetic_rows)
+            alias_rows.clear()
+            trigram_rows.clear()
+            phonetic_rows.clear()
+        
+        with_trigrams = not PersonSearchService.uses_pg_trgm()
+        persons = persons.only('first_name', 'last_name', 'known_aliases')
+        for person in persons.iterator(chunk_size=batch_size):
+            alias_rows.extend(
+                (person.id, alias, normalized)
+                for normalized, alias in parse_aliases(person.known_aliases).items()
+            )
+            phonetic_rows.extend(
+                (person.id, code, source)
+                for code, source in PersonSearchService.person_phonetic_keys(person)
+            )
+            if with_trigrams:
+                trigram_rows.extend(
+                    (person.id, gram) for gram in PersonSearchService.person_trigrams(person)
+                )
+            if len(alias_rows) + len(trigram_rows) + len(phonetic_rows) >= batch_size:
+                flush()
+        flush()
+        return counts
+    
+    @staticmethod
+    def rebuild_index(batch_size: int = 5000) -> dict:
+        """
+        Baut Alias-, Trigramm- und Phonetik-Tabelle komplett neu auf.
+        
+        Returns:
+            dict mit Anzahl Zeilen je Tabelle
+        """
+        PersonAlias.objects.all().delete()
+        PersonTrigram.objects.all().delete()
+        PersonPhoneticKey.objects.all().delete()
+        return PersonSearchService._bulk_index(Person.objects.all(), batch_size)
+    
+    @staticmethod
+    def index_missing(batch_size: int = 5000) -> dict:
+        """
+        Indiziert nur Personen ohne Phonetik-Zeilen (Backfill nach Migration/Bulk-Import).
+        Personen ohne auswertbare Namenswörter werden dabei jedes Mal erneut geprüft.
+        """
+        persons = Person.objects.filter(phonetic_keys__isnull=True)
+        PersonAlias.objects.filter(person__in=persons).delete()
+        PersonTrigram.objects.filter(person__in=persons).delete()
+        return PersonSearchService._bulk_index(persons, batch_size)
+    
+    @staticmethod
+    def alias_person_ids(query: str, prefix: bool = False):
+        """
+        Personen-IDs mit exakt passendem Alias bzw. Alias-Präfix (normalisiert).
+        Liefert ein values()-Queryset zur Verwendung in id__in.
+        """
+        normalized = normalize_text(query)
+        if not normalized:
+            return PersonAlias.objects.none().values('person_id')
+        
+        if prefix:
+            aliases = PersonAlias.objects.filter(prefix_q('normalized', normalized))
+        else:
+            aliases = PersonAlias.objects.filter(normalized=normalized)
+        return aliases.values('person_id')
+    
+    @staticmethod
+    def similarity(query_trigrams: set, person: Person) -> float:
+        """
+        Beste Ähnlichkeit der Suchanfrage zu Vorname, Nachname, vollem Namen oder einem Alias.
+        """
+        values = [person.first_name, person.last_name, person.full_name]
+        values += split_aliases(person.known_aliases)
+        return max(trigram_similarity(query_trigrams, value) for value in values)
+    
+    @staticmethod
+    def fuzzy_search(query: str, queryset=None, limit: int = 50,
+                     min_similarity: float = None) -> list:
+        """
+        Sucht Personen tolerant gegenüber Tippfehlern.
+        
+        Returns:
+            Liste von Personen mit Attribut `similarity`, absteigend sortiert
+        """
+        restricted = queryset is not None
+        if queryset is None:
+            queryset = Person.objects.all()
+        if min_similarity is None:
+            min_similarity = PersonSearchService.MIN_SIMILARITY
+        query = (query or '').strip()
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        
+        if PersonSearchService.uses_pg_trgm():
+            # Operator % nutzt die GIN-Indizes auf Namen und PersonAlias.normalized
+            normalized = normalize_text(query)
+            aliases = PersonAlias.objects.filter(normalized__trigram_similar=normalized)
+            alias_similarity = aliases.filter(
+                person=OuterRef('pk')
+            ).annotate(
+                sim=TrigramSimilarity('normalized', normalized)
+            ).order_by('-sim').values('sim')[:1]
+            
+            return list(queryset.annotate(
+                similarity=Greatest(
+                    TrigramSimilarity('first_name', query),
+                    TrigramSimilarity('last_name', query),
+                    Coalesce(Subquery(alias_similarity), Value(0.0), output_field=FloatField()),
+                )
+            ).filter(
+                Q(first_name__trigram_similar=query) |
+                Q(last_name__trigram_similar=query) |
+                Q(id__in=aliases.values('person_id'))
+            ).filter(
+                similarity__gte=min_similarity
+            ).order_by('-similarity', 'last_name', 'first_name')[:limit])
+        
+        # Jaccard >= s setzt mindestens s * |Q| gemeinsame Trigramme voraus
+        min_shared = max(1, math.ceil(min_similarity * len(query_trigrams)))
+        candidates = PersonTrigram.objects.filter(trigram__in=query_trigrams)
+        if restricted:
+            # Vor dem Abschneiden einschränken, sonst verdrängen Treffer außerhalb des Querysets die übrigen
+            candidates = candidates.filter(person_id__in=queryset.values('id'))
+        candidate_ids = list(
+            candidates.values('person_id').annotate(
+                shared=Count('id')
+            ).filter(
+                shared__gte=min_shared
+            ).order_by('-shared').values_list(
+                'person_id', flat=True
+            )[:limit * PersonSearchService.CANDIDATE_FACTOR]
+        )
+        
+        results = []
+        for person in queryset.filter(id__in=candidate_ids):
+            person.similarity = PersonSearchService.similarity(query_trigrams, person)
+            if person.similarity >= min_similarity:
+                results.append(person)
+        results.sort(key=lambda p: (-p.similarity, p.last_name, p.first_name))
+        return results[:limit]
+    
+    @staticmethod
+    def phonetic_search(query: str, queryset=None):
+        """
+        Phonetische Suche (Kölner Phonetik) per Index-Lookup.
+        Jedes Wort der Anfrage muss bei der Person vorkommen (Name oder Alias).
+        """
+        if queryset is None:
+            queryset = Person.objects.all()
+        codes = set(phonetic_codes(query or ''))
+        if not codes:
+            return queryset.none()
+        
+        person_ids = PersonPhoneticKey.objects.filter(
+            code__in=codes
+        ).values('person_id').annotate(
+            matched=Count('code', distinct=True)
+        ).filter(
+            matched=len(codes)
+        ).values('person_id')
+        return queryset.filter(id__in=person_ids)
+
+
+class VehicleSearchService:
+    """
+    Kennzeichen-Suche über den normalisierten plate_key ("B-AB 123" == "bab123").
+    Anfang über den plate_key-Index, Ende über plate_key_reversed, Teilstücke
+    ab drei Zeichen über den Trigramm-Index VehiclePlateTrigram. Exakt
+    geprüft (LIKE bzw. Regex) werden nur die so gefundenen Kandidaten.
+    """
+    
+    @staticmethod
+    def is_pattern(query: str) -> bool:
+        return '?' in (query or '') or '*' in (query or '')
+    
+    @staticmethod
+    def index_vehicle(vehicle: Vehicle) -> None:
+        """Gleicht die Trigramm-Zeilen eines Fahrzeugs mit seinem Schlüssel ab."""
+        wanted = plate_ngrams(vehicle.plate_key)
+        existing = dict(VehiclePlateTrigram.objects.filter(vehicle=vehicle).values_list('trigram', 'id'))
+        stale = [pk for gram, pk in existing.items() if gram not in wanted]
+        if stale:
+            VehiclePlateTrigram.objects.filter(id__in=stale).delete()
+        VehiclePlateTrigram.objects.bulk_create([
+            VehiclePlateTrigram(vehicle=vehicle, trigram=gram) for gram in wanted if gram not in existing
+        ])
+    
+    @staticmethod
+    def index_missing(batch_size: int = 5000) -> int:
+        """
+        Trigramme für Fahrzeuge ohne Index-Zeilen (nach Bulk-Importen ohne Signale).
+        
+        Returns:
+            Anzahl angelegter Zeilen
+        """
+        vehicles = Vehicle.objects.filter(plate_trigrams__isnull=True).values_list('pk', 'plate_key')
+        rows = []
+        count = 0
+        for pk, plate_key in vehicles.iterator(chunk_size=batch_size):
+            rows.extend(VehiclePlateTrigram(vehicle_id=pk, trigram=gram) for gram in plate_ngrams(plate_key))
+            if len(rows) >= batch_size:
+                VehiclePlateTrigram.objects.bulk_create(rows)
+                count += len(rows)
+                rows = []
+        VehiclePlateTrigram.objects.bulk_create(rows)
+        return count + len(rows)
+    
+    @staticmethod
+    def trigram_candidates(grams: set):
+        """IDs der Fahrzeuge, deren Schlüssel alle Trigramme enthält (values()-Queryset für pk__in)."""
+        return VehiclePlateTrigram.objects.filter(trigram__in=grams).values('vehicle_id').annotate(
+            hits=Count('trigram')
+        ).filter(hits=len(grams)).values('vehicle_id')
+    
+    @staticmethod
+    def plate_q(query: str) -> Q:
+        """
+        Teilstück-Suche ("AB 123" findet "B-AB 1234"), bei ? und * Muster-Suche
+        ("B?AB*23"). Index-Bedingungen grenzen ein, nur die Kandidaten werden
+        exakt geprüft. Kurze Suchbegriffe (unter drei Zeichen) haben keine
+        Trigramme und werden ohne Index als Teilstück gesucht; Muster ohne
+        Anfang, Ende oder Teilstück ab drei Zeichen (z.B. "*2*") liefern keine
+        Treffer.
+        """
+        pattern = normalize_plate(query, wildcards=True)
+        if not pattern.strip('?*'):
+            return Q(pk__in=[])
+        
+        if not VehicleSearchService.is_pattern(pattern):
+            grams = plate_ngrams(pattern)
+            if not grams:
+                return Q(plate_key__contains=pattern)
+            return Q(pk__in=VehicleSearchService.trigram_candidates(grams), plate_key__contains=pattern)
+        
+        segments = re.split(r'[?*]', pattern)
+        condition = Q()
+        if segments[0]:
+            condition &= prefix_q('plate_key', segments[0])
+        if segments[-1]:
+            condition &= prefix_q('plate_key_reversed', segments[-1][::-1])
+        grams = set().union(*(plate_ngrams(segment) for segment in segments))
+        if grams:
+            condition &= Q(pk__in=VehicleSearchService.trigram_candidates(grams))
+        if not condition:
+            return Q(pk__in=[])
+        return condition & Q(plate_key__regex=plate_pattern_regex(pattern))
+    
+    @staticmethod
+    def search_plates(query: str, queryset=None):
+        """
+        Fahrzeuge zu einem Kennzeichen(-muster), exakte Treffer zuerst.
+        """
+        if queryset is None:
+            queryset = Vehicle.objects.all()
+        return queryset.filter(VehicleSearchService.plate_q(query)).annotate(
+            exact=ExpressionWrapper(
+                Q(plate_key=normalize_plate(query)), output_field=BooleanField()
+            )
+        ).order_by('-exact', 'plate_key')
+
+
+class GeoSearchService:
+    """
+    Umkreis- und Rechtecksuche über die Adress-Koordinaten ohne PostGIS.
+    Kandidaten liefern Präfix-Bereiche auf dem Geohash-Index (höchstens
+    geo.MAX_CELLS Zellen), die exakte Filterung erfolgt vektorisiert in NumPy.
+    Fälle werden über ihren Tatort, Personen über ihre Adressen gefunden.
+    """
+    
+    MAX_RADIUS_M = 50000
+    MAX_BBOX_SIDE_M = 2 * MAX_RADIUS_M  # Rechteck höchstens so groß wie der größte Umkreis
+    DEFAULT_LIMIT = 100
+    ID_CHUNK_SIZE = 5000  # IDs pro IN-Abfrage (SQLite-Parameterlimit)
+    
+    @staticmethod
+    def validate(latitude: float, longitude: float) -> None:
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError('Koordinaten außerhalb des gültigen Bereichs')
+    
+    @staticmethod
+    def candidates(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> tuple:
+        """
+        Adressen in den Geohash-Zellen, die das Rechteck abdecken.
+        
+        Returns:
+            (IDs, Breitengrade, Längengrade) als NumPy-Arrays
+        """
+        condition = Q()
+        for cell in geo.covering_cells(min_lat, min_lon, max_lat, max_lon):
+            condition |= prefix_q('geohash', cell)
+        rows = list(Address.objects.exclude(geohash='').filter(condition).values_list(
+            'pk', 'latitude', 'longitude'
+        ))
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        coordinates = np.array([row[1:] for row in rows], dtype=np.float64).reshape(-1, 2)
+        return ids, coordinates[:, 0], coordinates[:, 1]
+    
+    @staticmethod
+    def within_radius(latitude: float, longitude: float, radius_m: float) -> tuple:
+        """
+        Adressen im Umkreis, nach Entfernung sortiert.
+        
+        Returns:
+            (IDs, Entfernungen in Metern) als NumPy-Arrays
+        """
+        GeoSearchService.validate(latitude, longitude)
+        if not 0 < radius_m <= GeoSearchService.MAX_RADIUS_M:
+            raise ValueError(f'Radius muss zwischen 1 und {GeoSearchService.MAX_RADIUS_M} m liegen')
+        
+        ids, latitudes, longitudes = GeoSearchService.candidates(
+            *geo.bounding_box(latitude, longitude, radius_m)
+        )
+        distances = geo.haversine_m(latitude, longitude, latitudes, longitudes)
+        inside = distances <= radius_m
+        ids, distances = ids[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return ids[order], distances[order]
+    
+    @staticmethod
+    def within_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """
+        IDs der Adressen im Rechteck (min_lon > max_lon: über die Datumsgrenze).
+        Seitenlängen über MAX_BBOX_SIDE_M werden abgelehnt.
+        """
+        GeoSearchService.validate(min_lat, min_lon)
+        GeoSearchService.validate(max_lat, max_lon)
+        if min_lat > max_lat:
+            raise ValueError('Südgrenze liegt nördlich der Nordgrenze')
+        if min_lon > max_lon:
+            max_lon += 360
+        if max(geo.bbox_size_m(min_lat, min_lon, max_lat, max_lon)) > GeoSearchService.MAX_BBOX_SIDE_M:
+            raise ValueError(f'Rechteck größer als {GeoSearchService.MAX_BBOX_SIDE_M // 1000} km Seitenlänge')
+        
+        ids, latitudes, longitudes = GeoSearchService.candidates(min_lat, min_lon, max_lat, max_lon)
+        return np.sort(ids[geo.in_bbox(latitudes, longitudes, min_lat, min_lon, max_lat, max_lon)])
+    
+    @staticmethod
+    def _rows(queryset, field: str, ids: np.ndarray, *values):
+        """values()-Zeilen für viele Adress-IDs, abgefragt in Blöcken."""
+        for start in range(0, len(ids), GeoSearchService.ID_CHUNK_SIZE):
+            chunk = ids[start:start + GeoSearchService.ID_CHUNK_SIZE].tolist()
+            yield from queryset.filter(**{f'{field}__in': chunk}).values(field, *values)
+    
+    @staticmethod
+    def collect(ids: np.ndarray, distances: np.ndarray = None, limit: int = DEFAULT_LIMIT) -> dict:
+        """
+        Adressen, Fälle (Tatort) und Personen (Wohn-/Arbeitsadressen) zu
+        gefundenen Adress-IDs. Mit Entfernungen wird danach sortiert, sonst
+        nach ID; jede Liste ist auf limit Einträge gekürzt.
+        
+        Returns:
+            dict mit 'addresses', 'cases', 'persons' und 'total' (Anzahl je Liste)
+        """
+        distance_of = dict(zip(ids.tolist(), distances.tolist())) if distances is not None else {}
+        
+        def with_distance(item, address_id):
+            if distances is not None:
+                item['distance_m'] = round(distance_of[address_id], 1)
+            return item
+        
+        addresses = Address.objects.in_bulk(ids[:limit].tolist())
+        address_rows = [
+            with_distance({
+                'id': address.pk,
+                'label': str(address),
+                'latitude': float(address.latitude),
+                'longitude': float(address.longitude),
+            }, address.pk)
+            for address in (addresses[pk] for pk in ids[:limit].tolist())
+        ]
+        
+        cases = [
+            with_distance({
+                'id': row['id'],
+                'case_number': row['case_number'],
+                'title': row['title'],
+                'address_id': row['location_id'],
+            }, row['location_id'])
+            for row in GeoSearchService._rows(Case.objects.all(), 'location_id', ids, 'id', 'case_number', 'title')
+        ]
+        
+        persons = {}
+        for row in GeoSearchService._rows(
+            PersonAddress.objects.all(), 'address_id', ids, 'person_id', 'person__first_name', 'person__last_name'
+        ):
+            # Je Person die nächstgelegene Adresse
+            current = persons.get(row['person_id'])
+            if current is None or (distances is not None and distance_of[row['address_id']] < current['distance_m']):
+                persons[row['person_id']] = with_distance({
+                    'id': row['person_id'],
+                    'name': f"{row['person__first_name']} {row['person__last_name']}",
+                    'address_id': row['address_id'],
+                }, row['address_id'])
+        persons = list(persons.values())
+        
+        sort_key = (lambda item: (item['distance_m'], item['id'])) if distances is not None else (lambda item: item['id'])
+        cases.sort(key=sort_key)
+        persons.sort(key=sort_key)
+        return {
+            'addresses': address_rows,
+            'cases': cases[:limit],
+            'persons': persons[:limit],
+            'total': {'addresses': len(ids), 'cases': len(cases), 'persons': len(persons)},
+        }
+    
+    @staticmethod
+    def nearby(latitude: float, longitude: float, radius_m: float, limit: int = DEFAULT_LIMIT) -> dict:
+        """Alles im Umkreis um einen Punkt, nach Entfernung sortiert (siehe collect)."""
+        ids, distances = GeoSearchService.within_radius(latitude, longitude, radius_m)
+        return GeoSearchService.collect(ids, distances, limit=limit)
+    
+    @staticmethod
+    def in_area(min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                limit: int = DEFAULT_LIMIT) -> dict:
+        """Alles im Rechteck (siehe collect)."""
+        return GeoSearchService.collect(GeoSearchService.within_bbox(min_lat, min_lon, max_lat, max_lon), limit=limit)
+
+
+class GlobalSearchService:
+    """
+    Gerankte, seitenweise globale Suche über Personen, Fälle, Fahrzeuge, Adressen
+    und den extrahierten Volltext der Beweismittel.
+    Die Teilabfragen laufen parallel; Ergebnisse werden kurz zwischengespeichert.
+    """
+    
+    TYPES = ('persons', 'cases', 'vehicles', 'addresses', 'evidence')
+    CACHE_TIMEOUT = 30  # Sekunden
+    
+    _executor = ThreadPoolExecutor(max_workers=len(TYPES), thread_name_prefix='global-search')
+    
+    @staticmethod
+    def _rank(*conditions) -> CaseExpression:
+        """Rang 0..n-1 für die erste zutreffende Bedingung, sonst n."""
+        return CaseExpression(
+            *[When(condition, then=Value(rank)) for rank, condition in enumerate(conditions)],
+            default=Value(len(conditions)),
+            output_field=IntegerField(),
+        )
+    
+    @staticmethod
+    def encode_cursor(rank: int, pk: int) -> str:
+        return base64.urlsafe_b64encode(f'{rank}|{pk}'.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """
+        Raises:
+            ValueError bei ungültigem Cursor
+        """
+        try:
+            rank, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        except (TypeError, UnicodeDecodeError, binascii.Error) as exc:
+            raise ValueError('Ungültiger Cursor') from exc
+        return int(rank), int(pk)
+    
+    @staticmethod
+    def _page(queryset, cursor, limit: int) -> dict:
+        """
+        Keyset-Pagination über (rank, id).
+        """
+        total = queryset.count()
+        if cursor:
+            rank, pk = GlobalSearchService.decode_cursor(cursor)
+            queryset = queryset.filter(Q(rank__gt=rank) | Q(rank=rank, id__gt=pk))
+        
+        items = list(queryset.order_by('rank', 'id')[:limit + 1])
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = GlobalSearchService.encode_cursor(items[-1].rank, items[-1].id)
+        return {'items': items, 'total': total, 'next_cursor': next_cursor}
+    
+    @staticmethod
+    def _persons(query: str, mode: str, cursor, limit: int) -> dict:
+        if mode == 'fuzzy':
+            # Ähnlichkeits-Ranking ist auf die besten Treffer begrenzt, daher ohne Cursor
+            items = PersonSearchService.fuzzy_search(query)
+            return {'items': items[:limit], 'total': len(items), 'next_cursor': None}
+        
+        key = normalize_text(query)
+        if mode == 'phonetic':
+            persons = PersonSearchService.phonetic_search(query)
+        else:
+            persons = Person.objects.filter(
+                Q(first_name__icontains=query) |
+                Q(last_name__icontains=query) |
+                Q(id__in=PersonSearchService.alias_person_ids(query, prefix=True))
+            )
+        persons = persons.annotate(rank=GlobalSearchService._rank(
+            Q(name_key=key) | Q(name_key_first=key),
+            prefix_q('name_key', key) | prefix_q('name_key_first', key),
+        ))
+        return GlobalSearchService._page(persons, cursor, limit)
+    
+    @staticmethod
+    def _cases(query: str, mode: str, cursor, limit: int) -> dict:
+        cases = Case.objects.filter(
+            Q(case_number__icontains=query) |
+            Q(title__icontains=query) |
+            Q(description__icontains=query)
+        ).annotate(rank=GlobalSearchService._rank(
+            Q(case_number__iexact=query),
+            Q(case_number__istartswith=query),
+            Q(title__icontains=query),
+        ))
+        return GlobalSearchService._page(cases, cursor, limit)
+    
+    @staticmethod
+    def _vehicles(query: str, mode: str, cursor, limit: int) -> dict:
+        plate_q = VehicleSearchService.plate_q(query)
+        if VehicleSearchService.is_pattern(query):
+            vehicles = Vehicle.objects.filter(plate_q)
+        else:
+            vehicles = Vehicle.objects.filter(
+                plate_q | Q(make__icontains=query) | Q(model__icontains=query)
+            )
+        vehicles = vehicles.select_related('owner').annotate(rank=GlobalSearchService._rank(
+            Q(plate_key=normalize_plate(query)),
+            plate_q,
+        ))
+        return GlobalSearchService._page(vehicles, cursor, limit)
+    
+    @staticmethod
+    def _addresses(query: str, mode: str, cursor, limit: int) -> dict:
+        addresses = Address.objects.filter(
+            Q(street__icontains=query) |
+            Q(city__icontains=query) |
+            Q(postal_code__icontains=query)
+        ).prefetch_related(
+            Prefetch('personaddress_set', queryset=PersonAddress.objects.select_related('person'))
+        ).annotate(rank=GlobalSearchService._rank(
+            prefix_q('search_key', normalize_text(query)),
+            Q(postal_code=query.strip()) | Q(city__iexact=query),
+        ))
+        return GlobalSearchService._page(addresses, cursor, limit)
+    
+    @staticmethod
+    def _evidence(query: str, mode: str, cursor, limit: int) -> dict:
+        # Nach Relevanz sortiert und auf die besten Treffer begrenzt, daher ohne Cursor
+        results = EvidenceTextService.search(query, limit=limit)
+        return {'items': results['items'], 'total': results['total'], 'next_cursor': None}
+    
+    @staticmethod
+    def _run(handler, *args) -> dict:
+        """Führt eine Teilabfrage im Pool-Thread mit eigener DB-Verbindung aus."""
+        close_old_connections()
+        try:
+            return handler(*args)
+        finally:
+            close_old_connections()
+    
+    @staticmethod
+    def cache_key(query: str, mode: str, types, cursor, limit: int) -> str:
+        raw = '|'.join([normalize_text(query), mode, ','.join(types), cursor or '', str(limit)])
+        return 'global_search:' + hashlib.sha1(raw.encode()).hexdigest()
+    
+    @staticmethod
+    def search(query: str, mode: str = 'contains', types=None, cursor: str = None,
+               limit: int = 10) -> dict:
+        """
+        Top-N je Entitätstyp mit Gesamtanzahl und Cursor für "Mehr laden".
+        
+        Args:
+            types: Teilmenge von TYPES (Standard: alle)
+            cursor: Cursor aus next_cursor; nur sinnvoll zusammen mit genau einem Typ
+            
+        Returns:
+            dict Typ -> {'items', 'total', 'next_cursor'}
+            
+        Raises:
+            ValueError bei ungültigem Cursor
+        """
+        query = (query or '').strip()
+        if not normalize_text(query):
+            return {}
+        types = [t for t in GlobalSearchService.TYPES if types is None or t in types]
+        if cursor:
+            GlobalSearchService.decode_cursor(cursor)
+        
+        key = GlobalSearchService.cache_key(query, mode, types, cursor, limit)
+        results = cache.get(key)
+        if results is not None:
+            return results
+        
+        handlers = {
+            'persons': GlobalSearchService._persons,
+            'cases': GlobalSearchService._cases,
+            'vehicles': GlobalSearchService._vehicles,
+            'addresses': GlobalSearchService._addresses,
+            'evidence': GlobalSearchService._evidence,
+        }
+        if connection.in_atomic_block:
+            # Andere Verbindungen sähen ungespeicherte Änderungen dieser Transaktion nicht
+            results = {t: handlers[t](query, mode, cursor, limit) for t in types}
+        else:
+            futures = {
+                t: GlobalSearchService._executor.submit(
+                    GlobalSearchService._run, handlers[t], query, mode, cursor, limit
+                )
+                for t in types
+            }
+            results = {t: future.result() for t, future in futures.items()}
+        
+        cache.set(key, results, GlobalSearchService.CACHE_TIMEOUT)
+        return results
+
+
+class EntityResolutionService:
+    """
+    Batch-Erkennung doppelt erfasster Personen.
+    Blocking: nur Personen mit gemeinsamem Schlüssel (Kölner Phonetik des
+    Nachnamens + Geburtsjahr, Phonetik von Vor- und Nachname, Ausweisnummer)
+    werden paarweise bewertet. Aliase aus mehreren Wörtern liefern dieselben
+    Namensschlüssel, damit eine unter ihrem Alias erfasste Dublette gefunden
+    wird. Alle Schritte iterieren in Chunks, der Speicherbedarf hängt nur von
+    Chunk- und Blockgröße ab.
+    """
+    
+    MIN_SCORE = 0.7
+    MAX_BLOCK_SIZE = 200
+    NAME_WEIGHT = 0.6
+    BIRTH_WEIGHT = 0.4
+    ID_BONUS = 0.3
+    ID_MATCH = 0.9
+    PHONETIC_MATCH = 0.9
+    
+    PERSON_FIELDS = ('person_id', 'person__first_name', 'person__last_name', 'person__birth_date',
+                     'person__id_number')
+    
+    @staticmethod
+    def _name_keys(first_name: str, last_name: str, birth_date) -> set:
+        last_code = cologne_phonetic(last_name)
+        first_code = cologne_phonetic(first_name)
+        keys = set()
+        if last_code and birth_date:
+            keys.add(f'py|{last_code}|{birth_date.year}')
+        if last_code and first_code:
+            # Reihenfolge-unabhängig, damit vertauschte Vor-/Nachnamen zusammenfallen
+            keys.add('pn|' + '|'.join(sorted([last_code, first_code])))
+        return keys
+    
+    @staticmethod
+    def block_keys(first_name: str, last_name: str, birth_date, id_number: str, aliases=()) -> set:
+        """
+        Blocking-Schlüssel einer Person.
+        
+        Args:
+            aliases: normalisierte Aliase (PersonAlias.normalized); mehrteilige
+                Aliase werden wie Vor- und Nachname verschlüsselt
+        """
+        keys = EntityResolutionService._name_keys(first_name, last_name, birth_date)
+        for alias in aliases:
+            words = alias.split()
+            if len(words) >= 2:
+                keys |= EntityResolutionService._name_keys(words[0], ' '.join(words[1:]), birth_date)
+        id_key = normalize_id_number(id_number)
+        if id_key:
+            keys.add(f'id|{id_key}'[:120])
+        return keys
+    
+    @staticmethod
+    def _aliases_by_person(person_ids) -> dict:
+        aliases = {}
+        rows = PersonAlias.objects.filter(person_id__in=person_ids).values_list('person_id', 'normalized')
+        for person_id, normalized in rows:
+            aliases.setdefault(person_id, []).append(normalized)
+        return aliases
+    
+    @staticmethod
+    def build_block_keys(batch_size: int = 5000) -> int:
+        """Berechnet die Blocking-Schlüssel aller Personen (inkl. Aliase) neu."""
+        PersonBlockKey.objects.all().delete()
+        count = 0
+        persons = Person.objects.values_list('id', 'first_name', 'last_name', 'birth_date', 'id_number')
+        iterator = persons.iterator(chunk_size=batch_size)
+        while chunk := list(islice(iterator, batch_size)):
+            aliases = EntityResolutionService._aliases_by_person([row[0] for row in chunk])
+            rows = [
+                PersonBlockKey(key=key, person_id=person_id)
+                for person_id, *fields in chunk
+                for key in EntityResolutionService.block_keys(*fields, aliases=aliases.get(person_id, ()))
+            ]
+            PersonBlockKey.objects.bulk_create(rows)
+            count += len(rows)
+        return count
+    
+    @staticmethod
+    def _name_similarity(left_grams: set, left_codes: tuple, right_grams: set, right_codes: tuple) -> float:
+        name = trigram_similarity(left_grams, right_grams)
+        if left_codes and left_codes == right_codes:
+            name = max(name, EntityResolutionService.PHONETIC_MATCH)
+        return name
+    
+    @staticmethod
+    def score_pair(left: tuple, right: tuple) -> tuple:
+        """
+        Bewertet zwei Personen (id, Trigramme, Phonetik, Geburtsdatum, Ausweisnummer,
+        Aliase als (Trigramme, Phonetik)-Paare).
+        Gleich klingende Namen (Müller/Mueller) zählen mindestens PHONETIC_MATCH,
+        ein Alias, der dem Namen der anderen Person entspricht, zählt wie der Name;
+        eine gleiche Ausweisnummer hebt das Paar auf mindestens ID_MATCH.
+        
+        Returns:
+            (score, Begründung)
+        """
+        _id, left_grams, left_codes, left_birth, left_id, left_aliases = left
+        _id, right_grams, right_codes, right_birth, right_id, right_aliases = right
+        name = EntityResolutionService._name_similarity(left_grams, left_codes, right_grams, right_codes)
+        alias = max(
+            [EntityResolutionService._name_similarity(*pair, right_grams, right_codes) for pair in left_aliases]
+            + [EntityResolutionService._name_similarity(left_grams, left_codes, *pair) for pair in right_aliases],
+            default=0.0,
+        )
+        birth = birth_date_similarity(left_birth, right_birth)
+        
+        reasons = [f'Name {name:.2f}']
+        if alias > name:
+            reasons.append(f'Alias {alias:.2f}')
+            name = alias
+        score = EntityResolutionService.NAME_WEIGHT * name + EntityResolutionService.BIRTH_WEIGHT * birth
+        if birth == 1.0:
+            reasons.append('Geburtsdatum gleich')
+        elif birth == 0.8:
+            reasons.append('Geburtsdatum Tippfehler')
+        if left_id and right_id:
+            if left_id == right_id:
+                score = min(1.0, max(score + EntityResolutionService.ID_BONUS, EntityResolutionService.ID_MATCH))
+                reasons.append('Ausweisnummer gleich')
+            else:
+                score -= EntityResolutionService.ID_BONUS
+                reasons.append('Ausweisnummer verschieden')
+        return score, ', '.join(reasons)
+    
+    @staticmethod
+    def _blocks(batch_size: int):
+        """
+        Liefert die Blöcke als Listen von Personendaten, sortiert nach Schlüssel,
+        jeweils mit den Aliasen ihrer Personen (eine Abfrage je batch_size Personen).
+        """
+        rows = PersonBlockKey.objects.order_by('key', 'person_id').values_list(
+            'key', *EntityResolutionService.PERSON_FIELDS
+        ).iterator(chunk_size=batch_size)
+        pending, size = [], 0
+        for _key, members in groupby(rows, key=lambda row: row[0]):
+            block = [row[1:] for row in members]
+            pending.append(block)
+            size += len(block)
+            if size >= batch_size:
+                yield from EntityResolutionService._with_aliases(pending)
+                pending, size = [], 0
+        yield from EntityResolutionService._with_aliases(pending)
+    
+    @staticmethod
+    def _with_aliases(blocks: list):
+        if not blocks:
+            return
+        aliases = EntityResolutionService._aliases_by_person({row[0] for block in blocks for row in block})
+        for block in blocks:
+            yield block, aliases
+    
+    @staticmethod
+    def run(batch_size: int = 5000, max_block_size: int = None, min_score: float = None) -> dict:
+        """
+        Baut die Blocking-Schlüssel auf und schreibt die Kandidatentabelle neu.
+        Abgelehnte Paare bleiben erhalten und werden nicht erneut vorgeschlagen.
+        
+        Returns:
+            dict mit Kennzahlen des Laufs
+        """
+        max_block_size = max_block_size or EntityResolutionService.MAX_BLOCK_SIZE
+        min_score = EntityResolutionService.MIN_SCORE if min_score is None else min_score
+        stats = {'keys': EntityResolutionService.build_block_keys(batch_size),
+                 'blocks': 0, 'skipped_blocks': 0, 'comparisons': 0}
+        PersonMatchCandidate.objects.filter(status='open').delete()
+        
+        candidates = []
+        for block, aliases in EntityResolutionService._blocks(batch_size):
+            if len(block) < 2:
+                continue
+            if len(block) > max_block_size:
+                # Zu unspezifisch (z.B. sehr häufiger Name) - die anderen Schlüssel greifen
+                stats['skipped_blocks'] += 1
+                continue
+            stats['blocks'] += 1
+            
+            features = [
+                (
+                    person_id,
+                    trigrams(f'{first_name} {last_name}'),
+                    tuple(sorted(phonetic_codes(f'{first_name} {last_name}'))),
+                    birth_date,
+                    normalize_id_number(id_number),
+                    tuple(
+                        (trigrams(alias), tuple(sorted(phonetic_codes(alias))))
+                        for alias in aliases.get(person_id, ())
+                    ),
+                )
+                for person_id, first_name, last_name, birth_date, id_number in block
+            ]
+            for left, right in combinations(features, 2):
+                stats['comparisons'] += 1
+                score, reasons = EntityResolutionService.score_pair(left, right)
+                if score >= min_score:
+                    candidates.append(PersonMatchCandidate(
+                        person_a_id=min(left[0], right[0]), person_b_id=max(left[0], right[0]),
+                        score=round(score, 4), reasons=reasons,
+                    ))
+            if len(candidates) >= batch_size:
+                PersonMatchCandidate.objects.bulk_create(candidates, ignore_conflicts=True)
+                candidates = []
+        PersonMatchCandidate.objects.bulk_create(candidates, ignore_conflicts=True)
+        
+        stats['candidates'] = PersonMatchCandidate.objects.filter(status='open').count()
+        return stats
+    
+    @staticmethod
+    def get_candidates(status: str = 'open', limit: int = 100) -> list:
+        """Kandidatenpaare, absteigend nach Übereinstimmung."""
+        return list(
+            PersonMatchCandidate.objects.filter(status=status)
+            .select_related('person_a', 'person_b')
+            .order_by('-score', 'person_a_id', 'person_b_id')[:limit]
+        )
+
+
+class PersonMergeService:
+    """
+    Zusammenführung doppelt erfasster Personen.
+    Alle Verweise werden je Batch mit einem UPDATE pro Tabelle umgehängt
+    (CASE WHEN alte ID THEN neue ID). Zeilen, die danach gegen ein
+    unique_together verstoßen würden, werden vorher gelöscht - es bleibt die
+    Zeile der Zielperson bzw. die älteste Zeile erhalten.
+    """
+    
+    BATCH_SIZE = 500
+    FILL_FIELDS = ('birth_date', 'birth_place', 'id_number')
+    
+    # (Model, Personen-Spalten, weitere Spalten des unique_together)
+    UNIQUE_REFERENCES = (
+        (PersonInvolvement, ('person_id',), ('case_id', 'involvement_type')),
+        (PersonAddress, ('person_id',), ('address_id', 'address_type')),
+        (PersonRelationship, ('person1_id', 'person2_id'), ('relationship_type',)),
+        (Investigation.target_persons.through, ('person_id',), ('investigation_id',)),
+    )
+    PLAIN_REFERENCES = (
+        (Vehicle, 'owner_id'),
+        (Timeline, 'related_person_id'),
+        (PersonMergeLog, 'target_id'),  # Protokolle früherer Zusammenführungen bleiben erhalten
+    )
+    
+    @staticmethod
+    def resolve_mapping(pairs) -> dict:
+        """
+        Dublette -> Zielperson aus (Ziel, Dublette)-Paaren; Ketten werden aufgelöst.
+        
+        Raises:
+            ValueError bei Selbst-Zusammenführung, mehrdeutigen Zielen oder Zyklen
+        """
+        mapping = {}
+        for target_id, source_id in pairs:
+            target_id, source_id = int(target_id), int(source_id)
+            if target_id == source_id:
+                raise ValueError(f'Person {source_id} kann nicht mit sich selbst zusammengeführt werden')
+            if mapping.get(source_id, target_id) != target_id:
+                raise ValueError(f'Person {source_id} hat mehrere Zielpersonen')
+            mapping[source_id] = target_id
+        
+        resolved = {}
+        for source_id, target_id in mapping.items():
+            seen = {source_id}
+            while target_id in mapping:
+                if target_id in seen:
+                    raise ValueError(f'Zyklische Zusammenführung bei Person {source_id}')
+                seen.add(target_id)
+                target_id = mapping[target_id]
+            resolved[source_id] = target_id
+        return resolved
+    
+    @staticmethod
+    def pairs_from_candidates(candidates) -> list:
+        """
+        (Ziel, Dublette)-Paare aus Kandidaten; verbundene Paare bilden einen
+        Cluster, dessen älteste Person (kleinste ID) erhalten bleibt.
+        """
+        parent = {}
+        
+        def find(person_id):
+            parent.setdefault(person_id, person_id)
+            while parent[person_id] != person_id:
+                parent[person_id] = parent[parent[person_id]]
+                person_id = parent[person_id]
+            return person_id
+        
+        for person_a_id, person_b_id in candidates:
+            root_a, root_b = find(person_a_id), find(person_b_id)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        return [(find(person_id), person_id) for person_id in sorted(parent) if find(person_id) != person_id]
+    
+    @staticmethod
+    def _remap(column: str, mapping: dict) -> CaseExpression:
+        return CaseExpression(
+            *[When(**{column: source_id}, then=Value(target_id)) for source_id, target_id in mapping.items()],
+            default=F(column),
+            output_field=BigIntegerField(),
+        )
+    
+    @staticmethod
+    def _rewire_unique(model, person_columns: tuple, key_columns: tuple, mapping: dict) -> tuple:
+        """
+        Hängt Verweise einer Tabelle mit unique_together um.
+        
+        Returns:
+            (umgehängte Zeilen, gelöschte Dubletten)
+        """
+        person_ids = set(mapping) | set(mapping.values())
+        condition = Q()
+        for column in person_columns:
+            condition |= Q(**{f'{column}__in': person_ids})
+        rows = model.objects.filter(condition).order_by('id').values_list('id', *person_columns, *key_columns)
+        
+        width = len(person_columns)
+        unchanged, changed = [], []
+        for row in rows:
+            (changed if any(pid in mapping for pid in row[1:1 + width]) else unchanged).append(row)
+        
+        taken = {row[1:] for row in unchanged}
+        update_ids, delete_ids = [], []
+        for row in changed:
+            persons = tuple(mapping.get(pid, pid) for pid in row[1:1 + width])
+            key = persons + row[1 + width:]
+            if key in taken or (width > 1 and len(set(persons)) < width):
+                # Dublette oder Beziehung einer Person zu sich selbst
+                delete_ids.append(row[0])
+            else:
+                taken.add(key)
+                update_ids.append(row[0])
+        
+        if delete_ids:
+            model.objects.filter(id__in=delete_ids).delete()
+        if update_ids:
+            model.objects.filter(id__in=update_ids).update(**{
+                column[:-3]: PersonMergeService._remap(column, mapping) for column in person_columns
+            })
+        return len(update_ids), len(delete_ids)
+    
+    @staticmethod
+    def _merge_person_data(target: Person, sources: list) -> None:
+        """Ergänzt leere Stammdaten, Aliase, Risikostufe und Notizen der Zielperson."""
+        aliases = {normalize_text(alias): alias for alias in split_aliases(target.known_aliases)}
+        own_name = normalize_text(target.full_name)
+        notes = [target.notes] if target.notes else []
+        for source in sources:
+            for field in PersonMergeService.FILL_FIELDS:
+                if not getattr(target, field) and getattr(source, field):
+                    setattr(target, field, getattr(source, field))
+            target.risk_level = max(target.risk_level, source.risk_level)
+            for alias in [source.full_name] + split_aliases(source.known_aliases):
+                key = normalize_text(alias)
+                if key and key != own_name:
+                    aliases.setdefault(key, alias)
+            notes.append(f'Zusammengeführt mit #{source.id} ({source.full_name})')
+            if source.notes:
+                notes.append(source.notes)
+        target.known_aliases = ', '.join(aliases.values())
+        target.notes = '\n'.join(notes)
+        target.updated_at = timezone.now()
+    
+    @staticmethod
+    @transaction.atomic
+    def _merge_batch(mapping: dict, user=None) -> dict:
+        stats = {'merged': len(mapping), 'rewired': 0, 'duplicates_removed': 0}
+        persons = Person.objects.in_bulk(set(mapping) | set(mapping.values()))
+        missing = (set(mapping) | set(mapping.values())) - set(persons)
+        if missing:
+            raise ValueError(f'Unbekannte Personen: {sorted(missing)}')
+        
+        for model, person_columns, key_columns in PersonMergeService.UNIQUE_REFERENCES:
+            rewired, removed = PersonMergeService._rewire_unique(model, person_columns, key_columns, mapping)
+            stats['rewired'] += rewired
+            stats['duplicates_removed'] += removed
+        for model, column in PersonMergeService.PLAIN_REFERENCES:
+            stats['rewired'] += model.objects.filter(**{f'{column}__in': list(mapping)}).update(
+                **{column[:-3]: PersonMergeService._remap(column, mapping)}
+            )
+        
+        sources_by_target = {}
+        for source_id, target_id in mapping.items():
+            sources_by_target.setdefault(target_id, []).append(persons[source_id])
+        targets = []
+        for target_id, sources in sources_by_target.items():
+            PersonMergeService._merge_person_data(persons[target_id], sources)
+            targets.append(persons[target_id])
+        Person.objects.bulk_update(
+            targets, ['known_aliases', 'notes', 'risk_level', 'updated_at', *PersonMergeService.FILL_FIELDS]
+        )
+        
+        PersonMergeLog.objects.bulk_create([
+            PersonMergeLog(
+                target_id=mapping[source.id], source_id=source.id, source_name=source.full_name,
+                merged_by=user, source_data={
+                    'first_name': source.first_name, 'last_name': source.last_name,
+                    'birth_date': source.birth_date.isoformat() if source.birth_date else None,
+                    'birth_place': source.birth_place, 'id_number': source.id_number,
+                    'known_aliases': source.known_aliases, 'external_id': source.external_id,
+                },
+            )
+            for sources in sources_by_target.values() for source in sources
+        ])
+        
+        # Verbleibende Zeilen der Dubletten (Suchindex, Zähler, Kandidaten) per Kaskade
+        Person.objects.filter(id__in=list(mapping)).delete()
+        
+        target_ids = list(sources_by_target)
+        for model in (PersonAlias, PersonTrigram, PersonPhoneticKey):
+            model.objects.filter(person_id__in=target_ids).delete()
+        PersonSearchService._bulk_index(Person.objects.filter(id__in=target_ids), 5000)
+        CaseRollupService.refresh_suspect_counters(target_ids)
+        return stats
+    
+    @staticmethod
+    def merge_many(pairs, batch_size: int = None, user=None) -> dict:
+        """
+        Führt viele (Ziel, Dublette)-Paare zusammen; jeder Batch in einer Transaktion.
+        
+        Raises:
+            ValueError bei ungültigen Paaren oder unbekannten Personen
+        """
+        mapping = PersonMergeService.resolve_mapping(pairs)
+        batch_size = batch_size or PersonMergeService.BATCH_SIZE
+        
+        # Alle Dubletten einer Zielperson landen im selben Batch
+        by_target = {}
+        for source_id, target_id in sorted(mapping.items()):
+            by_target.setdefault(target_id, []).append(source_id)
+        
+        stats = Counter()
+        batch = {}
+        for target_id, source_ids in by_target.items():
+            batch.update({source_id: target_id for source_id in source_ids})
+            if len(batch) >= batch_size:
+                stats.update(PersonMergeService._merge_batch(batch, user))
+                batch = {}
+        if batch:
+            stats.update(PersonMergeService._merge_batch(batch, user))
+        return {key: stats[key] for key in ('merged', 'rewired', 'duplicates_removed')}
+    
+    @staticmethod
+    def merge(target: Person, sources: list, user=None) -> dict:
+        """Führt eine oder mehrere Dubletten in die Zielperson zusammen."""
+        return PersonMergeService.merge_many(
+            [(target.pk, getattr(source, 'pk', source)) for source in sources], user=user
+        )
+
+
+class BulkImportService:
+    """
+    Massenimport von Personen, Beziehungen und Fallbeteiligungen aus CSV/JSONL.
+    
+    Zeilen werden gestreamt, validiert und chunkweise geschrieben: Fremdschlüssel
+    (externe Personen-ID, Aktenzeichen) werden gegen Schlüssel-Maps im Speicher
+    aufgelöst, vorhandene Datensätze vorab aussortiert und der Rest per
+    bulk_create in einer Transaktion je Chunk angelegt. Signale laufen dabei
+    nicht; Suchindex und Verdächtigen-Zähler werden je Chunk nachgezogen.
+    """
+    
+    CHUNK_SIZE = 5000
+    MAX_ERRORS = 1000
+    
+    @staticmethod
+    def checksum(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def import_file(path: str, kind: str, fmt: str = None, user=None, chunk_size: int = None,
+                    progress=None, resume: bool = True) -> ImportRun:
+        """
+        Importiert eine Datei. Ein abgebrochener Lauf derselben Datei (gleiche
+        Prüfsumme) wird ab dem letzten bestätigten Chunk fortgesetzt.
+        """
+        fmt = fmt or detect_format(path)
+        BulkImportService.validate(kind, fmt)
+        run = BulkImportService._resumable_run(
+            kind, os.path.basename(path), BulkImportService.checksum(path), user, resume
+        )
+        with open(path, 'rb') as stream:
+            return BulkImportService.import_stream(stream, kind, fmt, run=run, chunk_size=chunk_size,
+                                                   progress=progress)
+    
+    @staticmethod
+    def import_upload(upload, kind: str, fmt: str = None, user=None) -> ImportRun:
+        """
+        Importiert eine hochgeladene Datei (UploadedFile). Django legt große
+        Uploads als temporäre Datei ab; Prüfsumme und Import lesen blockweise.
+        Wie bei import_file wird ein abgebrochener Lauf derselben Datei fortgesetzt.
+        """
+        fmt = fmt or detect_format(upload.name)
+        BulkImportService.validate(kind, fmt)
+        digest = hashlib.sha256()
+        for block in upload.chunks():
+            digest.update(block)
+        upload.seek(0)
+        run = BulkImportService._resumable_run(kind, os.path.basename(upload.name), digest.hexdigest(), user)
+        return BulkImportService.import_stream(upload.file, kind, fmt, run=run)
+    
+    @staticmethod
+    def validate(kind: str, fmt: str) -> None:
+        """
+        Prüft Datenart und Format, bevor ein ImportRun angelegt wird.
+        
+        Raises:
+            ValueError bei unbekannter Datenart oder unbekanntem Format
+        """
+        if kind not in CLEANERS:
+            raise ValueError(f'Unbekannte Datenart: {kind}')
+        if fmt not in FORMATS:
+            raise ValueError(f'Unbekanntes Importformat: {fmt}')
+    
+    @staticmethod
+    def _resumable_run(kind: str, source_name: str, checksum: str, user=None, resume: bool = True) -> ImportRun:
+        """Abgebrochener Lauf mit gleicher Prüfsumme oder ein neuer ImportRun."""
+        run = None
+        if resume:
+            run = ImportRun.objects.filter(
+                kind=kind, checksum=checksum, status__in=['running', 'failed']
+            ).first()
+        if run is None:
+            run = ImportRun.objects.create(
+                kind=kind, source_name=source_name, checksum=checksum, started_by=user
+            )
+        return run
+    
+    @staticmethod
+    def run_status(run: ImportRun) -> dict:
+        """Stand eines Importlaufs für die JSON-API."""
+        return {
+            'id': run.pk,
+            'kind': run.kind,
+            'source_name': run.source_name,
+            'status': run.status,
+            'rows_done': run.rows_done,
+            'created': run.created,
+            'duplicates': run.duplicates,
+            'invalid': run.invalid,
+            'errors': run.errors[:100],
+            'started_at': run.started_at.isoformat(),
+            'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+        }
+    
+    @staticmethod
+    def import_stream(stream, kind: str, fmt: str, run: ImportRun = None, user=None,
+                      chunk_size: int = None, progress=None) -> ImportRun:
+        """
+        Importiert aus einem binären Datenstrom (Datei, Upload).
+        
+        Args:
+            progress: optionaler Callback, wird nach jedem Chunk mit dem ImportRun aufgerufen
+        
+        Raises:
+            ValueError bei unbekannter Datenart oder unbekanntem Format
+        """
+        BulkImportService.validate(kind, fmt)
+        if run is None:
+            run = ImportRun.objects.create(
+                kind=kind, source_name=getattr(stream, 'name', '') or '-', started_by=user
+            )
+        run.status = 'running'
+        chunk_size = chunk_size or BulkImportService.CHUNK_SIZE
+        keys = {}
+        
+        chunk = []
+        try:
+            for line, row in enumerate(read_rows(stream, fmt), 1):
+                if line <= run.rows_done:
+                    continue
+                chunk.append((line, row))
+                if len(chunk) >= chunk_size:
+                    BulkImportService._import_chunk(run, chunk, keys)
+                    chunk = []
+                    if progress:
+                        progress(run)
+            if chunk:
+                BulkImportService._import_chunk(run, chunk, keys)
+                if progress:
+                    progress(run)
+        except Exception:
+            run.status = 'failed'
+            run.save(update_fields=['status'])
+            raise
+        
+        run.status = 'done'
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'finished_at'])
+        return run
+    
+    @staticmethod
+    def _reject(run: ImportRun, line: int, message: str) -> None:
+        run.invalid += 1
+        if len(run.errors) < BulkImportService.MAX_ERRORS:
+            run.errors.append({'line': line, 'error': message})
+    
+    @staticmethod
+    @transaction.atomic
+    def _import_chunk(run: ImportRun, chunk: list, keys: dict) -> None:
+        clean = CLEANERS[run.kind]
+        records = []
+        for line, row in chunk:
+            try:
+                if isinstance(row, ImportRowError):
+                    raise row
+                records.append((line, clean(row)))
+            except ImportRowError as exc:
+                BulkImportService._reject(run, line, str(exc))
+        
+        writer = {
+            'person': BulkImportService._write_persons,
+            'relationship': BulkImportService._write_relationships,
+            'involvement': BulkImportService._write_involvements,
+        }[run.kind]
+        writer(run, records, keys)
+        
+        run.rows_done = chunk[-1][0]
+        run.save(update_fields=['status', 'rows_done', 'created', 'duplicates', 'invalid', 'errors'])
+    
+    @staticmethod
+    def _person_keys(keys: dict) -> dict:
+        if 'person' not in keys:
+            keys['person'] = dict(
+                Person.objects.filter(external_id__isnull=False).order_by().values_list('external_id', 'id')
+            )
+        return keys['person']
+    
+    @staticmethod
+    def _write_persons(run: ImportRun, records: list, keys: dict) -> None:
+        known = BulkImportService._person_keys(keys)
+        new = {}
+        for line, data in records:
+            if data['external_id'] in known or data['external_id'] in new:
+                run.duplicates += 1
+                continue
+            person = Person(created_by_id=run.started_by_id, **data)
+            person.update_search_keys()
+            new[data['external_id']] = person
+        if not new:
+            return
+        
+        Person.objects.bulk_create(new.values(), batch_size=1000, ignore_conflicts=True)
+        created = dict(
+            Person.objects.filter(external_id__in=list(new)).order_by().values_list('external_id', 'id')
+        )
+        known.update(created)
+        run.created += len(created)
+        PersonSearchService._bulk_index(Person.objects.filter(id__in=list(created.values())), 5000)
+    
+    @staticmethod
+    def _write_relationships(run: ImportRun, records: list, keys: dict) -> None:
+        known = BulkImportService._person_keys(keys)
+        rows = {}
+        for line, data in records:
+            person1_id, person2_id = known.get(data.pop('person1')), known.get(data.pop('person2'))
+            if person1_id is None or person2_id is None:
+                BulkImportService._reject(run, line, 'Unbekannte Person')
+                continue
+            if person1_id == person2_id:
+                BulkImportService._reject(run, line, 'Beziehung einer Person zu sich selbst')
+                continue
+            key = (person1_id, person2_id, data['relationship_type'])
+            if key in rows:
+                run.duplicates += 1
+                continue
+            rows[key] = PersonRelationship(
+                person1_id=person1_id, person2_id=person2_id, created_by_id=run.started_by_id, **data
+            )
+        
+        existing = set(PersonRelationship.objects.filter(
+            person1_id__in={key[0] for key in rows}
+        ).order_by().values_list('person1_id', 'person2_id', 'relationship_type'))
+        new = [relationship for key, relationship in rows.items() if key not in existing]
+        run.duplicates += len(rows) - len(new)
+        PersonRelationship.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+        run.created += len(new)
+    
+    @staticmethod
+    def _write_involvements(run: ImportRun, records: list, keys: dict) -> None:
+        known = BulkImportService._person_keys(keys)
+        if 'case' not in keys:
+            keys['case'] = dict(Case.objects.order_by().values_list('case_number', 'id'))
+        cases = keys['case']
+        
+        rows = {}
+        for line, data in records:
+            person_id, case_id = known.get(data.pop('person')), cases.get(data.pop('case'))
+            if person_id is None or case_id is None:
+                BulkImportService._reject(run, line, 'Unbekannte Person' if person_id is None else 'Unbekannter Fall')
+                continue
+            key = (person_id, case_id, data['involvement_type'])
+            if key in rows:
+                run.duplicates += 1
+                continue
+            rows[key] = PersonInvolvement(
+                person_id=person_id, case_id=case_id, created_by_id=run.started_by_id, **data
+            )
+        
+        existing = set(PersonInvolvement.objects.filter(
+            person_id__in={key[0] for key in rows}
+        ).order_by().values_list('person_id', 'case_id', 'involvement_type'))
+        new = [involvement for key, involvement in rows.items() if key not in existing]
+        run.duplicates += len(rows) - len(new)
+        PersonInvolvement.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+        run.created += len(new)
+        CaseRollupService.refresh_suspect_counters(
+            {involvement.person_id for involvement in new if involvement.involvement_type == 'suspect'}
+        )
+
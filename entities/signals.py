@@ -0,0 +1,32 @@
+# entities/signals.py
+"""
+Signal-Handler zur Pflege der Suchindizes für Personen, Adressen und Fahrzeuge.
+Bulk-Operationen lösen keine Signale aus – dafür gibt es rebuild_person_index.
+"""
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+from .models import Person, Address, Vehicle
+from .services import PersonSearchService, VehicleSearchService
+
+
+@receiver(pre_save, sender=Person)
+@receiver(pre_save, sender=Address)
+@receiver(pre_save, sender=Vehicle)
+def update_search_keys(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.update_search_keys()
+
+
+@receiver(post_save, sender=Person)
+def index_person(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    PersonSearchService.index_person(instance)
+
+
+@receiver(post_save, sender=Vehicle)
+def index_vehicle(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    VehicleSearchService.index_vehicle(instance)
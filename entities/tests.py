@@ -3,13 +3,41 @@
 Unit- und Integration-Tests für die entities App.
 Demonstriert Test-Kompetenz für Bewerbungen.
 """
-from django.test import TestCase, Client
-from django.contrib.auth.models import User
+import io
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.forms import modelform_factory
+from django.test import TestCase, TransactionTestCase, Client
+from django.contrib.auth.models import Permission, User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
-from datetime import date
+from django.utils import timezone
+from datetime import date, datetime
 
-from .models import Person, Address, Vehicle, PersonRelationship, PersonAddress
-from .services import PersonAnalysisService, RelationshipGraphService
+from .models import (
+    Person, Address, Vehicle, PersonRelationship, PersonAddress, PersonAlias, PersonTrigram,
+    PersonPhoneticKey, PersonMatchCandidate, PersonMergeLog, ImportRun, VehiclePlateTrigram
+)
+from .services import (
+    PersonAnalysisService, RelationshipGraphService, CrossCaseAnalysisService, PersonSearchService,
+    VehicleSearchService, GlobalSearchService, EntityResolutionService, PersonMergeService,
+    BulkImportService, GeoSearchService
+)
+from . import geo, graph_export
+from .utils import (
+    normalize_text, normalize_plate, parse_aliases, trigram_similarity, cologne_phonetic,
+    birth_date_similarity
+)
+from investigations.models import (
+    Case, PersonInvolvement, CaseMonthlyStat, SuspectCaseCounter, Investigation, Timeline
+)
+from investigations.services import CaseRollupService
 
 
 class PersonModelTest(TestCase):
@@ -104,7 +132,7 @@ class PersonRelationshipModelTest(TestCase):
             relationship_type='friend',
             created_by=self.user
         )
-        from django.db import IntegrityError
+        from django.db import IntegrityError, connection, transaction
         with self.assertRaises(IntegrityError):
             PersonRelationship.objects.create(
                 person1=self.person1,
@@ -203,6 +231,733 @@ class RelationshipGraphServiceTest(TestCase):
         self.assertIn('id', node)
         self.assertIn('label', node)
         self.assertIn('risk_level', node)
+    
+    def test_iter_network_matches_build_network_data(self):
+        """Gestreamte Knoten und Kanten entsprechen build_network_data für denselben Filter."""
+        case = Case.objects.create(
+            case_number='NET-1', title='Netz', description='Test', case_type='fraud', created_by=self.user
+        )
+        PersonInvolvement.objects.create(person=self.person1, case=case, involvement_type='suspect')
+        PersonInvolvement.objects.create(person=self.person2, case=case, involvement_type='witness')
+        
+        expected = RelationshipGraphService.build_network_data(case_type='fraud')
+        nodes, edges = RelationshipGraphService.iter_network(case_type='fraud', chunk_size=1)
+        nodes, edges = list(nodes), list(edges)
+        
+        self.assertEqual(
+            {(n['id'], n['case_count'], tuple(sorted(n['roles']))) for n in expected['nodes']},
+            {(n['id'], n['case_count'], tuple(n['roles'])) for n in nodes}
+        )
+        self.assertEqual(edges[0]['common_cases'], 1)
+        self.assertEqual(edges[0]['common_cases'], expected['edges'][0]['common_cases'])
+    
+    def test_graphml_and_gexf_are_well_formed(self):
+        """Beide Formate sind gültiges XML mit Knoten- und Kantenattributen."""
+        self.person1.last_name = 'Test & <Söhne>\x01'
+        self.person1.save()
+        
+        nodes, edges = RelationshipGraphService.iter_network()
+        root = ET.fromstring(b''.join(graph_export.stream_graphml(nodes, edges)))
+        ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
+        self.assertEqual(len(root.findall('.//g:node', ns)), 2)
+        edge = root.find('.//g:edge', ns)
+        self.assertEqual(edge.find("g:data[@key='e_strength']", ns).text, '3')
+        self.assertIn('Test & <Söhne>', root.find(".//g:data[@key='label']", ns).text)
+        
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('entities:relationship_graph'), {'export': 'gexf'})
+        root = ET.fromstring(b''.join(response.streaming_content))
+        ns = {'x': 'http://gexf.net/1.3'}
+        self.assertEqual(len(root.findall('.//x:edge', ns)), 1)
+        self.assertEqual(root.find('.//x:edge', ns).get('weight'), '3')
+
+
+class CrossCaseAnalysisServiceTest(TestCase):
+    """Tests für die Muster-Analyse auf Basis der Rollups."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.suspect = Person.objects.create(
+            first_name='Max', last_name='Test', created_by=self.user
+        )
+        self.cases = []
+        for i, month in enumerate([1, 1, 2]):
+            case = Case.objects.create(
+                case_number=f'2024-TEST-{i:03d}',
+                title=f'Case {i}',
+                description='Description',
+                case_type='theft' if i < 2 else 'fraud',
+                incident_date=timezone.make_aware(datetime(2024, month, 15, 12, 0)),
+                created_by=self.user
+            )
+            PersonInvolvement.objects.create(
+                person=self.suspect, case=case, involvement_type='suspect', created_by=self.user
+            )
+            self.cases.append(case)
+    
+    def _snapshot(self):
+        return (
+            set(CaseMonthlyStat.objects.filter(count__gt=0).values_list('month', 'case_type', 'status', 'count')),
+            set(SuspectCaseCounter.objects.values_list('person_id', 'case_count')),
+        )
+    
+    def test_pattern_analysis_from_rollups(self):
+        """Testet Trend, Typverteilung und Wiederholungstäter."""
+        patterns = CrossCaseAnalysisService.get_pattern_analysis()
+        
+        self.assertEqual(
+            [(row['month'], row['count']) for row in patterns['monthly_trend']],
+            [(date(2024, 1, 1), 2), (date(2024, 2, 1), 1)]
+        )
+        self.assertEqual(patterns['case_type_distribution'][0], {'case_type': 'theft', 'count': 2})
+        self.assertEqual(patterns['repeat_suspect_count'], 1)
+    
+    def test_rollups_follow_changes(self):
+        """Testet Status-/Datumswechsel und Löschungen gegen einen Neuaufbau."""
+        case = self.cases[0]
+        case.status = 'closed'
+        case.incident_date = timezone.make_aware(datetime(2024, 3, 1, 8, 0))
+        case.save()
+        self.cases[1].delete()
+        PersonInvolvement.objects.filter(case=self.cases[2]).delete()
+        
+        incremental = self._snapshot()
+        self.assertEqual(CrossCaseAnalysisService.get_pattern_analysis()['repeat_suspect_count'], 0)
+        
+        CaseRollupService.rebuild()
+        self.assertEqual(incremental, self._snapshot())
+
+
+class PersonSearchServiceTest(TestCase):
+    """Tests für die unscharfe Trigramm-Suche."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.max = Person.objects.create(
+            first_name='Max', last_name='Mustermann',
+            known_aliases='Der Graf, Maxi', created_by=self.user
+        )
+        self.erika = Person.objects.create(
+            first_name='Erika', last_name='Musterfrau', created_by=self.user
+        )
+        Person.objects.create(first_name='Hans', last_name='Schulz', created_by=self.user)
+    
+    def test_normalization(self):
+        """Testet Case-Folding und Akzent-/ß-Normalisierung."""
+        self.assertEqual(normalize_text('  Jürgen  STRAẞE '), 'jurgen strasse')
+        self.assertGreater(trigram_similarity('Müller', 'mueller'), 0.3)
+        self.assertEqual(trigram_similarity('', 'abc'), 0.0)
+    
+    def test_typo_ranked_by_similarity(self):
+        """Testet Treffer trotz Tippfehler und die Sortierung."""
+        results = PersonSearchService.fuzzy_search('Musterman')
+        
+        self.assertEqual(results[0], self.max)
+        self.assertIn(self.erika, results)
+        self.assertGreater(results[0].similarity, results[1].similarity)
+        self.assertNotIn('Schulz', [p.last_name for p in results])
+    
+    def test_alias_and_queryset_filter(self):
+        """Testet Alias-Treffer und die Einschränkung auf ein Queryset."""
+        self.assertEqual(PersonSearchService.fuzzy_search('Graff'), [self.max])
+        self.assertEqual(
+            PersonSearchService.fuzzy_search('Musterman', queryset=Person.objects.exclude(id=self.max.id)),
+            [self.erika]
+        )
+    
+    def test_queryset_applied_before_candidate_limit(self):
+        """Treffer außerhalb des Querysets verdrängen keine Kandidaten innerhalb."""
+        Person.objects.bulk_create([
+            Person(first_name='Max', last_name='Mustermann', created_by=self.user)
+            for _ in range(PersonSearchService.CANDIDATE_FACTOR)
+        ])
+        PersonSearchService.rebuild_index()
+        self.erika.risk_level = 3
+        self.erika.save()
+        
+        results = PersonSearchService.fuzzy_search(
+            'Max Mustermann', queryset=Person.objects.filter(risk_level=3), limit=1
+        )
+        self.assertEqual(results, [self.erika])
+    
+    def test_index_follows_changes(self):
+        """Testet die Pflege der Trigramm-Tabelle bei Änderungen."""
+        self.max.last_name = 'Schneider'
+        self.max.save()
+        
+        self.assertEqual(PersonSearchService.fuzzy_search('Schnieder'), [self.max])
+        incremental = set(PersonTrigram.objects.values_list('person_id', 'trigram'))
+        PersonSearchService.rebuild_index()
+        self.assertEqual(incremental, set(PersonTrigram.objects.values_list('person_id', 'trigram')))
+    
+    def test_cologne_phonetic(self):
+        """Testet Kölner Phonetik inkl. Umlaut- und ß-Normalisierung."""
+        self.assertEqual(cologne_phonetic('Müller'), '657')
+        self.assertEqual(cologne_phonetic('Mueller'), cologne_phonetic('Miller'))
+        self.assertEqual(cologne_phonetic('Schmidt'), cologne_phonetic('Schmitt'))
+        self.assertEqual(cologne_phonetic('Strauß'), cologne_phonetic('Strauss'))
+        self.assertEqual(cologne_phonetic('Wikipedia'), '3412')
+        self.assertEqual(cologne_phonetic('Müller-Lüdenscheidt'), '65752682')
+    
+    def test_phonetic_search(self):
+        """Testet die phonetische Suche über Namen und Aliase."""
+        mueller = Person.objects.create(
+            first_name='Jörg', last_name='Müller', known_aliases='Schmitti', created_by=self.user
+        )
+        
+        self.assertEqual(list(PersonSearchService.phonetic_search('Mueller')), [mueller])
+        self.assertEqual(list(PersonSearchService.phonetic_search('Joerg Miller')), [mueller])
+        self.assertEqual(list(PersonSearchService.phonetic_search('Schmiddi')), [mueller])
+        self.assertEqual(list(PersonSearchService.phonetic_search('Max Miller')), [])
+        
+        PersonPhoneticKey.objects.all().delete()
+        self.assertEqual(PersonSearchService.index_missing()['phonetic'], 12)
+        self.assertEqual(list(PersonSearchService.phonetic_search('Mueller')), [mueller])
+    
+    def test_alias_table(self):
+        """Testet Zerlegung, Normalisierung und Pflege der Alias-Zeilen."""
+        self.assertEqual(
+            parse_aliases('Der Graf, der graf;\n  Jörgi  '),
+            {'der graf': 'Der Graf', 'jorgi': 'Jörgi'}
+        )
+        self.assertEqual(
+            list(self.max.aliases.values_list('normalized', flat=True)), ['der graf', 'maxi']
+        )
+        
+        self.max.known_aliases = 'Maxi\nBoss'
+        self.max.save()
+        self.assertEqual(
+            set(PersonAlias.objects.values_list('person_id', 'alias')),
+            {(self.max.id, 'Maxi'), (self.max.id, 'Boss')}
+        )
+    
+    def test_alias_exact_and_prefix_lookup(self):
+        """Testet exakte und Präfix-Suche ohne Teilstring-Treffer."""
+        def lookup(query, prefix=False):
+            return list(Person.objects.filter(id__in=PersonSearchService.alias_person_ids(query, prefix)))
+        
+        self.assertEqual(lookup('DER GRAF'), [self.max])
+        self.assertEqual(lookup('der'), [])
+        self.assertEqual(lookup('der', prefix=True), [self.max])
+        self.assertEqual(lookup('graf', prefix=True), [])
+        self.assertEqual(lookup('', prefix=True), [])
+
+
+class VehicleSearchServiceTest(TestCase):
+    """Tests für die normalisierte Kennzeichen-Suche."""
+    
+    def setUp(self):
+        self.owner = Person.objects.create(first_name='Max', last_name='Mustermann')
+        self.bab = Vehicle.objects.create(license_plate='B-AB 123', owner=self.owner)
+        self.bab1 = Vehicle.objects.create(license_plate='B-AB 1234', owner=self.owner)
+        self.bxb = Vehicle.objects.create(license_plate='B-XB 923', owner=self.owner)
+        self.m = Vehicle.objects.create(license_plate='M-AB 123', owner=self.owner)
+    
+    def _plates(self, query):
+        return [v.license_plate for v in VehicleSearchService.search_plates(query)]
+    
+    def test_plate_key_normalization(self):
+        """Testet Normalisierung und Eindeutigkeit des Schlüssels."""
+        self.assertEqual(normalize_plate('b ab-123'), 'BAB123')
+        self.assertEqual(normalize_plate('b?ab*23', wildcards=True), 'B?AB*23')
+        self.assertEqual(self.bab.plate_key, 'BAB123')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Vehicle.objects.create(license_plate='BAB123', owner=self.owner)
+        
+        VehicleForm = modelform_factory(Vehicle, fields=['license_plate', 'vehicle_type', 'owner'])
+        form = VehicleForm({'license_plate': 'B AB 123', 'vehicle_type': 'car', 'owner': self.owner.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('B-AB 123', form.errors['license_plate'][0])
+        form = VehicleForm({'license_plate': 'B AB 123', 'vehicle_type': 'truck', 'owner': self.owner.pk},
+                           instance=self.bab)
+        self.assertTrue(form.is_valid())
+    
+    def test_exact_prefix_and_pattern(self):
+        """Testet exakte, Präfix- und Muster-Suche."""
+        self.assertEqual(self._plates('bab 123'), ['B-AB 123', 'B-AB 1234'])
+        self.assertEqual(self._plates('B?B*23'), ['B-AB 123', 'B-XB 923'])
+        self.assertEqual(self._plates('*AB123'), ['B-AB 123', 'M-AB 123'])
+        self.assertEqual(self._plates('*23'), ['B-AB 123', 'B-XB 923', 'M-AB 123'])
+        self.assertEqual(self._plates('*'), [])
+    
+    def test_partial_plates_use_trigram_index(self):
+        """Teilstücke finden Kennzeichen in der Mitte und am Ende - über den Trigramm-Index."""
+        self.assertEqual(self._plates('AB 123'), ['B-AB 123', 'B-AB 1234', 'M-AB 123'])
+        self.assertEqual(self._plates('123'), ['B-AB 123', 'B-AB 1234', 'M-AB 123'])
+        self.assertEqual(self._plates('34'), ['B-AB 1234'])
+        self.assertEqual(self._plates('AB'), ['B-AB 123', 'B-AB 1234', 'M-AB 123'])
+        self.assertEqual(self._plates('*B9*'), [])  # kein Anker, Teilstück zu kurz
+        
+        # Umbenennung pflegt den Index; ohne Index-Zeilen kein Treffer
+        self.m.license_plate = 'M-XY 777'
+        self.m.save()
+        self.assertEqual(self._plates('XY7'), ['M-XY 777'])
+        VehiclePlateTrigram.objects.filter(vehicle=self.m).delete()
+        self.assertEqual(self._plates('XY7'), [])
+        self.assertEqual(VehicleSearchService.index_missing(), 4)
+        self.assertEqual(self._plates('XY7'), ['M-XY 777'])
+        
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(user)
+        response = self.client.get(reverse('entities:vehicle_list'), {'search': 'AB 123'})
+        self.assertContains(response, 'B-AB 1234')
+        cache.clear()
+        results = GlobalSearchService.search('AB 123', types=['vehicles'])
+        self.assertEqual(results['vehicles']['total'], 2)
+
+
+class GeoSearchServiceTest(TestCase):
+    """Tests für Geohash-Index und Umkreis-/Rechtecksuche."""
+    
+    CENTER = (52.5219, 13.4132)  # Berlin Alexanderplatz
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+    
+    def address(self, street, latitude, longitude):
+        return Address.objects.create(street=street, city='Berlin', latitude=latitude, longitude=longitude)
+    
+    def test_radius_matches_brute_force(self):
+        """Zellabdeckung verliert keine Treffer; Entfernungen sind exakt und sortiert."""
+        self.assertEqual(geo.encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        rng = np.random.default_rng(7)
+        points = np.column_stack([
+            self.CENTER[0] + rng.normal(0, 0.01, 400), self.CENTER[1] + rng.normal(0, 0.015, 400)
+        ]).round(6)
+        addresses = []
+        for index, (latitude, longitude) in enumerate(points):
+            address = Address(street=f'Straße {index}', city='Berlin', latitude=latitude, longitude=longitude)
+            address.update_search_keys()
+            addresses.append(address)
+        Address.objects.bulk_create(addresses)
+        Address.objects.create(street='Ohne Koordinaten', city='Berlin')
+        
+        for radius in (50, 500, 1500):
+            ids, distances = GeoSearchService.within_radius(*self.CENTER, radius)
+            all_ids, latitudes, longitudes = GeoSearchService.candidates(-90, -180, 90, 180)
+            expected = all_ids[geo.haversine_m(*self.CENTER, latitudes, longitudes) <= radius]
+            self.assertEqual(sorted(ids.tolist()), sorted(expected.tolist()))
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+        self.assertTrue(0 < len(ids) < 400)
+        
+        with self.assertRaises(ValueError):
+            GeoSearchService.within_radius(*self.CENTER, GeoSearchService.MAX_RADIUS_M + 1)
+    
+    def test_nearby_cases_persons_and_view(self):
+        """Umkreissuche liefert Fälle über den Tatort und Personen über ihre Adressen."""
+        near = self.address('Alexanderplatz', 52.5219, 13.4132)
+        close = self.address('Karl-Liebknecht-Str.', 52.5240, 13.4100)  # ca. 310 m
+        far = self.address('Potsdamer Platz', 52.5096, 13.3760)  # ca. 2,8 km
+        case = Case.objects.create(
+            case_number='GEO-1', title='Raub', description='Test', case_type='robbery',
+            location=close, created_by=self.user
+        )
+        Case.objects.create(
+            case_number='GEO-2', title='Raub', description='Test', case_type='robbery',
+            location=far, created_by=self.user
+        )
+        person = Person.objects.create(first_name='Max', last_name='Mustermann')
+        PersonAddress.objects.create(person=person, address=far)
+        PersonAddress.objects.create(person=person, address=close, address_type='work')
+        
+        result = GeoSearchService.nearby(*self.CENTER, 500)
+        self.assertEqual([row['id'] for row in result['addresses']], [near.id, close.id])
+        self.assertEqual(result['addresses'][0]['distance_m'], 0)
+        self.assertEqual([row['id'] for row in result['cases']], [case.id])
+        self.assertEqual(result['persons'][0]['address_id'], close.id)
+        self.assertAlmostEqual(result['cases'][0]['distance_m'], 310, delta=10)
+        
+        area = GeoSearchService.in_area(52.50, 13.37, 52.52, 13.38)
+        self.assertEqual([row['id'] for row in area['addresses']], [far.id])
+        self.assertEqual(area['total'], {'addresses': 1, 'cases': 1, 'persons': 1})
+        
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('entities:geo_search'), {'lat': 52.5219, 'lon': 13.4132, 'radius': 5000})
+        self.assertEqual(response.json()['total']['addresses'], 3)
+        response = self.client.get(reverse('entities:geo_search'), {'bbox': '52.5,179.9,52.6,-179.9'})
+        self.assertEqual(response.json()['total']['addresses'], 0)
+        response = self.client.get(reverse('entities:geo_search'), {'lat': 'nan', 'lon': 13})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('entities:geo_search'), {'bbox': '-90,-180,90,180'})
+        self.assertEqual(response.status_code, 400)
+        with self.assertRaises(ValueError):
+            GeoSearchService.in_area(52.0, 13.0, 52.5, 14.6)  # ca. 108 km breit
+
+
+class GlobalSearchServiceTest(TestCase):
+    """Tests für die gerankte, seitenweise globale Suche."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.others = [
+            Person.objects.create(first_name='Anna', last_name=f'Kleinmeier{i}', created_by=self.user)
+            for i in range(5)
+        ]
+        self.exact = Person.objects.create(first_name='Max', last_name='Meier', created_by=self.user)
+        self.prefix = Person.objects.create(first_name='Meike', last_name='Schulz', created_by=self.user)
+        Case.objects.create(
+            case_number='2024-MEI-001', title='Diebstahl', description='Meier beteiligt',
+            case_type='theft', created_by=self.user
+        )
+    
+    def test_ranking_and_totals(self):
+        """Testet exakte vor Präfix- vor Teilstring-Treffern."""
+        results = GlobalSearchService.search('Meier Max', limit=3)
+        self.assertEqual(results['persons']['items'], [])
+        
+        results = GlobalSearchService.search('mei', limit=3)
+        persons = results['persons']
+        self.assertEqual(persons['total'], 7)
+        self.assertEqual(persons['items'][:2], [self.exact, self.prefix])
+        self.assertIsNotNone(persons['next_cursor'])
+        self.assertEqual(results['cases']['total'], 1)
+        self.assertEqual(set(results), set(GlobalSearchService.TYPES))
+    
+    def test_cursor_pages_are_complete(self):
+        """Testet, dass die Seiten alle Treffer genau einmal liefern."""
+        seen, cursor = [], None
+        while True:
+            page = GlobalSearchService.search('mei', types=['persons'], cursor=cursor, limit=2)['persons']
+            seen += [person.id for person in page['items']]
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), sorted(p.id for p in self.others + [self.exact, self.prefix]))
+        
+        with self.assertRaises(ValueError):
+            GlobalSearchService.search('mei', types=['persons'], cursor='kaputt')
+    
+    def test_results_are_cached(self):
+        """Testet den Cache für normalisiert gleiche Anfragen."""
+        GlobalSearchService.search('Meier')
+        with self.assertNumQueries(0):
+            results = GlobalSearchService.search('  MEIER ')
+        self.assertEqual(results['persons']['items'][0], self.exact)
+
+
+class GlobalSearchPoolTest(TransactionTestCase):
+    """
+    Tests für die parallelen Teilabfragen der globalen Suche. Nur außerhalb
+    einer Transaktion laufen sie im Thread-Pool mit eigenen Verbindungen.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        for i in range(5):
+            owner = Person.objects.create(first_name='Anna', last_name=f'Kleinmeier{i}', created_by=user)
+            Vehicle.objects.create(license_plate=f'B-MEI {i}', owner=owner)
+        Person.objects.create(first_name='Max', last_name='Meier', created_by=user)
+        Address.objects.create(street='Meierweg 1', city='Berlin')
+        Case.objects.create(
+            case_number='2024-MEI-001', title='Diebstahl', description='Meier beteiligt',
+            case_type='theft', created_by=user
+        )
+    
+    def _pages(self, types, limit=2):
+        pages, cursor = [], None
+        while True:
+            results = GlobalSearchService.search('mei', types=types, cursor=cursor, limit=limit)
+            pages.append({
+                t: ([item.id for item in page['items']], page['total'], page['next_cursor'])
+                for t, page in results.items()
+            })
+            cursor = results[types[0]]['next_cursor']
+            if not cursor or len(types) > 1:
+                return pages
+    
+    def test_pool_matches_serial_results(self):
+        """Ranking, Gesamtzahlen und Cursor-Seiten sind parallel wie seriell."""
+        self.assertFalse(connection.in_atomic_block)
+        pooled = [self._pages(list(GlobalSearchService.TYPES))]
+        pooled += [self._pages([t]) for t in ('persons', 'vehicles')]
+        
+        cache.clear()
+        with transaction.atomic():
+            serial = [self._pages(list(GlobalSearchService.TYPES))]
+            serial += [self._pages([t]) for t in ('persons', 'vehicles')]
+        
+        self.assertEqual(pooled, serial)
+        self.assertEqual(pooled[0][0]['persons'][1], 6)
+        self.assertEqual(len(pooled[2]), 3)  # 5 Fahrzeuge, je 2 pro Seite
+
+
+class EntityResolutionServiceTest(TestCase):
+    """Tests für die Duplikaterkennung bei Personen."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+    
+    def create(self, first_name, last_name, birth_date=None, id_number=None):
+        return Person.objects.create(
+            first_name=first_name, last_name=last_name, birth_date=birth_date,
+            id_number=id_number, created_by=self.user
+        )
+    
+    def test_birth_date_similarity(self):
+        """Testet die Erkennung von Tippfehlern im Geburtsdatum."""
+        self.assertEqual(birth_date_similarity(date(1980, 5, 12), date(1980, 5, 12)), 1.0)
+        self.assertEqual(birth_date_similarity(date(1980, 5, 12), date(1980, 5, 13)), 0.8)
+        self.assertEqual(birth_date_similarity(date(1980, 5, 12), date(1980, 12, 5)), 0.8)
+        self.assertEqual(birth_date_similarity(date(1980, 5, 12), date(1908, 5, 12)), 0.8)
+        self.assertEqual(birth_date_similarity(date(1980, 5, 12), date(1975, 3, 1)), 0.0)
+        self.assertEqual(birth_date_similarity(None, None), 0.5)
+    
+    def test_run_ranks_candidates_within_blocks(self):
+        """Testet Blocking, Ranking und den Erhalt abgelehnter Paare."""
+        original = self.create('Thomas', 'Müller', date(1980, 5, 12), 'L01X 00T47')
+        typo = self.create('Tomas', 'Mueller', date(1980, 5, 13))
+        same_id = self.create('T.', 'Miller', date(1979, 1, 1), 'l01x00t47')
+        swapped = self.create('Müller', 'Thomas', date(1980, 5, 12))
+        other = self.create('Anna', 'Schmidt', date(1980, 5, 12))
+        
+        stats = EntityResolutionService.run(batch_size=2)
+        self.assertGreater(stats['comparisons'], 0)
+        candidates = EntityResolutionService.get_candidates()
+        pairs = [{c.person_a_id, c.person_b_id} for c in candidates]
+        self.assertEqual(pairs[0], {original.id, swapped.id})
+        self.assertIn({original.id, typo.id}, pairs)
+        self.assertIn({original.id, same_id.id}, pairs)
+        self.assertFalse(any(other.id in pair for pair in pairs))
+        self.assertTrue(all(c.person_a_id < c.person_b_id for c in candidates))
+        self.assertIn('Ausweisnummer gleich', next(
+            c.reasons for c in candidates if {c.person_a_id, c.person_b_id} == {original.id, same_id.id}
+        ))
+        
+        PersonMatchCandidate.objects.filter(person_a=original, person_b=typo).update(status='rejected')
+        EntityResolutionService.run()
+        pairs = [{c.person_a_id, c.person_b_id} for c in EntityResolutionService.get_candidates()]
+        self.assertNotIn({original.id, typo.id}, pairs)
+        self.assertEqual(PersonMatchCandidate.objects.filter(status='rejected').count(), 1)
+        self.assertEqual(EntityResolutionService.run(max_block_size=1)['candidates'], 0)
+    
+    def test_alias_matches_name_of_other_person(self):
+        """Testet Blocking und Bewertung über Aliase (Dublette unter Alias erfasst)."""
+        original = self.create('Thomas', 'Müller', date(1980, 5, 12))
+        aliased = Person.objects.create(
+            first_name='Karl', last_name='Schulz', birth_date=date(1980, 5, 12),
+            known_aliases='Tomas Mueller, Der Boss', created_by=self.user
+        )
+        self.create('Karla', 'Schmitz', date(1975, 1, 1))
+        
+        EntityResolutionService.run()
+        candidate = EntityResolutionService.get_candidates()[0]
+        self.assertEqual((candidate.person_a_id, candidate.person_b_id), (original.id, aliased.id))
+        self.assertIn('Alias 0.90', candidate.reasons)
+        self.assertGreaterEqual(candidate.score, 0.9)
+        self.assertEqual(len(EntityResolutionService.get_candidates()), 1)
+
+
+class PersonMergeServiceTest(TestCase):
+    """Tests für die Zusammenführung doppelt erfasster Personen."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.target = Person.objects.create(
+            first_name='Thomas', last_name='Müller', risk_level=1, created_by=self.user
+        )
+        self.source = Person.objects.create(
+            first_name='Tomas', last_name='Mueller', birth_date=date(1980, 5, 12),
+            risk_level=3, known_aliases='Tommy', created_by=self.user
+        )
+        self.other = Person.objects.create(first_name='Anna', last_name='Schmidt', created_by=self.user)
+        self.case = Case.objects.create(
+            case_number='2024-MRG-001', title='Diebstahl', description='Beschreibung',
+            case_type='theft', created_by=self.user
+        )
+    
+    def test_merge_rewires_references_and_removes_conflicts(self):
+        """Testet Umhängen, Entfernen doppelter Verweise und Stammdaten-Ergänzung."""
+        address = Address.objects.create(street='Hauptstraße', city='Berlin')
+        for person in (self.target, self.source):
+            PersonInvolvement.objects.create(person=person, case=self.case, involvement_type='suspect')
+            PersonAddress.objects.create(person=person, address=address, address_type='primary')
+        PersonInvolvement.objects.create(person=self.source, case=self.case, involvement_type='witness')
+        PersonRelationship.objects.create(person1=self.target, person2=self.source, relationship_type='family')
+        PersonRelationship.objects.create(person1=self.source, person2=self.other, relationship_type='friend')
+        vehicle = Vehicle.objects.create(license_plate='B-MR 1', owner=self.source)
+        timeline = Timeline.objects.create(
+            case=self.case, datetime=timezone.now(), title='Festnahme', description='-',
+            related_person=self.source
+        )
+        investigation = Investigation.objects.create(
+            case=self.case, title='Vernehmung', description='-', investigation_type='interview'
+        )
+        investigation.target_persons.add(self.target, self.source)
+        
+        stats = PersonMergeService.merge(self.target, [self.source], user=self.user)
+        
+        self.assertEqual(stats['merged'], 1)
+        self.assertEqual(stats['duplicates_removed'], 4)
+        self.assertFalse(Person.objects.filter(pk=self.source.pk).exists())
+        roles = PersonInvolvement.objects.filter(person=self.target).values_list('involvement_type', flat=True)
+        self.assertEqual(set(roles), {'suspect', 'witness'})
+        self.assertEqual(PersonAddress.objects.filter(person=self.target).count(), 1)
+        self.assertEqual(list(PersonRelationship.objects.values_list('person1_id', 'person2_id')),
+                         [(self.target.id, self.other.id)])
+        self.assertEqual(list(investigation.target_persons.all()), [self.target])
+        vehicle.refresh_from_db()
+        timeline.refresh_from_db()
+        self.assertEqual((vehicle.owner_id, timeline.related_person_id), (self.target.id, self.target.id))
+        
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.birth_date, date(1980, 5, 12))
+        self.assertEqual(self.target.risk_level, 3)
+        self.assertIn('Tomas Mueller', self.target.known_aliases)
+        self.assertTrue(PersonAlias.objects.filter(person=self.target, normalized='tommy').exists())
+        self.assertEqual(SuspectCaseCounter.objects.get(person=self.target).case_count, 1)
+        log = PersonMergeLog.objects.get()
+        self.assertEqual((log.target_id, log.source_id, log.merged_by), (self.target.id, self.source.id, self.user))
+    
+    def test_batch_merge_resolves_chains_and_rejects_invalid_pairs(self):
+        """Testet Ketten, Cluster aus Kandidaten und ungültige Paare."""
+        third = Person.objects.create(first_name='T.', last_name='Müller', created_by=self.user)
+        PersonInvolvement.objects.create(person=third, case=self.case, involvement_type='suspect')
+        
+        self.assertEqual(
+            PersonMergeService.resolve_mapping([(self.target.id, self.source.id), (self.source.id, third.id)]),
+            {self.source.id: self.target.id, third.id: self.target.id}
+        )
+        for pairs in ([(self.target.id, self.target.id)],
+                      [(self.target.id, self.source.id), (self.source.id, self.target.id)],
+                      [(self.target.id, third.id), (self.other.id, third.id)]):
+            with self.assertRaises(ValueError):
+                PersonMergeService.resolve_mapping(pairs)
+        
+        pairs = PersonMergeService.pairs_from_candidates([(self.source.id, third.id), (self.target.id, third.id)])
+        self.assertEqual(pairs, [(self.target.id, self.source.id), (self.target.id, third.id)])
+        stats = PersonMergeService.merge_many(pairs, batch_size=1)
+        self.assertEqual(stats['merged'], 2)
+        self.assertEqual(Person.objects.count(), 2)
+        self.assertEqual(PersonInvolvement.objects.get().person_id, self.target.id)
+        self.assertEqual(PersonMergeLog.objects.filter(target=self.target).count(), 2)
+    
+    def test_chained_merge_keeps_earlier_logs(self):
+        """Testet, dass das Protokoll einer Dublette bei einer weiteren Zusammenführung erhalten bleibt."""
+        third = Person.objects.create(first_name='T.', last_name='Müller', created_by=self.user)
+        PersonMergeService.merge(self.source, [third])
+        PersonMergeService.merge(self.target, [self.source])
+        
+        logs = PersonMergeLog.objects.order_by('id').values_list('target_id', 'source_id')
+        self.assertEqual(list(logs), [(self.target.id, third.id), (self.target.id, self.source.id)])
+
+
+class BulkImportServiceTest(TestCase):
+    """Tests für den Massenimport aus CSV/JSONL."""
+    
+    PERSONS_CSV = (
+        'external_id,first_name,last_name,birth_date,known_aliases,risk_level\n'
+        'P1,Max,Mustermann,1985-03-15,Der Boss,2\n'
+        'P2,Anna,Schmidt,,,\n'
+        'P1,Max,Mustermann,1985-03-15,,\n'
+        'P3,Peter,,1990-01-01,,\n'
+        'P4,Lisa,Weber,15.03.1985,,\n'
+        'P5,Julia,Richter,,,9\n'
+    )
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.case = Case.objects.create(
+            case_number='2024-IMP-001', title='Betrug', description='Beschreibung',
+            case_type='fraud', created_by=self.user
+        )
+    
+    def test_import_validates_resolves_keys_and_skips_duplicates(self):
+        """Testet Validierung, Schlüsselauflösung, Suchindex und Zähler."""
+        run = BulkImportService.import_stream(
+            io.BytesIO(self.PERSONS_CSV.encode()), 'person', 'csv', user=self.user, chunk_size=2
+        )
+        self.assertEqual((run.status, run.rows_done), ('done', 6))
+        self.assertEqual((run.created, run.duplicates, run.invalid), (2, 1, 3))
+        self.assertEqual([error['line'] for error in run.errors], [4, 5, 6])
+        max_person = Person.objects.get(external_id='P1')
+        self.assertEqual((max_person.name_key, max_person.created_by), ('mustermann max', self.user))
+        self.assertTrue(PersonAlias.objects.filter(person=max_person, normalized='der boss').exists())
+        self.assertEqual(PersonSearchService.fuzzy_search('Musterman'), [max_person])
+        
+        relationships = (
+            '{"person1": "P1", "person2": "P2", "relationship_type": "friend"}\n'
+            '{"person1": "P1", "person2": "P2", "relationship_type": "friend"}\n'
+            '{"person1": "P1", "person2": "P9", "relationship_type": "friend"}\n'
+            'kein json\n'
+        )
+        run = BulkImportService.import_stream(io.BytesIO(relationships.encode()), 'relationship', 'jsonl')
+        self.assertEqual((run.created, run.duplicates, run.invalid), (1, 1, 2))
+        
+        involvements = (
+            'person,case,involvement_type\n'
+            'P1,2024-IMP-001,suspect\n'
+            'P2,2024-IMP-999,witness\n'
+            'P2,2024-IMP-001,accomplice\n'
+        )
+        run = BulkImportService.import_stream(io.BytesIO(involvements.encode()), 'involvement', 'csv')
+        self.assertEqual((run.created, run.invalid), (1, 2))
+        self.assertEqual(SuspectCaseCounter.objects.get(person=max_person).case_count, 1)
+        run = BulkImportService.import_stream(io.BytesIO(involvements.encode()), 'involvement', 'csv')
+        self.assertEqual((run.created, run.duplicates), (0, 1))
+    
+    def test_interrupted_import_resumes_after_last_chunk(self):
+        """Testet das Fortsetzen eines abgebrochenen Imports derselben Datei."""
+        lines = ['external_id,first_name,last_name'] + [f'E{i},Vorname{i},Nachname{i}' for i in range(10)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'personen.csv')
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write('\n'.join(lines))
+            
+            def interrupt(run):
+                if run.rows_done >= 4:
+                    raise RuntimeError('Abbruch')
+            
+            with self.assertRaises(RuntimeError):
+                BulkImportService.import_file(path, 'person', chunk_size=4, progress=interrupt)
+            run = ImportRun.objects.get()
+            self.assertEqual((run.status, run.rows_done, Person.objects.count()), ('failed', 4, 4))
+            
+            resumed = BulkImportService.import_file(path, 'person', chunk_size=4)
+        self.assertEqual(resumed.pk, run.pk)
+        self.assertEqual((resumed.status, resumed.rows_done, resumed.created), ('done', 10, 10))
+        self.assertEqual(Person.objects.count(), 10)
+    
+    def test_import_api(self):
+        """Upload-Endpunkt: Rechteprüfung, Import mit Status, Abfrage des Laufs."""
+        url = reverse('entities:import_upload')
+        self.client.login(username='testuser', password='testpass123')
+        upload = SimpleUploadedFile('personen.csv', self.PERSONS_CSV.encode())
+        self.assertEqual(self.client.post(url, {'type': 'person', 'file': upload}).status_code, 403)
+        
+        self.user.user_permissions.add(Permission.objects.get(codename='add_importrun'))
+        response = self.client.post(url, {'type': 'person', 'file': SimpleUploadedFile('p.txt', b'x')})
+        self.assertEqual(response.status_code, 400)
+        for data in ({'type': 'vehicle'}, {'type': 'person', 'format': 'xlsx'}):
+            upload = SimpleUploadedFile('personen.csv', self.PERSONS_CSV.encode())
+            self.assertEqual(self.client.post(url, {**data, 'file': upload}).status_code, 400)
+        self.assertFalse(ImportRun.objects.exists())
+        
+        upload = SimpleUploadedFile('personen.csv', self.PERSONS_CSV.encode())
+        response = self.client.post(url, {'type': 'person', 'file': upload})
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['status'], data['created'], data['duplicates'], data['invalid']), ('done', 2, 1, 3))
+        self.assertEqual(Person.objects.get(external_id='P1').created_by, self.user)
+        
+        status_url = reverse('entities:import_status', kwargs={'run_id': data['id']})
+        self.assertEqual(self.client.get(status_url).json()['rows_done'], 6)
+        User.objects.create_user(username='fremd', password='testpass123')
+        self.client.login(username='fremd', password='testpass123')
+        self.assertEqual(self.client.get(status_url).status_code, 403)
 
 
 class PersonViewTest(TestCase):
@@ -224,6 +979,17 @@ class PersonViewTest(TestCase):
         response = self.client.get(reverse('entities:person_list'))
         self.assertEqual(response.status_code, 302)
     
+    def test_person_list_fuzzy_export(self):
+        """Export übernimmt auch die nach Ähnlichkeit sortierte Trefferliste."""
+        Person.objects.create(first_name='Erika', last_name='Schmidt', risk_level=3, created_by=self.user)
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(
+            reverse('entities:person_list'), {'search': 'Musterman', 'mode': 'fuzzy', 'export': 'csv'}
+        )
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertIn('Mustermann;Max', content)
+        self.assertNotIn('Schmidt', content)
+    
     def test_person_list_authenticated(self):
         """Testet person_list für authentifizierte User."""
         self.client.login(username='testuser', password='testpass123')
@@ -250,6 +1016,27 @@ class PersonViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Max')
     
+    def test_person_list_fuzzy_search(self):
+        """Testet den unscharfen Suchmodus in person_list."""
+        self.client.login(username='testuser', password='testpass123')
+        
+        response = self.client.get(
+            reverse('entities:person_list'), {'search': 'Mustremann', 'mode': 'fuzzy'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Max Mustermann')
+        self.assertContains(response, 'Ähnlichkeit')
+    
+    def test_vehicle_list_plate_search(self):
+        """Testet die Kennzeichen-Suche in vehicle_list."""
+        Vehicle.objects.create(license_plate='B-AB 123', make='VW', owner=self.person)
+        self.client.login(username='testuser', password='testpass123')
+        
+        for query in ('bab123', 'B AB-1', 'B?B*3'):
+            response = self.client.get(reverse('entities:vehicle_list'), {'search': query})
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'B-AB 123')
+    
     def test_person_list_risk_filter(self):
         """Testet den Risikostufen-Filter."""
         self.client.login(username='testuser', password='testpass123')
@@ -266,3 +1053,19 @@ class PersonViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'High')
+    
+    def test_person_activity_stream(self):
+        """Testet den JSON-Aktivitäts-Stream einer Person."""
+        self.client.login(username='testuser', password='testpass123')
+        
+        response = self.client.get(
+            reverse('entities:person_activity', kwargs={'person_id': self.person.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'events': [], 'next_cursor': None})
+        
+        response = self.client.get(
+            reverse('entities:person_activity', kwargs={'person_id': self.person.id}),
+            {'cursor': 'kaputt'}
+        )
+        self.assertEqual(response.status_code, 400)
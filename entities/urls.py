@@ -6,8 +6,12 @@ app_name = 'entities'
 urlpatterns = [
     path('persons/', views.person_list, name='person_list'),
     path('persons/<int:person_id>/', views.person_detail, name='person_detail'),
+    path('persons/<int:person_id>/activity/', views.person_activity, name='person_activity'),
     path('persons/create/', views.person_create, name='person_create'),
     path('addresses/', views.address_list, name='address_list'),
+    path('geo/', views.geo_search, name='geo_search'),
+    path('imports/', views.import_upload, name='import_upload'),
+    path('imports/<int:run_id>/', views.import_status, name='import_status'),
     path('vehicles/', views.vehicle_list, name='vehicle_list'),
     path('relationships/', views.relationship_graph, name='relationship_graph'),
     path('cross-case-analysis/', views.cross_case_analysis, name='cross_case_analysis'),
@@ -0,0 +1,202 @@
+# entities/utils.py
+"""
+Hilfsfunktionen für Normalisierung und unscharfe Namenssuche.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import Q
+
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+ALIAS_SPLIT_RE = re.compile(r'[,;\n]+')
+PLATE_STRIP_RE = re.compile(r'[^0-9A-ZÄÖÜ]')
+PLATE_PATTERN_STRIP_RE = re.compile(r'[^0-9A-ZÄÖÜ?*]')
+
+
+def normalize_text(value: str) -> str:
+    """
+    Case-Folding, Entfernen von Akzenten (ß -> ss) und Zusammenfassen von Leerraum.
+    """
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', value.casefold())
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return ' '.join(value.split())
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    """
+    Index-taugliche Präfix-Bedingung.
+    Postgres nutzt für LIKE 'x%' den varchar_pattern_ops-Index; SQLite-LIKE ist
+    case-insensitiv und nutzt keinen Index, ein Bereichsvergleich dagegen schon.
+    """
+    if connection.vendor == 'postgresql':
+        return Q(**{f'{field}__startswith': prefix})
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'})
+
+
+def normalize_plate(value: str, wildcards: bool = False) -> str:
+    """
+    Kennzeichen-Schlüssel: Großbuchstaben, ohne Trennzeichen ("b ab-123" -> "BAB123").
+    Mit wildcards=True bleiben ? (ein Zeichen) und * (beliebig viele) erhalten.
+    """
+    if not value:
+        return ''
+    pattern = PLATE_PATTERN_STRIP_RE if wildcards else PLATE_STRIP_RE
+    return pattern.sub('', value.upper())
+
+
+def plate_ngrams(key: str) -> set:
+    """Trigramme eines (normalisierten) Kennzeichen-Schlüssels ohne Auffüllung."""
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def plate_pattern_regex(pattern: str) -> str:
+    """
+    Übersetzt ein normalisiertes Kennzeichen-Muster ("B?AB*23") in einen Regex.
+    """
+    parts = ('.' if ch == '?' else '.*' if ch == '*' else re.escape(ch) for ch in pattern)
+    return '^' + ''.join(parts) + '$'
+
+
+def split_aliases(value: str) -> list:
+    """
+    Zerlegt das Freitextfeld known_aliases (Komma, Semikolon oder Zeilenumbruch).
+    """
+    if not value:
+        return []
+    return [alias.strip() for alias in ALIAS_SPLIT_RE.split(value) if alias.strip()]
+
+
+def parse_aliases(value: str, max_length: int = 200) -> dict:
+    """
+    Normalisierte Aliase aus known_aliases: {normalisiert: Originalschreibweise}.
+    Dubletten (nach Normalisierung) werden zusammengefasst.
+    """
+    parsed = {}
+    for alias in split_aliases(value):
+        alias = alias[:max_length]
+        normalized = normalize_text(alias)
+        if normalized:
+            parsed.setdefault(normalized, alias)
+    return parsed
+
+
+def trigrams(value: str) -> set:
+    """
+    Trigramme wie bei pg_trgm: jedes Wort wird mit zwei Leerzeichen vorne
+    und einem hinten aufgefüllt.
+    """
+    result = set()
+    for word in WORD_RE.findall(normalize_text(value)):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(left, right) -> float:
+    """
+    Jaccard-Ähnlichkeit zweier Trigramm-Mengen (akzeptiert auch Strings).
+    """
+    if isinstance(left, str):
+        left = trigrams(left)
+    if isinstance(right, str):
+        right = trigrams(right)
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _cologne_code(word: str, i: int) -> str:
+    char = word[i]
+    prev = word[i - 1] if i > 0 else ''
+    nxt = word[i + 1] if i + 1 < len(word) else ''
+    
+    if char in 'aeijouy':
+        return '0'
+    if char == 'h':
+        return ''
+    if char == 'b':
+        return '1'
+    if char == 'p':
+        return '3' if nxt == 'h' else '1'
+    if char in 'dt':
+        return '8' if nxt in ('c', 's', 'z') else '2'
+    if char in 'fvw':
+        return '3'
+    if char in 'gkq':
+        return '4'
+    if char == 'c':
+        if i == 0:
+            return '4' if nxt in ('a', 'h', 'k', 'l', 'o', 'q', 'r', 'u', 'x') else '8'
+        if nxt in ('a', 'h', 'k', 'o', 'q', 'u', 'x') and prev not in ('s', 'z'):
+            return '4'
+        return '8'
+    if char == 'x':
+        return '8' if prev in ('c', 'k', 'q') else '48'
+    if char == 'l':
+        return '5'
+    if char in 'mn':
+        return '6'
+    if char == 'r':
+        return '7'
+    if char in 'sz':
+        return '8'
+    return ''
+
+
+def cologne_phonetic(value: str) -> str:
+    """
+    Kölner Phonetik eines einzelnen Wortes.
+    Umlaute und ß werden vorher normalisiert (ü -> u, ß -> ss).
+    """
+    word = ''.join(WORD_RE.findall(normalize_text(value)))
+    word = ''.join(ch for ch in word if ch.isalpha())
+    if not word:
+        return ''
+    
+    raw = ''.join(_cologne_code(word, i) for i in range(len(word)))
+    collapsed = [code for i, code in enumerate(raw) if i == 0 or code != raw[i - 1]]
+    return collapsed[0] + ''.join(code for code in collapsed[1:] if code != '0')
+
+
+def phonetic_codes(value: str) -> list:
+    """
+    Phonetische Codes aller Wörter eines Namens (ohne leere Codes).
+    """
+    codes = (cologne_phonetic(word) for word in WORD_RE.findall(normalize_text(value)))
+    return [code for code in codes if code]
+
+
+def normalize_id_number(value: str) -> str:
+    """Ausweisnummer ohne Leer- und Trennzeichen, kleingeschrieben."""
+    return re.sub(r'[^0-9a-z]', '', normalize_text(value))
+
+
+def birth_date_similarity(left, right) -> float:
+    """
+    Ähnlichkeit zweier Geburtsdaten: 1.0 gleich, 0.8 bei einem Tippfehler
+    (eine abweichende oder zwei vertauschte Ziffern, Tag/Monat vertauscht),
+    0.5 wenn beide fehlen, 0.3 wenn eines fehlt, sonst 0.0.
+    """
+    if left is None or right is None:
+        return 0.5 if left is None and right is None else 0.3
+    if left == right:
+        return 1.0
+    if (left.year, left.month, left.day) == (right.year, right.day, right.month):
+        return 0.8
+    
+    differing = (left.year != right.year) + (left.month != right.month) + (left.day != right.day)
+    if differing == 3:
+        # Ein Tippfehler betrifft höchstens zwei benachbarte Bestandteile
+        return 0.0
+    a = f'{left.year:04d}{left.month:02d}{left.day:02d}'
+    b = f'{right.year:04d}{right.month:02d}{right.day:02d}'
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    if len(diff) == 1:
+        return 0.8
+    if len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]:
+        return 0.8
+    return 0.0
@@ -2,10 +2,53 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q, Count
+from django.core.exceptions import PermissionDenied
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 import json
-from .models import Person, Address, Vehicle, PersonAddress, PersonRelationship
+from .models import ImportRun, Person, Address, Vehicle, PersonAddress, PersonRelationship
 from investigations.models import PersonInvolvement, Case
+from investigations.export import FORMATS as EXPORT_FORMATS, export_response
+from investigations.services import PersonActivityService
+from .graph_export import FORMATS as NETWORK_FORMATS, network_export_response
+from .services import (
+    BulkImportService, CrossCaseAnalysisService, GeoSearchService, PersonSearchService,
+    RelationshipGraphService, VehicleSearchService
+)
+
+
+PERSON_EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('last_name', 'Nachname'),
+    ('first_name', 'Vorname'),
+    ('birth_date', 'Geburtsdatum'),
+    ('birth_place', 'Geburtsort'),
+    ('id_number', 'Ausweisnummer'),
+    ('known_aliases', 'Bekannte Aliase'),
+    ('risk_level', 'Risikostufe', Person.RISK_LEVEL_CHOICES),
+    ('created_at', 'Erstellt am'),
+]
+
+ADDRESS_EXPORT_COLUMNS = [
+    ('street', 'Straße'),
+    ('house_number', 'Hausnummer'),
+    ('postal_code', 'PLZ'),
+    ('city', 'Stadt'),
+    ('country', 'Land'),
+    ('latitude', 'Breitengrad'),
+    ('longitude', 'Längengrad'),
+]
+
+VEHICLE_EXPORT_COLUMNS = [
+    ('license_plate', 'Kennzeichen'),
+    ('vehicle_type', 'Fahrzeugtyp', Vehicle.VEHICLE_TYPE_CHOICES),
+    ('make', 'Hersteller'),
+    ('model', 'Modell'),
+    ('year', 'Baujahr'),
+    ('color', 'Farbe'),
+    ('owner__last_name', 'Besitzer Nachname'),
+    ('owner__first_name', 'Besitzer Vorname'),
+]
 
 
 @login_required
@@ -18,22 +61,33 @@ def person_list(request):
     # Filter
     risk_level_filter = request.GET.get('risk_level')
     search_query = request.GET.get('search')
+    search_mode = request.GET.get('mode', 'contains')
     
     if risk_level_filter:
         persons = persons.filter(risk_level=risk_level_filter)
     
-    if search_query:
+    if search_query and search_mode == 'fuzzy':
+        # Nach Ähnlichkeit sortierte Liste statt Queryset
+        persons = PersonSearchService.fuzzy_search(search_query, queryset=persons)
+    elif search_query and search_mode == 'phonetic':
+        persons = PersonSearchService.phonetic_search(search_query, queryset=persons)
+    elif search_query:
         persons = persons.filter(
             Q(first_name__icontains=search_query) |
             Q(last_name__icontains=search_query) |
-            Q(known_aliases__icontains=search_query)
+            Q(id__in=PersonSearchService.alias_person_ids(search_query, prefix=True))
         )
     
+    export_format = request.GET.get('export')
+    if export_format in EXPORT_FORMATS:
+        return export_response(persons, PERSON_EXPORT_COLUMNS, 'personen', export_format)
+    
     context = {
         'persons': persons,
         'risk_level_choices': Person.RISK_LEVEL_CHOICES,
         'current_risk_level': risk_level_filter,
         'search_query': search_query,
+        'search_mode': search_mode,
     }
     
     return render(request, 'entities/person_list.html', context)
@@ -71,6 +125,24 @@ def person_detail(request, person_id):
     return render(request, 'entities/person_detail.html', context)
 
 
+@login_required
+def person_activity(request, person_id):
+    """
+    Fallübergreifender Aktivitäts-Stream einer Person (JSON, Keyset-Pagination)
+    """
+    person = get_object_or_404(Person, id=person_id)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+        page = PersonActivityService.get_activity_stream(
+            person.id, cursor=request.GET.get('cursor'), limit=limit
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Ungültige Parameter.'}, status=400)
+    
+    return JsonResponse(page)
+
+
 @login_required
 def person_create(request):
     """
@@ -121,6 +193,10 @@ def address_list(request):
             Q(postal_code__icontains=search_query)
         )
     
+    export_format = request.GET.get('export')
+    if export_format in EXPORT_FORMATS:
+        return export_response(addresses, ADDRESS_EXPORT_COLUMNS, 'adressen', export_format)
+    
     # Verfügbare Städte für Filter
     cities = Address.objects.values_list('city', flat=True).distinct().order_by('city')
     
@@ -134,6 +210,31 @@ def address_list(request):
     return render(request, 'entities/address_list.html', context)
 
 
+@login_required
+def geo_search(request):
+    """
+    Umkreis- bzw. Rechtecksuche über Adressen, Fälle und Personen (JSON).
+    Parameter: lat, lon und radius (Meter, Standard 500) oder
+    bbox=min_lat,min_lon,max_lat,max_lon; optional limit
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', GeoSearchService.DEFAULT_LIMIT)), 1), 1000)
+        if request.GET.get('bbox'):
+            bbox = [float(value) for value in request.GET['bbox'].split(',')]
+            if len(bbox) != 4:
+                raise ValueError('bbox benötigt vier Werte')
+            results = GeoSearchService.in_area(*bbox, limit=limit)
+        else:
+            results = GeoSearchService.nearby(
+                float(request.GET['lat']), float(request.GET['lon']),
+                float(request.GET.get('radius', 500)), limit=limit,
+            )
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Ungültige Parameter.'}, status=400)
+    
+    return JsonResponse(results)
+
+
 @login_required
 def vehicle_list(request):
     """
@@ -148,15 +249,21 @@ def vehicle_list(request):
     if vehicle_type_filter:
         vehicles = vehicles.filter(vehicle_type=vehicle_type_filter)
     
-    if search_query:
+    if search_query and VehicleSearchService.is_pattern(search_query):
+        vehicles = VehicleSearchService.search_plates(search_query, queryset=vehicles)
+    elif search_query:
         vehicles = vehicles.filter(
-            Q(license_plate__icontains=search_query) |
+            VehicleSearchService.plate_q(search_query) |
             Q(make__icontains=search_query) |
             Q(model__icontains=search_query) |
             Q(owner__first_name__icontains=search_query) |
             Q(owner__last_name__icontains=search_query)
         )
     
+    export_format = request.GET.get('export')
+    if export_format in EXPORT_FORMATS:
+        return export_response(vehicles, VEHICLE_EXPORT_COLUMNS, 'fahrzeuge', export_format)
+    
     context = {
         'vehicles': vehicles,
         'vehicle_type_choices': Vehicle.VEHICLE_TYPE_CHOICES,
@@ -178,6 +285,17 @@ def relationship_graph(request):
     risk_level = request.GET.get('risk_level')
     analysis_mode = request.GET.get('mode', 'all')  # 'all', 'case', 'cross_case'
     
+    # Export für externe Graph-Werkzeuge (GraphML/GEXF), gestreamt
+    export_format = request.GET.get('export')
+    if export_format in NETWORK_FORMATS:
+        nodes, edges = RelationshipGraphService.iter_network(
+            case_id=case_id or None,
+            case_type=case_type or None,
+            min_risk_level=int(risk_level) if risk_level and risk_level.isdigit() else None,
+            analysis_mode=analysis_mode,
+        )
+        return network_export_response(nodes, edges, export_format)
+    
     # Basis-Queries
     relationships = PersonRelationship.objects.all().select_related('person1', 'person2')
     persons = Person.objects.all()
@@ -391,6 +509,43 @@ def cross_case_analysis(request):
         'total_multi_case_persons': len(multi_case_persons),
         'total_network_hubs': network_hubs.count(),
         'total_case_clusters': len(case_clusters),
+        'patterns': CrossCaseAnalysisService.get_pattern_analysis(),
     }
     
     return render(request, 'entities/cross_case_analysis.html', context)
+
+
+@login_required
+@require_POST
+def import_upload(request):
+    """
+    Massenimport per Upload (JSON-API): Datei im Feld file, Datenart in type
+    (person, relationship, involvement), optional format (csv, jsonl; sonst
+    anhand der Dateiendung). Der Import läuft im Request; sehr große Dateien
+    besser per Command import_data einspielen.
+    """
+    if not request.user.has_perm('entities.add_importrun'):
+        raise PermissionDenied
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'error': 'Keine Datei übermittelt.'}, status=400)
+    
+    try:
+        run = BulkImportService.import_upload(
+            upload, request.POST.get('type', ''), fmt=request.POST.get('format') or None, user=request.user
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    return JsonResponse(BulkImportService.run_status(run), status=201)
+
+
+@login_required
+def import_status(request, run_id):
+    """
+    Stand eines Importlaufs (JSON) - für den Starter oder mit Recht view_importrun
+    """
+    run = get_object_or_404(ImportRun, id=run_id)
+    if run.started_by_id != request.user.pk and not request.user.has_perm('entities.view_importrun'):
+        raise PermissionDenied
+    return JsonResponse(BulkImportService.run_status(run))
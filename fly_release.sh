@@ -7,6 +7,18 @@ set -e
 echo "🚀 Running database migrations..."
 python manage.py migrate --noinput
 
+echo "📊 Reconciling rollup tables..."
+python manage.py reconcile_rollups
+
+echo "🧭 Rebuilding case similarity index..."
+python manage.py rebuild_case_similarity
+
+echo "🔎 Indexing new persons for search..."
+python manage.py rebuild_person_index --missing
+
+echo "📄 Extracting evidence text (incremental)..."
+python manage.py extract_evidence_text --limit 500
+
 echo "👤 Setting up demo user..."
 python manage.py shell << 'EOF'
 from django.contrib.auth.models import User
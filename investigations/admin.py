@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Case, PersonInvolvement, Evidence, Investigation, Timeline
+from .models import Case, PersonInvolvement, Evidence, EvidencePreview, EvidenceUpload, Investigation, Timeline
 
 
 class PersonInvolvementInline(admin.TabularInline):
@@ -63,15 +63,15 @@ class PersonInvolvementAdmin(admin.ModelAdmin):
 class EvidenceAdmin(admin.ModelAdmin):
     list_display = ['evidence_number', 'title', 'case', 'evidence_type', 'collected_date', 'collected_by']
     list_filter = ['evidence_type', 'collected_date', 'collected_by']
-    search_fields = ['evidence_number', 'title', 'description', 'case__case_number']
-    readonly_fields = ['created_at']
+    search_fields = ['evidence_number', 'title', 'description', 'case__case_number', 'sha256']
+    readonly_fields = ['created_at', 'sha256', 'file_size']
     
     fieldsets = (
         ('Grunddaten', {
             'fields': ('case', 'evidence_number', 'title', 'description', 'evidence_type')
         }),
         ('Fundort', {
-            'fields': ('location_found', 'file')
+            'fields': ('location_found', 'file', 'sha256', 'file_size')
         }),
         ('Verwahrung', {
             'fields': ('chain_of_custody', 'collected_date', 'collected_by')
@@ -82,6 +82,40 @@ class EvidenceAdmin(admin.ModelAdmin):
         })
     )
 
+    
+    def save_model(self, request, obj, form, change):
+        # Neue Datei: Prüfsumme trägt maintain_evidence_storage --hash-missing nach
+        if 'file' in form.changed_data:
+            obj.sha256 = ''
+            obj.file_size = None
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(EvidenceUpload)
+class EvidenceUploadAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'case', 'status', 'offset', 'size', 'created_by', 'updated_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name', 'case__case_number']
+    readonly_fields = [field.name for field in EvidenceUpload._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(EvidencePreview)
+class EvidencePreviewAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'evidence', 'status', 'attempts', 'generated_at']
+    list_filter = ['status']
+    search_fields = ['file_name', 'evidence__evidence_number', 'sha256']
+    readonly_fields = [field.name for field in EvidencePreview._meta.fields]
+    actions = ['regenerate']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Vorschau neu erzeugen')
+    def regenerate(self, request, queryset):
+        queryset.update(status='pending', attempts=0, claimed_at=None, error='')
 
 @admin.register(Investigation)
 class InvestigationAdmin(admin.ModelAdmin):
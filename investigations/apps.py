@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InvestigationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'investigations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
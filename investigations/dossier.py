@@ -0,0 +1,215 @@
+# investigations/dossier.py
+"""
+Fallakte als ZIP-Archiv: Falldaten, Beteiligte, Zeitachse, Ermittlungsmaßnahmen
+und Beweismittel-Metadaten jeweils als JSON und CSV, dazu die Originaldateien
+der Beweismittel.
+
+Das Archiv wird direkt in die Antwort geschrieben (Data Descriptors, kein
+Zurückspringen). Dateien werden blockweise aus dem Storage gelesen - weder
+Arbeitsspeicher noch temporäre Dateien wachsen mit der Dateigröße.
+Ein manifest.json am Ende listet Größe und SHA-256 jeder Datei. Dateien, die
+der Nutzer nicht einsehen darf (siehe media.can_view_evidence), fehlen im
+Archiv und sind im Manifest unter withheld_files aufgeführt.
+"""
+import hashlib
+import json
+import posixpath
+import re
+import zipfile
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .export import ROWS_PER_WRITE, ChunkSink, iter_rows, stream_csv
+from .media import viewable_evidence_q
+from .models import Case, Evidence, Investigation, PersonInvolvement, Timeline
+
+
+FILE_CHUNK_SIZE = 1024 * 1024
+FILES_DIR = 'beweismittel'
+
+CASE_COLUMNS = [
+    ('id', 'ID'),
+    ('case_number', 'Aktenzeichen'),
+    ('title', 'Titel'),
+    ('description', 'Beschreibung'),
+    ('case_type', 'Falltyp', Case.CASE_TYPE_CHOICES),
+    ('status', 'Status', Case.CASE_STATUS_CHOICES),
+    ('priority', 'Priorität', Case.PRIORITY_CHOICES),
+    ('incident_date', 'Tatzeitpunkt'),
+    ('reported_date', 'Gemeldet am'),
+    ('location__street', 'Tatort Straße'),
+    ('location__city', 'Tatort Stadt'),
+    ('assigned_to__username', 'Zugewiesen an'),
+    ('created_at', 'Erstellt am'),
+]
+
+# Abschnitt -> (Queryset-Fabrik, Spalten)
+SECTIONS = {
+    'beteiligte': (
+        lambda case: PersonInvolvement.objects.filter(case=case).order_by('id'),
+        [
+            ('person_id', 'Person-ID'),
+            ('person__last_name', 'Nachname'),
+            ('person__first_name', 'Vorname'),
+            ('person__birth_date', 'Geburtsdatum'),
+            ('involvement_type', 'Rolle', PersonInvolvement.INVOLVEMENT_TYPE_CHOICES),
+            ('credibility', 'Glaubwürdigkeit'),
+            ('description', 'Beschreibung'),
+            ('created_at', 'Erstellt am'),
+        ],
+    ),
+    'zeitachse': (
+        lambda case: Timeline.objects.filter(case=case).order_by('datetime', 'id'),
+        [
+            ('datetime', 'Datum/Zeit'),
+            ('title', 'Titel'),
+            ('description', 'Beschreibung'),
+            ('related_person_id', 'Person-ID'),
+            ('related_person__last_name', 'Person Nachname'),
+            ('related_person__first_name', 'Person Vorname'),
+            ('related_location__street', 'Ort Straße'),
+            ('related_location__city', 'Ort Stadt'),
+            ('created_at', 'Erstellt am'),
+        ],
+    ),
+    'ermittlungsmassnahmen': (
+        lambda case: Investigation.objects.filter(case=case).order_by('id'),
+        [
+            ('id', 'ID'),
+            ('title', 'Titel'),
+            ('description', 'Beschreibung'),
+            ('investigation_type', 'Maßnahmentyp', Investigation.INVESTIGATION_TYPE_CHOICES),
+            ('planned_date', 'Geplant für'),
+            ('completed_date', 'Durchgeführt am'),
+            ('result', 'Ergebnis'),
+            ('assigned_to__username', 'Zugewiesen an'),
+            ('created_at', 'Erstellt am'),
+        ],
+    ),
+    'beweismittel': (
+        lambda case: Evidence.objects.filter(case=case).order_by('id'),
+        [
+            ('id', 'ID'),
+            ('evidence_number', 'Beweis-Nr.'),
+            ('title', 'Titel'),
+            ('description', 'Beschreibung'),
+            ('evidence_type', 'Beweistyp', Evidence.EVIDENCE_TYPE_CHOICES),
+            ('location_found', 'Fundort'),
+            ('file', 'Datei'),
+            ('chain_of_custody', 'Verwahrungskette'),
+            ('collected_date', 'Sichergestellt am'),
+            ('collected_by__username', 'Sichergestellt von'),
+            ('created_at', 'Erstellt am'),
+        ],
+    ),
+}
+
+
+def evidence_archive_path(evidence_id: int, file_name: str) -> str:
+    """Pfad der Originaldatei im Archiv; die ID verhindert Namenskollisionen."""
+    base = re.sub(r'[^\w.\-]+', '_', posixpath.basename(file_name)).strip('._') or 'datei'
+    return f'{FILES_DIR}/{evidence_id}-{base}'
+
+
+def _json_blocks(keys: list, rows):
+    """JSON-Array von Objekten, blockweise kodiert."""
+    yield b'['
+    pending = []
+    first = True
+    for row in rows:
+        item = json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=str)
+        pending.append(('\n' if first else ',\n') + item)
+        first = False
+        if len(pending) >= ROWS_PER_WRITE:
+            yield ''.join(pending).encode()
+            pending.clear()
+    yield (''.join(pending) + '\n]\n').encode()
+
+
+def _zip_info(name: str, compress_type: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+    info.compress_type = compress_type
+    return info
+
+
+def _write_entry(archive, sink, name: str, blocks, compress_type=zipfile.ZIP_DEFLATED):
+    """Schreibt einen Eintrag blockweise und gibt die bereits fertigen Archiv-Bytes weiter."""
+    with archive.open(_zip_info(name, compress_type), 'w', force_zip64=True) as entry:
+        for block in blocks:
+            entry.write(block)
+            data = sink.drain()
+            if data:
+                yield data
+
+
+def _file_blocks(evidence: Evidence, digest):
+    with evidence.file.open('rb') as handle:
+        for block in handle.chunks(FILE_CHUNK_SIZE):
+            digest.update(block)
+            yield block
+
+
+def stream_dossier(case: Case, user):
+    """
+    Fallakte als ZIP-Datenstrom mit den Dateien, die user einsehen darf.
+
+    Yields:
+        bytes-Blöcke des Archivs (höchstens ein Datei-Block gleichzeitig im Speicher)
+    """
+    sink = ChunkSink()
+    archive = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+    cases = Case.objects.filter(id=case.id)
+    manifest = {
+        'case_number': case.case_number,
+        'created_at': timezone.localtime().isoformat(),
+        'files': [],
+        'missing_files': [],
+        'withheld_files': [],
+    }
+
+    yield from _write_entry(archive, sink, 'fall.json', [
+        json.dumps(
+            dict(zip([column[0] for column in CASE_COLUMNS], next(iter_rows(cases, CASE_COLUMNS)))),
+            ensure_ascii=False, indent=2, default=str
+        ).encode()
+    ])
+    for name, (queryset, columns) in SECTIONS.items():
+        keys = [column[0] for column in columns]
+        header = [column[1] for column in columns]
+        yield from _write_entry(archive, sink, f'{name}.json', _json_blocks(keys, iter_rows(queryset(case), columns)))
+        yield from _write_entry(archive, sink, f'{name}.csv', stream_csv(header, iter_rows(queryset(case), columns)))
+
+    # Originaldateien unkomprimiert: Fotos/Videos sind bereits komprimiert
+    evidence_files = Evidence.objects.filter(case=case).exclude(file='').exclude(file__isnull=True)
+    visible = set(evidence_files.filter(viewable_evidence_q(user)).values_list('id', flat=True))
+    for evidence in evidence_files.only('id', 'evidence_number', 'file').order_by('id').iterator():
+        if evidence.id not in visible:
+            manifest['withheld_files'].append({'evidence_id': evidence.id, 'evidence_number': evidence.evidence_number})
+            continue
+        path = evidence_archive_path(evidence.id, evidence.file.name)
+        if not evidence.file.storage.exists(evidence.file.name):
+            manifest['missing_files'].append({'evidence_id': evidence.id, 'file': evidence.file.name})
+            continue
+        digest = hashlib.sha256()
+        yield from _write_entry(archive, sink, path, _file_blocks(evidence, digest), zipfile.ZIP_STORED)
+        manifest['files'].append({
+            'evidence_id': evidence.id,
+            'evidence_number': evidence.evidence_number,
+            'path': path,
+            'size': archive.getinfo(path).file_size,
+            'sha256': digest.hexdigest(),
+        })
+
+    archive.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+    archive.close()
+    yield sink.drain()
+
+
+def dossier_response(case: Case, user) -> StreamingHttpResponse:
+    """StreamingHttpResponse mit der Fallakte als ZIP (Dateien nach Rechten von user)."""
+    response = StreamingHttpResponse(stream_dossier(case, user), content_type='application/zip')
+    name = re.sub(r'[^\w\-]+', '_', case.case_number)
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    response['Content-Disposition'] = f'attachment; filename="fallakte-{name}-{stamp}.zip"'
+    return response
@@ -0,0 +1,256 @@
+# investigations/export.py
+"""
+Streaming-Export von Listen als CSV oder XLSX.
+Zeilen kommen per values_list().iterator() aus der Datenbank und werden
+blockweise geschrieben - der Speicherbedarf hängt nicht von der Zeilenzahl ab.
+
+XLSX wird ohne Zusatzbibliothek erzeugt: ein ZIP-Archiv mit Inline-Strings,
+das ohne Zurückspringen (Data Descriptors) direkt in die Antwort fließt.
+Mehr als MAX_SHEET_ROWS Zeilen werden auf weitere Tabellenblätter verteilt.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+FORMATS = ('csv', 'xlsx')
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+MAX_SHEET_ROWS = 1_048_575  # Excel-Limit ohne Kopfzeile
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Zeichen, die in XML 1.0 nicht vorkommen dürfen
+ILLEGAL_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+# Tabellenkalkulationen werten solche Zellen als Formel aus (CSV-Injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def format_value(value, choices: dict = None):
+    """Anzeigewert: Choice-Label, lokale Zeit, leere Zelle für None."""
+    if value is None:
+        return ''
+    if choices is not None:
+        return choices.get(value, value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M') if timezone.is_aware(value) \
+            else value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(source, columns: list, chunk_size: int = CHUNK_SIZE):
+    """
+    Zeilen als Tupel von Anzeigewerten.
+
+    Args:
+        source: QuerySet (gestreamt per values_list/iterator) oder bereits geladene Liste von Objekten
+        columns: [(Feldpfad, Überschrift) oder (Feldpfad, Überschrift, Choices), ...]
+    """
+    fields = [column[0] for column in columns]
+    choices = [dict(column[2]) if len(column) > 2 else None for column in columns]
+
+    if isinstance(source, list):
+        def resolve(obj, path):
+            for part in path.split('__'):
+                obj = getattr(obj, part, None) if obj is not None else None
+            return obj
+        rows = ([resolve(obj, field) for field in fields] for obj in source)
+    else:
+        rows = source.values_list(*fields).iterator(chunk_size=chunk_size)
+
+    for row in rows:
+        yield tuple(format_value(value, mapping) for value, mapping in zip(row, choices))
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(header: list, rows):
+    """
+    CSV mit Semikolon und BOM (öffnet in deutschem Excel direkt korrekt).
+
+    Yields:
+        bytes-Blöcke zu je ROWS_PER_WRITE Zeilen
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+    writer.writerow(header)
+    yield '\ufeff'.encode() + buffer.getvalue().encode()
+
+    pending = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([_csv_safe(value) for value in row])
+        pending += 1
+        if pending >= ROWS_PER_WRITE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+class ChunkSink(io.RawIOBase):
+    """Nicht rücksetzbares Schreibziel für zipfile; gesammelte Bytes holt drain() ab."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _xlsx_cell(value) -> str:
+    if isinstance(value, bool):
+        value = 'Ja' if value else 'Nein'
+    elif isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(ILLEGAL_XML_RE.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(number: int, values) -> str:
+    return f'<row r="{number}">' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def _xlsx_metadata(sheets: int, title: str) -> dict:
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    relationships = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    package = 'http://schemas.openxmlformats.org/package/2006/relationships'
+    sheet_type = f'{relationships}/worksheet'
+    sheet_content = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+    names = [title[:31] if sheets == 1 else f'{title[:26]} {index}' for index in range(1, sheets + 1)]
+    return {
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + ''.join(f'<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="{sheet_content}"/>'
+                      for index in range(1, sheets + 1))
+            + '</Types>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<Relationships xmlns="{package}">'
+            f'<Relationship Id="rId1" Type="{relationships}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/workbook.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<workbook xmlns="{main}" xmlns:r="{relationships}"><sheets>'
+            + ''.join(f'<sheet name="{escape(name)}" sheetId="{index}" r:id="rId{index}"/>'
+                      for index, name in enumerate(names, 1))
+            + '</sheets></workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<Relationships xmlns="{package}">'
+            + ''.join(f'<Relationship Id="rId{index}" Type="{sheet_type}" Target="worksheets/sheet{index}.xml"/>'
+                      for index in range(1, sheets + 1))
+            + '</Relationships>'
+        ),
+    }
+
+
+def stream_xlsx(header: list, rows, title: str = 'Export', max_sheet_rows: int = MAX_SHEET_ROWS):
+    """
+    XLSX-Arbeitsmappe; Tabellenblätter werden nacheinander geschrieben,
+    Arbeitsmappe und Content-Types erst am Ende (dann steht die Blattzahl fest).
+
+    Yields:
+        bytes-Blöcke des ZIP-Archivs
+    """
+    sink = ChunkSink()
+    archive = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+    sheet_start = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        + _xlsx_row(1, header)
+    )
+    sheets = 0
+    sheet = None
+    row_number = 0
+    pending = []
+
+    def write_pending():
+        sheet.write(''.join(pending).encode())
+        pending.clear()
+
+    for row in rows:
+        if sheet is None or row_number > max_sheet_rows:
+            if sheet is not None:
+                write_pending()
+                sheet.write(b'</sheetData></worksheet>')
+                sheet.close()
+            sheets += 1
+            sheet = archive.open(f'xl/worksheets/sheet{sheets}.xml', 'w', force_zip64=True)
+            sheet.write(sheet_start.encode())
+            row_number = 1
+        row_number += 1
+        pending.append(_xlsx_row(row_number, row))
+        if len(pending) >= ROWS_PER_WRITE:
+            write_pending()
+            yield sink.drain()
+
+    if sheet is None:
+        sheets = 1
+        sheet = archive.open('xl/worksheets/sheet1.xml', 'w')
+        sheet.write(sheet_start.encode())
+    write_pending()
+    sheet.write(b'</sheetData></worksheet>')
+    sheet.close()
+    for name, content in _xlsx_metadata(sheets, title).items():
+        archive.writestr(name, content)
+    archive.close()
+    yield sink.drain()
+
+
+def export_response(source, columns: list, filename: str, fmt: str) -> StreamingHttpResponse:
+    """
+    StreamingHttpResponse für eine Liste (QuerySet oder Objektliste).
+
+    Args:
+        columns: siehe iter_rows
+        filename: Dateiname ohne Endung
+        fmt: 'csv' oder 'xlsx'
+    """
+    header = [column[1] for column in columns]
+    rows = iter_rows(source, columns)
+    if fmt == 'xlsx':
+        content = stream_xlsx(header, rows, title=filename)
+    else:
+        content = stream_csv(header, rows)
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[fmt])
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{fmt}"'
+    return response
@@ -0,0 +1,164 @@
+# investigations/extraction.py
+"""
+Text-Extraktion aus Beweismittel-Dateien (Text, HTML, PDF, Office).
+Reine Funktionen ohne Datenbankzugriff; die Einplanung übernimmt EvidenceTextService.
+"""
+import io
+import re
+import zipfile
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+
+
+MAX_FILE_SIZE = 50 * 1024 * 1024  # Bytes
+MAX_TEXT_LENGTH = 5_000_000  # Zeichen
+
+TEXT_EXTENSIONS = {'txt', 'csv', 'log', 'md', 'json', 'xml', 'eml'}
+HTML_EXTENSIONS = {'html', 'htm'}
+PDF_EXTENSIONS = {'pdf'}
+
+# Archivpfade, deren XML-Textknoten den Dokumentinhalt enthalten
+OFFICE_MEMBERS = {
+    'docx': re.compile(r'^word/(document|footnotes|endnotes|header\d*|footer\d*)\.xml$'),
+    'xlsx': re.compile(r'^xl/(sharedStrings|worksheets/sheet\d+)\.xml$'),
+    'pptx': re.compile(r'^ppt/slides/slide\d+\.xml$'),
+    'odt': re.compile(r'^content\.xml$'),
+    'ods': re.compile(r'^content\.xml$'),
+    'odp': re.compile(r'^content\.xml$'),
+}
+
+# Elemente, nach denen ein Zeilenumbruch eingefügt wird (Absatz, Zelle, Folie …)
+BLOCK_TAGS = {'p', 'tr', 'br', 'row', 'si', 'h', 'list-item', 'table-row', 'page'}
+
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+class UnsupportedFormat(Exception):
+    """Dateiformat wird nicht extrahiert (z.B. Foto, Video)."""
+
+
+def file_extension(name: str) -> str:
+    return name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+
+
+def is_supported(name: str) -> bool:
+    extension = file_extension(name)
+    return (extension in TEXT_EXTENSIONS or extension in HTML_EXTENSIONS
+            or extension in PDF_EXTENSIONS or extension in OFFICE_MEMBERS)
+
+
+def clean_text(text: str) -> str:
+    """Vereinheitlicht Leerraum und begrenzt die Länge."""
+    text = text.replace('\x00', '')
+    text = WHITESPACE_RE.sub(' ', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()[:MAX_TEXT_LENGTH]
+
+
+def decode_text(data: bytes) -> str:
+    """UTF-8 (mit BOM) und Rückfall auf Latin-1."""
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+class _HTMLTextParser(HTMLParser):
+    SKIP_TAGS = {'script', 'style', 'head', 'noscript'}
+    BREAK_TAGS = {'p', 'br', 'div', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'title'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in self.BREAK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in self.BREAK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def extract_html(data: bytes) -> str:
+    parser = _HTMLTextParser()
+    parser.feed(decode_text(data))
+    parser.close()
+    return ''.join(parser.parts)
+
+
+def extract_pdf(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:
+        raise UnsupportedFormat('pypdf ist nicht installiert') from exc
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _xml_text(xml: bytes) -> str:
+    parts = []
+    for element in ElementTree.fromstring(xml).iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in ('t', 'span', 'p', 'h') and element.text:
+            parts.append(element.text)
+        elif tag == 'tab':
+            parts.append('\t')
+        if tag in BLOCK_TAGS:
+            parts.append('\n')
+        if element.tail and tag in ('span', 's', 'tab', 'line-break'):
+            parts.append(element.tail)
+    return ''.join(parts)
+
+
+def extract_office(data: bytes, extension: str) -> str:
+    """
+    Office Open XML (docx/xlsx/pptx) und OpenDocument (odt/ods/odp)
+    sind ZIP-Archive; der Text steht in den XML-Textknoten.
+    """
+    pattern = OFFICE_MEMBERS[extension]
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = sorted(
+            (name for name in archive.namelist() if pattern.match(name)),
+            key=lambda name: [int(d) if d.isdigit() else d for d in re.split(r'(\d+)', name)],
+        )
+        return '\n\n'.join(_xml_text(archive.read(name)) for name in members)
+
+
+def extract_text(name: str, data: bytes) -> str:
+    """
+    Extrahiert den Klartext einer Datei anhand der Dateiendung.
+
+    Raises:
+        UnsupportedFormat wenn das Format nicht unterstützt wird
+        ValueError bei beschädigten oder zu großen Dateien
+    """
+    if len(data) > MAX_FILE_SIZE:
+        raise ValueError(f'Datei größer als {MAX_FILE_SIZE // (1024 * 1024)} MB')
+
+    extension = file_extension(name)
+    try:
+        if extension in TEXT_EXTENSIONS:
+            text = decode_text(data)
+        elif extension in HTML_EXTENSIONS:
+            text = extract_html(data)
+        elif extension in PDF_EXTENSIONS:
+            text = extract_pdf(data)
+        elif extension in OFFICE_MEMBERS:
+            text = extract_office(data, extension)
+        else:
+            raise UnsupportedFormat(f'Format .{extension or "?"} wird nicht unterstützt')
+    except (zipfile.BadZipFile, ElementTree.ParseError, KeyError) as exc:
+        raise ValueError(f'Datei konnte nicht gelesen werden: {exc}') from exc
+    return clean_text(text)
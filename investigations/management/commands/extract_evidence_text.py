@@ -0,0 +1,37 @@
+# investigations/management/commands/extract_evidence_text.py
+"""
+Management-Command zur Volltext-Extraktion der Beweismittel-Dateien.
+Inkrementell: verarbeitet nur ausstehende Einträge und kann nach einem
+Abbruch einfach erneut gestartet werden.
+"""
+from django.core.management.base import BaseCommand
+from investigations.services import EvidenceTextService
+
+
+class Command(BaseCommand):
+    help = 'Extrahiert den Text ausstehender Beweismittel-Dateien in den Volltextindex'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Parallele Worker')
+        parser.add_argument('--batch-size', type=int, default=100, help='Einträge pro Batch')
+        parser.add_argument('--limit', type=int, default=None, help='Höchstens so viele Dateien verarbeiten')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Fehlgeschlagene Einträge erneut versuchen')
+        parser.add_argument('--rebuild-index', action='store_true',
+                            help='Volltextindex aus den gespeicherten Texten neu aufbauen')
+
+    def handle(self, *args, **options):
+        queued = EvidenceTextService.enqueue_missing(retry_failed=options['retry_failed'])
+        self.stdout.write(f'Neu eingeplant: {queued}')
+        
+        stats = EvidenceTextService.process_pending(
+            workers=options['workers'], batch_size=options['batch_size'], limit=options['limit'],
+        )
+        for status, count in sorted(stats.items()):
+            self.stdout.write(f'{status}: {count}')
+        
+        if options['rebuild_index']:
+            EvidenceTextService.rebuild_search_index()
+            self.stdout.write('Volltextindex neu aufgebaut')
+        
+        self.stdout.write(self.style.SUCCESS('Extraktion abgeschlossen!'))
@@ -0,0 +1,32 @@
+# investigations/management/commands/generate_previews.py
+"""
+Management-Command zur Erzeugung der Beweismittel-Vorschauen.
+Arbeitet die Vorschau-Warteschlange ab, die der Worker im Webprozess wegen
+des begrenzten Pools liegen lässt (z.B. nach Bulk-Importen). Inkrementell
+und nach einem Abbruch erneut startbar.
+"""
+from django.core.management.base import BaseCommand
+from investigations.services import EvidencePreviewService
+
+
+class Command(BaseCommand):
+    help = 'Erzeugt Miniaturen und Seitenvorschauen ausstehender Beweismittel-Dateien'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Parallele Worker')
+        parser.add_argument('--batch-size', type=int, default=100, help='Einträge pro Batch')
+        parser.add_argument('--limit', type=int, default=None, help='Höchstens so viele Dateien verarbeiten')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Fehlgeschlagene Einträge erneut versuchen')
+
+    def handle(self, *args, **options):
+        queued = EvidencePreviewService.enqueue_missing(retry_failed=options['retry_failed'])
+        self.stdout.write(f'Neu eingeplant: {queued}')
+
+        stats = EvidencePreviewService.process_pending(
+            workers=options['workers'], batch_size=options['batch_size'], limit=options['limit'],
+        )
+        for status, count in sorted(stats.items()):
+            self.stdout.write(f'{status}: {count}')
+
+        self.stdout.write(self.style.SUCCESS('Vorschauen erfolgreich erzeugt!'))
@@ -0,0 +1,56 @@
+# investigations/management/commands/generate_synthetic_data.py
+"""
+Management-Command zum Erzeugen synthetischer Datensätze für Lasttests und
+Kapazitätsplanung (z.B. 1.000.000 Personen und 100.000 Fälle).
+Gleicher Seed ergibt denselben Datensatz.
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from entities.models import Person
+from investigations.synthetic import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Erzeugt einen reproduzierbaren synthetischen Datensatz per bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--persons', type=int, default=10_000, help='Anzahl Personen')
+        parser.add_argument('--cases', type=int, default=1_000, help='Anzahl Fälle')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Zeilen pro bulk_create')
+        parser.add_argument('--prefix', default='SYN', help='Präfix für externe IDs und Aktenzeichen')
+        parser.add_argument('--user', help='Benutzername für "Erstellt von"')
+        parser.add_argument('--skip-index', action='store_true',
+                            help='Personen-Suchindex nicht aufbauen (später: rebuild_person_index)')
+
+    def handle(self, *args, **options):
+        if Person.objects.filter(external_id__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Es gibt bereits Daten mit dem Präfix {options['prefix']}")
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Benutzer {options['user']} nicht gefunden")
+        
+        started = time.monotonic()
+        
+        def progress(step, count):
+            self.stdout.write(f'{step}: {count} ({time.monotonic() - started:.0f} s)')
+        
+        self.stdout.write(
+            f"Erzeuge {options['persons']} Personen und {options['cases']} Fälle (Seed {options['seed']})..."
+        )
+        stats = SyntheticDataGenerator(
+            persons=options['persons'], cases=options['cases'], seed=options['seed'],
+            batch_size=options['batch_size'], prefix=options['prefix'], user=user,
+            index=not options['skip_index'], progress=progress,
+        ).generate()
+        self.stdout.write(', '.join(f'{key}: {value}' for key, value in stats.items()))
+        self.stdout.write(
+            'Ähnlichkeits- und Duplikatindizes bei Bedarf mit rebuild_case_similarity '
+            'und rebuild_duplicate_index aufbauen.'
+        )
+        
+        self.stdout.write(self.style.SUCCESS('Synthetische Daten erfolgreich erzeugt!'))
@@ -0,0 +1,32 @@
+# investigations/management/commands/maintain_evidence_storage.py
+"""
+Management-Command zur Pflege der Beweismittel-Ablage.
+Bricht liegengebliebene Block-Uploads ab (Teildateien werden gelöscht) und
+trägt Prüfsummen für klassisch hochgeladene Dateien nach.
+Gedacht für den nächtlichen Lauf (Cron / Fly Release).
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from investigations.services import EvidenceUploadService
+
+
+class Command(BaseCommand):
+    help = 'Räumt offene Uploads auf und trägt fehlende SHA-256-Prüfsummen nach'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-hours', type=int,
+                            default=int(EvidenceUploadService.STALE_AFTER.total_seconds() // 3600),
+                            help='Offene Uploads ohne Fortschritt seit so vielen Stunden abbrechen')
+        parser.add_argument('--skip-hashing', action='store_true',
+                            help='Keine Prüfsummen für Altbestände berechnen')
+
+    def handle(self, *args, **options):
+        purged = EvidenceUploadService.purge_stale(timedelta(hours=options['stale_hours']))
+        self.stdout.write(f'Abgebrochene Uploads: {purged}')
+
+        if not options['skip_hashing']:
+            hashed = EvidenceUploadService.hash_missing()
+            self.stdout.write(f'Nachgetragene Prüfsummen: {hashed}')
+
+        self.stdout.write(self.style.SUCCESS('Beweismittel-Ablage erfolgreich gepflegt!'))
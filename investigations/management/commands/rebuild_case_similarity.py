@@ -0,0 +1,26 @@
+# investigations/management/commands/rebuild_case_similarity.py
+"""
+Management-Command zum Neuaufbau der TF-IDF-Fallähnlichkeit.
+Gedacht für den nächtlichen Lauf (Cron / Fly Release); gleicht die idf-Drift
+der inkrementellen Fortschreibung ab.
+"""
+from django.core.management.base import BaseCommand
+from investigations.services import CaseSimilarityService
+
+
+class Command(BaseCommand):
+    help = 'Berechnet TF-IDF-Vektoren und Top-k-Nachbarn aller Fälle neu'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=CaseSimilarityService.TOP_K,
+                            help='Gespeicherte Nachbarn je Fall')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Berechne Fall-Ähnlichkeiten...')
+        
+        result = CaseSimilarityService.rebuild(top_k=options['top_k'])
+        self.stdout.write(
+            f"{result['cases']} Fälle, {result['terms']} Terme, {result['similarities']} Nachbarn"
+        )
+        
+        self.stdout.write(self.style.SUCCESS('Fall-Ähnlichkeit erfolgreich aufgebaut!'))
@@ -0,0 +1,22 @@
+# investigations/management/commands/rebuild_duplicate_index.py
+"""
+Management-Command zum Neuaufbau der MinHash-Signaturen für die Duplikaterkennung.
+Nur nach Bulk-Importen nötig; Einzeländerungen pflegen die Signale.
+"""
+from django.core.management.base import BaseCommand
+from investigations.services import DuplicateDetectionService
+
+
+class Command(BaseCommand):
+    help = 'Berechnet MinHash-Signaturen und LSH-Buckets für Fälle und Beweismittel neu'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Signaturen pro Batch')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Berechne Duplikat-Signaturen...')
+        
+        counts = DuplicateDetectionService.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(f"Fälle: {counts['case']}, Beweismittel: {counts['evidence']}")
+        
+        self.stdout.write(self.style.SUCCESS('Duplikat-Index erfolgreich aufgebaut!'))
@@ -0,0 +1,25 @@
+# investigations/management/commands/reconcile_rollups.py
+"""
+Management-Command zum Abgleich der vorberechneten Rollup-Tabellen.
+Gedacht für den nächtlichen Lauf (Cron / Fly Release).
+"""
+from django.core.management.base import BaseCommand
+from investigations.services import TemporalHeatmapService, CaseRollupService
+
+
+class Command(BaseCommand):
+    help = 'Baut die vorberechneten Rollup-Tabellen aus den Quelldaten neu auf'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Gleiche Rollup-Tabellen ab...')
+        
+        cells = TemporalHeatmapService.rebuild()
+        self.stdout.write(f'Heatmap-Würfel: {cells} Zellen')
+        
+        rollups = CaseRollupService.rebuild()
+        self.stdout.write(
+            f"Fall-Trends: {rollups['daily']} Tages-, {rollups['monthly']} Monats-, "
+            f"{rollups['weekly_city']} Stadt-Wochenzeilen, {rollups['suspects']} Verdächtigen-Zähler"
+        )
+        
+        self.stdout.write(self.style.SUCCESS('Rollup-Tabellen erfolgreich abgeglichen!'))
@@ -0,0 +1,182 @@
+# investigations/media.py
+"""
+Auslieferung von Beweismittel-Dateien mit Range-Requests (Vorspulen in
+Video/Audio), ETag/If-None-Match und Übergabe an den Frontend-Proxy.
+
+EVIDENCE_SENDFILE steuert, wer die Bytes überträgt:
+    ''          Django; gunicorn nutzt sendfile() über wsgi.file_wrapper (kein Kopieren
+                durch Python), der Worker bleibt aber bis zum Ende der Übertragung belegt
+    'nginx'     X-Accel-Redirect auf EVIDENCE_SENDFILE_PREFIX + Dateiname (internal location)
+    'xsendfile' X-Sendfile mit absolutem Pfad (Apache mod_xsendfile, lighttpd)
+Mit Proxy-Übergabe endet der Request nach der Rechteprüfung; Range und
+Übertragung erledigt der Proxy.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, quote_etag
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header: str, size: int):
+    """
+    Einzelner Byte-Bereich aus dem Range-Header.
+
+    Returns:
+        (start, end) inklusive, None ohne (unterstützten) Range-Header,
+        'invalid' bei nicht erfüllbarem Bereich
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        # Mehrfachbereiche werden ignoriert - Antwort ist dann die ganze Datei
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start > end or start >= size:
+            return 'invalid'
+    else:
+        length = int(last)
+        if length == 0 or size == 0:
+            return 'invalid'
+        start, end = max(size - length, 0), size - 1
+    return start, end
+
+
+class RangeFile:
+    """
+    Dateiausschnitt für FileResponse. fileno() bleibt erreichbar, damit gunicorn
+    per sendfile() ab der aktuellen Position Content-Length Bytes überträgt;
+    ohne sendfile liefert read() höchstens die Länge des Ausschnitts.
+    """
+
+    def __init__(self, handle, start: int, length: int):
+        self.handle = handle
+        self.handle.seek(start)
+        self.remaining = length
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.handle.close()
+
+
+def can_view_evidence(user, evidence) -> bool:
+    """
+    Zugriff auf die Datei: Recht view_evidence (inkl. Superuser) oder
+    Beteiligung am Fall als Ersteller, Zuständiger oder Sicherstellender.
+    """
+    if not user.is_authenticated:
+        return False
+    if user.has_perm('investigations.view_evidence'):
+        return True
+    return user.pk in (evidence.case.created_by_id, evidence.case.assigned_to_id, evidence.collected_by_id)
+
+
+def viewable_evidence_q(user) -> Q:
+    """Filter auf Beweismittel, die can_view_evidence dem Nutzer freigibt."""
+    if not user.is_authenticated:
+        return Q(pk__in=[])
+    if user.has_perm('investigations.view_evidence'):
+        return Q()
+    return Q(case__created_by=user.pk) | Q(case__assigned_to=user.pk) | Q(collected_by=user.pk)
+
+
+def file_etag(evidence, stat) -> str:
+    """Inhaltsadressierte Dateien nutzen die Prüfsumme, sonst Größe und Änderungszeit."""
+    if evidence.sha256:
+        return quote_etag(evidence.sha256)
+    return quote_etag(f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    candidates = {value.strip().removeprefix('W/') for value in header.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def evidence_file_response(request, evidence, attachment: bool = False):
+    """
+    Antwort für die Datei eines Beweismittels (Rechte müssen vorher geprüft sein).
+    Beachtet If-None-Match, Range und If-Range.
+    """
+    path = evidence.file.path
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = file_etag(evidence, stat)
+    content_type = mimetypes.guess_type(evidence.file.name)[0] or 'application/octet-stream'
+    extension = os.path.splitext(evidence.file.name)[1].lower()
+    filename = re.sub(r'[^\w.\-]+', '_', f'{evidence.evidence_number}{extension}')
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, max-age=0, must-revalidate',
+        'Content-Disposition': f"{'attachment' if attachment else 'inline'}; filename*=UTF-8''{quote(filename)}",
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+        for name in ('ETag', 'Last-Modified', 'Cache-Control'):
+            response[name] = headers[name]
+        return response
+
+    backend = settings.EVIDENCE_SENDFILE
+    if backend in ('nginx', 'xsendfile'):
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if backend == 'nginx':
+            response['X-Accel-Redirect'] = quote(settings.EVIDENCE_SENDFILE_PREFIX + evidence.file.name)
+        else:
+            response['X-Sendfile'] = path
+        return response
+
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if_range = request.headers.get('If-Range')
+    if byte_range is not None and if_range and if_range.strip() != etag:
+        byte_range = None
+    if byte_range == 'invalid':
+        response = HttpResponse(status=416, headers=headers)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = max(end - start + 1, 0)
+    response = FileResponse(
+        RangeFile(open(path, 'rb'), start, length), content_type=content_type, headers=headers,
+        status=206 if byte_range else 200,
+    )
+    response['Content-Length'] = str(length)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def preview_response(request, path: str, digest: str, content_type: str):
+    """
+    Antwort für ein Vorschaubild. Vorschauen sind nach Inhalt benannt und
+    ändern sich nie - der Browser darf sie einen Tag ohne Nachfrage nutzen.
+    """
+    headers = {
+        'ETag': quote_etag(digest),
+        'Cache-Control': 'private, max-age=86400',
+    }
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and etag_matches(if_none_match, headers['ETag']):
+        return HttpResponseNotModified(headers=headers)
+    return FileResponse(open(path, 'rb'), content_type=content_type, headers=headers)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0001_initial'),
+        ('investigations', '0002_alter_case_priority_alter_case_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeline',
+            index=models.Index(fields=['case', 'datetime'], name='timeline_case_datetime_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0003_timeline_case_datetime_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineHeatmapCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case_type', models.CharField(choices=[('theft', 'Diebstahl'), ('fraud', 'Betrug'), ('assault', 'Körperverletzung'), ('drug', 'Drogen'), ('traffic', 'Verkehr'), ('domestic', 'Häusliche Gewalt'), ('other', 'Sonstiges')], max_length=20, verbose_name='Falltyp')),
+                ('month', models.DateField(verbose_name='Monat')),
+                ('weekday', models.PositiveSmallIntegerField(verbose_name='Wochentag')),
+                ('hour', models.PositiveSmallIntegerField(verbose_name='Stunde')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Anzahl')),
+            ],
+            options={
+                'verbose_name': 'Heatmap-Zelle',
+                'verbose_name_plural': 'Heatmap-Zellen',
+                'indexes': [models.Index(fields=['month', 'case_type'], name='heatmap_month_type_idx')],
+                'unique_together': {('case_type', 'month', 'weekday', 'hour')},
+            },
+        ),
+    ]
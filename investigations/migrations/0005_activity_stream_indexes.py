@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0001_initial'),
+        ('investigations', '0004_timelineheatmapcell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['case', 'collected_date'], name='evidence_case_collected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personinvolvement',
+            index=models.Index(fields=['person', 'created_at'], name='involvement_person_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeline',
+            index=models.Index(fields=['related_person', 'datetime'], name='timeline_person_datetime_idx'),
+        ),
+    ]
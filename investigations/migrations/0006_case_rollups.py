@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0001_initial'),
+        ('investigations', '0005_activity_stream_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuspectCaseCounter',
+            fields=[
+                ('person', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='suspect_counter', serialize=False, to='entities.person', verbose_name='Person')),
+                ('case_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Fälle als Verdächtiger')),
+            ],
+            options={
+                'verbose_name': 'Verdächtigen-Zähler',
+                'verbose_name_plural': 'Verdächtigen-Zähler',
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True, verbose_name='Tag')),
+                ('case_type', models.CharField(choices=[('theft', 'Diebstahl'), ('fraud', 'Betrug'), ('assault', 'Körperverletzung'), ('drug', 'Drogen'), ('traffic', 'Verkehr'), ('domestic', 'Häusliche Gewalt'), ('other', 'Sonstiges')], max_length=20, verbose_name='Falltyp')),
+                ('status', models.CharField(choices=[('open', 'Offen'), ('in_progress', 'In Bearbeitung'), ('closed', 'Abgeschlossen'), ('suspended', 'Ausgesetzt')], max_length=20, verbose_name='Status')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Anzahl')),
+            ],
+            options={
+                'verbose_name': 'Tagesstatistik',
+                'verbose_name_plural': 'Tagesstatistiken',
+                'unique_together': {('day', 'case_type', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseMonthlyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(blank=True, null=True, verbose_name='Monat')),
+                ('case_type', models.CharField(choices=[('theft', 'Diebstahl'), ('fraud', 'Betrug'), ('assault', 'Körperverletzung'), ('drug', 'Drogen'), ('traffic', 'Verkehr'), ('domestic', 'Häusliche Gewalt'), ('other', 'Sonstiges')], max_length=20, verbose_name='Falltyp')),
+                ('status', models.CharField(choices=[('open', 'Offen'), ('in_progress', 'In Bearbeitung'), ('closed', 'Abgeschlossen'), ('suspended', 'Ausgesetzt')], max_length=20, verbose_name='Status')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Anzahl')),
+            ],
+            options={
+                'verbose_name': 'Monatsstatistik',
+                'verbose_name_plural': 'Monatsstatistiken',
+                'unique_together': {('month', 'case_type', 'status')},
+            },
+        ),
+    ]
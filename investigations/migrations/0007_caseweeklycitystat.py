@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0006_case_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseWeeklyCityStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(verbose_name='Woche')),
+                ('city', models.CharField(max_length=100, verbose_name='Stadt')),
+                ('case_type', models.CharField(choices=[('theft', 'Diebstahl'), ('fraud', 'Betrug'), ('assault', 'Körperverletzung'), ('drug', 'Drogen'), ('traffic', 'Verkehr'), ('domestic', 'Häusliche Gewalt'), ('other', 'Sonstiges')], max_length=20, verbose_name='Falltyp')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Anzahl')),
+            ],
+            options={
+                'verbose_name': 'Wochenstatistik (Stadt)',
+                'verbose_name_plural': 'Wochenstatistiken (Stadt)',
+                'unique_together': {('week', 'city', 'case_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FTS_TABLE = 'investigations_evidencetext_fts'
+
+SQLITE_FTS_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"content, content='investigations_evidencetext', content_rowid='evidence_id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON investigations_evidencetext BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.evidence_id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON investigations_evidencetext BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.evidence_id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF content ON investigations_evidencetext BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.evidence_id, old.content); "
+    f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.evidence_id, new.content); END",
+]
+
+SQLITE_FTS_DROP_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+PG_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS evidencetext_content_fts_idx ON investigations_evidencetext "
+    "USING gin (to_tsvector('german'::regconfig, COALESCE(content, '')))"
+)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(PG_INDEX_SQL)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS evidencetext_content_fts_idx')
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS_DROP_SQL:
+            schema_editor.execute(sql)
+
+
+def enqueue_existing_files(apps, schema_editor):
+    Evidence = apps.get_model('investigations', 'Evidence')
+    EvidenceText = apps.get_model('investigations', 'EvidenceText')
+    rows = [
+        EvidenceText(evidence_id=pk, case_id=case_id, file_name=file_name)
+        for pk, case_id, file_name in Evidence.objects.exclude(file='').exclude(file__isnull=True)
+        .values_list('pk', 'case_id', 'file').iterator()
+    ]
+    EvidenceText.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0007_caseweeklycitystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceText',
+            fields=[
+                ('evidence', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='extracted_text', serialize=False, to='investigations.evidence', verbose_name='Beweismittel')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Dateiname')),
+                ('checksum', models.CharField(blank=True, max_length=64, verbose_name='SHA-256')),
+                ('status', models.CharField(choices=[('pending', 'Ausstehend'), ('processing', 'In Bearbeitung'), ('done', 'Extrahiert'), ('unsupported', 'Nicht unterstützt'), ('failed', 'Fehlgeschlagen')], default='pending', max_length=20, verbose_name='Status')),
+                ('content', models.TextField(blank=True, verbose_name='Inhalt')),
+                ('error', models.TextField(blank=True, verbose_name='Fehler')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Versuche')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Übernommen am')),
+                ('extracted_at', models.DateTimeField(blank=True, null=True, verbose_name='Extrahiert am')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence_texts', to='investigations.case', verbose_name='Fall')),
+            ],
+            options={
+                'verbose_name': 'Beweismittel-Volltext',
+                'verbose_name_plural': 'Beweismittel-Volltexte',
+                'indexes': [models.Index(fields=['status', 'claimed_at'], name='evidencetext_status_idx')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(enqueue_existing_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from investigations import minhash
+
+
+def backfill_signatures(apps, schema_editor):
+    Case = apps.get_model('investigations', 'Case')
+    Evidence = apps.get_model('investigations', 'Evidence')
+    MinHashSignature = apps.get_model('investigations', 'MinHashSignature')
+    MinHashBucket = apps.get_model('investigations', 'MinHashBucket')
+    
+    sources = [
+        ('case', ((pk, pk, f'{title or ""}\n{description or ""}')
+                  for pk, title, description in Case.objects.values_list('pk', 'title', 'description').iterator())),
+        ('evidence', Evidence.objects.values_list('pk', 'case_id', 'description').iterator()),
+    ]
+    for source, rows in sources:
+        for object_id, case_id, text in rows:
+            sig = minhash.signature(text)
+            if sig is None:
+                continue
+            row = MinHashSignature.objects.create(
+                source=source, object_id=object_id, case_id=case_id, signature=minhash.to_bytes(sig)
+            )
+            MinHashBucket.objects.bulk_create(
+                MinHashBucket(signature=row, source=source, bucket=key) for key in minhash.band_keys(sig)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0008_evidencetext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MinHashSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('case', 'Fall'), ('evidence', 'Beweismittel')], max_length=10, verbose_name='Quelle')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Objekt-ID')),
+                ('signature', models.BinaryField(verbose_name='Signatur')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Aktualisiert am')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_signatures', to='investigations.case', verbose_name='Fall')),
+            ],
+            options={
+                'verbose_name': 'MinHash-Signatur',
+                'verbose_name_plural': 'MinHash-Signaturen',
+                'unique_together': {('source', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MinHashBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=10, verbose_name='Quelle')),
+                ('bucket', models.BigIntegerField(verbose_name='Bucket')),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='investigations.minhashsignature', verbose_name='Signatur')),
+            ],
+            options={
+                'verbose_name': 'LSH-Bucket',
+                'verbose_name_plural': 'LSH-Buckets',
+                'indexes': [models.Index(fields=['source', 'bucket'], name='minhashbucket_lookup_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_signatures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0009_minhash_signatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseTermStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True, verbose_name='Term')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Anzahl Fälle')),
+            ],
+            options={
+                'verbose_name': 'Term-Statistik',
+                'verbose_name_plural': 'Term-Statistiken',
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseTextIndex',
+            fields=[
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text_index', serialize=False, to='investigations.case', verbose_name='Fall')),
+                ('checksum', models.CharField(max_length=64, verbose_name='Text-Prüfsumme')),
+                ('terms', models.JSONField(default=dict, verbose_name='Termhäufigkeiten')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='Indiziert am')),
+            ],
+            options={
+                'verbose_name': 'Fall-Textindex',
+                'verbose_name_plural': 'Fall-Textindizes',
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Ähnlichkeit')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_cases', to='investigations.case', verbose_name='Fall')),
+                ('similar_case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='investigations.case', verbose_name='Ähnlicher Fall')),
+            ],
+            options={
+                'verbose_name': 'Fall-Ähnlichkeit',
+                'verbose_name_plural': 'Fall-Ähnlichkeiten',
+                'indexes': [models.Index(fields=['case', '-score'], name='casesimilarity_rank_idx')],
+                'unique_together': {('case', 'similar_case')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseTermWeight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Term')),
+                ('weight', models.FloatField(verbose_name='Gewicht')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_weights', to='investigations.case', verbose_name='Fall')),
+            ],
+            options={
+                'verbose_name': 'Term-Gewicht',
+                'verbose_name_plural': 'Term-Gewichte',
+                'unique_together': {('term', 'case')},
+            },
+        ),
+    ]
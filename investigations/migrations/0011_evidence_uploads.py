@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-19 07:34
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0010_case_text_similarity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evidence',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Dateigröße (Bytes)'),
+        ),
+        migrations.AddField(
+            model_name='evidence',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='SHA-256'),
+        ),
+        migrations.CreateModel(
+            name='EvidenceUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255, verbose_name='Dateiname')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Größe (Bytes)')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Empfangen (Bytes)')),
+                ('expected_sha256', models.CharField(blank=True, max_length=64, verbose_name='Erwartete SHA-256')),
+                ('metadata', models.JSONField(default=dict, verbose_name='Beweismittel-Daten')),
+                ('status', models.CharField(choices=[('open', 'Offen'), ('complete', 'Abgeschlossen'), ('aborted', 'Abgebrochen')], default='open', max_length=20, verbose_name='Status')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Erstellt am')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Aktualisiert am')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence_uploads', to='investigations.case', verbose_name='Fall')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Erstellt von')),
+                ('evidence', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='investigations.evidence', verbose_name='Beweismittel')),
+            ],
+            options={
+                'verbose_name': 'Beweismittel-Upload',
+                'verbose_name_plural': 'Beweismittel-Uploads',
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='evidenceupload_status_idx')],
+            },
+        ),
+    ]
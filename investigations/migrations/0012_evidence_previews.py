@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 07:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0011_evidence_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidencePreview',
+            fields=[
+                ('evidence', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='preview', serialize=False, to='investigations.evidence', verbose_name='Beweismittel')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Dateiname')),
+                ('sha256', models.CharField(blank=True, max_length=64, verbose_name='SHA-256')),
+                ('thumbnail', models.CharField(blank=True, max_length=255, verbose_name='Miniatur')),
+                ('page', models.CharField(blank=True, max_length=255, verbose_name='Seitenvorschau')),
+                ('status', models.CharField(choices=[('pending', 'Ausstehend'), ('processing', 'In Bearbeitung'), ('done', 'Erzeugt'), ('unsupported', 'Nicht unterstützt'), ('failed', 'Fehlgeschlagen')], default='pending', max_length=20, verbose_name='Status')),
+                ('error', models.TextField(blank=True, verbose_name='Fehler')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Versuche')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Übernommen am')),
+                ('generated_at', models.DateTimeField(blank=True, null=True, verbose_name='Erzeugt am')),
+            ],
+            options={
+                'verbose_name': 'Beweismittel-Vorschau',
+                'verbose_name_plural': 'Beweismittel-Vorschauen',
+                'indexes': [models.Index(fields=['status', 'claimed_at'], name='evidencepreview_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 08:41
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def merge_undated_duplicates(apps, schema_editor):
+    """Fasst parallel angelegte Zeilen ohne Tatzeitpunkt zusammen, bevor der Constraint greift."""
+    for model_name, field in (('CaseDailyStat', 'day'), ('CaseMonthlyStat', 'month')):
+        model = apps.get_model('investigations', model_name)
+        undated = model.objects.filter(**{f'{field}__isnull': True})
+        totals = undated.values('case_type', 'status').annotate(total=Sum('count'))
+        for row in totals:
+            rows = undated.filter(case_type=row['case_type'], status=row['status']).order_by('id')
+            keep = rows.first()
+            rows.exclude(id=keep.id).delete()
+            rows.filter(id=keep.id).update(count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0012_evidence_previews'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_undated_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='casedailystat',
+            constraint=models.UniqueConstraint(condition=models.Q(('day__isnull', True)), fields=('case_type', 'status'), name='casedailystat_undated_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='casemonthlystat',
+            constraint=models.UniqueConstraint(condition=models.Q(('month__isnull', True)), fields=('case_type', 'status'), name='casemonthlystat_undated_uniq'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# investigations/minhash.py
+"""
+MinHash-Signaturen und LSH-Buckets zur Erkennung von Beinahe-Duplikaten.
+Reine Funktionen ohne Datenbankzugriff; die Pflege übernimmt DuplicateDetectionService.
+
+Zwei Texte landen mit Wahrscheinlichkeit 1 - (1 - J^ROWS)^BANDS in mindestens
+einem gemeinsamen Bucket (J = Jaccard-Ähnlichkeit der Shingle-Mengen).
+Mit 32 Bändern à 4 Zeilen liegt die Schwelle bei J ≈ 0,42.
+"""
+import hashlib
+import zlib
+
+import numpy as np
+
+from entities.utils import normalize_text
+
+
+SHINGLE_SIZE = 5  # Zeichen
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_PRIME = np.uint64(4294967291)  # größte Primzahl < 2^32
+
+# Feste Koeffizienten der Hashfunktionen h(x) = (a*x + b) mod p.
+# Sie dürfen sich nie ändern, sonst passen gespeicherte Signaturen nicht mehr.
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+del _rng
+
+
+def shingles(text: str) -> set:
+    """
+    Zeichen-Shingles des normalisierten Textes. Kurze Texte ergeben ein Shingle.
+    """
+    text = normalize_text(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str):
+    """
+    MinHash-Signatur (uint32-Array der Länge NUM_PERM) oder None für leeren Text.
+    """
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+    values = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def to_bytes(sig) -> bytes:
+    return sig.astype('<u4').tobytes()
+
+
+def from_bytes(data: bytes):
+    return np.frombuffer(bytes(data), dtype='<u4')
+
+
+def band_keys(sig) -> list:
+    """
+    Ein Bucket-Schlüssel je Band (vorzeichenbehaftet 63 Bit, passt in BigIntegerField).
+    Die Bandnummer fließt in den Schlüssel ein, gleiche Werte in verschiedenen
+    Bändern kollidieren also nicht.
+    """
+    data = sig.astype('<u4').reshape(BANDS, ROWS)
+    keys = []
+    for band, row in enumerate(data):
+        digest = hashlib.blake2b(band.to_bytes(2, 'little') + row.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little') >> 1)
+    return keys
+
+
+def estimate_similarity(left, right) -> float:
+    """Geschätzte Jaccard-Ähnlichkeit: Anteil übereinstimmender Signaturwerte."""
+    return float(np.count_nonzero(left == right)) / NUM_PERM
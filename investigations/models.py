@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 from entities.models import Person, Address, Vehicle
@@ -94,6 +96,9 @@ class PersonInvolvement(models.Model):
         verbose_name = "Person-Fall-Beteiligung"
         verbose_name_plural = "Person-Fall-Beteiligungen"
         unique_together = ['person', 'case', 'involvement_type']
+        indexes = [
+            models.Index(fields=['person', 'created_at'], name='involvement_person_created_idx'),
+        ]
 
 
 class Evidence(models.Model):
@@ -120,6 +125,9 @@ class Evidence(models.Model):
     
     # Datei-Upload (optional)
     file = models.FileField(upload_to='evidence/', null=True, blank=True, verbose_name="Datei")
+    # Inhaltsadresse der Datei (gleiche Prüfsumme = gleiche Datei, auch fallübergreifend)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="SHA-256")
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, verbose_name="Dateigröße (Bytes)")
     
     # Kette der Verwahrung
     chain_of_custody = models.TextField(blank=True, verbose_name="Verwahrungskette")
@@ -136,8 +144,48 @@ class Evidence(models.Model):
         verbose_name = "Beweismittel"
         verbose_name_plural = "Beweismittel"
         ordering = ['-collected_date']
+        indexes = [
+            models.Index(fields=['case', 'collected_date'], name='evidence_case_collected_idx'),
+        ]
+
 
 
+class EvidenceUpload(models.Model):
+    """
+    Laufender, wiederaufnehmbarer Upload einer Beweismittel-Datei in Blöcken.
+    Nach dem letzten Block wird die Datei inhaltsadressiert abgelegt und
+    das Beweismittel angelegt.
+    """
+    STATUS_CHOICES = [
+        ('open', 'Offen'),
+        ('complete', 'Abgeschlossen'),
+        ('aborted', 'Abgebrochen'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='evidence_uploads', verbose_name="Fall")
+    file_name = models.CharField(max_length=255, verbose_name="Dateiname")
+    size = models.PositiveBigIntegerField(verbose_name="Größe (Bytes)")
+    offset = models.PositiveBigIntegerField(default=0, verbose_name="Empfangen (Bytes)")
+    expected_sha256 = models.CharField(max_length=64, blank=True, verbose_name="Erwartete SHA-256")
+    metadata = models.JSONField(default=dict, verbose_name="Beweismittel-Daten")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open', verbose_name="Status")
+    evidence = models.ForeignKey(Evidence, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='+', verbose_name="Beweismittel")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Erstellt von")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Erstellt am")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Aktualisiert am")
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.offset}/{self.size})"
+    
+    class Meta:
+        verbose_name = "Beweismittel-Upload"
+        verbose_name_plural = "Beweismittel-Uploads"
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='evidenceupload_status_idx'),
+        ]
+
 class Investigation(models.Model):
     """
     Ermittlungsmaßnahme
@@ -207,3 +255,285 @@ class Timeline(models.Model):
         verbose_name = "Zeitachsen-Eintrag"
         verbose_name_plural = "Zeitachsen-Einträge"
         ordering = ['datetime']
+        indexes = [
+            models.Index(fields=['case', 'datetime'], name='timeline_case_datetime_idx'),
+            models.Index(fields=['related_person', 'datetime'], name='timeline_person_datetime_idx'),
+        ]
+
+
+class TimelineHeatmapCell(models.Model):
+    """
+    Vorberechnete Zelle des Zeit-Heatmap-Würfels (Falltyp × Monat × Wochentag × Stunde).
+    Wird bei Timeline-Änderungen inkrementell fortgeschrieben.
+    """
+    case_type = models.CharField(max_length=20, choices=Case.CASE_TYPE_CHOICES, verbose_name="Falltyp")
+    month = models.DateField(verbose_name="Monat")  # Erster Tag des Monats
+    weekday = models.PositiveSmallIntegerField(verbose_name="Wochentag")  # 1 = Sonntag ... 7 = Samstag
+    hour = models.PositiveSmallIntegerField(verbose_name="Stunde")
+    count = models.PositiveIntegerField(default=0, verbose_name="Anzahl")
+    
+    def __str__(self):
+        return f"{self.case_type} {self.month:%m.%Y} WT{self.weekday} {self.hour:02d}h: {self.count}"
+    
+    class Meta:
+        verbose_name = "Heatmap-Zelle"
+        verbose_name_plural = "Heatmap-Zellen"
+        unique_together = ['case_type', 'month', 'weekday', 'hour']
+        indexes = [
+            models.Index(fields=['month', 'case_type'], name='heatmap_month_type_idx'),
+        ]
+
+
+class CaseDailyStat(models.Model):
+    """
+    Vorberechnete Fallzahlen pro Tattag, Falltyp und Status.
+    """
+    day = models.DateField(null=True, blank=True, verbose_name="Tag")  # None = ohne Tatzeitpunkt
+    case_type = models.CharField(max_length=20, choices=Case.CASE_TYPE_CHOICES, verbose_name="Falltyp")
+    status = models.CharField(max_length=20, choices=Case.CASE_STATUS_CHOICES, verbose_name="Status")
+    count = models.PositiveIntegerField(default=0, verbose_name="Anzahl")
+    
+    def __str__(self):
+        return f"{self.day} {self.case_type}/{self.status}: {self.count}"
+    
+    class Meta:
+        verbose_name = "Tagesstatistik"
+        verbose_name_plural = "Tagesstatistiken"
+        unique_together = ['day', 'case_type', 'status']
+        constraints = [
+            # NULL ist in unique_together nie gleich NULL - eigener Schlüssel für Fälle ohne Tatzeitpunkt
+            models.UniqueConstraint(fields=['case_type', 'status'], condition=models.Q(day__isnull=True),
+                                    name='casedailystat_undated_uniq'),
+        ]
+
+
+class CaseMonthlyStat(models.Model):
+    """
+    Vorberechnete Fallzahlen pro Tatmonat, Falltyp und Status.
+    """
+    month = models.DateField(null=True, blank=True, verbose_name="Monat")  # Erster Tag des Monats
+    case_type = models.CharField(max_length=20, choices=Case.CASE_TYPE_CHOICES, verbose_name="Falltyp")
+    status = models.CharField(max_length=20, choices=Case.CASE_STATUS_CHOICES, verbose_name="Status")
+    count = models.PositiveIntegerField(default=0, verbose_name="Anzahl")
+    
+    def __str__(self):
+        return f"{self.month} {self.case_type}/{self.status}: {self.count}"
+    
+    class Meta:
+        verbose_name = "Monatsstatistik"
+        verbose_name_plural = "Monatsstatistiken"
+        unique_together = ['month', 'case_type', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['case_type', 'status'], condition=models.Q(month__isnull=True),
+                                    name='casemonthlystat_undated_uniq'),
+        ]
+
+
+class CaseWeeklyCityStat(models.Model):
+    """
+    Vorberechnete Fallzahlen pro Kalenderwoche, Tatort-Stadt und Falltyp.
+    """
+    week = models.DateField(verbose_name="Woche")  # Montag der Kalenderwoche
+    city = models.CharField(max_length=100, verbose_name="Stadt")
+    case_type = models.CharField(max_length=20, choices=Case.CASE_TYPE_CHOICES, verbose_name="Falltyp")
+    count = models.PositiveIntegerField(default=0, verbose_name="Anzahl")
+    
+    def __str__(self):
+        return f"{self.week} {self.city}/{self.case_type}: {self.count}"
+    
+    class Meta:
+        verbose_name = "Wochenstatistik (Stadt)"
+        verbose_name_plural = "Wochenstatistiken (Stadt)"
+        unique_together = ['week', 'city', 'case_type']
+
+
+class SuspectCaseCounter(models.Model):
+    """
+    Anzahl der Fälle, in denen eine Person als Verdächtiger geführt wird.
+    """
+    person = models.OneToOneField(Person, on_delete=models.CASCADE, primary_key=True,
+                                  related_name='suspect_counter', verbose_name="Person")
+    case_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name="Fälle als Verdächtiger")
+    
+    def __str__(self):
+        return f"{self.person_id}: {self.case_count}"
+    
+    class Meta:
+        verbose_name = "Verdächtigen-Zähler"
+        verbose_name_plural = "Verdächtigen-Zähler"
+
+
+class EvidenceText(models.Model):
+    """
+    Aus der Beweismittel-Datei extrahierter Volltext.
+    Wird außerhalb des Requests vom Extraktions-Worker befüllt.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Ausstehend'),
+        ('processing', 'In Bearbeitung'),
+        ('done', 'Extrahiert'),
+        ('unsupported', 'Nicht unterstützt'),
+        ('failed', 'Fehlgeschlagen'),
+    ]
+    
+    evidence = models.OneToOneField(Evidence, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='extracted_text', verbose_name="Beweismittel")
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='evidence_texts', verbose_name="Fall")
+    file_name = models.CharField(max_length=255, verbose_name="Dateiname")
+    checksum = models.CharField(max_length=64, blank=True, verbose_name="SHA-256")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Status")
+    content = models.TextField(blank=True, verbose_name="Inhalt")
+    error = models.TextField(blank=True, verbose_name="Fehler")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Versuche")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Übernommen am")
+    extracted_at = models.DateTimeField(null=True, blank=True, verbose_name="Extrahiert am")
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = "Beweismittel-Volltext"
+        verbose_name_plural = "Beweismittel-Volltexte"
+        indexes = [
+            models.Index(fields=['status', 'claimed_at'], name='evidencetext_status_idx'),
+        ]
+
+
+
+class EvidencePreview(models.Model):
+    """
+    Vorschaubilder eines Beweismittels (Miniatur und erste Seite).
+    Wird außerhalb des Requests vom Vorschau-Worker erzeugt; die Bilder liegen
+    nach Inhalts-Prüfsumme unter MEDIA_ROOT/previews und werden geteilt.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Ausstehend'),
+        ('processing', 'In Bearbeitung'),
+        ('done', 'Erzeugt'),
+        ('unsupported', 'Nicht unterstützt'),
+        ('failed', 'Fehlgeschlagen'),
+    ]
+    
+    evidence = models.OneToOneField(Evidence, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='preview', verbose_name="Beweismittel")
+    file_name = models.CharField(max_length=255, verbose_name="Dateiname")
+    sha256 = models.CharField(max_length=64, blank=True, verbose_name="SHA-256")
+    thumbnail = models.CharField(max_length=255, blank=True, verbose_name="Miniatur")
+    page = models.CharField(max_length=255, blank=True, verbose_name="Seitenvorschau")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Status")
+    error = models.TextField(blank=True, verbose_name="Fehler")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Versuche")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Übernommen am")
+    generated_at = models.DateTimeField(null=True, blank=True, verbose_name="Erzeugt am")
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = "Beweismittel-Vorschau"
+        verbose_name_plural = "Beweismittel-Vorschauen"
+        indexes = [
+            models.Index(fields=['status', 'claimed_at'], name='evidencepreview_status_idx'),
+        ]
+
+
+class MinHashSignature(models.Model):
+    """
+    Gespeicherte MinHash-Signatur eines Fall- oder Beweismittel-Textes
+    für die Erkennung von Beinahe-Duplikaten.
+    """
+    SOURCE_CHOICES = [
+        ('case', 'Fall'),
+        ('evidence', 'Beweismittel'),
+    ]
+    
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, verbose_name="Quelle")
+    object_id = models.PositiveBigIntegerField(verbose_name="Objekt-ID")
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='minhash_signatures', verbose_name="Fall")
+    signature = models.BinaryField(verbose_name="Signatur")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Aktualisiert am")
+    
+    def __str__(self):
+        return f"{self.get_source_display()} {self.object_id}"
+    
+    class Meta:
+        verbose_name = "MinHash-Signatur"
+        verbose_name_plural = "MinHash-Signaturen"
+        unique_together = ['source', 'object_id']
+
+
+class MinHashBucket(models.Model):
+    """
+    LSH-Bucket (ein Eintrag je Band und Signatur).
+    Kandidaten für Duplikate sind alle Signaturen mit mindestens einem gemeinsamen Bucket.
+    """
+    signature = models.ForeignKey(MinHashSignature, on_delete=models.CASCADE, related_name='buckets',
+                                  verbose_name="Signatur")
+    source = models.CharField(max_length=10, verbose_name="Quelle")
+    bucket = models.BigIntegerField(verbose_name="Bucket")
+    
+    class Meta:
+        verbose_name = "LSH-Bucket"
+        verbose_name_plural = "LSH-Buckets"
+        indexes = [
+            models.Index(fields=['source', 'bucket'], name='minhashbucket_lookup_idx'),
+        ]
+
+
+class CaseTextIndex(models.Model):
+    """
+    Indexstand eines Falls in der TF-IDF-Ähnlichkeitssuche
+    (Text aus Titel, Beschreibung und Zeitachse).
+    """
+    case = models.OneToOneField(Case, on_delete=models.CASCADE, primary_key=True,
+                                related_name='text_index', verbose_name="Fall")
+    checksum = models.CharField(max_length=64, verbose_name="Text-Prüfsumme")
+    terms = models.JSONField(default=dict, verbose_name="Termhäufigkeiten")
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name="Indiziert am")
+    
+    class Meta:
+        verbose_name = "Fall-Textindex"
+        verbose_name_plural = "Fall-Textindizes"
+
+
+class CaseTermStat(models.Model):
+    """
+    Dokumentfrequenz eines Terms (Anzahl indizierter Fälle, die ihn enthalten).
+    """
+    term = models.CharField(max_length=64, unique=True, verbose_name="Term")
+    count = models.PositiveIntegerField(default=0, verbose_name="Anzahl Fälle")
+    
+    class Meta:
+        verbose_name = "Term-Statistik"
+        verbose_name_plural = "Term-Statistiken"
+
+
+class CaseTermWeight(models.Model):
+    """
+    TF-IDF-Gewicht eines Terms in einem Fall (Posting-Liste der dünn besetzten Matrix).
+    """
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='term_weights', verbose_name="Fall")
+    term = models.CharField(max_length=64, verbose_name="Term")
+    weight = models.FloatField(verbose_name="Gewicht")
+    
+    class Meta:
+        verbose_name = "Term-Gewicht"
+        verbose_name_plural = "Term-Gewichte"
+        unique_together = ['term', 'case']
+
+
+class CaseSimilarity(models.Model):
+    """
+    Vorberechneter Top-k-Nachbar eines Falls nach Kosinus-Ähnlichkeit der TF-IDF-Vektoren.
+    """
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='similar_cases', verbose_name="Fall")
+    similar_case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='+', verbose_name="Ähnlicher Fall")
+    score = models.FloatField(verbose_name="Ähnlichkeit")
+    
+    class Meta:
+        verbose_name = "Fall-Ähnlichkeit"
+        verbose_name_plural = "Fall-Ähnlichkeiten"
+        unique_together = ['case', 'similar_case']
+        indexes = [
+            models.Index(fields=['case', '-score'], name='casesimilarity_rank_idx'),
+        ]
@@ -0,0 +1,130 @@
+# investigations/previews.py
+"""
+Vorschaubilder für Beweismittel: Miniaturen von Fotos und eine Darstellung
+der ersten Seite von Dokumenten. Reine Funktionen ohne Datenbankzugriff;
+Einplanung und Ablage übernimmt EvidencePreviewService.
+
+Fotos werden mit Pillow verkleinert, PDFs mit pdftoppm (poppler) gerendert.
+Fehlen diese, wird für PDFs und alle Textformate der Anfang des Textes als
+SVG-Seite gesetzt.
+"""
+import io
+import shutil
+import subprocess
+import textwrap
+from xml.sax.saxutils import escape
+
+from . import extraction
+
+
+SIZES = {
+    'thumb': 256,
+    'page': 1024,
+}
+MAX_FILE_SIZE = 50 * 1024 * 1024  # Bytes (Datei wird für das Rendern ganz gelesen)
+RENDER_TIMEOUT = 30  # Sekunden pro pdftoppm-Aufruf
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tif', 'tiff'}
+
+# Textseite: A4-Verhältnis, Zeilen und Zeichen je Zeile
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+PAGE_LINES = 46
+LINE_CHARS = 84
+
+CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'svg': 'image/svg+xml',
+}
+
+
+def is_supported(name: str) -> bool:
+    extension = extraction.file_extension(name)
+    return extension in IMAGE_EXTENSIONS or extraction.is_supported(name)
+
+
+def render_image(data: bytes, size: int) -> bytes:
+    """JPEG-Miniatur mit korrigierter EXIF-Ausrichtung."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as exc:
+        raise extraction.UnsupportedFormat('Pillow ist nicht installiert') from exc
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('RGB', (size, size))  # JPEG: verkleinert schon beim Dekodieren
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        image.thumbnail((size, size))
+        output = io.BytesIO()
+        image.save(output, 'JPEG', quality=80, optimize=True)
+        return output.getvalue()
+
+
+def render_pdf_page(data: bytes, size: int):
+    """Erste PDF-Seite als JPEG über pdftoppm (stdin -> stdout) oder None, wenn pdftoppm fehlt."""
+    binary = shutil.which('pdftoppm')
+    if binary is None:
+        return None
+    result = subprocess.run(
+        [binary, '-f', '1', '-l', '1', '-singlefile', '-jpeg', '-scale-to', str(size), '-'],
+        input=data, capture_output=True, timeout=RENDER_TIMEOUT, check=False,
+    )
+    if result.returncode != 0 or not result.stdout:
+        raise ValueError(f'pdftoppm fehlgeschlagen: {result.stderr.decode(errors="replace")[:200]}')
+    return result.stdout
+
+
+def render_text_page(text: str, size: int) -> bytes:
+    """Beginn des Textes als SVG-Seite (Höhe = size)."""
+    lines = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, LINE_CHARS) or [''])
+        if len(lines) >= PAGE_LINES:
+            break
+    rows = ''.join(
+        f'<text x="36" y="{48 + index * 17}">{escape(line)}</text>'
+        for index, line in enumerate(lines[:PAGE_LINES])
+    )
+    width = round(size * PAGE_WIDTH / PAGE_HEIGHT)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{size}" '
+        f'viewBox="0 0 {PAGE_WIDTH} {PAGE_HEIGHT}">'
+        f'<rect width="{PAGE_WIDTH}" height="{PAGE_HEIGHT}" fill="#fff" stroke="#ccc"/>'
+        f'<g font-family="Helvetica, Arial, sans-serif" font-size="12" fill="#222" xml:space="preserve">'
+        f'{rows}</g></svg>'
+    ).encode()
+
+
+def _first_page_text(name: str, data: bytes) -> str:
+    if extraction.file_extension(name) in extraction.PDF_EXTENSIONS:
+        try:
+            from pypdf import PdfReader
+        except ImportError as exc:
+            raise extraction.UnsupportedFormat('pypdf ist nicht installiert') from exc
+        reader = PdfReader(io.BytesIO(data))
+        return extraction.clean_text(reader.pages[0].extract_text() or '') if reader.pages else ''
+    return extraction.extract_text(name, data)
+
+
+def render(name: str, data: bytes, size: int) -> tuple:
+    """
+    Rendert die Vorschau einer Datei anhand der Dateiendung.
+
+    Returns:
+        (Bytes, Endung 'jpg' oder 'svg')
+
+    Raises:
+        UnsupportedFormat wenn das Format keine Vorschau hat
+        ValueError bei beschädigten oder zu großen Dateien
+    """
+    if len(data) > MAX_FILE_SIZE:
+        raise ValueError(f'Datei größer als {MAX_FILE_SIZE // (1024 * 1024)} MB')
+
+    extension = extraction.file_extension(name)
+    if extension in IMAGE_EXTENSIONS:
+        return render_image(data, size), 'jpg'
+    if not extraction.is_supported(name):
+        raise extraction.UnsupportedFormat(f'Keine Vorschau für .{extension}')
+    if extension in extraction.PDF_EXTENSIONS:
+        rendered = render_pdf_page(data, size)
+        if rendered is not None:
+            return rendered, 'jpg'
+    return render_text_page(_first_page_text(name, data), size), 'svg'
@@ -2,10 +2,58 @@
 """
 Service-Layer für Investigation-bezogene Business Logic.
 """
-from django.db.models import Count, Q, Prefetch
+import base64
+import binascii
+import hashlib
+import heapq
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Count, Q, Prefetch, F, Min, Sum, Window, ExpressionWrapper, DurationField
+from django.db.models.functions import Coalesce, Lag, ExtractHour, ExtractWeekDay, TruncDate, TruncMonth
 from django.utils import timezone
-from datetime import timedelta
-from .models import Case, PersonInvolvement, Evidence, Investigation, Timeline
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.dateparse import parse_datetime
+from datetime import date, timedelta
+from entities.models import Person, Address, Vehicle
+from entities.utils import normalize_text, normalize_plate, prefix_q
+from . import extraction, minhash, previews, tfidf
+from .media import viewable_evidence_q
+from .models import (
+    Case, PersonInvolvement, Evidence, EvidencePreview, EvidenceText, EvidenceUpload, Investigation, Timeline,
+    MinHashSignature, MinHashBucket, CaseTextIndex, CaseTermStat, CaseTermWeight, CaseSimilarity,
+    TimelineHeatmapCell, CaseDailyStat, CaseMonthlyStat, CaseWeeklyCityStat, SuspectCaseCounter,
+)
+
+
+def _apply_rollup_delta(model, key: dict, delta: int) -> None:
+    """
+    Schreibt einen Rollup-Zähler inkrementell fort (atomar per F-Expression).
+    Zähler werden nie negativ; Abweichungen korrigiert reconcile_rollups.
+    """
+    rows = model.objects.filter(**key)
+    if delta < 0:
+        rows.filter(count__gte=-delta).update(count=F('count') + delta)
+        return
+    
+    if rows.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # Parallel angelegt - dann eben fortschreiben
+        rows.update(count=F('count') + delta)
 
 
 class CaseAnalysisService:
@@ -95,6 +143,13 @@ class CaseAnalysisService:
         ).filter(shared_persons__gt=0).distinct().order_by('-shared_persons')[:5]
         
         return list(related)
+    
+    @staticmethod
+    def get_similar_cases(case: Case, limit: int = 5) -> list:
+        """
+        Findet Fälle mit ähnlichem Modus Operandi (TF-IDF-Textähnlichkeit).
+        """
+        return CaseSimilarityService.get_similar_cases(case, limit)
 
 
 class TimelineAnalysisService:
@@ -102,6 +157,13 @@ class TimelineAnalysisService:
     Service für Timeline-basierte Analysen.
     """
     
+    # Größere Schwellen liefern ohnehin keine Lücken; timedelta liefe sonst über
+    MAX_GAP_THRESHOLD_HOURS = 24 * 366 * 200
+    
+    @staticmethod
+    def _gap_threshold(threshold_hours: int) -> timedelta:
+        return timedelta(hours=min(threshold_hours, TimelineAnalysisService.MAX_GAP_THRESHOLD_HOURS))
+    
     @staticmethod
     def get_timeline_gaps(case: Case, threshold_hours: int = 24) -> list:
         """
@@ -109,13 +171,14 @@ class TimelineAnalysisService:
         Hilfreich für Ermittler.
         """
         entries = Timeline.objects.filter(case=case).order_by('datetime')
+        threshold = TimelineAnalysisService._gap_threshold(threshold_hours)
         gaps = []
         
         prev_entry = None
         for entry in entries:
             if prev_entry:
                 diff = entry.datetime - prev_entry.datetime
-                if diff > timedelta(hours=threshold_hours):
+                if diff > threshold:
                     gaps.append({
                         'start': prev_entry.datetime,
                         'end': entry.datetime,
@@ -126,7 +189,50 @@ class TimelineAnalysisService:
             prev_entry = entry
         
         return gaps
-    
+
+    @staticmethod
+    def get_timeline_gaps_bulk(threshold_hours: int = 24, case_ids: list = None):
+        """
+        Identifiziert Timeline-Lücken über alle Fälle in einer einzigen Query.
+
+        Der Vorgänger-Eintrag wird per LAG()-Window-Funktion (partitioniert
+        nach Fall) in der Datenbank bestimmt; es werden keine Timeline-Zeilen
+        nach Python geladen. Das Ergebnis ist ein lazy Queryset, absteigend
+        nach Lückendauer sortiert – direkt nutzbar mit Paginator, Slicing
+        oder .iterator().
+
+        Args:
+            threshold_hours: Mindestdauer einer Lücke in Stunden
+            case_ids: Optional - Einschränkung auf bestimmte Fälle
+
+        Returns:
+            Queryset von dicts mit case_id, case_number, case_title,
+            start, end, gap, before_event, after_event
+        """
+        entries = Timeline.objects.all()
+        if case_ids is not None:
+            entries = entries.filter(case_id__in=case_ids)
+
+        per_case = {
+            'partition_by': [F('case_id')],
+            'order_by': [F('datetime').asc(), F('id').asc()],
+        }
+
+        return entries.annotate(
+            start=Window(Lag('datetime'), **per_case),
+            before_event=Window(Lag('title'), **per_case),
+        ).annotate(
+            gap=ExpressionWrapper(F('datetime') - F('start'), output_field=DurationField()),
+        ).filter(
+            gap__gt=TimelineAnalysisService._gap_threshold(threshold_hours)
+        ).values(
+            'case_id', 'start', 'gap', 'before_event',
+            end=F('datetime'),
+            after_event=F('title'),
+            case_number=F('case__case_number'),
+            case_title=F('case__title'),
+        ).order_by('-gap', 'case_id')
+
     @staticmethod
     def get_person_timeline_across_cases(person_id: int) -> list:
         """
@@ -142,37 +248,599 @@ class TimelineAnalysisService:
     def detect_temporal_patterns(case_type: str = None) -> dict:
         """
         Erkennt zeitliche Muster (z.B. häufige Tageszeiten).
+        Liest aus dem vorberechneten Heatmap-Würfel statt die Timeline zu scannen.
+        """
+        heatmap = TemporalHeatmapService.get_heatmap(
+            case_types=[case_type] if case_type else None
+        )
+        
+        return {
+            'by_hour': heatmap['by_hour'],
+            'by_weekday': heatmap['by_weekday'],
+            'peak_hour': heatmap['peak_hour'],
+            'peak_weekday': heatmap['peak_weekday'],
+        }
+
+
+class TemporalHeatmapService:
+    """
+    Service für den vorberechneten Zeit-Heatmap-Würfel
+    (Falltyp × Monat × Wochentag × Stunde).
+    """
+    
+    @staticmethod
+    def cell_key(case_type: str, moment) -> dict:
+        """
+        Bestimmt die Würfel-Zelle für einen Zeitpunkt.
+        Rechnet in lokaler Zeit; Wochentage wie ExtractWeekDay (1 = Sonntag).
+        """
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        local = timezone.localtime(moment)
+        return {
+            'case_type': case_type,
+            'month': local.date().replace(day=1),
+            'weekday': local.isoweekday() % 7 + 1,
+            'hour': local.hour,
+        }
+    
+    @staticmethod
+    def apply_delta(key: dict, delta: int) -> None:
+        _apply_rollup_delta(TimelineHeatmapCell, key, delta)
+    
+    @staticmethod
+    def move_case(case_id: int, old_case_type: str, new_case_type: str) -> None:
+        """
+        Verschiebt die Timeline-Einträge eines Falls nach Änderung des Falltyps.
         """
-        from django.db.models.functions import ExtractHour, ExtractWeekDay
+        moments = Timeline.objects.filter(case_id=case_id).values_list('datetime', flat=True)
+        cells = Counter()
+        for moment in moments:
+            key = TemporalHeatmapService.cell_key(None, moment)
+            cells[(key['month'], key['weekday'], key['hour'])] += 1
         
-        base_query = Timeline.objects.all()
-        if case_type:
-            base_query = base_query.filter(case__case_type=case_type)
+        for (month, weekday, hour), count in cells.items():
+            key = {'month': month, 'weekday': weekday, 'hour': hour}
+            TemporalHeatmapService.apply_delta({**key, 'case_type': old_case_type}, -count)
+            TemporalHeatmapService.apply_delta({**key, 'case_type': new_case_type}, count)
+    
+    @staticmethod
+    @transaction.atomic
+    def rebuild() -> int:
+        """
+        Baut den Würfel vollständig aus der Timeline neu auf (eine GROUP-BY-Query).
         
-        by_hour = dict(
-            base_query.annotate(
-                hour=ExtractHour('datetime')
-            ).values('hour').annotate(
-                count=Count('id')
-            ).values_list('hour', 'count')
-        )
+        Returns:
+            Anzahl geschriebener Zellen
+        """
+        rows = Timeline.objects.annotate(
+            month=TruncMonth('datetime'),
+            weekday=ExtractWeekDay('datetime'),
+            hour=ExtractHour('datetime'),
+        ).values('case__case_type', 'month', 'weekday', 'hour').annotate(
+            count=Count('id')
+        ).order_by()
         
-        by_weekday = dict(
-            base_query.annotate(
-                weekday=ExtractWeekDay('datetime')
-            ).values('weekday').annotate(
-                count=Count('id')
-            ).values_list('weekday', 'count')
-        )
+        cells = [
+            TimelineHeatmapCell(
+                case_type=row['case__case_type'],
+                month=timezone.localtime(row['month']).date(),
+                weekday=row['weekday'],
+                hour=row['hour'],
+                count=row['count'],
+            )
+            for row in rows
+        ]
+        
+        TimelineHeatmapCell.objects.all().delete()
+        TimelineHeatmapCell.objects.bulk_create(cells, batch_size=1000)
+        return len(cells)
+    
+    @staticmethod
+    def get_heatmap(case_types: list = None, start_month=None, end_month=None) -> dict:
+        """
+        Beantwortet beliebige Slices durch Summieren vorberechneter Zellen.
+        
+        Args:
+            case_types: Optional - Liste von Falltypen
+            start_month: Optional - date, erster einbezogener Monat
+            end_month: Optional - date, letzter einbezogener Monat
+            
+        Returns:
+            dict mit 'matrix' (7 Wochentage × 24 Stunden, Index 0 = Sonntag),
+            'by_hour', 'by_weekday', 'total', 'peak_hour', 'peak_weekday'
+        """
+        cells = TimelineHeatmapCell.objects.filter(count__gt=0)
+        if case_types:
+            cells = cells.filter(case_type__in=case_types)
+        if start_month:
+            cells = cells.filter(month__gte=start_month.replace(day=1))
+        if end_month:
+            cells = cells.filter(month__lte=end_month.replace(day=1))
+        
+        matrix = [[0] * 24 for _ in range(7)]
+        for row in cells.values('weekday', 'hour').annotate(total=Sum('count')).order_by():
+            matrix[row['weekday'] - 1][row['hour']] = row['total']
+        
+        by_hour = {
+            hour: total
+            for hour, total in enumerate(map(sum, zip(*matrix)))
+            if total
+        }
+        by_weekday = {
+            weekday: sum(hours)
+            for weekday, hours in enumerate(matrix, start=1)
+            if sum(hours)
+        }
         
         return {
+            'matrix': matrix,
             'by_hour': by_hour,
             'by_weekday': by_weekday,
+            'total': sum(by_weekday.values()),
             'peak_hour': max(by_hour, key=by_hour.get) if by_hour else None,
             'peak_weekday': max(by_weekday, key=by_weekday.get) if by_weekday else None,
         }
 
 
+class CaseRollupService:
+    """
+    Service für die vorberechneten Fall-Trends (Tag/Monat × Falltyp × Status)
+    und die Verdächtigen-Zähler.
+    """
+    
+    @staticmethod
+    def case_state(incident_date, case_type: str, status: str, city: str = None) -> tuple:
+        """
+        Rollup-Schlüssel eines Falls: (lokaler Tattag, Falltyp, Status, Tatort-Stadt).
+        """
+        day = None
+        if incident_date is not None:
+            if timezone.is_naive(incident_date):
+                incident_date = timezone.make_aware(incident_date)
+            day = timezone.localtime(incident_date).date()
+        return day, case_type, status, city
+    
+    @staticmethod
+    def apply_case_delta(state: tuple, delta: int) -> None:
+        """
+        Schreibt Tages-, Monats- und Stadt-Wochenrollup für einen Fall-Zustand fort.
+        """
+        day, case_type, status, city = state
+        month = day.replace(day=1) if day else None
+        _apply_rollup_delta(CaseDailyStat, {'day': day, 'case_type': case_type, 'status': status}, delta)
+        _apply_rollup_delta(CaseMonthlyStat, {'month': month, 'case_type': case_type, 'status': status}, delta)
+        
+        if day and city:
+            week = day - timedelta(days=day.weekday())
+            _apply_rollup_delta(CaseWeeklyCityStat, {'week': week, 'city': city, 'case_type': case_type}, delta)
+    
+    @staticmethod
+    def refresh_suspect_counter(person_id: int) -> None:
+        """
+        Zählt die Verdächtigen-Fälle einer Person neu (eine indexgestützte Query).
+        """
+        count = PersonInvolvement.objects.filter(
+            person_id=person_id, involvement_type='suspect'
+        ).values('case_id').distinct().count()
+        
+        if count:
+            SuspectCaseCounter.objects.update_or_create(
+                person_id=person_id, defaults={'case_count': count}
+            )
+        else:
+            SuspectCaseCounter.objects.filter(person_id=person_id).delete()
+    
+    @staticmethod
+    def refresh_suspect_counters(person_ids) -> None:
+        """
+        Zählt die Verdächtigen-Fälle vieler Personen neu (für Bulk-Operationen ohne Signale).
+        """
+        person_ids = list(person_ids)
+        counts = PersonInvolvement.objects.filter(
+            person_id__in=person_ids, involvement_type='suspect'
+        ).values('person_id').annotate(
+            case_count=Count('case_id', distinct=True)
+        ).order_by()
+        
+        SuspectCaseCounter.objects.filter(person_id__in=person_ids).delete()
+        SuspectCaseCounter.objects.bulk_create([SuspectCaseCounter(**row) for row in counts])
+    
+    @staticmethod
+    @transaction.atomic
+    def rebuild() -> dict:
+        """
+        Baut alle Fall-Rollups und Verdächtigen-Zähler neu auf.
+        
+        Returns:
+            dict mit der Anzahl geschriebener Zeilen pro Tabelle
+        """
+        daily_rows = Case.objects.annotate(
+            day=TruncDate('incident_date')
+        ).values('day', 'case_type', 'status').annotate(
+            count=Count('id')
+        ).order_by()
+        
+        daily = []
+        monthly = Counter()
+        for row in daily_rows:
+            daily.append(CaseDailyStat(**row))
+            month = row['day'].replace(day=1) if row['day'] else None
+            monthly[(month, row['case_type'], row['status'])] += row['count']
+        
+        weekly_rows = Case.objects.filter(
+            incident_date__isnull=False, location__isnull=False
+        ).annotate(
+            day=TruncDate('incident_date')
+        ).values('day', 'location__city', 'case_type').annotate(
+            count=Count('id')
+        ).order_by()
+        
+        weekly = Counter()
+        for row in weekly_rows:
+            week = row['day'] - timedelta(days=row['day'].weekday())
+            weekly[(week, row['location__city'], row['case_type'])] += row['count']
+        
+        suspects = PersonInvolvement.objects.filter(
+            involvement_type='suspect'
+        ).values('person_id').annotate(
+            case_count=Count('case_id', distinct=True)
+        ).order_by()
+        
+        CaseDailyStat.objects.all().delete()
+        CaseMonthlyStat.objects.all().delete()
+        CaseWeeklyCityStat.objects.all().delete()
+        SuspectCaseCounter.objects.all().delete()
+        
+        CaseDailyStat.objects.bulk_create(daily, batch_size=1000)
+        CaseMonthlyStat.objects.bulk_create([
+            CaseMonthlyStat(month=month, case_type=case_type, status=status, count=count)
+            for (month, case_type, status), count in monthly.items()
+        ], batch_size=1000)
+        CaseWeeklyCityStat.objects.bulk_create([
+            CaseWeeklyCityStat(week=week, city=city, case_type=case_type, count=count)
+            for (week, city, case_type), count in weekly.items()
+        ], batch_size=1000)
+        counters = SuspectCaseCounter.objects.bulk_create([
+            SuspectCaseCounter(person_id=row['person_id'], case_count=row['case_count'])
+            for row in suspects
+        ], batch_size=1000)
+        
+        return {
+            'daily': len(daily),
+            'monthly': len(monthly),
+            'weekly_city': len(weekly),
+            'suspects': len(counters),
+        }
+    
+    @staticmethod
+    def get_trend(granularity: str = 'month', case_types: list = None,
+                  start=None, end=None) -> list:
+        """
+        Liest den Fall-Trend aus den Rollups.
+        
+        Args:
+            granularity: 'month' oder 'day'
+            case_types: Optional - Liste von Falltypen
+            start, end: Optional - date-Grenzen (inklusive)
+            
+        Returns:
+            Liste von dicts mit 'month' bzw. 'day' und 'count'
+        """
+        if granularity == 'day':
+            model, field = CaseDailyStat, 'day'
+        else:
+            model, field = CaseMonthlyStat, 'month'
+            start = start.replace(day=1) if start else None
+            end = end.replace(day=1) if end else None
+        
+        rows = model.objects.filter(count__gt=0)
+        if case_types:
+            rows = rows.filter(case_type__in=case_types)
+        if start:
+            rows = rows.filter(**{f'{field}__gte': start})
+        if end:
+            rows = rows.filter(**{f'{field}__lte': end})
+        
+        return list(
+            rows.values(field).annotate(count=Sum('count')).order_by(field)
+        )
+
+
+class TrendAnomalyService:
+    """
+    Service zur Anomalie-Erkennung auf den Fall-Trends.
+    
+    Bewertet alle Serien (Falltyp pro Monat/Woche, Tatort-Stadt pro Woche)
+    gleichzeitig per Rolling-z-Score, vektorisiert mit NumPy über eine
+    Serien × Perioden-Matrix aus den Rollup-Tabellen.
+    """
+    
+    SERIES = (
+        ('case_type', 'month'),
+        ('case_type', 'week'),
+        ('city', 'week'),
+    )
+    
+    @staticmethod
+    def rolling_zscores(counts: np.ndarray, window: int, min_std: float = 1.0) -> np.ndarray:
+        """
+        z-Score jedes Werts gegenüber den `window` vorangehenden Perioden seiner Serie.
+        
+        Args:
+            counts: Matrix (Serien × Perioden)
+            window: Anzahl Vergleichsperioden
+            min_std: Untergrenze der Standardabweichung (dämpft dünn besetzte Serien)
+            
+        Returns:
+            Matrix gleicher Form; die ersten `window` Perioden sind NaN
+        """
+        counts = np.asarray(counts, dtype=float)
+        n_series, n_periods = counts.shape
+        zscores = np.full((n_series, n_periods), np.nan)
+        if n_periods <= window:
+            return zscores
+        
+        cumsum = np.zeros((n_series, n_periods + 1))
+        cumsum[:, 1:] = np.cumsum(counts, axis=1)
+        cumsum_sq = np.zeros((n_series, n_periods + 1))
+        cumsum_sq[:, 1:] = np.cumsum(counts ** 2, axis=1)
+        
+        # Fenster [t - window, t) für alle t >= window
+        mean = (cumsum[:, window:-1] - cumsum[:, :-window - 1]) / window
+        mean_sq = (cumsum_sq[:, window:-1] - cumsum_sq[:, :-window - 1]) / window
+        std = np.maximum(np.sqrt(np.maximum(mean_sq - mean ** 2, 0)), min_std)
+        
+        zscores[:, window:] = (counts[:, window:] - mean) / std
+        return zscores
+    
+    @staticmethod
+    def _period_index(granularity: str, day: date) -> int:
+        if granularity == 'month':
+            return day.year * 12 + day.month - 1
+        return (day.toordinal() - 1) // 7  # 01.01.0001 ist ein Montag
+    
+    @staticmethod
+    def _period_start(granularity: str, index: int) -> date:
+        if granularity == 'month':
+            return date(index // 12, index % 12 + 1, 1)
+        return date.fromordinal(index * 7 + 1)
+    
+    @staticmethod
+    def _load_rows(dimension: str, granularity: str, since: date):
+        """
+        Liefert (Label, Datum, Anzahl)-Tupel aus der passenden Rollup-Tabelle.
+        """
+        if dimension == 'city':
+            return CaseWeeklyCityStat.objects.filter(
+                week__gte=since, count__gt=0
+            ).values_list('city', 'week', 'count')
+        if granularity == 'month':
+            return CaseMonthlyStat.objects.filter(
+                month__gte=since, count__gt=0
+            ).values_list('case_type', 'month', 'count')
+        return CaseDailyStat.objects.filter(
+            day__gte=since, count__gt=0
+        ).values_list('case_type', 'day', 'count')
+    
+    @staticmethod
+    def build_matrix(dimension: str, granularity: str, n_periods: int, today: date = None) -> tuple:
+        """
+        Baut die Serien × Perioden-Matrix; die letzte Spalte ist die aktuelle Periode.
+        
+        Returns:
+            (labels, first_period_index, matrix)
+        """
+        today = today or timezone.localdate()
+        last = TrendAnomalyService._period_index(granularity, today)
+        first = last - n_periods + 1
+        since = TrendAnomalyService._period_start(granularity, first)
+        
+        rows = list(TrendAnomalyService._load_rows(dimension, granularity, since))
+        if not rows:
+            return [], first, np.zeros((0, n_periods))
+        
+        labels, days, counts = zip(*rows)
+        labels, series_idx = np.unique(np.array(labels), return_inverse=True)
+        period_idx = np.fromiter(
+            (TrendAnomalyService._period_index(granularity, day) for day in days),
+            dtype=np.int64, count=len(days)
+        ) - first
+        
+        matrix = np.zeros((len(labels), n_periods))
+        valid = (period_idx >= 0) & (period_idx < n_periods)
+        np.add.at(matrix, (series_idx[valid], period_idx[valid]), np.asarray(counts)[valid])
+        return labels.tolist(), first, matrix
+    
+    @staticmethod
+    def detect_anomalies(window: int = 8, threshold: float = 3.0, min_count: int = 3,
+                         recent_periods: int = 1, today: date = None) -> list:
+        """
+        Markiert Ausreißer nach oben in den jüngsten Perioden aller Serien.
+        
+        Args:
+            window: Anzahl Vergleichsperioden für Mittelwert/Streuung
+            threshold: Mindest-z-Score
+            min_count: Mindestanzahl Fälle, damit ein Ausreißer zählt
+            recent_periods: Anzahl der jüngsten Perioden, die bewertet werden
+            
+        Returns:
+            Liste von dicts, absteigend nach z-Score
+        """
+        case_types = dict(Case.CASE_TYPE_CHOICES)
+        anomalies = []
+        
+        for dimension, granularity in TrendAnomalyService.SERIES:
+            labels, first, matrix = TrendAnomalyService.build_matrix(
+                dimension, granularity, window + recent_periods, today=today
+            )
+            if not labels:
+                continue
+            
+            zscores = TrendAnomalyService.rolling_zscores(matrix, window)[:, -recent_periods:]
+            recent = matrix[:, -recent_periods:]
+            expected = np.stack([
+                matrix[:, col - window:col].mean(axis=1)
+                for col in range(window, window + recent_periods)
+            ], axis=1)
+            
+            hits = np.argwhere((zscores >= threshold) & (recent >= min_count))
+            for row, col in hits:
+                label = labels[row]
+                anomalies.append({
+                    'dimension': dimension,
+                    'granularity': granularity,
+                    'label': case_types.get(label, label) if dimension == 'case_type' else label,
+                    'period': TrendAnomalyService._period_start(granularity, first + window + col),
+                    'count': int(recent[row, col]),
+                    'expected': float(expected[row, col]),
+                    'zscore': float(zscores[row, col]),
+                })
+        
+        return sorted(anomalies, key=lambda a: a['zscore'], reverse=True)
+
+
+class PersonActivityService:
+    """
+    Service für den fallübergreifenden Aktivitäts-Stream einer Person.
+    
+    Führt Timeline-Einträge, Fallbeteiligungen, Ermittlungsmaßnahmen und
+    Beweismittel chronologisch zusammen (k-Wege-Merge über je einen
+    indexgestützten Cursor pro Quelle, Keyset-Pagination).
+    """
+    
+    # Reihenfolge = Tie-Breaker bei identischem Zeitstempel
+    SOURCES = ('timeline', 'involvement', 'investigation', 'evidence')
+    
+    @staticmethod
+    def _source_querysets(person_id: int) -> dict:
+        """
+        Liefert pro Quelle ein Queryset mit einheitlichen Feldern (id, ts, ...).
+        """
+        involved_cases = PersonInvolvement.objects.filter(person_id=person_id).values('case_id')
+        
+        return {
+            'timeline': Timeline.objects.filter(
+                related_person_id=person_id
+            ).annotate(ts=F('datetime')).values(
+                'id', 'ts', 'title', 'case_id', case_number=F('case__case_number')
+            ),
+            'involvement': PersonInvolvement.objects.filter(
+                person_id=person_id
+            ).annotate(ts=F('created_at')).values(
+                'id', 'ts', 'case_id', 'involvement_type', case_number=F('case__case_number')
+            ),
+            'investigation': Investigation.objects.filter(
+                target_persons__id=person_id
+            ).annotate(
+                ts=Coalesce('completed_date', 'planned_date', 'created_at')
+            ).values(
+                'id', 'ts', 'title', 'case_id', case_number=F('case__case_number')
+            ),
+            'evidence': Evidence.objects.filter(
+                case_id__in=involved_cases, collected_date__isnull=False
+            ).annotate(ts=F('collected_date')).values(
+                'id', 'ts', 'title', 'case_id', case_number=F('case__case_number')
+            ),
+        }
+    
+    @staticmethod
+    def encode_cursor(event: dict) -> str:
+        raw = f"{event['timestamp'].isoformat()}|{PersonActivityService.SOURCES.index(event['source'])}|{event['id']}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """
+        Raises:
+            ValueError bei ungültigem Cursor
+        """
+        try:
+            timestamp, rank, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            timestamp = parse_datetime(timestamp)
+        except (TypeError, UnicodeDecodeError, binascii.Error) as exc:
+            raise ValueError('Ungültiger Cursor') from exc
+        if timestamp is None:
+            raise ValueError('Ungültiger Cursor')
+        return timestamp, int(rank), int(pk)
+    
+    @staticmethod
+    def _after_cursor(queryset, rank: int, cursor: tuple):
+        """
+        Keyset-Filter: nur Zeilen, deren (ts, rank, id) nach dem Cursor liegt.
+        """
+        cursor_ts, cursor_rank, cursor_id = cursor
+        if rank > cursor_rank:
+            return queryset.filter(ts__gte=cursor_ts)
+        if rank < cursor_rank:
+            return queryset.filter(ts__gt=cursor_ts)
+        return queryset.filter(Q(ts__gt=cursor_ts) | Q(ts=cursor_ts, id__gt=cursor_id))
+    
+    @staticmethod
+    def _to_event(source: str, row: dict) -> dict:
+        if source == 'involvement':
+            roles = dict(PersonInvolvement.INVOLVEMENT_TYPE_CHOICES)
+            title = f"Beteiligung als {roles.get(row['involvement_type'], row['involvement_type'])}"
+        else:
+            title = row['title']
+        
+        return {
+            'timestamp': row['ts'],
+            'source': source,
+            'id': row['id'],
+            'title': title,
+            'case_id': row['case_id'],
+            'case_number': row['case_number'],
+        }
+    
+    @staticmethod
+    def get_activity_stream(person_id: int, cursor: str = None, limit: int = 50) -> dict:
+        """
+        Liefert eine Seite des chronologischen Aktivitäts-Streams.
+        
+        Pro Quelle werden höchstens limit + 1 Zeilen über den Index gelesen;
+        die Kosten sind damit unabhängig von der Gesamtzahl der Ereignisse.
+        
+        Args:
+            person_id: ID der Person
+            cursor: Optional - next_cursor der vorherigen Seite
+            limit: Seitengröße
+            
+        Returns:
+            dict mit 'events' und 'next_cursor' (None auf der letzten Seite)
+            
+        Raises:
+            ValueError bei ungültigem Cursor
+        """
+        position = PersonActivityService.decode_cursor(cursor) if cursor else None
+        
+        streams = []
+        for rank, (source, queryset) in enumerate(
+            PersonActivityService._source_querysets(person_id).items()
+        ):
+            if position:
+                queryset = PersonActivityService._after_cursor(queryset, rank, position)
+            streams.append([
+                (row['ts'], rank, row['id'], source, row)
+                for row in queryset.order_by('ts', 'id')[:limit + 1]
+            ])
+        
+        merged = list(islice(heapq.merge(*streams), limit + 1))
+        events = [
+            PersonActivityService._to_event(source, row)
+            for _, _, _, source, row in merged[:limit]
+        ]
+        
+        next_cursor = None
+        if len(merged) > limit:
+            next_cursor = PersonActivityService.encode_cursor(events[-1])
+        
+        return {
+            'events': events,
+            'next_cursor': next_cursor,
+        }
+
+
 class DashboardService:
     """
     Service für Dashboard-Daten.
@@ -204,7 +872,19 @@ class DashboardService:
             completed_date__isnull=True
         ).select_related('case', 'assigned_to').order_by('planned_date')[:5]
         
-        # Alert-würdige Items
+        return {
+            'stats': case_stats,
+            'recent_cases': recent_cases,
+            'high_risk_persons': high_risk_persons,
+            'upcoming_investigations': upcoming_investigations,
+            'alerts': DashboardService.get_alerts(),
+        }
+    
+    @staticmethod
+    def get_alerts() -> list:
+        """
+        Sammelt Alert-würdige Items inklusive auffälliger Trend-Ausreißer.
+        """
         alerts = []
         
         # Überfällige Maßnahmen
@@ -228,10 +908,1314 @@ class DashboardService:
                 'message': f'{urgent_open} dringende offene Fälle',
             })
         
+        # Trend-Ausreißer
+        for anomaly in TrendAnomalyService.detect_anomalies()[:5]:
+            period = (
+                anomaly['period'].strftime('%m/%Y') if anomaly['granularity'] == 'month'
+                else f"KW {anomaly['period'].isocalendar()[1]}/{anomaly['period'].isocalendar()[0]}"
+            )
+            alerts.append({
+                'type': 'info',
+                'message': (
+                    f"Auffälliger Anstieg: {anomaly['label']} – {anomaly['count']} Fälle in {period} "
+                    f"(erwartet ~{anomaly['expected']:.0f}, z = {anomaly['zscore']:.1f})"
+                ),
+            })
+        
+        return alerts
+
+
+class AutocompleteService:
+    """
+    Typeahead-Vorschläge für Formulare per indizierter Präfix-Suche.
+    Kosten hängen nur vom Limit ab, nicht von der Tabellengröße.
+    """
+    
+    TYPES = ('person', 'address', 'vehicle', 'case')
+    
+    @staticmethod
+    def _persons(query: str, limit: int) -> list:
+        key = normalize_text(query)
+        persons = Person.objects.filter(
+            prefix_q('name_key', key) | prefix_q('name_key_first', key)
+        ).only('first_name', 'last_name', 'birth_date').order_by('name_key')[:limit]
+        return [
+            {
+                'id': person.id,
+                'label': person.full_name,
+                'detail': person.birth_date.strftime('%d.%m.%Y') if person.birth_date else '',
+            }
+            for person in persons
+        ]
+    
+    @staticmethod
+    def _addresses(query: str, limit: int) -> list:
+        addresses = Address.objects.filter(
+            prefix_q('search_key', normalize_text(query))
+        ).only('street', 'house_number', 'postal_code', 'city').order_by('search_key')[:limit]
+        return [
+            {
+                'id': address.id,
+                'label': ' '.join(filter(None, [address.street, address.house_number])),
+                'detail': ' '.join(filter(None, [address.postal_code, address.city])),
+            }
+            for address in addresses
+        ]
+    
+    @staticmethod
+    def _vehicles(query: str, limit: int) -> list:
+        key = normalize_plate(query)
+        if not key:
+            return []
+        vehicles = Vehicle.objects.filter(
+            prefix_q('plate_key', key)
+        ).only('license_plate', 'make', 'model').order_by('plate_key')[:limit]
+        return [
+            {
+                'id': vehicle.id,
+                'label': vehicle.license_plate,
+                'detail': ' '.join(filter(None, [vehicle.make, vehicle.model])),
+            }
+            for vehicle in vehicles
+        ]
+    
+    @staticmethod
+    def _cases(query: str, limit: int) -> list:
+        cases = Case.objects.filter(
+            prefix_q('case_number', query.strip())
+        ).only('case_number', 'title').order_by('case_number')[:limit]
+        return [
+            {'id': case.id, 'label': case.case_number, 'detail': case.title}
+            for case in cases
+        ]
+    
+    @staticmethod
+    def suggest(entity_type: str, query: str, limit: int = 10) -> list:
+        """
+        Liefert bis zu `limit` Vorschläge (id, label, detail) für einen Präfix.
+        
+        Raises:
+            ValueError bei unbekanntem Typ
+        """
+        if entity_type not in AutocompleteService.TYPES:
+            raise ValueError(f'Unbekannter Typ: {entity_type}')
+        if not normalize_text(query):
+            return []
+        
+        handler = {
+            'person': AutocompleteService._persons,
+            'address': AutocompleteService._addresses,
+            'vehicle': AutocompleteService._vehicles,
+            'case': AutocompleteService._cases,
+        }[entity_type]
+        return handler(query, limit)
+
+
+class EvidenceTextService:
+    """
+    Volltext-Extraktion der Beweismittel-Dateien außerhalb des Request-Pfads.
+    Jede Datei hat eine Zeile in EvidenceText (Status-Warteschlange); Worker
+    übernehmen Zeilen per bedingtem UPDATE, abgebrochene Läufe werden nach
+    STALE_AFTER wieder aufgenommen. Der Suchindex ist FTS5 (SQLite) bzw. ein
+    GIN-Index über to_tsvector('german', content) (Postgres).
+    """
+    
+    FTS_TABLE = 'investigations_evidencetext_fts'
+    MAX_ATTEMPTS = 3
+    STALE_AFTER = timedelta(minutes=15)
+    SNIPPET_START = '\x02'
+    SNIPPET_STOP = '\x03'
+    
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='evidence-text')
+    
+    @staticmethod
+    def enqueue(evidence: Evidence) -> None:
+        """
+        Plant die Extraktion nach dem Speichern eines Beweismittels ein.
+        Geänderte Dateien setzen den Eintrag zurück, entfernte löschen ihn.
+        """
+        if not evidence.file:
+            EvidenceText.objects.filter(evidence_id=evidence.pk).delete()
+            return
+        
+        file_name = evidence.file.name
+        row = EvidenceText.objects.filter(evidence_id=evidence.pk).first()
+        if row is None:
+            EvidenceText.objects.create(evidence_id=evidence.pk, case_id=evidence.case_id, file_name=file_name)
+        elif row.file_name != file_name or row.case_id != evidence.case_id:
+            EvidenceText.objects.filter(pk=row.pk).update(
+                case_id=evidence.case_id, file_name=file_name, status='pending', checksum='',
+                content='', error='', attempts=0, claimed_at=None, extracted_at=None,
+            )
+        else:
+            return
+        
+        pk = evidence.pk
+        transaction.on_commit(lambda: EvidenceTextService._executor.submit(EvidenceTextService._run, pk))
+    
+    @staticmethod
+    def enqueue_missing(retry_failed: bool = False) -> int:
+        """
+        Legt fehlende Einträge für Beweismittel mit Datei an (z.B. nach
+        Bulk-Importen ohne Signale) und setzt optional fehlgeschlagene zurück.
+        """
+        missing = Evidence.objects.exclude(file='').exclude(file__isnull=True).filter(
+            extracted_text__isnull=True
+        ).values_list('pk', 'case_id', 'file')
+        rows = [
+            EvidenceText(evidence_id=pk, case_id=case_id, file_name=file_name)
+            for pk, case_id, file_name in missing.iterator()
+        ]
+        EvidenceText.objects.bulk_create(rows, batch_size=1000)
+        
+        count = len(rows)
+        if retry_failed:
+            count += EvidenceText.objects.filter(
+                status='failed', attempts__lt=EvidenceTextService.MAX_ATTEMPTS
+            ).update(status='pending', claimed_at=None)
+        return count
+    
+    @staticmethod
+    def _claimable() -> Q:
+        stale = timezone.now() - EvidenceTextService.STALE_AFTER
+        return Q(status='pending') | Q(status='processing', claimed_at__lt=stale)
+    
+    @staticmethod
+    def claim(evidence_id: int) -> bool:
+        """Übernimmt einen Eintrag exklusiv (nur ein Worker gewinnt das UPDATE)."""
+        return bool(EvidenceText.objects.filter(
+            EvidenceTextService._claimable(), pk=evidence_id
+        ).update(status='processing', claimed_at=timezone.now(), attempts=F('attempts') + 1))
+    
+    @staticmethod
+    def process_one(evidence_id: int):
+        """
+        Extrahiert den Text einer Datei.
+        
+        Returns:
+            Neuer Status oder None, wenn der Eintrag nicht übernommen werden konnte
+        """
+        if not EvidenceTextService.claim(evidence_id):
+            return None
+        row = EvidenceText.objects.select_related('evidence').get(pk=evidence_id)
+        
+        def finish(status, **fields):
+            fields.update(status=status, claimed_at=None)
+            for name, value in fields.items():
+                setattr(row, name, value)
+            row.save(update_fields=list(fields))
+            return status
+        
+        if not extraction.is_supported(row.file_name):
+            return finish('unsupported', error='', extracted_at=timezone.now())
+        
+        try:
+            with row.evidence.file.open('rb') as handle:
+                data = handle.read(extraction.MAX_FILE_SIZE + 1)
+            checksum = hashlib.sha256(data).hexdigest()
+            if checksum == row.checksum and row.extracted_at:
+                # Unveränderte Datei - vorhandenen Text behalten
+                return finish('done', error='')
+            content = extraction.extract_text(row.file_name, data)
+        except extraction.UnsupportedFormat as exc:
+            return finish('unsupported', error=str(exc), extracted_at=timezone.now())
+        except Exception as exc:  # noqa: BLE001 - defekte Dateien dürfen den Lauf nicht abbrechen
+            return finish('failed', error=f'{type(exc).__name__}: {exc}'[:1000])
+        
+        return finish('done', content=content, checksum=checksum, error='', extracted_at=timezone.now())
+    
+    @staticmethod
+    def _run(evidence_id: int):
+        """Verarbeitet einen Eintrag im Pool-Thread mit eigener DB-Verbindung."""
+        close_old_connections()
+        try:
+            return EvidenceTextService.process_one(evidence_id)
+        finally:
+            close_old_connections()
+    
+    @staticmethod
+    def process_pending(workers: int = 4, batch_size: int = 100, limit: int = None) -> dict:
+        """
+        Arbeitet die Warteschlange in Batches ab. Ein abgebrochener Lauf
+        kann jederzeit erneut gestartet werden.
+        
+        Returns:
+            dict Status -> Anzahl verarbeiteter Einträge
+        """
+        stats = Counter()
+        seen = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='evidence-text') as pool:
+            while limit is None or len(seen) < limit:
+                size = batch_size if limit is None else min(batch_size, limit - len(seen))
+                ids = list(EvidenceText.objects.filter(EvidenceTextService._claimable()).exclude(
+                    pk__in=seen
+                ).order_by('pk').values_list('pk', flat=True)[:size])
+                if not ids:
+                    break
+                seen.update(ids)
+                
+                if connection.in_atomic_block or workers <= 1:
+                    results = [EvidenceTextService.process_one(pk) for pk in ids]
+                else:
+                    results = pool.map(EvidenceTextService._run, ids)
+                stats.update(status for status in results if status)
+        return dict(stats)
+    
+    @staticmethod
+    def rebuild_search_index() -> None:
+        """Baut den FTS5-Index aus der Inhaltstabelle neu auf (nur SQLite nötig)."""
+        if connection.vendor == 'sqlite':
+            table = EvidenceTextService.FTS_TABLE
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    
+    @staticmethod
+    def fts_query(query: str) -> str:
+        """FTS5-Ausdruck: alle Wörter müssen vorkommen, jeweils als Präfix."""
+        return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', query))
+    
+    @staticmethod
+    def highlight(snippet: str):
+        """Escaped den Ausschnitt und markiert die Treffer."""
+        return mark_safe(
+            escape(snippet)
+            .replace(EvidenceTextService.SNIPPET_START, '<mark>')
+            .replace(EvidenceTextService.SNIPPET_STOP, '</mark>')
+        )
+    
+    @staticmethod
+    def search(query: str, limit: int = 20) -> dict:
+        """
+        Volltextsuche im extrahierten Text.
+        
+        Returns:
+            dict mit 'items' (EvidenceText mit .snippet) und 'total'
+        """
+        start, stop = EvidenceTextService.SNIPPET_START, EvidenceTextService.SNIPPET_STOP
+        rows = EvidenceText.objects.select_related('evidence', 'case')
+        
+        if connection.vendor == 'sqlite':
+            match = EvidenceTextService.fts_query(query)
+            if not match:
+                return {'items': [], 'total': 0}
+            table = EvidenceTextService.FTS_TABLE
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT count(*) FROM {table} WHERE {table} MATCH %s', [match])
+                total = cursor.fetchone()[0]
+                cursor.execute(
+                    f"SELECT rowid, snippet({table}, 0, %s, %s, '…', 24) FROM {table} "
+                    f"WHERE {table} MATCH %s ORDER BY rank LIMIT %s",
+                    [start, stop, match, limit],
+                )
+                snippets = dict(cursor.fetchall())
+            by_pk = rows.in_bulk(list(snippets))
+            items = []
+            for pk, snippet in snippets.items():
+                if pk in by_pk:
+                    by_pk[pk].snippet = EvidenceTextService.highlight(snippet)
+                    items.append(by_pk[pk])
+            return {'items': items, 'total': total}
+        
+        if connection.vendor == 'postgresql':
+            search_query = SearchQuery(query, config='german', search_type='websearch')
+            matches = rows.annotate(
+                search=SearchVector('content', config='german')
+            ).filter(search=search_query)
+            total = matches.count()
+            items = list(matches.annotate(
+                rank=SearchRank(SearchVector('content', config='german'), search_query),
+                headline=SearchHeadline(
+                    'content', search_query, config='german',
+                    start_sel=start, stop_sel=stop, max_words=35, min_words=15,
+                ),
+            ).order_by('-rank', 'pk')[:limit])
+            for item in items:
+                item.snippet = EvidenceTextService.highlight(item.headline)
+            return {'items': items, 'total': total}
+        
+        matches = rows.filter(content__icontains=query)
+        items = list(matches.order_by('pk')[:limit])
+        for item in items:
+            item.snippet = item.content[:200]
+        return {'items': items, 'total': matches.count()}
+
+
+class EvidencePreviewService:
+    """
+    Vorschaubilder der Beweismittel außerhalb des Request-Pfads. Warteschlange
+    und Übernahme wie bei EvidenceTextService (Zeile je Datei, bedingtes UPDATE).
+    
+    Gegendruck: der lokale Pool nimmt höchstens MAX_QUEUED Aufträge an. Jeder
+    Auftrag holt sich den ältesten offenen Eintrag und zieht nach Abschluss den
+    nächsten nach; was keinen Platz findet, bleibt 'pending' und wird beim
+    nächsten freien Platz oder vom Command generate_previews abgearbeitet.
+    Gerenderte Bilder liegen unter PREVIEW_DIR/<aa>/<sha256>-<Größe>.<Endung>
+    und werden von Dateien gleichen Inhalts mitbenutzt.
+    """
+    
+    PREVIEW_DIR = 'previews'
+    MAX_ATTEMPTS = 3
+    MAX_QUEUED = 8
+    STALE_AFTER = timedelta(minutes=15)
+    
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='evidence-preview')
+    _slots = threading.BoundedSemaphore(MAX_QUEUED)
+    
+    @staticmethod
+    def enqueue(evidence: Evidence) -> None:
+        """
+        Plant die Vorschau nach dem Speichern eines Beweismittels ein.
+        Geänderte Dateien setzen den Eintrag zurück, entfernte löschen ihn.
+        """
+        if not evidence.file:
+            EvidencePreview.objects.filter(evidence_id=evidence.pk).delete()
+            return
+        
+        file_name = evidence.file.name
+        row = EvidencePreview.objects.filter(evidence_id=evidence.pk).first()
+        if row is None:
+            EvidencePreview.objects.create(evidence_id=evidence.pk, file_name=file_name)
+        elif row.file_name != file_name:
+            EvidencePreview.objects.filter(pk=row.pk).update(
+                file_name=file_name, status='pending', sha256='', thumbnail='', page='',
+                error='', attempts=0, claimed_at=None, generated_at=None,
+            )
+        else:
+            return
+        
+        transaction.on_commit(EvidencePreviewService.submit)
+    
+    @staticmethod
+    def submit() -> bool:
+        """Startet einen Pool-Auftrag, sofern ein Platz frei ist."""
+        if not EvidencePreviewService._slots.acquire(blocking=False):
+            return False
+        try:
+            EvidencePreviewService._executor.submit(EvidencePreviewService._run_next)
+        except RuntimeError:
+            # Pool beim Herunterfahren bereits geschlossen
+            EvidencePreviewService._slots.release()
+            return False
+        return True
+    
+    @staticmethod
+    def _claimable() -> Q:
+        stale = timezone.now() - EvidencePreviewService.STALE_AFTER
+        return Q(status='pending') | Q(status='processing', claimed_at__lt=stale)
+    
+    @staticmethod
+    def claim(evidence_id: int) -> bool:
+        """Übernimmt einen Eintrag exklusiv (nur ein Worker gewinnt das UPDATE)."""
+        return bool(EvidencePreview.objects.filter(
+            EvidencePreviewService._claimable(), pk=evidence_id
+        ).update(status='processing', claimed_at=timezone.now(), attempts=F('attempts') + 1))
+    
+    @staticmethod
+    def cache_name(digest: str, size_key: str, extension: str) -> str:
+        return f'{EvidencePreviewService.PREVIEW_DIR}/{digest[:2]}/{digest}-{size_key}.{extension}'
+    
+    @staticmethod
+    def _cached(digest: str, size_key: str):
+        for extension in previews.CONTENT_TYPES:
+            name = EvidencePreviewService.cache_name(digest, size_key, extension)
+            if os.path.exists(os.path.join(settings.MEDIA_ROOT, name)):
+                return name
+        return None
+    
+    @staticmethod
+    def _store(name: str, data: bytes) -> None:
+        """Schreibt atomar (temporäre Datei + rename), parallele Worker sehen nie halbe Bilder."""
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, path)
+    
+    @staticmethod
+    def process_one(evidence_id: int):
+        """
+        Erzeugt Miniatur und Seitenvorschau einer Datei (oder nutzt den Cache).
+        
+        Returns:
+            Neuer Status oder None, wenn der Eintrag nicht übernommen werden konnte
+        """
+        if not EvidencePreviewService.claim(evidence_id):
+            return None
+        row = EvidencePreview.objects.select_related('evidence').get(pk=evidence_id)
+        
+        def finish(status, **fields):
+            fields.update(status=status, claimed_at=None)
+            for name, value in fields.items():
+                setattr(row, name, value)
+            row.save(update_fields=list(fields))
+            return status
+        
+        if not previews.is_supported(row.file_name):
+            return finish('unsupported', error='', generated_at=timezone.now())
+        
+        try:
+            with row.evidence.file.open('rb') as handle:
+                data = handle.read(previews.MAX_FILE_SIZE + 1)
+            digest = row.evidence.sha256 or hashlib.sha256(data).hexdigest()
+            names = {}
+            for size_key, size in previews.SIZES.items():
+                names[size_key] = EvidencePreviewService._cached(digest, size_key)
+                if names[size_key] is None:
+                    rendered, extension = previews.render(row.file_name, data, size)
+                    names[size_key] = EvidencePreviewService.cache_name(digest, size_key, extension)
+                    EvidencePreviewService._store(names[size_key], rendered)
+        except extraction.UnsupportedFormat as exc:
+            return finish('unsupported', error=str(exc), generated_at=timezone.now())
+        except Exception as exc:  # noqa: BLE001 - defekte Dateien dürfen den Lauf nicht abbrechen
+            return finish('failed', error=f'{type(exc).__name__}: {exc}'[:1000])
+        
+        return finish(
+            'done', sha256=digest, thumbnail=names['thumb'], page=names['page'], error='',
+            generated_at=timezone.now(),
+        )
+    
+    @staticmethod
+    def _next_id():
+        return EvidencePreview.objects.filter(
+            EvidencePreviewService._claimable()
+        ).order_by('pk').values_list('pk', flat=True).first()
+    
+    @staticmethod
+    def _run_next():
+        """Pool-Auftrag: ältesten offenen Eintrag verarbeiten, danach den nächsten nachziehen."""
+        close_old_connections()
+        evidence_id = processed = None
+        try:
+            evidence_id = EvidencePreviewService._next_id()
+            if evidence_id is not None:
+                processed = EvidencePreviewService.process_one(evidence_id)
+        finally:
+            close_old_connections()
+            EvidencePreviewService._slots.release()
+        if evidence_id is not None:
+            EvidencePreviewService.submit()
+        return processed
+    
+    @staticmethod
+    def _run(evidence_id: int):
+        """Verarbeitet einen Eintrag im Pool-Thread mit eigener DB-Verbindung."""
+        close_old_connections()
+        try:
+            return EvidencePreviewService.process_one(evidence_id)
+        finally:
+            close_old_connections()
+    
+    @staticmethod
+    def enqueue_missing(retry_failed: bool = False) -> int:
+        """
+        Legt fehlende Einträge für Beweismittel mit Datei an (z.B. nach
+        Bulk-Importen ohne Signale) und setzt optional fehlgeschlagene zurück.
+        """
+        missing = Evidence.objects.exclude(file='').exclude(file__isnull=True).filter(
+            preview__isnull=True
+        ).values_list('pk', 'file')
+        rows = [EvidencePreview(evidence_id=pk, file_name=file_name) for pk, file_name in missing.iterator()]
+        EvidencePreview.objects.bulk_create(rows, batch_size=1000)
+        
+        count = len(rows)
+        if retry_failed:
+            count += EvidencePreview.objects.filter(
+                status='failed', attempts__lt=EvidencePreviewService.MAX_ATTEMPTS
+            ).update(status='pending', claimed_at=None)
+        return count
+    
+    @staticmethod
+    def process_pending(workers: int = 2, batch_size: int = 100, limit: int = None) -> dict:
+        """
+        Arbeitet die Warteschlange in Batches ab (Command generate_previews).
+        
+        Returns:
+            dict Status -> Anzahl verarbeiteter Einträge
+        """
+        stats = Counter()
+        seen = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='evidence-preview') as pool:
+            while limit is None or len(seen) < limit:
+                size = batch_size if limit is None else min(batch_size, limit - len(seen))
+                ids = list(EvidencePreview.objects.filter(EvidencePreviewService._claimable()).exclude(
+                    pk__in=seen
+                ).order_by('pk').values_list('pk', flat=True)[:size])
+                if not ids:
+                    break
+                seen.update(ids)
+                
+                if connection.in_atomic_block or workers <= 1:
+                    results = [EvidencePreviewService.process_one(pk) for pk in ids]
+                else:
+                    results = pool.map(EvidencePreviewService._run, ids)
+                stats.update(status for status in results if status)
+        return dict(stats)
+    
+    @staticmethod
+    def status_map(case: Case) -> dict:
+        """Evidence-ID -> Vorschau-Status eines Falls (für das Nachladen im Browser)."""
+        return dict(EvidencePreview.objects.filter(evidence__case=case).values_list('pk', 'status'))
+
+
+class UploadOffsetMismatch(ValueError):
+    """Block passt nicht an den bisher empfangenen Stand (Client muss ab offset fortsetzen)."""
+    
+    def __init__(self, offset: int):
+        super().__init__(f'Upload steht bei Byte {offset}')
+        self.offset = offset
+
+
+class EvidenceUploadService:
+    """
+    Wiederaufnehmbare Beweismittel-Uploads in Blöcken mit inhaltsadressierter Ablage.
+    Blöcke werden an eine Teildatei angehängt und dabei fortlaufend mit SHA-256
+    gehasht; fertige Dateien liegen unter BLOB_DIR/<aa>/<bb>/<sha256><Endung>,
+    identische Inhalte teilen sich eine Datei - auch über Fälle hinweg.
+    
+    Der Hash-Zustand lebt im Prozess. Setzt ein anderer Worker den Upload fort,
+    wird die Teildatei einmal nachgehasht.
+    """
+    
+    BLOB_DIR = 'evidence/sha256'
+    PARTIAL_DIR = 'evidence/.partial'
+    MAX_CHUNK_SIZE = 64 * 1024 * 1024
+    COPY_BUFFER = 1024 * 1024
+    STALE_AFTER = timedelta(days=2)
+    SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+    
+    _hashers = {}
+    _hashers_lock = threading.Lock()
+    
+    @staticmethod
+    def clean_metadata(data) -> dict:
+        """Pflichtangaben des späteren Beweismittels prüfen."""
+        metadata = {
+            field: (data.get(field) or '').strip()
+            for field in ('evidence_number', 'title', 'description', 'evidence_type', 'location_found')
+        }
+        if not metadata['evidence_number'] or len(metadata['evidence_number']) > 50:
+            raise ValueError('Beweis-Nr. fehlt oder ist zu lang.')
+        if not metadata['title'] or len(metadata['title']) > 200:
+            raise ValueError('Titel fehlt oder ist zu lang.')
+        if metadata['evidence_type'] not in dict(Evidence.EVIDENCE_TYPE_CHOICES):
+            raise ValueError('Ungültiger Beweistyp.')
+        return metadata
+    
+    @staticmethod
+    def blob_name(digest: str, file_name: str) -> str:
+        extension = os.path.splitext(file_name)[1].lower()
+        if not re.fullmatch(r'\.[a-z0-9]{1,10}', extension):
+            extension = ''
+        return f'{EvidenceUploadService.BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+    
+    @staticmethod
+    def find_blob(digest: str, user=None):
+        """
+        Vorhandene Datei mit dieser Prüfsumme (Storage-Name) oder None.
+        Mit user nur unter Beweismitteln, die der Nutzer einsehen darf.
+        """
+        evidence = Evidence.objects.filter(sha256=digest).exclude(file='').exclude(file__isnull=True)
+        if user is not None:
+            evidence = evidence.filter(viewable_evidence_q(user))
+        names = evidence.values_list('file', flat=True).distinct()
+        return next((name for name in names if default_storage.exists(name)), None)
+    
+    @staticmethod
+    def duplicates(evidence: Evidence, user) -> list:
+        """Andere Beweismittel mit identischem Dateiinhalt, die der Nutzer einsehen darf (alle Fälle)."""
+        if not evidence.sha256:
+            return []
+        return [
+            {'evidence_id': pk, 'evidence_number': number, 'case_id': case_id, 'case_number': case_number}
+            for pk, number, case_id, case_number in Evidence.objects.filter(
+                viewable_evidence_q(user), sha256=evidence.sha256
+            ).exclude(pk=evidence.pk).order_by('case_id', 'pk').values_list(
+                'pk', 'evidence_number', 'case_id', 'case__case_number'
+            )
+        ]
+    
+    @staticmethod
+    def partial_path(upload: EvidenceUpload) -> str:
+        return os.path.join(settings.MEDIA_ROOT, EvidenceUploadService.PARTIAL_DIR, f'{upload.pk}.part')
+    
+    @staticmethod
+    def start(case: Case, file_name: str, size: int, metadata: dict, user=None, sha256: str = '') -> EvidenceUpload:
+        """
+        Legt einen Upload an. Liegt eine Datei mit der angekündigten Prüfsumme
+        und Größe bereits bei einem Beweismittel, das der Nutzer einsehen darf,
+        wird das Beweismittel sofort ohne Datenübertragung angelegt. Alle
+        anderen Inhalte müssen übertragen werden und werden erst nach dem
+        serverseitigen Hashen dedupliziert - die Kenntnis einer Prüfsumme
+        allein gibt keinen Zugriff auf fremde Dateien.
+        """
+        metadata = EvidenceUploadService.clean_metadata(metadata)
+        file_name = os.path.basename(file_name or '').strip()[:255]
+        sha256 = (sha256 or '').strip().lower()
+        if not file_name:
+            raise ValueError('Dateiname fehlt.')
+        if size < 0:
+            raise ValueError('Ungültige Dateigröße.')
+        if sha256 and not EvidenceUploadService.SHA256_RE.match(sha256):
+            raise ValueError('Ungültige SHA-256-Prüfsumme.')
+        
+        upload = EvidenceUpload.objects.create(
+            case=case, file_name=file_name, size=size, expected_sha256=sha256,
+            metadata=metadata, created_by=user,
+        )
+        existing = EvidenceUploadService.find_blob(sha256, user=user) if sha256 and user is not None else None
+        if existing and default_storage.size(existing) == size:
+            EvidenceUploadService._complete(upload, existing, sha256, size)
+            return upload
+        
+        path = EvidenceUploadService.partial_path(upload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'wb').close()
+        if size == 0:
+            upload = EvidenceUploadService._finalize(upload, hashlib.sha256())
+        return upload
+    
+    @staticmethod
+    def _hasher(upload: EvidenceUpload):
+        """Hash-Zustand bis upload.offset; nach Prozesswechsel aus der Teildatei rekonstruiert."""
+        with EvidenceUploadService._hashers_lock:
+            cached = EvidenceUploadService._hashers.pop(upload.pk, None)
+        if cached and cached[0] == upload.offset:
+            return cached[1]
+        
+        hasher = hashlib.sha256()
+        remaining = upload.offset
+        with open(EvidenceUploadService.partial_path(upload), 'rb') as handle:
+            while remaining:
+                block = handle.read(min(EvidenceUploadService.COPY_BUFFER, remaining))
+                if not block:
+                    raise ValueError('Teildatei ist kürzer als der empfangene Stand.')
+                hasher.update(block)
+                remaining -= len(block)
+        return hasher
+    
+    @staticmethod
+    def append(upload_id, offset: int, stream, length: int) -> EvidenceUpload:
+        """
+        Hängt einen Block an. Der Block wird in COPY_BUFFER-Stücken gelesen,
+        geschrieben und gehasht; nach dem letzten Block folgt die Ablage.
+        
+        Raises:
+            UploadOffsetMismatch: offset entspricht nicht dem empfangenen Stand
+            ValueError: Upload nicht offen, Block zu groß oder unvollständig
+        """
+        with transaction.atomic():
+            upload = EvidenceUpload.objects.select_for_update().get(pk=upload_id)
+            if upload.status != 'open':
+                raise ValueError('Upload ist nicht mehr offen.')
+            if offset != upload.offset:
+                raise UploadOffsetMismatch(upload.offset)
+            if length > EvidenceUploadService.MAX_CHUNK_SIZE or offset + length > upload.size:
+                raise ValueError('Block ist zu groß.')
+            
+            hasher = EvidenceUploadService._hasher(upload)
+            received = 0
+            with open(EvidenceUploadService.partial_path(upload), 'r+b') as handle:
+                # Reste eines abgebrochenen Blocks verwerfen
+                handle.seek(offset)
+                handle.truncate()
+                while received < length:
+                    block = stream.read(min(EvidenceUploadService.COPY_BUFFER, length - received))
+                    if not block:
+                        break
+                    handle.write(block)
+                    hasher.update(block)
+                    received += len(block)
+                if received != length:
+                    handle.truncate(offset)
+                    raise ValueError('Block unvollständig empfangen.')
+            
+            upload.offset += length
+            upload.save(update_fields=['offset', 'updated_at'])
+        
+        # Ein leerer Block am Ende schließt einen unterbrochenen Abschluss nach
+        if upload.offset == upload.size:
+            return EvidenceUploadService._finalize(upload, hasher)
+        with EvidenceUploadService._hashers_lock:
+            EvidenceUploadService._hashers[upload.pk] = (upload.offset, hasher)
+        return upload
+    
+    @staticmethod
+    def _finalize(upload: EvidenceUpload, hasher) -> EvidenceUpload:
+        """Prüfsumme abgleichen, Datei inhaltsadressiert ablegen (oder vorhandene nutzen)."""
+        digest = hasher.hexdigest()
+        if upload.expected_sha256 and upload.expected_sha256 != digest:
+            EvidenceUploadService.abort(upload)
+            raise ValueError('Prüfsumme stimmt nicht mit der angekündigten überein.')
+        
+        with transaction.atomic():
+            upload = EvidenceUpload.objects.select_for_update().select_related('case').get(pk=upload.pk)
+            if upload.status != 'open':
+                return upload
+            
+            path = EvidenceUploadService.partial_path(upload)
+            name = EvidenceUploadService.find_blob(digest)
+            if name is None:
+                name = EvidenceUploadService.blob_name(digest, upload.file_name)
+                target = os.path.join(settings.MEDIA_ROOT, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if not os.path.exists(target):
+                    os.replace(path, target)
+            if os.path.exists(path):
+                os.remove(path)
+            EvidenceUploadService._complete(upload, name, digest, upload.offset)
+        return upload
+    
+    @staticmethod
+    def _complete(upload: EvidenceUpload, name: str, digest: str, size: int) -> None:
+        metadata = upload.metadata
+        upload.evidence = Evidence.objects.create(
+            case=upload.case,
+            evidence_number=metadata['evidence_number'],
+            title=metadata['title'],
+            description=metadata.get('description', ''),
+            evidence_type=metadata['evidence_type'],
+            location_found=metadata.get('location_found') or None,
+            file=name,
+            sha256=digest,
+            file_size=size,
+            collected_by=upload.created_by,
+        )
+        upload.offset = upload.size
+        upload.status = 'complete'
+        upload.save(update_fields=['evidence', 'offset', 'status', 'updated_at'])
+    
+    @staticmethod
+    def abort(upload: EvidenceUpload) -> None:
+        """Bricht einen offenen Upload ab und löscht die Teildatei."""
+        with EvidenceUploadService._hashers_lock:
+            EvidenceUploadService._hashers.pop(upload.pk, None)
+        path = EvidenceUploadService.partial_path(upload)
+        if os.path.exists(path):
+            os.remove(path)
+        if upload.status == 'open':
+            upload.status = 'aborted'
+            upload.save(update_fields=['status', 'updated_at'])
+    
+    @staticmethod
+    def status(upload: EvidenceUpload, user) -> dict:
+        """Stand des Uploads; Duplikate nur, soweit der Nutzer sie einsehen darf."""
+        data = {
+            'upload_id': str(upload.pk),
+            'status': upload.status,
+            'offset': upload.offset,
+            'size': upload.size,
+            'chunk_size': EvidenceUploadService.MAX_CHUNK_SIZE,
+            'evidence_id': upload.evidence_id,
+        }
+        if upload.evidence_id:
+            data['sha256'] = upload.evidence.sha256
+            data['duplicates'] = EvidenceUploadService.duplicates(upload.evidence, user)
+        return data
+    
+    @staticmethod
+    def purge_stale(older_than: timedelta = STALE_AFTER) -> int:
+        """Bricht seit older_than unveränderte offene Uploads ab."""
+        stale = EvidenceUpload.objects.filter(status='open', updated_at__lt=timezone.now() - older_than)
+        count = 0
+        for upload in stale.iterator():
+            EvidenceUploadService.abort(upload)
+            count += 1
+        return count
+    
+    @staticmethod
+    def hash_missing() -> int:
+        """
+        Trägt Prüfsumme und Größe für Beweismittel nach, deren Datei noch
+        klassisch hochgeladen wurde. Die Dateien bleiben an ihrem Ort.
+        """
+        count = 0
+        missing = Evidence.objects.filter(sha256='').exclude(file='').exclude(file__isnull=True)
+        for pk, name in missing.values_list('pk', 'file').iterator():
+            if not default_storage.exists(name):
+                continue
+            hasher = hashlib.sha256()
+            size = 0
+            with default_storage.open(name, 'rb') as handle:
+                for block in handle.chunks(EvidenceUploadService.COPY_BUFFER):
+                    hasher.update(block)
+                    size += len(block)
+            Evidence.objects.filter(pk=pk).update(sha256=hasher.hexdigest(), file_size=size)
+            count += 1
+        return count
+
+
+class DuplicateDetectionService:
+    """
+    Beinahe-Duplikate von Fällen (Titel + Beschreibung) und Beweismitteln
+    (Beschreibung) über MinHash-Signaturen und LSH-Buckets.
+    Signaturen werden beim Speichern gepflegt; eine Abfrage liest nur die
+    Buckets der eigenen Signatur statt alle Texte paarweise zu vergleichen.
+    """
+    
+    THRESHOLD = 0.5  # geschätzte Jaccard-Ähnlichkeit
+    
+    @staticmethod
+    def case_text(title: str, description: str) -> str:
+        return f'{title or ""}\n{description or ""}'
+    
+    @staticmethod
+    def _buckets(row: MinHashSignature, sig) -> list:
+        return [
+            MinHashBucket(signature_id=row.pk, source=row.source, bucket=key)
+            for key in minhash.band_keys(sig)
+        ]
+    
+    @staticmethod
+    def _store(source: str, object_id: int, case_id: int, text: str) -> bool:
+        """
+        Speichert Signatur und Buckets eines Textes.
+        
+        Returns:
+            True, wenn sich die Signatur geändert hat
+        """
+        sig = minhash.signature(text)
+        rows = MinHashSignature.objects.filter(source=source, object_id=object_id)
+        if sig is None:
+            return bool(rows.delete()[0])
+        
+        data = minhash.to_bytes(sig)
+        existing = rows.first()
+        if existing and bytes(existing.signature) == data and existing.case_id == case_id:
+            return False
+        
+        with transaction.atomic():
+            if existing:
+                existing.signature = data
+                existing.case_id = case_id
+                existing.save(update_fields=['signature', 'case', 'updated_at'])
+                existing.buckets.all().delete()
+            else:
+                existing = MinHashSignature.objects.create(
+                    source=source, object_id=object_id, case_id=case_id, signature=data
+                )
+            MinHashBucket.objects.bulk_create(DuplicateDetectionService._buckets(existing, sig))
+        return True
+    
+    @staticmethod
+    def index_case(case: Case) -> bool:
+        return DuplicateDetectionService._store(
+            'case', case.pk, case.pk, DuplicateDetectionService.case_text(case.title, case.description)
+        )
+    
+    @staticmethod
+    def index_evidence(evidence: Evidence) -> bool:
+        return DuplicateDetectionService._store('evidence', evidence.pk, evidence.case_id, evidence.description)
+    
+    @staticmethod
+    def remove_evidence(evidence_id: int) -> None:
+        MinHashSignature.objects.filter(source='evidence', object_id=evidence_id).delete()
+    
+    @staticmethod
+    def rebuild(batch_size: int = 1000) -> dict:
+        """
+        Berechnet alle Signaturen neu (nach Bulk-Importen oder Parameteränderungen).
+        
+        Returns:
+            dict Quelle -> Anzahl Signaturen
+        """
+        sources = {
+            'case': Case.objects.values_list('pk', 'pk', 'title', 'description'),
+            'evidence': Evidence.objects.values_list('pk', 'case_id', 'description'),
+        }
+        counts = {}
+        with transaction.atomic():
+            MinHashBucket.objects.all().delete()
+            MinHashSignature.objects.all().delete()
+            for source, values in sources.items():
+                counts[source] = 0
+                pending = []
+                
+                def flush():
+                    rows = MinHashSignature.objects.bulk_create([row for row, _sig in pending])
+                    if not connection.features.can_return_rows_from_bulk_insert:
+                        # Ohne RETURNING die IDs nachladen
+                        ids = dict(MinHashSignature.objects.filter(
+                            source=source, object_id__in=[row.object_id for row in rows]
+                        ).values_list('object_id', 'pk'))
+                        for row in rows:
+                            row.pk = ids[row.object_id]
+                    MinHashBucket.objects.bulk_create([
+                        bucket for row, sig in pending
+                        for bucket in DuplicateDetectionService._buckets(row, sig)
+                    ], batch_size=5000)
+                    counts[source] += len(pending)
+                    pending.clear()
+                
+                for object_id, case_id, *texts in values.iterator(chunk_size=batch_size):
+                    text = DuplicateDetectionService.case_text(*texts) if source == 'case' else texts[0]
+                    sig = minhash.signature(text)
+                    if sig is None:
+                        continue
+                    pending.append((MinHashSignature(
+                        source=source, object_id=object_id, case_id=case_id, signature=minhash.to_bytes(sig)
+                    ), sig))
+                    if len(pending) >= batch_size:
+                        flush()
+                flush()
+        return counts
+    
+    @staticmethod
+    def _matches(source: str, signatures: dict, threshold: float) -> list:
+        """
+        Kandidaten aus gemeinsamen Buckets, bewertet per Signaturvergleich.
+        
+        Args:
+            signatures: dict object_id -> Signatur der Anfragetexte
+            
+        Returns:
+            Liste (object_id Anfrage, object_id Treffer, case_id Treffer, Ähnlichkeit)
+        """
+        if not signatures:
+            return []
+        keys = {
+            object_id: set(minhash.band_keys(sig)) for object_id, sig in signatures.items()
+        }
+        candidate_buckets = {}
+        for signature_id, bucket in MinHashBucket.objects.filter(
+            source=source, bucket__in=set().union(*keys.values())
+        ).values_list('signature_id', 'bucket'):
+            candidate_buckets.setdefault(signature_id, set()).add(bucket)
+        
+        candidates = MinHashSignature.objects.filter(pk__in=list(candidate_buckets)).exclude(
+            object_id__in=list(signatures)
+        ).values_list('pk', 'object_id', 'case_id', 'signature')
+        
+        matches = []
+        for pk, object_id, case_id, data in candidates:
+            candidate_sig = minhash.from_bytes(data)
+            for query_id, query_keys in keys.items():
+                if not query_keys & candidate_buckets[pk]:
+                    continue
+                similarity = minhash.estimate_similarity(signatures[query_id], candidate_sig)
+                if similarity >= threshold:
+                    matches.append((query_id, object_id, case_id, similarity))
+        matches.sort(key=lambda match: (-match[3], match[1]))
+        return matches
+    
+    @staticmethod
+    def _cases(matches: list) -> list:
+        cases = Case.objects.in_bulk([object_id for _q, object_id, _c, _s in matches])
+        result = []
+        for _query_id, object_id, _case_id, similarity in matches:
+            if object_id in cases:
+                cases[object_id].similarity = similarity
+                result.append(cases[object_id])
+        return result
+    
+    @staticmethod
+    def find_similar_cases(title: str, description: str, exclude_case_id: int = None,
+                           threshold: float = None, limit: int = 10) -> list:
+        """
+        Mögliche Duplikate für einen (auch noch nicht gespeicherten) Fall.
+        
+        Returns:
+            Liste von Case-Objekten mit Attribut similarity (absteigend)
+        """
+        sig = minhash.signature(DuplicateDetectionService.case_text(title, description))
+        if sig is None:
+            return []
+        query_id = exclude_case_id or 0
+        matches = DuplicateDetectionService._matches(
+            'case', {query_id: sig}, threshold or DuplicateDetectionService.THRESHOLD
+        )[:limit]
+        return DuplicateDetectionService._cases(matches)
+    
+    @staticmethod
+    def possible_duplicates(case: Case, threshold: float = None, limit: int = 10) -> list:
+        """
+        Mögliche Duplikate eines gespeicherten Falls anhand der gespeicherten Signatur.
+        """
+        data = MinHashSignature.objects.filter(source='case', object_id=case.pk).values_list(
+            'signature', flat=True
+        ).first()
+        if data is None:
+            return DuplicateDetectionService.find_similar_cases(
+                case.title, case.description, exclude_case_id=case.pk, threshold=threshold, limit=limit
+            )
+        matches = DuplicateDetectionService._matches(
+            'case', {case.pk: minhash.from_bytes(data)}, threshold or DuplicateDetectionService.THRESHOLD
+        )[:limit]
+        return DuplicateDetectionService._cases(matches)
+    
+    @staticmethod
+    def duplicate_evidence(case: Case, threshold: float = None, limit: int = 20) -> list:
+        """
+        Beweismittel anderer Einträge, deren Beschreibung einem Beweismittel dieses Falls ähnelt.
+        
+        Returns:
+            Liste von dicts mit 'evidence', 'duplicate' und 'similarity'
+        """
+        signatures = {
+            object_id: minhash.from_bytes(data)
+            for object_id, data in MinHashSignature.objects.filter(
+                source='evidence', case=case
+            ).values_list('object_id', 'signature')
+        }
+        matches = DuplicateDetectionService._matches(
+            'evidence', signatures, threshold or DuplicateDetectionService.THRESHOLD
+        )[:limit]
+        evidence = Evidence.objects.select_related('case').in_bulk(
+            {object_id for match in matches for object_id in match[:2]}
+        )
+        return [
+            {'evidence': evidence[query_id], 'duplicate': evidence[object_id], 'similarity': similarity}
+            for query_id, object_id, _case_id, similarity in matches
+            if query_id in evidence and object_id in evidence
+        ]
+
+
+class CaseSimilarityService:
+    """
+    Textähnlichkeit von Fällen (Titel, Beschreibung, Zeitachse) über TF-IDF
+    und Kosinus-Ähnlichkeit. Die Top-k-Nachbarn werden im Batch (rebuild)
+    vorberechnet und bei Änderungen eines Falls inkrementell fortgeschrieben;
+    eine Abfrage liest nur die gespeicherten Nachbarn.
+    
+    Gewichte anderer Fälle behalten bei inkrementellen Änderungen ihre idf vom
+    Zeitpunkt der Indizierung - der nächtliche Neuaufbau gleicht das ab.
+    """
+    
+    TOP_K = 20
+    MIN_SCORE = 0.05
+    CANDIDATES = 200
+    # Terme in mehr als 30 % der Fälle tragen kaum zur Unterscheidung bei
+    MAX_DF_RATIO = 0.3
+    MAX_DF_MIN_DOCUMENTS = 50
+    
+    _pending = threading.local()
+    
+    @staticmethod
+    def case_texts(case_ids=None) -> dict:
+        """Text je Fall aus Titel, Beschreibung und Zeitachsen-Einträgen."""
+        cases = Case.objects.all()
+        timeline = Timeline.objects.order_by('case_id', 'datetime', 'id')
+        if case_ids is not None:
+            cases = cases.filter(pk__in=case_ids)
+            timeline = timeline.filter(case_id__in=case_ids)
+        
+        parts = {pk: [title, description] for pk, title, description in
+                 cases.values_list('pk', 'title', 'description').iterator()}
+        for case_id, title, description in timeline.values_list('case_id', 'title', 'description').iterator():
+            if case_id in parts:
+                parts[case_id].extend([title, description])
+        return {pk: '\n'.join(filter(None, texts)) for pk, texts in parts.items()}
+    
+    @staticmethod
+    def idf_map(document_frequencies: dict, documents: int) -> dict:
+        """idf je Term; zu häufige Terme fallen weg."""
+        max_df = documents * CaseSimilarityService.MAX_DF_RATIO
+        limit_df = documents >= CaseSimilarityService.MAX_DF_MIN_DOCUMENTS
         return {
-            'stats': case_stats,
-            'recent_cases': recent_cases,
-            'high_risk_persons': high_risk_persons,
-            'upcoming_investigations': upcoming_investigations,
-            'alerts': alerts,
+            term: tfidf.idf(df, documents)
+            for term, df in document_frequencies.items()
+            if df > 0 and not (limit_df and df > max_df)
         }
+    
+    @staticmethod
+    def _adjust_document_frequency(terms: set, delta: int) -> None:
+        if not terms:
+            return
+        if delta > 0:
+            CaseTermStat.objects.bulk_create(
+                [CaseTermStat(term=term) for term in terms], ignore_conflicts=True
+            )
+            CaseTermStat.objects.filter(term__in=terms).update(count=F('count') + delta)
+        else:
+            CaseTermStat.objects.filter(term__in=terms, count__gte=-delta).update(count=F('count') + delta)
+    
+    @staticmethod
+    def _score(vector: dict, exclude_id: int) -> list:
+        """
+        Kosinus-Ähnlichkeit zu allen Fällen mit gemeinsamen Termen.
+        
+        Returns:
+            Liste (case_id, score) absteigend, höchstens CANDIDATES Einträge
+        """
+        scores = Counter()
+        for case_id, term, weight in CaseTermWeight.objects.filter(
+            term__in=list(vector)
+        ).exclude(case_id=exclude_id).values_list('case_id', 'term', 'weight').iterator():
+            scores[case_id] += weight * vector[term]
+        return [
+            (case_id, score) for case_id, score in scores.most_common(CaseSimilarityService.CANDIDATES)
+            if score > CaseSimilarityService.MIN_SCORE
+        ]
+    
+    @staticmethod
+    def _offer(case_id: int, neighbors: list) -> None:
+        """Trägt den Fall in die Top-k-Listen der Nachbarn ein, wo er hineinpasst."""
+        if not neighbors:
+            return
+        stats = {
+            row['case_id']: row for row in CaseSimilarity.objects.filter(
+                case_id__in=[neighbor for neighbor, _score in neighbors]
+            ).values('case_id').annotate(entries=Count('id'), worst=Min('score'))
+        }
+        rows = []
+        full = []
+        for neighbor, score in neighbors:
+            stat = stats.get(neighbor)
+            if stat is None or stat['entries'] < CaseSimilarityService.TOP_K:
+                rows.append(CaseSimilarity(case_id=neighbor, similar_case_id=case_id, score=score))
+            elif score > stat['worst']:
+                rows.append(CaseSimilarity(case_id=neighbor, similar_case_id=case_id, score=score))
+                full.append(neighbor)
+        CaseSimilarity.objects.bulk_create(rows)
+        for neighbor in full:
+            worst = CaseSimilarity.objects.filter(case_id=neighbor).order_by('score', 'id').values_list(
+                'id', flat=True
+            )[:1]
+            CaseSimilarity.objects.filter(id__in=list(worst)).delete()
+    
+    @staticmethod
+    def index_case(case_id: int) -> bool:
+        """
+        Indiziert einen Fall neu und aktualisiert die Nachbarlisten.
+        
+        Returns:
+            True, wenn sich der Text geändert hat
+        """
+        text = CaseSimilarityService.case_texts([case_id]).get(case_id)
+        if text is None:
+            return False
+        checksum = hashlib.sha256(text.encode()).hexdigest()
+        existing = CaseTextIndex.objects.filter(case_id=case_id).first()
+        if existing and existing.checksum == checksum:
+            return False
+        
+        counts = tfidf.tokenize(text)
+        with transaction.atomic():
+            old_terms = set(existing.terms) if existing else set()
+            CaseSimilarityService._adjust_document_frequency(set(counts) - old_terms, 1)
+            CaseSimilarityService._adjust_document_frequency(old_terms - set(counts), -1)
+            CaseTextIndex.objects.update_or_create(
+                case_id=case_id, defaults={'checksum': checksum, 'terms': dict(counts)}
+            )
+            
+            idf_by_term = CaseSimilarityService.idf_map(
+                dict(CaseTermStat.objects.filter(term__in=list(counts)).values_list('term', 'count')),
+                CaseTextIndex.objects.count(),
+            )
+            vector = tfidf.weigh(counts, idf_by_term)
+            CaseTermWeight.objects.filter(case_id=case_id).delete()
+            CaseTermWeight.objects.bulk_create([
+                CaseTermWeight(case_id=case_id, term=term, weight=weight) for term, weight in vector.items()
+            ])
+            
+            neighbors = CaseSimilarityService._score(vector, case_id)
+            CaseSimilarity.objects.filter(Q(case_id=case_id) | Q(similar_case_id=case_id)).delete()
+            CaseSimilarity.objects.bulk_create([
+                CaseSimilarity(case_id=case_id, similar_case_id=neighbor, score=score)
+                for neighbor, score in neighbors[:CaseSimilarityService.TOP_K]
+            ])
+            CaseSimilarityService._offer(case_id, neighbors)
+        return True
+    
+    @staticmethod
+    def schedule(case_id: int) -> None:
+        """
+        Indiziert den Fall nach dem Commit. Mehrere Änderungen in einer
+        Transaktion (z.B. Fall samt Zeitachse) lösen nur einen Lauf aus.
+        """
+        pending = getattr(CaseSimilarityService._pending, 'case_ids', None)
+        if pending is None:
+            pending = CaseSimilarityService._pending.case_ids = set()
+        pending.add(case_id)
+        transaction.on_commit(CaseSimilarityService._flush)
+    
+    @staticmethod
+    def _flush() -> None:
+        case_ids = getattr(CaseSimilarityService._pending, 'case_ids', None) or set()
+        CaseSimilarityService._pending.case_ids = set()
+        for case_id in sorted(case_ids):
+            CaseSimilarityService.index_case(case_id)
+    
+    @staticmethod
+    def forget_case(case_id: int) -> None:
+        """Nimmt die Terme eines gelöschten Falls aus der Dokumentfrequenz."""
+        terms = CaseTextIndex.objects.filter(case_id=case_id).values_list('terms', flat=True).first()
+        if terms:
+            CaseSimilarityService._adjust_document_frequency(set(terms), -1)
+    
+    @staticmethod
+    def rebuild(top_k: int = None, batch_size: int = 5000) -> dict:
+        """
+        Baut Dokumentfrequenzen, TF-IDF-Matrix und Top-k-Nachbarn aller Fälle neu auf.
+        
+        Returns:
+            dict mit Anzahl Fälle, Terme und Nachbarn
+        """
+        top_k = top_k or CaseSimilarityService.TOP_K
+        texts = CaseSimilarityService.case_texts()
+        case_ids = list(texts)
+        counts = [tfidf.tokenize(texts[case_id]) for case_id in case_ids]
+        document_frequencies = Counter()
+        for case_counts in counts:
+            document_frequencies.update(case_counts.keys())
+        
+        idf_by_term = CaseSimilarityService.idf_map(document_frequencies, len(case_ids))
+        vocabulary = {term: index for index, term in enumerate(idf_by_term)}
+        vectors = [tfidf.weigh(case_counts, idf_by_term) for case_counts in counts]
+        indptr, indices, data = tfidf.build_csr(vectors, vocabulary)
+        neighbors = tfidf.top_k_neighbors(
+            indptr, indices, data, len(vocabulary), top_k, CaseSimilarityService.MIN_SCORE
+        )
+        
+        similarities = 0
+        with transaction.atomic():
+            for model in (CaseSimilarity, CaseTermWeight, CaseTermStat, CaseTextIndex):
+                model.objects.all().delete()
+            
+            CaseTermStat.objects.bulk_create(
+                [CaseTermStat(term=term, count=df) for term, df in document_frequencies.items()],
+                batch_size=batch_size,
+            )
+            CaseTextIndex.objects.bulk_create([
+                CaseTextIndex(
+                    case_id=case_id, checksum=hashlib.sha256(texts[case_id].encode()).hexdigest(),
+                    terms=dict(case_counts),
+                )
+                for case_id, case_counts in zip(case_ids, counts)
+            ], batch_size=batch_size)
+            CaseTermWeight.objects.bulk_create((
+                CaseTermWeight(case_id=case_id, term=term, weight=weight)
+                for case_id, vector in zip(case_ids, vectors) for term, weight in vector.items()
+            ), batch_size=batch_size)
+            
+            rows = []
+            for row, row_neighbors in neighbors:
+                rows.extend(
+                    CaseSimilarity(case_id=case_ids[row], similar_case_id=case_ids[neighbor], score=score)
+                    for neighbor, score in row_neighbors
+                )
+                if len(rows) >= batch_size:
+                    CaseSimilarity.objects.bulk_create(rows)
+                    similarities += len(rows)
+                    rows = []
+            CaseSimilarity.objects.bulk_create(rows)
+            similarities += len(rows)
+        
+        return {'cases': len(case_ids), 'terms': len(vocabulary), 'similarities': similarities}
+    
+    @staticmethod
+    def get_similar_cases(case: Case, limit: int = 5) -> list:
+        """
+        Gespeicherte Nachbarn eines Falls.
+        
+        Returns:
+            Liste von Case-Objekten mit Attribut similarity (absteigend)
+        """
+        rows = CaseSimilarity.objects.filter(case=case).select_related('similar_case').order_by(
+            '-score', 'similar_case_id'
+        )[:limit]
+        result = []
+        for row in rows:
+            row.similar_case.similarity = row.score
+            result.append(row.similar_case)
+        return result
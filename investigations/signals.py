@@ -0,0 +1,164 @@
+# investigations/signals.py
+"""
+Signal-Handler zur inkrementellen Pflege der vorberechneten Rollup-Tabellen
+sowie der Volltext-Extraktion, der Duplikat-Signaturen und der Fall-Ähnlichkeit.
+Bulk-Operationen (bulk_create, queryset.update) lösen keine Signale aus –
+diese gleichen reconcile_rollups, extract_evidence_text,
+rebuild_duplicate_index und rebuild_case_similarity ab.
+"""
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import Case, Evidence, PersonInvolvement, Timeline
+from .services import (
+    TemporalHeatmapService, CaseRollupService, EvidenceTextService, EvidencePreviewService, DuplicateDetectionService,
+    CaseSimilarityService,
+)
+
+
+@receiver(pre_save, sender=Timeline)
+def remember_timeline_cell(sender, instance, raw=False, **kwargs):
+    """Merkt sich die bisherige Heatmap-Zelle eines geänderten Eintrags."""
+    instance._heatmap_old_key = None
+    if raw or not instance.pk:
+        return
+    
+    old = Timeline.objects.filter(pk=instance.pk).values('datetime', 'case__case_type').first()
+    if old:
+        instance._heatmap_old_key = TemporalHeatmapService.cell_key(
+            old['case__case_type'], old['datetime']
+        )
+
+
+@receiver(post_save, sender=Timeline)
+def update_timeline_cell(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    
+    new_key = TemporalHeatmapService.cell_key(instance.case.case_type, instance.datetime)
+    old_key = getattr(instance, '_heatmap_old_key', None)
+    if old_key == new_key:
+        return
+    
+    if old_key:
+        TemporalHeatmapService.apply_delta(old_key, -1)
+    TemporalHeatmapService.apply_delta(new_key, 1)
+
+
+@receiver(post_delete, sender=Timeline)
+def remove_timeline_cell(sender, instance, **kwargs):
+    case_type = Case.objects.filter(pk=instance.case_id).values_list('case_type', flat=True).first()
+    if case_type:
+        TemporalHeatmapService.apply_delta(
+            TemporalHeatmapService.cell_key(case_type, instance.datetime), -1
+        )
+
+
+def _current_case_state(case: Case) -> tuple:
+    city = case.location.city if case.location_id else None
+    return CaseRollupService.case_state(case.incident_date, case.case_type, case.status, city)
+
+
+@receiver(pre_save, sender=Case)
+def remember_case_state(sender, instance, raw=False, **kwargs):
+    """Merkt sich Tatzeitpunkt, Falltyp, Status und Tatort für die Rollup-Pflege."""
+    instance._rollup_old_state = None
+    if raw or not instance.pk:
+        return
+    
+    old = Case.objects.filter(pk=instance.pk).values(
+        'incident_date', 'case_type', 'status', city=F('location__city')
+    ).first()
+    if old:
+        instance._rollup_old_state = CaseRollupService.case_state(**old)
+
+
+@receiver(post_save, sender=Case)
+def update_case_rollups(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    
+    new_state = _current_case_state(instance)
+    old_state = getattr(instance, '_rollup_old_state', None)
+    if old_state == new_state:
+        return
+    
+    if old_state:
+        CaseRollupService.apply_case_delta(old_state, -1)
+    CaseRollupService.apply_case_delta(new_state, 1)
+    
+    # Falltyp-Wechsel verschiebt auch die Timeline im Heatmap-Würfel
+    if old_state and old_state[1] != new_state[1]:
+        TemporalHeatmapService.move_case(instance.pk, old_state[1], new_state[1])
+
+
+@receiver(post_save, sender=Case)
+def index_case_text(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    
+    DuplicateDetectionService.index_case(instance)
+    CaseSimilarityService.schedule(instance.pk)
+
+
+@receiver(pre_delete, sender=Case)
+def forget_case_terms(sender, instance, **kwargs):
+    CaseSimilarityService.forget_case(instance.pk)
+
+
+@receiver(post_save, sender=Timeline)
+@receiver(post_delete, sender=Timeline)
+def reindex_case_text(sender, instance, raw=False, **kwargs):
+    """Zeitachsen-Texte fließen in die Fall-Ähnlichkeit ein."""
+    if raw:
+        return
+    
+    CaseSimilarityService.schedule(instance.case_id)
+
+
+@receiver(post_delete, sender=Case)
+def remove_case_rollups(sender, instance, **kwargs):
+    CaseRollupService.apply_case_delta(_current_case_state(instance), -1)
+
+
+@receiver(pre_save, sender=PersonInvolvement)
+def remember_involvement_person(sender, instance, raw=False, **kwargs):
+    instance._rollup_old_person_id = None
+    if raw or not instance.pk:
+        return
+    
+    instance._rollup_old_person_id = PersonInvolvement.objects.filter(
+        pk=instance.pk
+    ).values_list('person_id', flat=True).first()
+
+
+@receiver(post_save, sender=PersonInvolvement)
+def update_suspect_counter(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    
+    CaseRollupService.refresh_suspect_counter(instance.person_id)
+    old_person_id = getattr(instance, '_rollup_old_person_id', None)
+    if old_person_id and old_person_id != instance.person_id:
+        CaseRollupService.refresh_suspect_counter(old_person_id)
+
+
+@receiver(post_delete, sender=PersonInvolvement)
+def remove_suspect_counter(sender, instance, **kwargs):
+    CaseRollupService.refresh_suspect_counter(instance.person_id)
+
+
+@receiver(post_save, sender=Evidence)
+def index_evidence(sender, instance, raw=False, **kwargs):
+    """Plant Volltext-Extraktion und Vorschau ein und aktualisiert die Duplikat-Signatur."""
+    if raw:
+        return
+    
+    EvidenceTextService.enqueue(instance)
+    EvidencePreviewService.enqueue(instance)
+    DuplicateDetectionService.index_evidence(instance)
+
+
+@receiver(post_delete, sender=Evidence)
+def remove_evidence_signature(sender, instance, **kwargs):
+    DuplicateDetectionService.remove_evidence(instance.pk)
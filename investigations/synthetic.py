@@ -0,0 +1,448 @@
+# investigations/synthetic.py
+"""
+Deterministischer Generator für synthetische Datensätze (Kapazitätsplanung,
+Benchmarks, Tests). Gleicher Seed und gleiche Parameter ergeben dieselben Daten.
+
+Die Verteilungen orientieren sich an realen Ermittlungsdaten:
+- Beziehungsgrade folgen einem Potenzgesetz (wenige stark vernetzte Personen)
+- ein kleiner Täterkreis taucht in vielen Fällen als Verdächtiger auf
+- Zeitachsen-Einträge häufen sich in Schüben um die Tatzeit
+- Tatorte konzentrieren sich auf Brennpunkt-Adressen in wenigen Großstädten
+
+Geschrieben wird per bulk_create in Batches. Signale laufen dabei nicht,
+Rollups und Personen-Suchindex baut generate() am Ende selbst nach.
+"""
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from entities.models import Address, Person, PersonAddress, PersonRelationship, Vehicle
+from entities.services import PersonSearchService, VehicleSearchService
+from .models import Case, PersonInvolvement, Timeline
+from .services import CaseRollupService, TemporalHeatmapService
+
+
+# (Stadt, PLZ-Präfix, Kennzeichen, Breitengrad, Längengrad, Einwohner in 10.000)
+CITIES = [
+    ('Berlin', '10', 'B', 52.5200, 13.4050, 366),
+    ('Hamburg', '20', 'HH', 53.5511, 9.9937, 185),
+    ('München', '80', 'M', 48.1351, 11.5820, 151),
+    ('Köln', '50', 'K', 50.9375, 6.9603, 108),
+    ('Frankfurt', '60', 'F', 50.1109, 8.6821, 77),
+    ('Stuttgart', '70', 'S', 48.7758, 9.1829, 63),
+    ('Düsseldorf', '40', 'D', 51.2277, 6.7735, 62),
+    ('Leipzig', '04', 'L', 51.3397, 12.3731, 60),
+    ('Dortmund', '44', 'DO', 51.5136, 7.4653, 59),
+    ('Essen', '45', 'E', 51.4556, 7.0116, 58),
+    ('Bremen', '28', 'HB', 53.0793, 8.8017, 57),
+    ('Dresden', '01', 'DD', 51.0504, 13.7373, 56),
+]
+
+STREETS = [
+    'Hauptstraße', 'Schulstraße', 'Gartenstraße', 'Bahnhofstraße', 'Dorfstraße', 'Bergstraße',
+    'Birkenweg', 'Lindenstraße', 'Kirchstraße', 'Waldstraße', 'Ringstraße', 'Schillerstraße',
+    'Goethestraße', 'Am Markt', 'Friedhofstraße', 'Mühlenweg', 'Jahnstraße', 'Rosenstraße',
+    'Industriestraße', 'Hafenstraße', 'Parkstraße', 'Lessingstraße', 'Wiesenweg', 'Feldstraße',
+]
+
+# Absteigend nach Häufigkeit, gewichtet per Zipf-Verteilung
+FIRST_NAMES = [
+    'Thomas', 'Michael', 'Andreas', 'Stefan', 'Peter', 'Christian', 'Frank', 'Markus', 'Sabine',
+    'Anna', 'Julia', 'Maria', 'Katrin', 'Jan', 'Daniel', 'Tobias', 'Sandra', 'Claudia', 'Lisa',
+    'Laura', 'Sarah', 'Jörg', 'Uwe', 'Klaus', 'Jürgen', 'Petra', 'Monika', 'Lukas', 'Leon',
+    'Max', 'Paul', 'Felix', 'Emma', 'Mia', 'Hannah', 'Sophie', 'Mehmet', 'Ali', 'Ayse',
+    'Fatma', 'Piotr', 'Anna-Lena', 'Karl-Heinz', 'Hans-Peter', 'Nicole', 'Melanie', 'Dennis',
+    'Kevin', 'Sven', 'Ralf', 'Heike', 'Birgit', 'Dirk', 'Holger', 'Ole', 'Finn', 'Jonas',
+]
+LAST_NAMES = [
+    'Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker', 'Schulz',
+    'Hoffmann', 'Schäfer', 'Koch', 'Bauer', 'Richter', 'Klein', 'Wolf', 'Schröder', 'Neumann',
+    'Schwarz', 'Zimmermann', 'Braun', 'Krüger', 'Hofmann', 'Hartmann', 'Lange', 'Schmitt',
+    'Werner', 'Schmitz', 'Krause', 'Meier', 'Lehmann', 'Schmid', 'Schulze', 'Maier', 'Köhler',
+    'Herrmann', 'König', 'Walter', 'Mayer', 'Huber', 'Kaiser', 'Fuchs', 'Peters', 'Lang',
+    'Scholz', 'Möller', 'Weiß', 'Jung', 'Hahn', 'Schubert', 'Vogel', 'Friedrich', 'Keller',
+    'Günther', 'Frank', 'Berger', 'Winkler', 'Roth', 'Beck', 'Lorenz', 'Baumann', 'Franke',
+    'Albrecht', 'Schuster', 'Simon', 'Ludwig', 'Böhm', 'Winter', 'Kraus', 'Martin', 'Schumacher',
+    'Yilmaz', 'Kaya', 'Demir', 'Nowak', 'Kowalski', 'Popescu', 'Ivanov', 'Rossi', 'Nguyen',
+]
+ALIASES = ['Der Boss', 'Kalle', 'Tommy', 'Blacky', 'Dr. No', 'Mecki', 'Hacki', 'Bubi', 'Ede', 'Charly']
+
+RELATIONSHIP_TYPES = [
+    ('associate', 0.30), ('friend', 0.22), ('family', 0.18), ('colleague', 0.12),
+    ('neighbor', 0.08), ('suspect', 0.05), ('other', 0.05),
+]
+CASE_TYPES = [
+    ('theft', 0.34), ('fraud', 0.20), ('assault', 0.14), ('drug', 0.10),
+    ('traffic', 0.12), ('domestic', 0.06), ('other', 0.04),
+]
+PRIORITIES = [('low', 0.35), ('medium', 0.40), ('high', 0.18), ('urgent', 0.07)]
+VEHICLES = [
+    ('car', 'VW', 'Golf'), ('car', 'VW', 'Passat'), ('car', 'BMW', '3er'), ('car', 'Mercedes', 'C-Klasse'),
+    ('car', 'Audi', 'A4'), ('car', 'Opel', 'Astra'), ('car', 'Ford', 'Focus'), ('car', 'Skoda', 'Octavia'),
+    ('motorcycle', 'Yamaha', 'MT-07'), ('truck', 'MAN', 'TGX'),
+]
+COLORS = ['Schwarz', 'Silber', 'Weiß', 'Grau', 'Blau', 'Rot']
+
+CASE_TITLES = {
+    'theft': ['Einbruch', 'Ladendiebstahl', 'Fahrraddiebstahl', 'Autodiebstahl', 'Taschendiebstahl'],
+    'fraud': ['Onlinebetrug', 'Enkeltrick', 'Kreditkartenbetrug', 'Anlagebetrug', 'Phishing'],
+    'assault': ['Körperverletzung', 'Schlägerei', 'Raubüberfall', 'Bedrohung'],
+    'drug': ['Drogenhandel', 'Cannabis-Plantage', 'Drogenlabor', 'Kokain-Schmuggel'],
+    'traffic': ['Unfallflucht', 'Trunkenheitsfahrt', 'Illegales Rennen', 'Fahren ohne Fahrerlaubnis'],
+    'domestic': ['Häusliche Gewalt', 'Stalking', 'Nötigung'],
+    'other': ['Sachbeschädigung', 'Urkundenfälschung', 'Cybercrime', 'Geldwäsche'],
+}
+CASE_DETAILS = {
+    'theft': ['Fenster aufgehebelt', 'Schmuck und Bargeld entwendet', 'Tür aufgebrochen',
+              'Elektronikartikel gestohlen', 'Täter flüchtete zu Fuß', 'Fahrzeug aus Tiefgarage entwendet'],
+    'fraud': ['Zahlung per Vorkasse', 'gefälschte Kleinanzeige', 'Anruf eines falschen Polizisten',
+              'Kontodaten abgegriffen', 'Schaden im fünfstelligen Bereich', 'Überweisung ins Ausland'],
+    'assault': ['Opfer leicht verletzt', 'Streit eskalierte vor einer Gaststätte', 'Täter bewaffnet',
+                'Zeugen alarmierten die Polizei', 'Opfer im Krankenhaus behandelt'],
+    'drug': ['Betäubungsmittel sichergestellt', 'Verkauf an Jugendliche', 'Indoor-Anlage entdeckt',
+             'Bargeld in Kleinstückelung', 'Kurierfahrten beobachtet'],
+    'traffic': ['Fahrer flüchtete', 'Blutprobe angeordnet', 'hohe Geschwindigkeit', 'Sachschaden am Fahrzeug',
+                'Kennzeichen teilweise abgelesen'],
+    'domestic': ['wiederholte Vorfälle', 'Kontaktverbot missachtet', 'Kinder im Haushalt',
+                 'Nachbarn hörten Schreie'],
+    'other': ['Graffiti an Hauswand', 'gefälschte Dokumente vorgelegt', 'Server kompromittiert',
+              'Bargeld über Strohleute verschoben'],
+}
+TIMELINE_TITLES = [
+    'Notruf eingegangen', 'Streife am Tatort', 'Spurensicherung', 'Zeugenbefragung', 'Anzeige aufgenommen',
+    'Fahndung eingeleitet', 'Vernehmung', 'Durchsuchung', 'Auswertung Videomaterial', 'Abgabe an StA',
+]
+
+
+def weighted(items: list) -> tuple:
+    """[(Wert, Gewicht), ...] -> (Werte, normierte Wahrscheinlichkeiten)."""
+    weights = np.array([weight for _, weight in items], dtype=np.float64)
+    return [value for value, _ in items], weights / weights.sum()
+
+
+def zipf_weights(n: int, exponent: float) -> np.ndarray:
+    """Wahrscheinlichkeiten ~ 1/Rang^exponent (wenige sehr häufige Werte)."""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -exponent
+    return weights / weights.sum()
+
+
+def power_law_degrees(rng, n: int, exponent: float = 2.5, maximum: int = None) -> np.ndarray:
+    """
+    Grade >= 1 mit P(k) ~ k^-exponent (diskretisierte Pareto-Verteilung per Inversion).
+    """
+    degrees = np.floor((1 - rng.random(n)) ** (-1 / (exponent - 1))).astype(np.int64)
+    return np.minimum(degrees, maximum or max(n - 1, 1))
+
+
+def configuration_edges(rng, degrees) -> np.ndarray:
+    """
+    Zufällige ungerichtete Kanten mit vorgegebenen Graden (Configuration Model).
+    Schleifen und Mehrfachkanten entfallen; Ergebnis: Array (m, 2) mit a < b.
+    """
+    stubs = np.repeat(np.arange(len(degrees)), degrees)
+    rng.shuffle(stubs)
+    edges = stubs[:len(stubs) - len(stubs) % 2].reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges.sort(axis=1)
+    return np.unique(edges, axis=0)
+
+
+class SyntheticDataGenerator:
+    """
+    Erzeugt Adressen, Personen, Fahrzeuge, Beziehungen, Fälle, Beteiligungen
+    und Zeitachsen. Personen erhalten die externe ID "<prefix>-<n>", Fälle das
+    Aktenzeichen "<prefix>-<Jahr>-<n>" - so lassen sich die Daten wiederfinden.
+    """
+
+    REFERENCE_DATE = date(2024, 12, 31)  # fest, damit die Daten reproduzierbar sind
+    YEARS = 3
+    PERSONS_PER_ADDRESS = 20
+    PERSONS_PER_VEHICLE = 10
+    CONNECTED_RATIO = 0.6  # Anteil Personen mit mindestens einer Beziehung
+    DEGREE_EXPONENT = 2.3
+    SUSPECT_POOL_RATIO = 0.05  # Täterkreis für Wiederholungstäter
+    REPEAT_SUSPECT_RATIO = 0.7  # Anteil Verdächtiger aus dem Täterkreis
+    BURST_RATIO = 0.75  # Anteil Zeitachsen-Einträge im Schub um die Tatzeit
+
+    def __init__(self, persons: int = 10_000, cases: int = 1_000, seed: int = 42, batch_size: int = 5000,
+                 prefix: str = 'SYN', user=None, index: bool = True, progress=None):
+        self.persons = persons
+        self.cases = cases
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.user = user
+        self.index = index
+        self.progress = progress
+        self.rng = np.random.default_rng(seed)
+        self.tz = timezone.get_default_timezone()
+
+    def _report(self, step: str, count: int) -> None:
+        if self.progress:
+            self.progress(step, count)
+
+    def _bulk_create(self, model, objects, **kwargs) -> list:
+        created = []
+        for start in range(0, len(objects), self.batch_size):
+            created.extend(model.objects.bulk_create(objects[start:start + self.batch_size], **kwargs))
+        return created
+
+    def _moment(self, day: date, minutes: int) -> datetime:
+        return datetime.combine(day, time(), tzinfo=self.tz) + timedelta(minutes=int(minutes))
+
+    @transaction.atomic
+    def generate(self) -> dict:
+        """
+        Returns:
+            dict mit der Anzahl erzeugter Zeilen je Tabelle
+        """
+        stats = {}
+        address_ids = self._addresses(stats)
+        person_ids = self._persons(address_ids, stats)
+        self._vehicles(person_ids, stats)
+        self._relationships(person_ids, stats)
+        case_ids, case_locations, case_moments = self._cases(address_ids, stats)
+        first_persons = self._involvements(person_ids, case_ids, stats)
+        self._timeline(case_ids, case_locations, case_moments, first_persons, stats)
+        self._rebuild_derived(stats)
+        return stats
+
+    def _addresses(self, stats: dict) -> np.ndarray:
+        rng = self.rng
+        n = max(10, self.persons // self.PERSONS_PER_ADDRESS)
+        population = np.array([city[5] for city in CITIES], dtype=np.float64)
+        cities = rng.choice(len(CITIES), n, p=population / population.sum())
+        # Um das Stadtzentrum gestreut (ca. 5 km Standardabweichung)
+        offsets = rng.normal(0, 0.045, (n, 2))
+        streets = rng.integers(0, len(STREETS), n)
+        numbers = rng.integers(1, 150, n)
+        postal = rng.integers(0, 1000, n)
+
+        addresses = []
+        for i in range(n):
+            city, prefix, _, lat, lon, _ = CITIES[cities[i]]
+            address = Address(
+                street=STREETS[streets[i]], house_number=str(numbers[i]), postal_code=f'{prefix}{postal[i]:03d}',
+                city=city, latitude=round(lat + offsets[i, 0], 6), longitude=round(lon + offsets[i, 1], 6),
+            )
+            address.update_search_keys()
+            addresses.append(address)
+        ids = np.array([address.pk for address in self._bulk_create(Address, addresses)], dtype=np.int64)
+        stats['addresses'] = len(ids)
+        self._report('addresses', len(ids))
+        return ids
+
+    def _persons(self, address_ids: np.ndarray, stats: dict) -> np.ndarray:
+        rng = self.rng
+        n = self.persons
+        first = rng.choice(len(FIRST_NAMES), n, p=zipf_weights(len(FIRST_NAMES), 0.7))
+        last = rng.choice(len(LAST_NAMES), n, p=zipf_weights(len(LAST_NAMES), 0.8))
+        ages = rng.integers(17 * 365, 82 * 365, n)
+        risk = rng.choice(5, n, p=[0.55, 0.2, 0.13, 0.08, 0.04])
+        id_numbers = np.where(rng.random(n) < 0.6, rng.integers(10 ** 8, 10 ** 9, n), 0)
+        aliases = np.where(rng.random(n) < 0.05, rng.integers(0, len(ALIASES), n), -1)
+        homes = address_ids[rng.integers(0, len(address_ids), n)]
+        moved_in = rng.integers(0, 20 * 365, n)
+
+        ids = []
+        for start in range(0, n, self.batch_size):
+            persons = []
+            for i in range(start, min(start + self.batch_size, n)):
+                person = Person(
+                    first_name=FIRST_NAMES[first[i]], last_name=LAST_NAMES[last[i]],
+                    birth_date=self.REFERENCE_DATE - timedelta(days=int(ages[i])),
+                    id_number=f'L{id_numbers[i]}' if id_numbers[i] else None,
+                    known_aliases=ALIASES[aliases[i]] if aliases[i] >= 0 else '',
+                    risk_level=int(risk[i]), external_id=f'{self.prefix}-{i}', created_by=self.user,
+                )
+                person.update_search_keys()
+                persons.append(person)
+            created = [person.pk for person in Person.objects.bulk_create(persons)]
+            PersonAddress.objects.bulk_create([
+                PersonAddress(
+                    person_id=person_id, address_id=int(homes[start + offset]), address_type='primary',
+                    start_date=self.REFERENCE_DATE - timedelta(days=int(moved_in[start + offset])),
+                )
+                for offset, person_id in enumerate(created)
+            ])
+            ids.extend(created)
+            self._report('persons', len(ids))
+        stats['persons'] = len(ids)
+        return np.array(ids, dtype=np.int64)
+
+    def _vehicles(self, person_ids: np.ndarray, stats: dict) -> None:
+        rng = self.rng
+        n = len(person_ids) // self.PERSONS_PER_VEHICLE
+        owners = person_ids[rng.integers(0, len(person_ids), n)]
+        cities = rng.integers(0, len(CITIES), n)
+        models = rng.integers(0, len(VEHICLES), n)
+        colors = rng.integers(0, len(COLORS), n)
+        years = rng.integers(2000, self.REFERENCE_DATE.year + 1, n)
+
+        vehicles = []
+        for i in range(n):
+            # Buchstaben/Ziffern aus der laufenden Nummer: eindeutig bis 6,7 Mio. Fahrzeuge
+            serial, number = divmod(i, 9999)
+            letters = chr(65 + serial // 26 % 26) + chr(65 + serial % 26)
+            vehicle_type, make, model = VEHICLES[models[i]]
+            vehicle = Vehicle(
+                license_plate=f'{CITIES[cities[i]][2]}-{letters} {number + 1}', vehicle_type=vehicle_type,
+                make=make, model=model, year=int(years[i]), color=COLORS[colors[i]], owner_id=int(owners[i]),
+            )
+            vehicle.update_search_keys()
+            vehicles.append(vehicle)
+        self._bulk_create(Vehicle, vehicles, ignore_conflicts=True)
+        stats['vehicles'] = n
+        self._report('vehicles', n)
+
+    def _relationships(self, person_ids: np.ndarray, stats: dict) -> None:
+        rng = self.rng
+        connected = np.flatnonzero(rng.random(len(person_ids)) < self.CONNECTED_RATIO)
+        degrees = power_law_degrees(rng, len(connected), self.DEGREE_EXPONENT, maximum=1000)
+        edges = connected[configuration_edges(rng, degrees)]
+        # Kantenreihenfolge mischen, sonst liegen Beziehungen nach Person sortiert vor
+        edges = edges[rng.permutation(len(edges))]
+        types, probabilities = weighted(RELATIONSHIP_TYPES)
+        kinds = rng.choice(len(types), len(edges), p=probabilities)
+        strengths = rng.integers(1, 6, len(edges))
+
+        relationships = [
+            PersonRelationship(
+                person1_id=int(person_ids[a]), person2_id=int(person_ids[b]), relationship_type=types[kind],
+                strength=int(strength), created_by=self.user,
+            )
+            for (a, b), kind, strength in zip(edges, kinds, strengths)
+        ]
+        self._bulk_create(PersonRelationship, relationships)
+        stats['relationships'] = len(relationships)
+        self._report('relationships', len(relationships))
+
+    def _cases(self, address_ids: np.ndarray, stats: dict) -> tuple:
+        rng = self.rng
+        n = self.cases
+        span = self.YEARS * 365
+        days = np.sort(rng.integers(0, span, n))
+        # Tageszeit: Häufung am Abend, wenig in den frühen Morgenstunden
+        hour_weights = np.array([3, 2, 2, 1, 1, 1, 2, 3, 4, 4, 4, 5, 5, 5, 5, 6, 6, 7, 8, 8, 8, 7, 6, 4],
+                                dtype=np.float64)
+        minutes = rng.choice(24, n, p=hour_weights / hour_weights.sum()) * 60 + rng.integers(0, 60, n)
+        types, probabilities = weighted(CASE_TYPES)
+        kinds = rng.choice(len(types), n, p=probabilities)
+        priorities, priority_probabilities = weighted(PRIORITIES)
+        priority = rng.choice(len(priorities), n, p=priority_probabilities)
+        # Brennpunkte: Tatorte Zipf-verteilt über zufällig gereihte Adressen
+        hotspots = rng.permutation(address_ids)
+        locations = hotspots[rng.choice(len(hotspots), n, p=zipf_weights(len(hotspots), 0.9))]
+        status_draw = rng.random(n)
+        title_draw = rng.integers(0, 1000, (n, 3))
+        first_day = self.REFERENCE_DATE - timedelta(days=span)
+        streets = dict(Address.objects.filter(id__in=address_ids.tolist()).values_list('id', 'street'))
+
+        case_ids, moments = [], []
+        for start in range(0, n, self.batch_size):
+            cases = []
+            for i in range(start, min(start + self.batch_size, n)):
+                case_type = types[kinds[i]]
+                day = first_day + timedelta(days=int(days[i]))
+                age = (span - days[i]) / span  # 0 = jüngster, 1 = ältester Fall
+                if status_draw[i] < 0.15 + 0.75 * age:
+                    status = 'closed'
+                elif status_draw[i] < 0.2 + 0.75 * age:
+                    status = 'suspended'
+                else:
+                    status = 'in_progress' if status_draw[i] < 0.6 + 0.4 * age else 'open'
+                title = CASE_TITLES[case_type][title_draw[i, 0] % len(CASE_TITLES[case_type])]
+                details = CASE_DETAILS[case_type]
+                description = '. '.join(
+                    [f'{title} {streets[int(locations[i])]}'] + sorted({
+                        details[title_draw[i, 1] % len(details)], details[title_draw[i, 2] % len(details)]
+                    })
+                ) + '.'
+                moment = self._moment(day, minutes[i])
+                moments.append(moment)
+                cases.append(Case(
+                    case_number=f'{self.prefix}-{day.year}-{i:07d}', title=f'{title} {streets[int(locations[i])]}',
+                    description=description, case_type=case_type, status=status, priority=priorities[priority[i]],
+                    incident_date=moment, location_id=int(locations[i]), created_by=self.user,
+                ))
+            case_ids.extend(case.pk for case in Case.objects.bulk_create(cases))
+            self._report('cases', len(case_ids))
+        stats['cases'] = len(case_ids)
+        return np.array(case_ids, dtype=np.int64), locations, moments
+
+    def _involvements(self, person_ids: np.ndarray, case_ids: np.ndarray, stats: dict) -> list:
+        rng = self.rng
+        n = len(case_ids)
+        pool = rng.choice(person_ids, max(1, int(len(person_ids) * self.SUSPECT_POOL_RATIO)), replace=False)
+        pool_weights = zipf_weights(len(pool), 0.5)
+        sizes = np.minimum(1 + rng.poisson(1.2, n), 6)
+        total = int(sizes.sum())
+        repeat = rng.random(n) < self.REPEAT_SUSPECT_RATIO
+        suspects = pool[rng.choice(len(pool), n, p=pool_weights)]
+        lead_is_suspect = rng.random(n) < 0.6
+        others = person_ids[rng.integers(0, len(person_ids), total)]
+        roles = rng.choice(['victim', 'witness', 'informant', 'other'], total, p=[0.35, 0.5, 0.05, 0.1])
+        credibility = rng.integers(1, 6, total)
+
+        involvements, first_persons = [], []
+        position = 0
+        for i in range(n):
+            seen = set()
+            for slot in range(sizes[i]):
+                if slot == 0:
+                    role = 'suspect' if lead_is_suspect[i] else 'victim'
+                    person_id = suspects[i] if role == 'suspect' and repeat[i] else others[position]
+                    first_persons.append(int(person_id))
+                else:
+                    role, person_id = roles[position], others[position]
+                key = (int(person_id), str(role))
+                if key not in seen:
+                    seen.add(key)
+                    involvements.append(PersonInvolvement(
+                        person_id=key[0], case_id=int(case_ids[i]), involvement_type=key[1],
+                        credibility=int(credibility[position]), created_by=self.user,
+                    ))
+                position += 1
+        self._bulk_create(PersonInvolvement, involvements)
+        stats['involvements'] = len(involvements)
+        self._report('involvements', len(involvements))
+        return first_persons
+
+    def _timeline(self, case_ids: np.ndarray, locations: np.ndarray, moments: list, first_persons: list,
+                  stats: dict) -> None:
+        rng = self.rng
+        n = len(case_ids)
+        sizes = np.minimum(rng.geometric(0.35, n), 12)
+        total = int(sizes.sum())
+        # Schub: Minuten bis Stunden nach der Tat; sonst Folgeermittlungen über Wochen
+        offsets = np.where(
+            rng.random(total) < self.BURST_RATIO,
+            rng.exponential(180, total), rng.exponential(14 * 24 * 60, total),
+        ).astype(np.int64)
+        titles = rng.integers(0, len(TIMELINE_TITLES), total)
+        with_person = rng.random(total) < 0.4
+
+        entries = []
+        position = 0
+        for i in range(n):
+            for offset in np.sort(offsets[position:position + sizes[i]]):
+                entries.append(Timeline(
+                    case_id=int(case_ids[i]), datetime=moments[i] + timedelta(minutes=int(offset)),
+                    title=TIMELINE_TITLES[titles[position]], description='Synthetischer Eintrag',
+                    related_person_id=first_persons[i] if with_person[position] else None,
+                    related_location_id=int(locations[i]), created_by=self.user,
+                ))
+                position += 1
+        self._bulk_create(Timeline, entries)
+        stats['timeline'] = len(entries)
+        self._report('timeline', len(entries))
+
+    def _rebuild_derived(self, stats: dict) -> None:
+        TemporalHeatmapService.rebuild()
+        CaseRollupService.rebuild()
+        self._report('rollups', 1)
+        if self.index:
+            stats['search_index'] = sum(PersonSearchService.index_missing(self.batch_size).values())
+            stats['search_index'] += VehicleSearchService.index_missing(self.batch_size)
+            self._report('search_index', stats['search_index'])
@@ -2,15 +2,37 @@
 """
 Unit- und Integration-Tests für die investigations App.
 """
-from django.test import TestCase, Client
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import Counter
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import Case, PersonInvolvement, Evidence, Timeline
-from .services import CaseAnalysisService, TimelineAnalysisService, DashboardService
-from entities.models import Person
+from .models import (
+    Case, PersonInvolvement, Evidence, EvidencePreview, EvidenceText, Investigation, Timeline, TimelineHeatmapCell,
+    SuspectCaseCounter, MinHashSignature, MinHashBucket, CaseTermStat, CaseSimilarity, CaseDailyStat, CaseMonthlyStat
+)
+from .services import (
+    CaseAnalysisService, TimelineAnalysisService, TemporalHeatmapService,
+    PersonActivityService, TrendAnomalyService, DashboardService, AutocompleteService,
+    EvidenceTextService, DuplicateDetectionService, CaseSimilarityService, EvidenceUploadService,
+    EvidencePreviewService, UploadOffsetMismatch
+)
+from . import dossier, export, minhash, synthetic, tfidf
+from .extraction import extract_text, UnsupportedFormat
+from entities.models import Person, Address, Vehicle, PersonRelationship, PersonAlias
+import numpy as np
 
 
 class CaseModelTest(TestCase):
@@ -133,6 +155,14 @@ class CaseAnalysisServiceTest(TestCase):
         """Testet Zählung dringender Fälle."""
         stats = CaseAnalysisService.get_case_statistics()
         self.assertEqual(stats['urgent_count'], 1)
+    
+    def test_undated_rollup_rows_are_unique(self):
+        """Fälle ohne Tatzeitpunkt teilen sich je Falltyp und Status eine Rollup-Zeile."""
+        self.assertEqual(CaseDailyStat.objects.get(day=None, case_type='theft', status='open').count, 2)
+        self.assertEqual(CaseMonthlyStat.objects.get(month=None, case_type='theft', status='open').count, 2)
+        for model in (CaseDailyStat, CaseMonthlyStat):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                model.objects.create(case_type='theft', status='open', count=1)
 
 
 class TimelineAnalysisServiceTest(TestCase):
@@ -186,6 +216,1029 @@ class TimelineAnalysisServiceTest(TestCase):
         gaps = TimelineAnalysisService.get_timeline_gaps(self.case, threshold_hours=24)
         self.assertEqual(len(gaps), 1)
         self.assertGreater(gaps[0]['duration_hours'], 24)
+    
+    def test_get_timeline_gaps_bulk_across_cases(self):
+        """Testet die fallübergreifende Lücken-Erkennung per Window-Funktion."""
+        other_case = Case.objects.create(
+            case_number='2024-TEST-002',
+            title='Other Case',
+            description='Description',
+            case_type='fraud',
+            created_by=self.user
+        )
+        now = timezone.now()
+        for case, offsets in ((self.case, [0, 2, 50]), (other_case, [0, 100])):
+            for hours in offsets:
+                Timeline.objects.create(
+                    case=case,
+                    datetime=now + timedelta(hours=hours),
+                    title=f'Event {hours}',
+                    description='Description',
+                    created_by=self.user
+                )
+        
+        gaps = list(TimelineAnalysisService.get_timeline_gaps_bulk(threshold_hours=24))
+        self.assertEqual(len(gaps), 2)
+        # Größte Lücke zuerst
+        self.assertEqual(gaps[0]['case_id'], other_case.id)
+        self.assertEqual(gaps[0]['gap'], timedelta(hours=100))
+        self.assertEqual(gaps[1]['before_event'], 'Event 2')
+        self.assertEqual(gaps[1]['after_event'], 'Event 50')
+        
+        only_first = TimelineAnalysisService.get_timeline_gaps_bulk(case_ids=[self.case.id])
+        self.assertEqual(only_first.count(), 1)
+
+
+class TemporalHeatmapServiceTest(TestCase):
+    """Tests für den vorberechneten Heatmap-Würfel."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.case = Case.objects.create(
+            case_number='2024-TEST-001',
+            title='Test Case',
+            description='Description',
+            case_type='theft',
+            created_by=self.user
+        )
+        # Sonntag, 14:00 Uhr lokale Zeit
+        self.moment = timezone.make_aware(timezone.datetime(2024, 3, 10, 14, 30))
+        self.entry = Timeline.objects.create(
+            case=self.case,
+            datetime=self.moment,
+            title='Event',
+            description='Description',
+            created_by=self.user
+        )
+    
+    def _cells(self):
+        return set(TimelineHeatmapCell.objects.filter(count__gt=0).values_list(
+            'case_type', 'month', 'weekday', 'hour', 'count'
+        ))
+    
+    def test_cell_updated_on_create(self):
+        """Testet die inkrementelle Fortschreibung beim Anlegen."""
+        heatmap = TemporalHeatmapService.get_heatmap()
+        self.assertEqual(heatmap['total'], 1)
+        self.assertEqual(heatmap['matrix'][0][14], 1)
+        self.assertEqual(heatmap['peak_weekday'], 1)
+    
+    def test_cell_moved_on_update_and_delete(self):
+        """Testet Verschieben und Entfernen von Zellen."""
+        self.entry.datetime = self.moment + timedelta(hours=3)
+        self.entry.save()
+        heatmap = TemporalHeatmapService.get_heatmap()
+        self.assertEqual(heatmap['by_hour'], {17: 1})
+        
+        self.entry.delete()
+        self.assertEqual(TemporalHeatmapService.get_heatmap()['total'], 0)
+    
+    def test_case_type_change_and_slices(self):
+        """Testet Falltyp-Wechsel und Slices nach Typ und Zeitraum."""
+        self.case.case_type = 'fraud'
+        self.case.save()
+        
+        self.assertEqual(TemporalHeatmapService.get_heatmap(case_types=['theft'])['total'], 0)
+        self.assertEqual(TemporalHeatmapService.get_heatmap(case_types=['fraud', 'drug'])['total'], 1)
+        self.assertEqual(
+            TemporalHeatmapService.get_heatmap(start_month=timezone.datetime(2024, 4, 1).date())['total'], 0
+        )
+    
+    def test_incremental_matches_rebuild(self):
+        """Testet, dass inkrementelle Pflege und Neuaufbau übereinstimmen."""
+        other = Case.objects.create(
+            case_number='2024-TEST-002',
+            title='Other',
+            description='Description',
+            case_type='drug',
+            created_by=self.user
+        )
+        for i in range(5):
+            Timeline.objects.create(
+                case=other,
+                datetime=self.moment + timedelta(hours=i * 7),
+                title=f'Event {i}',
+                description='Description',
+                created_by=self.user
+            )
+        other.delete()
+        incremental = self._cells()
+        
+        TemporalHeatmapService.rebuild()
+        self.assertEqual(incremental, self._cells())
+    
+    def test_detect_temporal_patterns(self):
+        """Testet die Mustererkennung auf Basis des Würfels."""
+        patterns = TimelineAnalysisService.detect_temporal_patterns(case_type='theft')
+        self.assertEqual(patterns['peak_hour'], 14)
+        self.assertEqual(patterns['by_weekday'], {1: 1})
+
+
+class PersonActivityServiceTest(TestCase):
+    """Tests für den Aktivitäts-Stream (k-Wege-Merge mit Keyset-Pagination)."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.person = Person.objects.create(
+            first_name='Test', last_name='Person', created_by=self.user
+        )
+        self.case = Case.objects.create(
+            case_number='2024-TEST-001',
+            title='Test Case',
+            description='Description',
+            case_type='theft',
+            created_by=self.user
+        )
+        PersonInvolvement.objects.create(
+            person=self.person, case=self.case, involvement_type='suspect', created_by=self.user
+        )
+        self.base = timezone.now() - timedelta(days=30)
+        for i in range(5):
+            Timeline.objects.create(
+                case=self.case,
+                datetime=self.base + timedelta(days=i * 2),
+                title=f'Event {i}',
+                description='Description',
+                related_person=self.person,
+                created_by=self.user
+            )
+        for i in range(3):
+            Evidence.objects.create(
+                case=self.case,
+                evidence_number=f'B-{i}',
+                title=f'Beweis {i}',
+                description='Description',
+                evidence_type='photo',
+                # Gleicher Zeitstempel wie ein Timeline-Eintrag (Tie-Breaker)
+                collected_date=self.base + timedelta(days=i * 4),
+            )
+        investigation = Investigation.objects.create(
+            case=self.case,
+            title='Vernehmung',
+            description='Description',
+            investigation_type='interview',
+            planned_date=self.base + timedelta(days=3),
+        )
+        investigation.target_persons.add(self.person)
+    
+    def test_stream_is_chronological_and_complete(self):
+        """Testet Vollständigkeit und Reihenfolge über alle Quellen."""
+        page = PersonActivityService.get_activity_stream(self.person.id, limit=100)
+        events = page['events']
+        
+        self.assertIsNone(page['next_cursor'])
+        self.assertEqual(len(events), 10)
+        self.assertEqual(
+            {e['source'] for e in events},
+            {'timeline', 'involvement', 'investigation', 'evidence'}
+        )
+        timestamps = [e['timestamp'] for e in events]
+        self.assertEqual(timestamps, sorted(timestamps))
+    
+    def test_keyset_pagination_matches_single_page(self):
+        """Testet, dass seitenweises Laden dieselbe Folge liefert."""
+        expected = PersonActivityService.get_activity_stream(self.person.id, limit=100)['events']
+        
+        collected, cursor = [], None
+        while True:
+            page = PersonActivityService.get_activity_stream(self.person.id, cursor=cursor, limit=3)
+            collected.extend(page['events'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        
+        self.assertEqual(
+            [(e['source'], e['id']) for e in collected],
+            [(e['source'], e['id']) for e in expected]
+        )
+    
+    def test_invalid_cursor(self):
+        """Testet die Ablehnung ungültiger Cursor."""
+        with self.assertRaises(ValueError):
+            PersonActivityService.get_activity_stream(self.person.id, cursor='kaputt')
+
+
+class TrendAnomalyServiceTest(TestCase):
+    """Tests für die vektorisierte Anomalie-Erkennung."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.address = Address.objects.create(street='Hauptstraße', city='Berlin')
+        self.today = timezone.datetime(2024, 6, 12).date()  # Mittwoch
+    
+    def _create_cases(self, weeks_ago: int, count: int):
+        for i in range(count):
+            Case.objects.create(
+                case_number=f'2024-W{weeks_ago:02d}-{i:03d}',
+                title='Case',
+                description='Description',
+                case_type='theft',
+                location=self.address,
+                incident_date=timezone.make_aware(
+                    timezone.datetime.combine(self.today - timedelta(weeks=weeks_ago), timezone.datetime.min.time())
+                    + timedelta(hours=12)
+                ),
+                created_by=self.user
+            )
+    
+    def test_rolling_zscores(self):
+        """Testet den z-Score gegen das vorangehende Fenster."""
+        counts = np.array([
+            [2, 2, 2, 2, 10],
+            [1, 3, 1, 3, 2],
+        ])
+        zscores = TrendAnomalyService.rolling_zscores(counts, window=4)
+        
+        self.assertTrue(np.isnan(zscores[:, :4]).all())
+        self.assertAlmostEqual(zscores[0, 4], 8.0)  # Streuung 0 -> Untergrenze 1
+        self.assertAlmostEqual(zscores[1, 4], 0.0)
+    
+    def test_detect_weekly_spike(self):
+        """Testet die Erkennung eines Wochen-Ausreißers pro Stadt und Falltyp."""
+        for weeks_ago in range(1, 9):
+            self._create_cases(weeks_ago, 1)
+        self._create_cases(0, 8)
+        
+        anomalies = TrendAnomalyService.detect_anomalies(today=self.today)
+        flagged = {(a['dimension'], a['granularity'], a['label']) for a in anomalies}
+        
+        self.assertIn(('city', 'week', 'Berlin'), flagged)
+        self.assertIn(('case_type', 'week', 'Diebstahl'), flagged)
+        self.assertEqual(anomalies[0]['count'], 8)
+        self.assertEqual(anomalies[0]['period'], timezone.datetime(2024, 6, 10).date())
+    
+    def test_no_anomaly_for_steady_series(self):
+        """Testet, dass gleichmäßige Serien nicht markiert werden."""
+        for weeks_ago in range(0, 9):
+            self._create_cases(weeks_ago, 3)
+        
+        self.assertEqual(TrendAnomalyService.detect_anomalies(today=self.today), [])
+
+
+class AutocompleteServiceTest(TestCase):
+    """Tests für die Präfix-Vorschläge."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.person = Person.objects.create(
+            first_name='Jürgen', last_name='Müller', created_by=self.user
+        )
+        Person.objects.create(first_name='Anna', last_name='Mueller', created_by=self.user)
+        self.address = Address.objects.create(
+            street='Hauptstraße', house_number='5', postal_code='10115', city='Berlin'
+        )
+        Vehicle.objects.create(license_plate='B-AB 123', make='VW', owner=self.person)
+        Case.objects.create(
+            case_number='2024-TEST-001', title='Test Case', description='Desc',
+            case_type='theft', created_by=self.user
+        )
+    
+    def test_person_prefix_on_both_name_orders(self):
+        """Testet Präfixe auf Nach- und Vorname inklusive Normalisierung."""
+        self.assertEqual(
+            [r['label'] for r in AutocompleteService.suggest('person', 'mu')],
+            ['Anna Mueller', 'Jürgen Müller']
+        )
+        self.assertEqual(
+            [r['id'] for r in AutocompleteService.suggest('person', 'JURGEN M')], [self.person.id]
+        )
+        self.assertEqual(len(AutocompleteService.suggest('person', 'mu', limit=1)), 1)
+    
+    def test_other_types_and_validation(self):
+        """Testet Adressen, Fahrzeuge, Fälle und ungültige Parameter."""
+        self.assertEqual(
+            AutocompleteService.suggest('address', 'hauptstrasse 5'),
+            [{'id': self.address.id, 'label': 'Hauptstraße 5', 'detail': '10115 Berlin'}]
+        )
+        self.assertEqual(AutocompleteService.suggest('vehicle', 'b-a')[0]['label'], 'B-AB 123')
+        self.assertEqual(AutocompleteService.suggest('case', '2024-T')[0]['detail'], 'Test Case')
+        self.assertEqual(AutocompleteService.suggest('case', '  '), [])
+        with self.assertRaises(ValueError):
+            AutocompleteService.suggest('evidence', 'x')
+        
+        self.address.city = 'Hamburg'
+        self.address.save()
+        self.assertEqual(AutocompleteService.suggest('address', 'haupt')[0]['detail'], '10115 Hamburg')
+
+
+class EvidenceTextServiceTest(TestCase):
+    """Tests für Volltext-Extraktion und -Suche der Beweismittel."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.case = Case.objects.create(
+            case_number='2024-TEST-001', title='Test Case', description='Desc',
+            case_type='theft', created_by=self.user
+        )
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def create_evidence(self, name, content):
+        return Evidence.objects.create(
+            case=self.case, evidence_number=f'E-{name}', title=name, description='Datei',
+            evidence_type='document', file=SimpleUploadedFile(name, content)
+        )
+    
+    def test_extractors(self):
+        """Testet Text-, HTML- und Office-Extraktion."""
+        self.assertEqual(extract_text('a.txt', 'Straße'.encode('latin-1')), 'Straße')
+        self.assertEqual(
+            extract_text('a.html', b'<html><head><script>x()</script></head><p>Hallo</p><p>Welt</p></html>'),
+            'Hallo\n\nWelt'
+        )
+        
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                '<w:body><w:p><w:r><w:t>Tatort Hafen</w:t></w:r></w:p></w:body></w:document>'
+            ))
+        self.assertEqual(extract_text('bericht.docx', buffer.getvalue()), 'Tatort Hafen')
+        
+        with self.assertRaises(UnsupportedFormat):
+            extract_text('foto.jpg', b'\xff\xd8')
+        with self.assertRaises(ValueError):
+            extract_text('kaputt.docx', b'kein zip')
+    
+    def test_queue_is_incremental_and_resumable(self):
+        """Testet Einplanung, Verarbeitung, Wiederaufnahme und Dateiwechsel."""
+        text_evidence = self.create_evidence('vernehmung.txt', b'Der Zeuge sah einen roten Transporter.')
+        photo = self.create_evidence('foto.jpg', b'\xff\xd8')
+        broken = self.create_evidence('kaputt.docx', b'kein zip')
+        self.assertEqual(EvidenceText.objects.filter(status='pending').count(), 3)
+        
+        # Abgebrochener Worker: hängender Eintrag wird nach STALE_AFTER wieder übernommen
+        EvidenceText.objects.filter(pk=text_evidence.pk).update(
+            status='processing', claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        stats = EvidenceTextService.process_pending(workers=1)
+        self.assertEqual(stats, {'done': 1, 'unsupported': 1, 'failed': 1})
+        self.assertEqual(EvidenceTextService.process_pending(workers=1), {})
+        
+        row = EvidenceText.objects.get(pk=text_evidence.pk)
+        self.assertIn('Transporter', row.content)
+        self.assertEqual(len(row.checksum), 64)
+        self.assertEqual(EvidenceText.objects.get(pk=photo.pk).status, 'unsupported')
+        self.assertTrue(EvidenceText.objects.get(pk=broken.pk).error)
+        
+        self.assertEqual(EvidenceTextService.enqueue_missing(retry_failed=True), 1)
+        self.assertEqual(EvidenceTextService.process_pending(workers=1), {'failed': 1})
+        
+        text_evidence.file = SimpleUploadedFile('neu.txt', b'Neue Aussage')
+        text_evidence.save()
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.content), ('pending', ''))
+        EvidenceTextService.process_pending(workers=1)
+        row.refresh_from_db()
+        self.assertEqual(row.content, 'Neue Aussage')
+        
+        text_evidence.file = None
+        text_evidence.save()
+        self.assertFalse(EvidenceText.objects.filter(pk=text_evidence.pk).exists())
+    
+    def test_fulltext_search(self):
+        """Testet Suche mit Präfix, Umlaut-Normalisierung und Hervorhebung."""
+        self.create_evidence('a.txt', b'Der Zeuge sah einen <roten> Transporter vor der M\xc3\xbchle.')
+        self.create_evidence('b.txt', b'Kein relevanter Inhalt.')
+        EvidenceTextService.process_pending(workers=1)
+        
+        results = EvidenceTextService.search('transp muhle')
+        self.assertEqual(results['total'], 1)
+        snippet = results['items'][0].snippet
+        self.assertIn('<mark>Transporter</mark>', snippet)
+        self.assertIn('&lt;roten&gt;', snippet)
+        self.assertEqual(EvidenceTextService.search('Fahrrad')['total'], 0)
+        self.assertEqual(EvidenceTextService.search('" *')['total'], 0)
+
+
+class DuplicateDetectionServiceTest(TestCase):
+    """Tests für die MinHash/LSH-Duplikaterkennung."""
+    
+    DESCRIPTION = (
+        'Unbekannte Täter brachen in der Nacht die Hintertür des Juweliergeschäfts auf, '
+        'entwendeten Schmuck aus drei Vitrinen und flüchteten mit einem dunklen Transporter.'
+    )
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        self.case = Case.objects.create(
+            case_number='2024-DUP-001', title='Einbruch Juwelier', description=self.DESCRIPTION,
+            case_type='theft', created_by=self.user
+        )
+        self.other = Case.objects.create(
+            case_number='2024-DUP-002', title='Betrug Online-Shop',
+            description='Ware wurde bezahlt, aber nie geliefert. Der Händler ist nicht erreichbar.',
+            case_type='fraud', created_by=self.user
+        )
+    
+    def test_signature_estimates_jaccard(self):
+        """Testet Signaturen, Serialisierung und Ähnlichkeitsschätzung."""
+        sig = minhash.signature(self.DESCRIPTION)
+        self.assertEqual(sig.shape, (minhash.NUM_PERM,))
+        self.assertTrue((minhash.from_bytes(minhash.to_bytes(sig)) == sig).all())
+        self.assertEqual(len(set(minhash.band_keys(sig))), minhash.BANDS)
+        self.assertIsNone(minhash.signature('  '))
+        
+        edited = self.DESCRIPTION.replace('drei', 'vier')
+        exact = len(minhash.shingles(self.DESCRIPTION) & minhash.shingles(edited)) / len(
+            minhash.shingles(self.DESCRIPTION) | minhash.shingles(edited)
+        )
+        estimate = minhash.estimate_similarity(sig, minhash.signature(edited))
+        self.assertAlmostEqual(estimate, exact, delta=0.15)
+    
+    def test_duplicates_maintained_on_save(self):
+        """Testet Pflege per Signal und Abfrage über die Buckets."""
+        self.assertEqual(MinHashBucket.objects.filter(source='case').count(), 2 * minhash.BANDS)
+        
+        duplicate = Case.objects.create(
+            case_number='2024-DUP-003', title='Einbruch beim Juwelier',
+            description=self.DESCRIPTION.replace('drei Vitrinen', 'zwei Vitrinen'),
+            case_type='theft', created_by=self.user
+        )
+        found = DuplicateDetectionService.possible_duplicates(self.case)
+        self.assertEqual([case.id for case in found], [duplicate.id])
+        self.assertGreater(found[0].similarity, 0.7)
+        
+        # Noch nicht gespeicherter Fall (z.B. Anlage-Formular) findet beide
+        found = DuplicateDetectionService.find_similar_cases('Juwelier Einbruch', self.DESCRIPTION)
+        self.assertEqual({case.id for case in found}, {self.case.id, duplicate.id})
+        
+        duplicate.description = 'Sachbeschädigung an einem geparkten Fahrzeug.'
+        duplicate.save()
+        self.assertEqual(DuplicateDetectionService.possible_duplicates(self.case), [])
+        
+        duplicate.delete()
+        self.assertEqual(MinHashSignature.objects.filter(source='case').count(), 2)
+    
+    def test_duplicate_evidence_and_rebuild(self):
+        """Testet Beweismittel-Duplikate über Fälle hinweg und den Neuaufbau."""
+        text = 'Schwarzer Rucksack mit Brecheisen und Handschuhen, gefunden hinter dem Gebäude.'
+        evidence = Evidence.objects.create(
+            case=self.case, evidence_number='E-1', title='Rucksack', description=text,
+            evidence_type='physical'
+        )
+        copy = Evidence.objects.create(
+            case=self.other, evidence_number='E-9', title='Rucksack', description=text + ' Sichergestellt.',
+            evidence_type='physical'
+        )
+        matches = DuplicateDetectionService.duplicate_evidence(self.case)
+        self.assertEqual(len(matches), 1)
+        self.assertEqual((matches[0]['evidence'], matches[0]['duplicate']), (evidence, copy))
+        
+        copy.delete()
+        self.assertEqual(DuplicateDetectionService.duplicate_evidence(self.case), [])
+        
+        MinHashSignature.objects.all().delete()
+        self.assertEqual(DuplicateDetectionService.rebuild(), {'case': 2, 'evidence': 1})
+        self.assertEqual(MinHashBucket.objects.count(), 3 * minhash.BANDS)
+
+
+class CaseSimilarityServiceTest(TestCase):
+    """Tests für die TF-IDF-Fallähnlichkeit."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skimming = self.create_case(
+                '1', 'Skimming am Geldautomaten',
+                'Manipulierter Geldautomat mit Kartenleser-Aufsatz und Minikamera in der Filiale.'
+            )
+            self.fraud = self.create_case(
+                '2', 'Online-Betrug', 'Ware über Kleinanzeigen bezahlt, Verkäufer nicht erreichbar.'
+            )
+            self.traffic = self.create_case(
+                '3', 'Verkehrsunfall', 'Auffahrunfall an der Kreuzung, Fahrer leicht verletzt.'
+            )
+    
+    def create_case(self, number, title, description):
+        return Case.objects.create(
+            case_number=f'2024-SIM-00{number}', title=title, description=description,
+            case_type='fraud', created_by=self.user
+        )
+    
+    def test_top_k_neighbors_match_dense_cosine(self):
+        """Testet die dünn besetzte Top-k-Berechnung gegen die dichte Kosinusmatrix."""
+        texts = ['rot blau gelb', 'rot blau', 'gelb gruen', 'schwarz weiss', 'blau blau rot']
+        counts = [tfidf.tokenize(text) for text in texts]
+        df = Counter(term for case_counts in counts for term in case_counts)
+        idf_by_term = {term: tfidf.idf(value, len(texts)) for term, value in df.items()}
+        vocabulary = {term: index for index, term in enumerate(idf_by_term)}
+        vectors = [tfidf.weigh(case_counts, idf_by_term) for case_counts in counts]
+        
+        dense = np.zeros((len(texts), len(vocabulary)))
+        for row, vector in enumerate(vectors):
+            for term, weight in vector.items():
+                dense[row, vocabulary[term]] = weight
+        cosine = dense @ dense.T
+        
+        indptr, indices, data = tfidf.build_csr(vectors, vocabulary)
+        for row, neighbors in tfidf.top_k_neighbors(indptr, indices, data, len(vocabulary), k=2):
+            expected = [i for i in np.argsort(-cosine[row], kind='stable') if i != row and cosine[row, i] > 0][:2]
+            self.assertEqual([neighbor for neighbor, _score in neighbors], expected)
+            for neighbor, score in neighbors:
+                self.assertAlmostEqual(score, cosine[row, neighbor])
+        self.assertEqual(tfidf.tokenize('Der Täter und die Täterin'), Counter({'tater': 1, 'taterin': 1}))
+    
+    def test_incremental_insertion(self):
+        """Testet neue Fälle, Zeitachsen-Text und die Nachbarlisten beider Seiten."""
+        self.assertEqual(CaseAnalysisService.get_similar_cases(self.skimming), [])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            similar = self.create_case(
+                '4', 'Skimming-Verdacht', 'Kartenleser-Aufsatz am Geldautomat der Sparkasse entdeckt.'
+            )
+        self.assertEqual([case.id for case in CaseAnalysisService.get_similar_cases(similar)], [self.skimming.id])
+        self.assertEqual([case.id for case in CaseAnalysisService.get_similar_cases(self.skimming)], [similar.id])
+        self.assertGreater(CaseAnalysisService.get_similar_cases(similar)[0].similarity, 0.2)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Timeline.objects.create(
+                case=self.traffic, datetime=timezone.now(), title='Zeuge',
+                description='Zeuge sah einen Kartenleser-Aufsatz am Geldautomat.'
+            )
+        self.assertIn(self.traffic, CaseAnalysisService.get_similar_cases(self.skimming))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            similar.delete()
+        self.assertFalse(CaseSimilarity.objects.filter(similar_case_id=similar.id).exists())
+        self.assertEqual(CaseTermStat.objects.get(term='sparkasse').count, 0)
+    
+    def test_rebuild_matches_incremental(self):
+        """Testet, dass der Neuaufbau dieselben Nachbarn liefert."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_case('4', 'Skimming', 'Kartenleser am Geldautomat manipuliert.')
+        before = {
+            case.id: [other.id for other in CaseSimilarityService.get_similar_cases(case, limit=20)]
+            for case in Case.objects.all()
+        }
+        result = CaseSimilarityService.rebuild()
+        self.assertEqual(result['cases'], 4)
+        after = {
+            case.id: [other.id for other in CaseSimilarityService.get_similar_cases(case, limit=20)]
+            for case in Case.objects.all()
+        }
+        self.assertEqual(before, after)
+    
+    def test_overlong_tokens_are_ignored(self):
+        """Testet, dass Zeichenketten über der Spaltenlänge der Terme nicht indiziert werden."""
+        noise = 'x' * 100
+        self.assertEqual(tfidf.tokenize(f'Geldautomat {noise}'), Counter({'geldautomat': 1}))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_case('4', 'Skimming', f'Kartenleser am Geldautomat {noise}')
+        self.assertFalse(CaseTermStat.objects.filter(term__startswith='xxx').exists())
+        self.assertTrue(CaseTermStat.objects.filter(term='kartenleser').exists())
+
+
+class SyntheticDataGeneratorTest(TestCase):
+    """Tests für den synthetischen Datengenerator."""
+    
+    def test_degree_distribution_is_heavy_tailed(self):
+        """Testet Potenzgesetz-Grade und das Configuration Model."""
+        rng = np.random.default_rng(1)
+        degrees = synthetic.power_law_degrees(rng, 20000, exponent=2.3)
+        self.assertEqual(degrees.min(), 1)
+        self.assertGreater(degrees.max(), 50 * np.median(degrees))
+        
+        edges = synthetic.configuration_edges(rng, degrees)
+        self.assertTrue(np.all(edges[:, 0] < edges[:, 1]))
+        self.assertEqual(len(np.unique(edges, axis=0)), len(edges))
+        realized = np.bincount(edges.ravel(), minlength=len(degrees))
+        self.assertTrue(np.all(realized <= degrees))
+        self.assertGreater(realized.sum(), 0.9 * degrees.sum())
+    
+    def test_generate_is_deterministic_and_consistent(self):
+        """Testet Reproduzierbarkeit, Wiederholungstäter und nachgezogene Rollups."""
+        stats = synthetic.SyntheticDataGenerator(
+            persons=400, cases=60, seed=7, batch_size=100, prefix='A'
+        ).generate()
+        self.assertEqual((stats['persons'], stats['cases']), (400, 60))
+        self.assertEqual(Person.objects.filter(external_id__startswith='A-').count(), 400)
+        self.assertGreater(stats['relationships'], 0)
+        self.assertTrue(PersonAlias.objects.exists())
+        
+        suspects = Counter(PersonInvolvement.objects.filter(
+            involvement_type='suspect'
+        ).values_list('person_id', flat=True))
+        self.assertGreater(max(suspects.values()), 1)
+        self.assertEqual(
+            dict(SuspectCaseCounter.objects.values_list('person_id', 'case_count')), dict(suspects)
+        )
+        
+        def snapshot(prefix):
+            persons = Person.objects.filter(external_id__startswith=f'{prefix}-').order_by('id')
+            cases = Case.objects.filter(case_number__startswith=f'{prefix}-').order_by('id')
+            return (
+                list(persons.values_list('first_name', 'last_name', 'birth_date', 'risk_level')),
+                list(cases.values_list('title', 'case_type', 'status', 'incident_date')),
+                PersonRelationship.objects.filter(person1__external_id__startswith=f'{prefix}-').count(),
+                Timeline.objects.filter(case__case_number__startswith=f'{prefix}-').count(),
+            )
+        
+        synthetic.SyntheticDataGenerator(
+            persons=400, cases=60, seed=7, batch_size=100, prefix='B', index=False
+        ).generate()
+        self.assertEqual(snapshot('A'), snapshot('B'))
+
+
+class ListExportTest(TestCase):
+    """Tests für den Streaming-Export der Listenansichten."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        for index in range(3):
+            Case.objects.create(
+                case_number=f'EXP-{index}', title=f'=Export {index}', description='Test',
+                case_type='theft', status='open' if index < 2 else 'closed', created_by=self.user
+            )
+    
+    def test_csv_export_honours_filters(self):
+        """CSV enthält nur gefilterte Fälle, Choice-Labels und entschärfte Formeln."""
+        response = self.client.get(reverse('investigations:case_list'), {'status': 'open', 'export': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('faelle-', response['Content-Disposition'])
+        
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(content.startswith('\ufeffAktenzeichen;Titel;'))
+        lines = content.strip().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("'=Export 0", content)
+        self.assertIn('Offen', content)
+        self.assertNotIn('EXP-2', content)
+    
+    def test_xlsx_export_is_valid_workbook(self):
+        """XLSX ist ein lesbares ZIP mit Arbeitsmappe und Tabellenblatt."""
+        response = self.client.get(reverse('investigations:case_list'), {'export': 'xlsx'})
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIn('xl/workbook.xml', archive.namelist())
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row '), 4)
+        self.assertIn('=Export 2', sheet)
+    
+    def test_xlsx_rolls_over_to_new_sheet(self):
+        """Überschreitet der Export das Zeilenlimit, entsteht ein weiteres Tabellenblatt."""
+        rows = ((index, f'Zeile {index}') for index in range(5))
+        data = b''.join(export.stream_xlsx(['Nr', 'Text'], rows, title='Test', max_sheet_rows=3))
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        first = archive.read('xl/worksheets/sheet1.xml').decode()
+        second = archive.read('xl/worksheets/sheet2.xml').decode()
+        self.assertEqual(first.count('<row '), 4)
+        self.assertEqual(second.count('<row '), 3)
+        self.assertIn('Test 2', archive.read('xl/workbook.xml').decode())
+
+
+class CaseDossierTest(TestCase):
+    """Tests für den Export der Fallakte als ZIP."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.case = Case.objects.create(
+            case_number='2024/DOS-1', title='Akte', description='Test', case_type='fraud', created_by=self.user
+        )
+        person = Person.objects.create(first_name='Max', last_name='Mustermann', created_by=self.user)
+        PersonInvolvement.objects.create(person=person, case=self.case, involvement_type='suspect')
+        Timeline.objects.create(case=self.case, datetime=timezone.now(), title='Anzeige', description='x')
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def test_dossier_contains_data_and_files(self):
+        """Archiv enthält alle Abschnitte, die Originaldatei und ein Manifest mit Prüfsumme."""
+        content = bytes(range(256)) * 10_000  # mehrere Lese-Blöcke
+        evidence = Evidence.objects.create(
+            case=self.case, evidence_number='B-1', title='Video', description='Kamera',
+            evidence_type='video', file=SimpleUploadedFile('kamera 1.mp4', content)
+        )
+        missing = Evidence.objects.create(
+            case=self.case, evidence_number='B-2', title='Weg', description='x',
+            evidence_type='photo', file='evidence/fehlt.jpg'
+        )
+        
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(dossier.stream_dossier(self.case, self.user))))
+        names = archive.namelist()
+        for section in dossier.SECTIONS:
+            self.assertIn(f'{section}.json', names)
+            self.assertIn(f'{section}.csv', names)
+        self.assertEqual(json.loads(archive.read('fall.json'))['case_number'], '2024/DOS-1')
+        involvements = json.loads(archive.read('beteiligte.json'))
+        self.assertEqual(involvements[0]['involvement_type'], 'Verdächtiger')
+        
+        path = dossier.evidence_archive_path(evidence.id, evidence.file.name)
+        self.assertEqual(archive.read(path), content)
+        self.assertEqual(archive.getinfo(path).compress_type, zipfile.ZIP_STORED)
+        manifest = json.loads(archive.read('manifest.json'))
+        self.assertEqual(manifest['files'][0]['sha256'], hashlib.sha256(content).hexdigest())
+        self.assertEqual(manifest['missing_files'][0]['evidence_id'], missing.id)
+    
+    def test_dossier_view(self):
+        """Die Fallakte wird als gestreamter ZIP-Download ausgeliefert."""
+        url = reverse('investigations:case_dossier', kwargs={'case_id': self.case.id})
+        self.assertEqual(self.client.get(url).status_code, 302)
+        
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertIn('fallakte-2024_DOS-1-', response['Content-Disposition'])
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+    
+    def test_dossier_withholds_files_without_access(self):
+        """Unbeteiligte erhalten die Akte ohne Dateien; diese stehen im Manifest."""
+        evidence = Evidence.objects.create(
+            case=self.case, evidence_number='B-1', title='Foto', description='x',
+            evidence_type='photo', file=SimpleUploadedFile('foto.jpg', b'geheim')
+        )
+        outsider = User.objects.create_user(username='fremd', password='testpass123')
+        
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(dossier.stream_dossier(self.case, outsider))))
+        self.assertNotIn(dossier.evidence_archive_path(evidence.id, evidence.file.name), archive.namelist())
+        manifest = json.loads(archive.read('manifest.json'))
+        self.assertEqual(manifest['files'], [])
+        self.assertEqual(manifest['withheld_files'], [{'evidence_id': evidence.id, 'evidence_number': 'B-1'}])
+
+
+class EvidenceUploadServiceTest(TestCase):
+    """Tests für Block-Uploads mit inhaltsadressierter Ablage."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.case = Case.objects.create(
+            case_number='UP-1', title='Upload', description='Test', case_type='fraud', created_by=self.user
+        )
+        self.other_case = Case.objects.create(
+            case_number='UP-2', title='Upload 2', description='Test', case_type='fraud', created_by=self.user
+        )
+        self.content = bytes(range(256)) * 40
+        self.digest = hashlib.sha256(self.content).hexdigest()
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def metadata(self, number):
+        return {'evidence_number': number, 'title': 'Video', 'evidence_type': 'video'}
+    
+    def test_resumable_upload_and_dedup(self):
+        """Blöcke werden fortgesetzt (auch nach Prozesswechsel), identische Inhalte teilen eine Datei."""
+        upload = EvidenceUploadService.start(
+            self.case, 'kamera.MP4', len(self.content), self.metadata('B-1'), user=self.user
+        )
+        EvidenceUploadService.append(upload.pk, 0, io.BytesIO(self.content[:4000]), 4000)
+        with self.assertRaises(UploadOffsetMismatch) as ctx:
+            EvidenceUploadService.append(upload.pk, 0, io.BytesIO(self.content[:10]), 10)
+        self.assertEqual(ctx.exception.offset, 4000)
+        
+        # Anderer Worker: Hash-Zustand wird aus der Teildatei rekonstruiert
+        EvidenceUploadService._hashers.clear()
+        upload = EvidenceUploadService.append(upload.pk, 4000, io.BytesIO(self.content[4000:]), len(self.content) - 4000)
+        self.assertEqual(upload.status, 'complete')
+        evidence = upload.evidence
+        self.assertEqual(evidence.sha256, self.digest)
+        self.assertEqual(evidence.file.name, f'evidence/sha256/{self.digest[:2]}/{self.digest[2:4]}/{self.digest}.mp4')
+        with evidence.file.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+        
+        # Zweiter Upload desselben Inhalts in anderem Fall: gleiche Datei, Dublette erkannt
+        second = EvidenceUploadService.start(
+            self.other_case, 'kopie.mp4', len(self.content), self.metadata('B-9'), user=self.user
+        )
+        second = EvidenceUploadService.append(second.pk, 0, io.BytesIO(self.content), len(self.content))
+        self.assertEqual(second.evidence.file.name, evidence.file.name)
+        self.assertEqual(EvidenceUploadService.duplicates(second.evidence, self.user)[0]['case_number'], 'UP-1')
+        self.assertEqual(os.listdir(os.path.join(self.media_root, EvidenceUploadService.PARTIAL_DIR)), [])
+        
+        # Bekannte Prüfsumme: sofort abgeschlossen, keine Übertragung
+        instant = EvidenceUploadService.start(
+            self.other_case, 'x.mp4', len(self.content), self.metadata('B-10'), user=self.user, sha256=self.digest
+        )
+        self.assertEqual(instant.status, 'complete')
+        self.assertEqual(instant.evidence.file.name, evidence.file.name)
+    
+    def test_known_digest_requires_access(self):
+        """Eine fremde Prüfsumme schließt nicht ab; Dubletten fremder Fälle bleiben verborgen."""
+        original = EvidenceUploadService.start(
+            self.case, 'geheim.mp4', len(self.content), self.metadata('B-1'), user=self.user
+        )
+        original = EvidenceUploadService.append(original.pk, 0, io.BytesIO(self.content), len(self.content))
+        
+        stranger = User.objects.create_user(username='fremd', password='testpass123')
+        own_case = Case.objects.create(
+            case_number='UP-3', title='Eigen', description='Test', case_type='fraud', created_by=stranger
+        )
+        claim = EvidenceUploadService.start(
+            own_case, 'x.mp4', len(self.content), self.metadata('B-2'), user=stranger, sha256=self.digest
+        )
+        self.assertEqual(claim.status, 'open')
+        self.assertIsNone(claim.evidence_id)
+        
+        # Wer die Bytes tatsächlich überträgt, nutzt die vorhandene Datei - ohne fremde Dubletten zu sehen
+        claim = EvidenceUploadService.append(claim.pk, 0, io.BytesIO(self.content), len(self.content))
+        self.assertEqual(claim.evidence.file.name, original.evidence.file.name)
+        self.assertEqual(claim.evidence.file_size, len(self.content))
+        self.assertEqual(EvidenceUploadService.status(claim, stranger)['duplicates'], [])
+        self.assertEqual(EvidenceUploadService.status(original, self.user)['duplicates'], [])
+    
+    def test_upload_api(self):
+        """JSON-API: Start, Block per PUT, Offset-Konflikt, Prüfsummenfehler."""
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.post(
+            reverse('investigations:evidence_upload_start', kwargs={'case_id': self.case.id}),
+            {'file_name': 'a.bin', 'size': len(self.content), 'sha256': '0' * 64, **self.metadata('B-1')}
+        )
+        self.assertEqual(response.status_code, 201)
+        url = reverse('investigations:evidence_upload', kwargs={'upload_id': response.json()['upload_id']})
+        
+        response = self.client.put(url, self.content[:100], content_type='application/octet-stream',
+                                   headers={'Upload-Offset': '5'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 0)
+        
+        response = self.client.put(url, self.content, content_type='application/octet-stream',
+                                   headers={'Upload-Offset': '0'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(url).json()['status'], 'aborted')
+        self.assertFalse(Evidence.objects.exists())
+
+
+class EvidenceFileViewTest(TestCase):
+    """Tests für die Auslieferung von Beweismittel-Dateien."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, EVIDENCE_SENDFILE='')
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.case = Case.objects.create(
+            case_number='MED-1', title='Medien', description='Test', case_type='fraud', created_by=self.user
+        )
+        self.content = bytes(range(256)) * 8
+        self.evidence = Evidence.objects.create(
+            case=self.case, evidence_number='V-1', title='Video', description='Kamera',
+            evidence_type='video', file=SimpleUploadedFile('kamera.mp4', self.content)
+        )
+        self.url = reverse('investigations:evidence_file', kwargs={'evidence_id': self.evidence.id})
+        self.client.login(username='testuser', password='testpass123')
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def test_range_requests(self):
+        """Teilbereiche liefern 206 mit Content-Range, ungültige 416."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        
+        response = self.client.get(self.url, headers={'Range': 'bytes=100-199'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+        
+        response = self.client.get(self.url, headers={'Range': 'bytes=-10'})
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+        
+        response = self.client.get(self.url, headers={'Range': f'bytes={len(self.content)}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+    
+    def test_conditional_requests(self):
+        """If-None-Match liefert 304, veraltetes If-Range die ganze Datei."""
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': etag}).status_code, 304)
+        
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-9', 'If-Range': '"veraltet"'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, headers={'Range': 'bytes=0-9', 'If-Range': etag})
+        self.assertEqual(response.status_code, 206)
+    
+    def test_permissions_and_proxy_handoff(self):
+        """Fremde Nutzer erhalten 403; mit nginx übernimmt X-Accel-Redirect die Übertragung."""
+        User.objects.create_user(username='fremd', password='testpass123')
+        self.client.login(username='fremd', password='testpass123')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        
+        self.client.login(username='testuser', password='testpass123')
+        with self.settings(EVIDENCE_SENDFILE='nginx', EVIDENCE_SENDFILE_PREFIX='/protected-media/'):
+            response = self.client.get(self.url, headers={'Range': 'bytes=0-9'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.evidence.file.name}')
+        self.assertEqual(response.content, b'')
+
+
+class EvidencePreviewServiceTest(TestCase):
+    """Tests für die Vorschau-Erzeugung der Beweismittel."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.case = Case.objects.create(
+            case_number='PRE-1', title='Vorschau', description='Test', case_type='fraud', created_by=self.user
+        )
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def create_evidence(self, number, name, content):
+        return Evidence.objects.create(
+            case=self.case, evidence_number=number, title=name, description='Datei',
+            evidence_type='document', file=SimpleUploadedFile(name, content)
+        )
+    
+    def test_previews_cached_by_content(self):
+        """Dokumente erhalten eine Textseite; gleicher Inhalt nutzt dieselben Dateien."""
+        first = self.create_evidence('P-1', 'bericht.txt', 'Tatort <Hafen>'.encode())
+        second = self.create_evidence('P-2', 'kopie.txt', 'Tatort <Hafen>'.encode())
+        video = self.create_evidence('P-3', 'kamera.mp4', b'\x00' * 64)
+        self.assertEqual(EvidencePreview.objects.filter(status='pending').count(), 3)
+        
+        stats = EvidencePreviewService.process_pending(workers=1)
+        self.assertEqual(stats, {'done': 2, 'unsupported': 1})
+        
+        preview = EvidencePreview.objects.get(pk=first.pk)
+        self.assertEqual(preview.thumbnail, EvidencePreviewService.cache_name(preview.sha256, 'thumb', 'svg'))
+        self.assertEqual(EvidencePreview.objects.get(pk=second.pk).page, preview.page)
+        with open(os.path.join(self.media_root, preview.page), 'rb') as handle:
+            self.assertIn(b'Tatort &lt;Hafen&gt;', handle.read())
+        self.assertEqual(EvidencePreview.objects.get(pk=video.pk).status, 'unsupported')
+        
+        # Neue Datei setzt die Vorschau zurück
+        first.file = SimpleUploadedFile('neu.txt', b'Anderer Inhalt')
+        first.save()
+        self.assertEqual(EvidencePreview.objects.get(pk=first.pk).status, 'pending')
+    
+    def test_jpeg_thumbnail(self):
+        """Fotos werden als verkleinerte JPEG-Miniatur und -Seite abgelegt."""
+        from PIL import Image
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (2000, 1000), (200, 30, 30)).save(buffer, 'JPEG')
+        evidence = self.create_evidence('P-1', 'tatort.jpg', buffer.getvalue())
+        self.assertEqual(EvidencePreviewService.process_pending(workers=1), {'done': 1})
+        
+        preview = EvidencePreview.objects.get(pk=evidence.pk)
+        self.assertTrue(preview.thumbnail.endswith('.jpg'))
+        for name, size in ((preview.thumbnail, (256, 128)), (preview.page, (1024, 512))):
+            with Image.open(os.path.join(self.media_root, name)) as image:
+                self.assertEqual((image.format, image.size), ('JPEG', size))
+    
+    def test_preview_view_and_placeholder(self):
+        """Fallansicht zeigt Platzhalter, bis die Vorschau erzeugt ist."""
+        evidence = self.create_evidence('P-1', 'bericht.txt', b'Sachstand')
+        self.client.login(username='testuser', password='testpass123')
+        url = reverse('investigations:evidence_preview', kwargs={'evidence_id': evidence.id})
+        
+        response = self.client.get(reverse('investigations:case_detail', kwargs={'case_id': self.case.id}))
+        self.assertContains(response, 'class="preview-placeholder"')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        
+        EvidencePreviewService.process_pending(workers=1)
+        response = self.client.get(reverse('investigations:case_previews', kwargs={'case_id': self.case.id}))
+        self.assertEqual(response.json(), {'previews': {str(evidence.id): 'done'}})
+        response = self.client.get(reverse('investigations:case_detail', kwargs={'case_id': self.case.id}))
+        self.assertContains(response, f'<img src="{url}"')
+        
+        response = self.client.get(url, {'size': 'page'})
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'Sachstand', b''.join(response.streaming_content))
+        response = self.client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        
+        other = User.objects.create_user(username='fremd', password='testpass123')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 403)
 
 
 class DashboardServiceTest(TestCase):
@@ -257,6 +1310,58 @@ class CaseViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Test Case')
     
+    def test_timeline_gap_report_authenticated(self):
+        """Testet den fallübergreifenden Lücken-Bericht."""
+        now = timezone.now()
+        for hours in (0, 72):
+            Timeline.objects.create(
+                case=self.case,
+                datetime=now + timedelta(hours=hours),
+                title=f'Event {hours}',
+                description='Description',
+                created_by=self.user
+            )
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('investigations:timeline_gap_report'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '2024-TEST-001')
+        self.assertContains(response, '72,0 h')
+        
+        response = self.client.get(reverse('investigations:timeline_gap_report'), {'threshold': '9' * 20})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['threshold'], TimelineAnalysisService.MAX_GAP_THRESHOLD_HOURS)
+        self.assertEqual(list(TimelineAnalysisService.get_timeline_gaps_bulk(threshold_hours=10 ** 12)), [])
+    
+    def test_timeline_heatmap_api(self):
+        """Testet die Heatmap-API inklusive Parameter-Validierung."""
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(
+            reverse('investigations:timeline_heatmap'), {'case_type': ['theft', 'fraud']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['matrix']), 7)
+        
+        response = self.client.get(reverse('investigations:timeline_heatmap'), {'start': '2024/01'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_autocomplete_and_timeline_form(self):
+        """Testet den Autocomplete-Endpunkt und das Formular ohne Vollliste."""
+        person = Person.objects.create(first_name='Max', last_name='Mustermann', created_by=self.user)
+        self.client.login(username='testuser', password='testpass123')
+        
+        response = self.client.get(reverse('investigations:autocomplete'), {'type': 'person', 'q': 'must'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['id'], person.id)
+        response = self.client.get(reverse('investigations:autocomplete'), {'type': 'person', 'limit': 'x'})
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get(
+            reverse('investigations:timeline_add', kwargs={'case_id': self.case.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Mustermann')
+        self.assertContains(response, 'data-autocomplete="person"')
+    
     def test_case_filter_by_status(self):
         """Testet Status-Filter."""
         self.client.login(username='testuser', password='testpass123')
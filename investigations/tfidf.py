@@ -0,0 +1,126 @@
+# investigations/tfidf.py
+"""
+TF-IDF-Vektoren und Top-k-Kosinus-Nachbarn für die Textähnlichkeit von Fällen.
+Reine Funktionen auf numpy-Arrays; die Pflege übernimmt CaseSimilarityService.
+
+Dünn besetzte Matrizen werden als CSR-Tripel (indptr, indices, data) gehalten.
+Das Skalarprodukt eines Falls mit allen anderen läuft über die transponierte
+Matrix (Posting-Listen je Term), nicht über einen dichten N×N-Vergleich.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from entities.utils import normalize_text
+
+
+TOKEN_RE = re.compile(r'[a-z]{3,}')
+MAX_TOKEN_LENGTH = 64  # CaseTermStat.term / CaseTermWeight.term; längere Zeichenketten sind keine Wörter
+
+# Häufige deutsche Funktionswörter ohne Aussagekraft für den Tathergang (normalisiert)
+STOPWORDS = frozenset('''
+    aber alle allem allen aller alles als also am an ander andere anderem anderen anderer
+    anderes auch auf aus bei beim bin bis bist da dabei dadurch daher damit dann darauf
+    darin das dass dein deine dem den denn der des dessen dich die dies diese diesem diesen
+    dieser dieses dir doch dort durch ein eine einem einen einer eines einige er es etwa
+    euch euer fur gegen gewesen hab habe haben hat hatte hatten hier hin hinter ich ihm
+    ihn ihnen ihr ihre ihrem ihren ihrer im in ins ist jede jedem jeden jeder jedes jene
+    kann kein keine keinem keinen keiner konnte machen man mehr mich mir mit muss nach
+    nachdem nicht nichts noch nun nur ob oder ohne sehr sein seine seinem seinen seiner
+    sich sie sind so solche soll sollte sondern sowie uber um und uns unser unter vom von
+    vor wahrend war waren warst was weg weil welche welchem welchen welcher welches wenn
+    wer werde werden wie wieder will wir wird wo wollen wurde wurden zu zum zur zwar
+    zwischen
+'''.split())
+
+
+def tokenize(text: str) -> Counter:
+    """Termhäufigkeiten (normalisiert, ohne Stoppwörter, 3 bis MAX_TOKEN_LENGTH Zeichen)."""
+    return Counter(
+        token for token in TOKEN_RE.findall(normalize_text(text))
+        if len(token) <= MAX_TOKEN_LENGTH and token not in STOPWORDS
+    )
+
+
+def idf(document_frequency: int, documents: int) -> float:
+    """Geglättete inverse Dokumentfrequenz (wie scikit-learn, smooth_idf=True)."""
+    return math.log((1 + documents) / (1 + document_frequency)) + 1
+
+
+def weigh(counts: Counter, idf_by_term: dict) -> dict:
+    """
+    L2-normierter Vektor {Term: Gewicht} mit sublinearer Termhäufigkeit.
+    Terme ohne idf (z.B. zu häufige) werden ignoriert.
+    """
+    weights = {
+        term: (1 + math.log(count)) * idf_by_term[term]
+        for term, count in counts.items() if term in idf_by_term
+    }
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in weights.items()}
+
+
+def build_csr(vectors: list, vocabulary: dict) -> tuple:
+    """
+    CSR-Matrix aus einer Liste von {Term: Gewicht}-Dicts.
+
+    Returns:
+        (indptr, indices, data)
+    """
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indices = []
+    data = []
+    for row, vector in enumerate(vectors):
+        indptr[row + 1] = indptr[row] + len(vector)
+        indices.extend(vocabulary[term] for term in vector)
+        data.extend(vector.values())
+    return indptr, np.asarray(indices, dtype=np.int64), np.asarray(data, dtype=np.float64)
+
+
+def transpose(indptr, indices, data, n_columns: int) -> tuple:
+    """CSR -> CSC (Posting-Listen je Term)."""
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order = np.argsort(indices, kind='stable')
+    column_ptr = np.zeros(n_columns + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_columns), out=column_ptr[1:])
+    return column_ptr, rows[order], data[order]
+
+
+def top_k_neighbors(indptr, indices, data, n_columns: int, k: int, min_score: float = 0.0):
+    """
+    Top-k-Kosinus-Nachbarn je Zeile (Zeilen müssen L2-normiert sein).
+
+    Yields:
+        (row, [(neighbor_row, score), ...]) absteigend nach score
+    """
+    column_ptr, posting_rows, posting_data = transpose(indptr, indices, data, n_columns)
+    for row in range(len(indptr) - 1):
+        start, end = indptr[row], indptr[row + 1]
+        if start == end:
+            yield row, []
+            continue
+
+        terms = indices[start:end]
+        lengths = column_ptr[terms + 1] - column_ptr[terms]
+        positions = np.concatenate([
+            np.arange(column_ptr[term], column_ptr[term + 1]) for term in terms
+        ])
+        neighbors = posting_rows[positions]
+        products = posting_data[positions] * np.repeat(data[start:end], lengths)
+
+        candidates, inverse = np.unique(neighbors, return_inverse=True)
+        scores = np.bincount(inverse, weights=products)
+        scores[candidates == row] = -1.0
+
+        if len(scores) > k:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        yield row, [
+            (int(candidates[i]), float(scores[i])) for i in best if scores[i] > min_score
+        ]
@@ -9,9 +9,18 @@ urlpatterns = [
     path('cases/<int:case_id>/', views.case_detail, name='case_detail'),
     path('cases/create/', views.case_create, name='case_create'),
     path('cases/<int:case_id>/edit/', views.case_edit, name='case_edit'),
+    path('cases/<int:case_id>/dossier/', views.case_dossier, name='case_dossier'),
+    path('cases/<int:case_id>/uploads/', views.evidence_upload_start, name='evidence_upload_start'),
+    path('uploads/<uuid:upload_id>/', views.evidence_upload, name='evidence_upload'),
+    path('evidence/<int:evidence_id>/file/', views.evidence_file, name='evidence_file'),
+    path('evidence/<int:evidence_id>/preview/', views.evidence_preview, name='evidence_preview'),
+    path('cases/<int:case_id>/previews/', views.case_previews, name='case_previews'),
     path('cases/<int:case_id>/delete/', views.case_delete, name='case_delete'),
     path('cases/<int:case_id>/timeline/add/', views.timeline_add, name='timeline_add'),
     path('timeline/<int:timeline_id>/edit/', views.timeline_edit, name='timeline_edit'),
     path('timeline/<int:timeline_id>/delete/', views.timeline_delete, name='timeline_delete'),
+    path('timeline/gaps/', views.timeline_gap_report, name='timeline_gap_report'),
+    path('timeline/heatmap/', views.timeline_heatmap, name='timeline_heatmap'),
     path('search/', views.search, name='search'),
+    path('search/autocomplete/', views.autocomplete, name='autocomplete'),
 ]
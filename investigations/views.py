@@ -1,11 +1,41 @@
+import os
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.db.models import Q, Count
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
 from django.utils import timezone
-from datetime import timedelta
-from .models import Case, PersonInvolvement, Evidence, Investigation, Timeline
-from entities.models import Person, Address, Vehicle
+from datetime import datetime, timedelta
+from .models import Case, PersonInvolvement, Evidence, EvidencePreview, EvidenceUpload, Investigation, Timeline
+from .services import (
+    CaseAnalysisService, TimelineAnalysisService, TemporalHeatmapService, DashboardService,
+    AutocompleteService, DuplicateDetectionService, EvidencePreviewService, EvidenceUploadService,
+    UploadOffsetMismatch,
+)
+from entities.models import Person, Address
+from entities.services import GlobalSearchService
+from .dossier import dossier_response
+from .export import FORMATS as EXPORT_FORMATS, export_response
+from .media import can_view_evidence, evidence_file_response, preview_response
+from .previews import CONTENT_TYPES as PREVIEW_CONTENT_TYPES
+
+
+CASE_EXPORT_COLUMNS = [
+    ('case_number', 'Aktenzeichen'),
+    ('title', 'Titel'),
+    ('case_type', 'Falltyp', Case.CASE_TYPE_CHOICES),
+    ('status', 'Status', Case.CASE_STATUS_CHOICES),
+    ('priority', 'Priorität', Case.PRIORITY_CHOICES),
+    ('incident_date', 'Tatzeitpunkt'),
+    ('location__city', 'Tatort (Stadt)'),
+    ('assigned_to__username', 'Zugewiesen an'),
+    ('created_at', 'Erstellt am'),
+]
 
 
 @login_required
@@ -37,6 +67,7 @@ def dashboard(request):
         'recent_cases': recent_cases,
         'high_risk_persons': high_risk_persons,
         'upcoming_investigations': upcoming_investigations,
+        'alerts': DashboardService.get_alerts(),
     }
     
     return render(request, 'investigations/dashboard.html', context)
@@ -67,6 +98,10 @@ def case_list(request):
             Q(description__icontains=search_query)
         )
     
+    export_format = request.GET.get('export')
+    if export_format in EXPORT_FORMATS:
+        return export_response(cases, CASE_EXPORT_COLUMNS, 'faelle', export_format)
+    
     # Statistiken für das Dashboard
     stats = {
         'open_cases': Case.objects.filter(status='open').count(),
@@ -97,7 +132,7 @@ def case_detail(request, case_id):
     involvements = PersonInvolvement.objects.filter(case=case).select_related('person')
     
     # Beweismittel
-    evidence = Evidence.objects.filter(case=case).order_by('-collected_date')
+    evidence = Evidence.objects.filter(case=case).select_related('preview').order_by('-collected_date')
     
     # Ermittlungsmaßnahmen
     investigations = Investigation.objects.filter(case=case).order_by('-created_at')
@@ -111,11 +146,129 @@ def case_detail(request, case_id):
         'evidence': evidence,
         'investigations': investigations,
         'timeline': timeline,
+        'related_cases': CaseAnalysisService.get_related_cases(case),
+        'similar_cases': CaseAnalysisService.get_similar_cases(case),
+        'possible_duplicates': DuplicateDetectionService.possible_duplicates(case),
+        'duplicate_evidence': DuplicateDetectionService.duplicate_evidence(case),
     }
     
     return render(request, 'investigations/case_detail.html', context)
 
 
+@login_required
+def case_dossier(request, case_id):
+    """
+    Fallakte als ZIP (Daten als JSON/CSV plus Beweismittel-Dateien), gestreamt.
+    Dateien ohne Leserecht werden nur im Manifest aufgeführt.
+    """
+    case = get_object_or_404(Case, id=case_id)
+    return dossier_response(case, request.user)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def evidence_file(request, evidence_id):
+    """
+    Datei eines Beweismittels mit Range-Requests (Vorspulen), ETag und
+    Übergabe an den Frontend-Proxy; ?download=1 erzwingt den Download
+    """
+    evidence = get_object_or_404(Evidence.objects.select_related('case'), id=evidence_id)
+    if not can_view_evidence(request.user, evidence):
+        raise PermissionDenied
+    if not evidence.file or not evidence.file.storage.exists(evidence.file.name):
+        raise Http404('Keine Datei vorhanden.')
+    
+    return evidence_file_response(request, evidence, attachment=request.GET.get('download') == '1')
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def evidence_preview(request, evidence_id):
+    """
+    Vorschaubild eines Beweismittels (?size=thumb|page). Liefert 404, solange
+    die Vorschau noch nicht erzeugt ist.
+    """
+    preview = get_object_or_404(
+        EvidencePreview.objects.select_related('evidence__case'), evidence_id=evidence_id, status='done'
+    )
+    if not can_view_evidence(request.user, preview.evidence):
+        raise PermissionDenied
+    name = preview.page if request.GET.get('size') == 'page' else preview.thumbnail
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    if not name or not os.path.exists(path):
+        raise Http404('Keine Vorschau vorhanden.')
+    
+    extension = name.rsplit('.', 1)[-1]
+    return preview_response(request, path, f'{preview.sha256}-{extension}', PREVIEW_CONTENT_TYPES[extension])
+
+
+@login_required
+def case_previews(request, case_id):
+    """
+    JSON-API: Vorschau-Status der Beweismittel eines Falls. Die Fallansicht
+    fragt sie ab, solange noch Vorschauen ausstehen.
+    """
+    case = get_object_or_404(Case, id=case_id)
+    return JsonResponse({'previews': {
+        str(evidence_id): status for evidence_id, status in EvidencePreviewService.status_map(case).items()
+    }})
+
+
+@login_required
+@require_POST
+def evidence_upload_start(request, case_id):
+    """
+    Startet einen Upload in Blöcken (JSON-API).
+    Parameter: file_name, size, optional sha256 sowie die Beweismittel-Daten
+    (evidence_number, title, evidence_type, description, location_found).
+    Ist die Prüfsumme bei einem einsehbaren Beweismittel bekannt, wird ohne
+    Übertragung abgeschlossen.
+    """
+    case = get_object_or_404(Case, id=case_id)
+    try:
+        upload = EvidenceUploadService.start(
+            case,
+            file_name=request.POST.get('file_name', ''),
+            size=int(request.POST.get('size', '')),
+            metadata=request.POST,
+            user=request.user,
+            sha256=request.POST.get('sha256', ''),
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    return JsonResponse(EvidenceUploadService.status(upload, request.user), status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD', 'PUT', 'DELETE'])
+def evidence_upload(request, upload_id):
+    """
+    Stand abfragen (GET), Block anhängen (PUT mit Header Upload-Offset,
+    Rohdaten im Body) oder Upload abbrechen (DELETE).
+    """
+    upload = get_object_or_404(EvidenceUpload, id=upload_id, created_by=request.user)
+    
+    if request.method == 'DELETE':
+        EvidenceUploadService.abort(upload)
+    elif request.method == 'PUT':
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'error': 'Header Upload-Offset fehlt oder ist ungültig.'}, status=400)
+        if length > EvidenceUploadService.MAX_CHUNK_SIZE:
+            return JsonResponse({'error': 'Block ist zu groß.'}, status=413)
+        try:
+            upload = EvidenceUploadService.append(upload.pk, offset, request, length)
+        except UploadOffsetMismatch as exc:
+            return JsonResponse({'error': str(exc), 'offset': exc.offset}, status=409)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+    
+    return JsonResponse(EvidenceUploadService.status(upload, request.user))
+
+
 @login_required
 def case_create(request):
     """
@@ -151,52 +304,98 @@ def search(request):
     Globale Suche über alle Entitäten
     """
     query = request.GET.get('q', '')
-    results = {}
-    
-    if query:
-        # Personen durchsuchen
-        persons = Person.objects.filter(
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(known_aliases__icontains=query)
-        )
-        
-        # Fälle durchsuchen
-        cases = Case.objects.filter(
-            Q(case_number__icontains=query) |
-            Q(title__icontains=query) |
-            Q(description__icontains=query)
-        )
-        
-        # Fahrzeuge durchsuchen
-        vehicles = Vehicle.objects.filter(
-            Q(license_plate__icontains=query) |
-            Q(make__icontains=query) |
-            Q(model__icontains=query)
-        )
-        
-        # Adressen durchsuchen
-        addresses = Address.objects.filter(
-            Q(street__icontains=query) |
-            Q(city__icontains=query) |
-            Q(postal_code__icontains=query)
+    mode = request.GET.get('mode', 'contains')
+    entity_type = request.GET.get('type')
+    types = [entity_type] if entity_type in GlobalSearchService.TYPES else None
+    
+    try:
+        results = GlobalSearchService.search(
+            query, mode=mode, types=types, cursor=request.GET.get('cursor') if types else None
         )
-        
-        results = {
-            'persons': persons,
-            'cases': cases,
-            'vehicles': vehicles,
-            'addresses': addresses,
-        }
+    except ValueError:
+        messages.error(request, 'Ungültiger Cursor, zeige erste Ergebnisse.')
+        results = GlobalSearchService.search(query, mode=mode, types=types)
     
     context = {
         'query': query,
+        'mode': mode,
+        'entity_type': types[0] if types else None,
         'results': results,
     }
     
     return render(request, 'investigations/search.html', context)
 
 
+@login_required
+def autocomplete(request):
+    """
+    Typeahead-Vorschläge für Personen, Adressen, Fahrzeuge und Fälle (JSON)
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 25)
+        results = AutocompleteService.suggest(
+            request.GET.get('type', ''), request.GET.get('q', ''), limit=limit
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Ungültige Parameter.'}, status=400)
+    
+    return JsonResponse({'results': results})
+
+
+@login_required
+def timeline_gap_report(request):
+    """
+    Fallübergreifender Bericht: größte unerklärte Lücken in den Zeitachsen
+    """
+    try:
+        threshold_hours = min(
+            max(int(request.GET.get('threshold', 24)), 1), TimelineAnalysisService.MAX_GAP_THRESHOLD_HOURS
+        )
+    except ValueError:
+        threshold_hours = 24
+    
+    gaps = TimelineAnalysisService.get_timeline_gaps_bulk(threshold_hours=threshold_hours)
+    page_obj = Paginator(gaps, 25).get_page(request.GET.get('page'))
+    
+    gaps = list(page_obj.object_list)
+    for gap in gaps:
+        gap['duration_hours'] = gap['gap'].total_seconds() / 3600
+    
+    context = {
+        'page_obj': page_obj,
+        'gaps': gaps,
+        'is_paginated': page_obj.has_other_pages(),
+        'threshold': threshold_hours,
+    }
+    
+    return render(request, 'investigations/timeline_gaps.html', context)
+
+
+@login_required
+def timeline_heatmap(request):
+    """
+    Heatmap-API (Wochentag × Stunde) über den vorberechneten Würfel.
+    Parameter: case_type (mehrfach), start/end im Format YYYY-MM
+    """
+    case_types = request.GET.getlist('case_type')
+    
+    try:
+        start_month = request.GET.get('start')
+        start_month = datetime.strptime(start_month, '%Y-%m').date() if start_month else None
+        end_month = request.GET.get('end')
+        end_month = datetime.strptime(end_month, '%Y-%m').date() if end_month else None
+    except ValueError:
+        return JsonResponse({'error': 'Ungültiger Monat, erwartet YYYY-MM.'}, status=400)
+    
+    heatmap = TemporalHeatmapService.get_heatmap(
+        case_types=case_types or None,
+        start_month=start_month,
+        end_month=end_month,
+    )
+    
+    return JsonResponse(heatmap)
+
+
 @login_required
 def case_edit(request, case_id):
     """
@@ -298,14 +497,9 @@ def timeline_add(request, case_id):
         messages.success(request, 'Zeitachse-Ereignis wurde erfolgreich hinzugefügt.')
         return redirect('case_detail', case_id=case.id)
     
-    # Get available persons and locations for the form
-    persons = Person.objects.all().order_by('last_name', 'first_name')
-    locations = Address.objects.all().order_by('city', 'street')
-    
+    # Personen und Orte werden per Autocomplete nachgeladen
     context = {
         'case': case,
-        'persons': persons,
-        'locations': locations,
     }
     
     return render(request, 'investigations/timeline_add.html', context)
@@ -368,15 +562,10 @@ def timeline_edit(request, timeline_id):
         messages.success(request, 'Zeitachse-Ereignis wurde erfolgreich aktualisiert.')
         return redirect('case_detail', case_id=timeline_entry.case.id)
     
-    # Get available persons and locations for the form
-    persons = Person.objects.all().order_by('last_name', 'first_name')
-    locations = Address.objects.all().order_by('city', 'street')
-    
+    # Personen und Orte werden per Autocomplete nachgeladen
     context = {
         'timeline_entry': timeline_entry,
         'case': timeline_entry.case,
-        'persons': persons,
-        'locations': locations,
     }
     
     return render(request, 'investigations/timeline_edit.html', context)